@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+asyncio 번역 엔진 벤치마크
+스레드 풀 (translate_chunks, 문서별 순차) vs asyncio 엔진 (translate_documents_async, 문서 동시)
+
+로컬 스텁 서버의 응답 지연(--latency-ms)으로 API 대기 시간을 모사합니다.
+진행 로그는 숨기고 소요시간만 출력합니다.
+
+사용법:
+  python benchmarks/bench_async_engine.py
+  python benchmarks/bench_async_engine.py --documents 4 --chunks 100 --concurrency 200
+"""
+import os
+import io
+import sys
+import time
+import asyncio
+import argparse
+import contextlib
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / 'benchmarks'))
+
+from stub_server import StubServer
+from src.llm import client_pool
+
+
+def make_documents(documents: int, chunks: int) -> dict:
+    """문서당 chunks개의 합성 청크"""
+    text = "The founder pitched the startup to investors. " * 20
+    return {
+        f"doc{d + 1}": {
+            'chunks': [{'text': text, 'overlap': None} for _ in range(chunks)],
+            'glossary': None,
+        }
+        for d in range(documents)
+    }
+
+
+def run_threads(translate_pdf, docs: dict, workers: int) -> float:
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for doc in docs.values():
+            translate_pdf.translate_chunks(doc['chunks'], api_key="stub-key", max_workers=workers)
+    return time.perf_counter() - start
+
+
+def run_async(translate_pdf, docs: dict, concurrency: int) -> float:
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        asyncio.run(translate_pdf.translate_documents_async(docs, api_key="stub-key", max_concurrency=concurrency))
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description='asyncio 번역 엔진 벤치마크')
+    parser.add_argument('--documents', type=int, default=3)
+    parser.add_argument('--chunks', type=int, default=60, help='문서당 청크 수')
+    parser.add_argument('--workers', type=int, default=20, help='스레드 풀 워커 수')
+    parser.add_argument('--concurrency', type=int, default=100, help='asyncio 동시 요청 수')
+    parser.add_argument('--latency-ms', type=float, default=300.0, help='스텁 응답 지연')
+    args = parser.parse_args()
+
+    with StubServer(latency_ms=args.latency_ms) as server:
+        os.environ['ANTHROPIC_BASE_URL'] = server.base_url
+        import translate_pdf
+
+        docs = make_documents(args.documents, args.chunks)
+        total = args.documents * args.chunks
+        print(f"[STUB] {server.base_url} (latency {args.latency_ms}ms)")
+        print(f"[BENCH] {args.documents} documents × {args.chunks} chunks = {total} requests")
+        print()
+        print(f"{'engine':<34} {'time':>8} {'req/s':>8}")
+        print("-" * 52)
+
+        threaded = run_threads(translate_pdf, docs, args.workers)
+        print(f"{f'thread pool ({args.workers} workers)':<34} {threaded:>7.2f}s {total / threaded:>8.1f}")
+        asynced = run_async(translate_pdf, docs, args.concurrency)
+        print(f"{f'asyncio ({args.concurrency} in flight)':<34} {asynced:>7.2f}s {total / asynced:>8.1f}")
+
+        print()
+        print(f"speedup: {threaded / asynced:.2f}x")
+
+    client_pool.close_all()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Message Batches 실행기 벤치마크 (run_batch / translate_chunks_batch)
+제출 → 폴링 → 청크 순서대로 재조립, 중단 후 재실행 시 배치 이어받기, 오류/만료 요청 재제출
+
+로컬 스텁 서버는 배치 결과를 요청 순서와 다르게 섞고 응답 끝에 custom_id를 붙입니다.
+시나리오마다 소요시간, 스텁이 받은 배치/요청 수, 원문으로 대체된 청크 수, 재조립 순서를 비교합니다.
+
+- submit + poll: 한 번 제출하고 완료까지 폴링
+- errored/expired resubmit: --error-rate/--expire-rate 비율의 결과를 새 배치로 한 번 더 제출
+- resume after interrupt: 제출 직후 프로세스를 죽이고 다시 실행 → .cache/batch_jobs.json의 배치를 이어서 기다림
+  (새 배치를 제출하지 않아야 하며, 결과를 받으면 기록 삭제)
+
+사용법:
+  python benchmarks/bench_batch.py
+  python benchmarks/bench_batch.py --chunks 500 --error-rate 0.1 --expire-rate 0.05
+"""
+import io
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import contextlib
+import subprocess
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / 'benchmarks'))
+
+from stub_server import StubServer
+from src.llm import client_pool
+
+TEXT = "The founder pitched the startup to investors. " * 20
+JOB_FILE = Path(".cache") / "batch_jobs.json"
+
+
+def make_chunks(count: int) -> list:
+    """시나리오와 자식 프로세스가 같은 배치 키를 만들도록 결정적인 청크"""
+    return [{'text': f"{TEXT} #{i}", 'overlap': None} for i in range(count)]
+
+
+def translate(chunks: list, poll: float) -> list:
+    """translate_chunks_batch 실행 (출력 숨김)"""
+    import translate_pdf
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        return translate_pdf.translate_chunks_batch(chunks, api_key="batch-key", poll_interval=poll)
+
+
+def check(chunks: list, results: list) -> tuple:
+    """(원문으로 대체된 청크 수, 성공한 청크가 모두 제자리에 있는지)"""
+    failed = 0
+    ordered = len(results) == len(chunks)
+    for i, (chunk, out) in enumerate(zip(chunks, results), 1):
+        if out == chunk['text']:
+            failed += 1
+        elif not out.endswith(f"(chunk-{i:05d})"):
+            ordered = False
+    return failed, ordered
+
+
+def interrupt_after_submit(chunks: list, poll: float, server, timeout: float = 30.0) -> None:
+    """자식 프로세스에서 배치를 제출하게 한 뒤 폴링 중에 강제 종료 (중단된 실행 모사)"""
+    child = subprocess.Popen(
+        [sys.executable, __file__, '--child', '--chunks', str(len(chunks)), '--poll', str(poll)],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    deadline = time.time() + timeout
+    while not (server.batches and JOB_FILE.exists()) and time.time() < deadline:
+        time.sleep(0.05)
+    child.kill()
+    child.wait()
+
+
+def report(name: str, elapsed: float, server, failed: int, ordered: bool, note: str = "") -> None:
+    print(f"{name:<26} {elapsed:>7.2f}s {len(server.batches):>8} {server.batch_requests:>9} "
+          f"{failed:>7} {'OK' if ordered else 'WRONG':>6}  {note}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Message Batches 실행기 벤치마크')
+    parser.add_argument('--chunks', type=int, default=200)
+    parser.add_argument('--error-rate', type=float, default=0.1, help='errored 배치 결과 비율')
+    parser.add_argument('--expire-rate', type=float, default=0.05, help='expired 배치 결과 비율')
+    parser.add_argument('--batch-seconds', type=float, default=1.0, help='스텁 배치 처리 시간')
+    parser.add_argument('--poll', type=float, default=0.2, help='완료 확인 간격 초')
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    chunks = make_chunks(args.chunks)
+    if args.child:
+        translate(chunks, args.poll)
+        return
+
+    # 첫 시나리오 시간에 모듈 로딩이 섞이지 않도록 미리 import
+    import translate_pdf  # noqa: F401
+
+    print(f"[BENCH] {args.chunks} chunks, batch {args.batch_seconds:g}s, poll {args.poll:g}s, "
+          f"{args.error_rate:.0%} errored + {args.expire_rate:.0%} expired results")
+    print()
+    print(f"{'scenario':<26} {'time':>8} {'batches':>8} {'requests':>9} {'failed':>7} {'order':>6}")
+    print("-" * 72)
+
+    # 배치 기록(.cache/batch_jobs.json)은 시나리오마다 빈 임시 디렉터리에
+    home = os.getcwd()
+    scenarios = [
+        ("submit + poll", 0.0, 0.0, False),
+        ("errored/expired resubmit", args.error_rate, args.expire_rate, False),
+        ("resume after interrupt", 0.0, 0.0, True),
+    ]
+    for name, error_rate, expire_rate, interrupt in scenarios:
+        with tempfile.TemporaryDirectory() as workdir, \
+                StubServer(error_rate=error_rate, batch_expire_rate=expire_rate, batch_seconds=args.batch_seconds,
+                           seed=1) as server:
+            os.chdir(workdir)
+            os.environ['ANTHROPIC_BASE_URL'] = server.base_url
+            note = ""
+            try:
+                if interrupt:
+                    interrupt_after_submit(chunks, args.poll, server)
+                    saved = json.loads(JOB_FILE.read_text(encoding='utf-8')) if JOB_FILE.exists() else {}
+                    note = f"saved job {'kept' if saved else 'MISSING'} after kill"
+                start = time.perf_counter()
+                results = translate(chunks, args.poll)
+                elapsed = time.perf_counter() - start
+                if interrupt:
+                    left = json.loads(JOB_FILE.read_text(encoding='utf-8')) if JOB_FILE.exists() else {}
+                    note += f", {'resumed' if len(server.batches) == 1 else 'RESUBMITTED'}"
+                    note += f", job record {'removed' if not left else 'LEFT'}"
+                elif error_rate or expire_rate:
+                    note = "failed = errored/expired in both rounds"
+                report(name, elapsed, server, *check(chunks, results), note)
+            finally:
+                os.chdir(home)
+                client_pool.close_all()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+청커 마이크로 벤치마크
+기존 chunk_text (re.split + 경계마다 크기 재계산) vs 선형 증분 청커 비교
+
+사용법:
+  python benchmarks/bench_chunker.py
+  python benchmarks/bench_chunker.py --repeat 20 --chunk-size 5000
+"""
+import sys
+import re
+import time
+import argparse
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from src.translation.chunker import iter_chunks
+
+
+def legacy_chunk_text(text, chunk_size=5000, overlap_sentences=2):
+    """기존 translate_pdf.chunk_text 구현 (출력 제외, 비교 기준)"""
+    sentence_pattern = r'(?<!\w\.\w.)(?<![A-Z][a-z]\.)(?<=\.|\?|\!)\s+'
+    sentences = re.split(sentence_pattern, text)
+
+    chunks = []
+    current_chunk = []
+    current_size = 0
+    overlap_buffer = []
+
+    for sentence in sentences:
+        sentence = sentence.strip()
+        if not sentence:
+            continue
+
+        sentence_size = len(sentence)
+
+        if current_size + sentence_size > chunk_size and current_chunk:
+            chunk_text = " ".join(current_chunk)
+            chunks.append({
+                'text': chunk_text,
+                'overlap': " ".join(overlap_buffer) if overlap_buffer else None
+            })
+            overlap_buffer = current_chunk[-overlap_sentences:] if len(current_chunk) >= overlap_sentences else current_chunk[:]
+            current_chunk = overlap_buffer[:] + [sentence]
+            current_size = sum(len(s) for s in current_chunk)
+        else:
+            current_chunk.append(sentence)
+            current_size += sentence_size
+
+    if current_chunk:
+        chunk_text = " ".join(current_chunk)
+        chunks.append({
+            'text': chunk_text,
+            'overlap': " ".join(overlap_buffer) if overlap_buffer and len(chunks) > 0 else None
+        })
+
+    return chunks
+
+
+def best_of(func, repeat):
+    """repeat회 실행 중 최소 소요시간 (초)"""
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='청커 마이크로 벤치마크')
+    parser.add_argument('files', nargs='*', help='입력 파일 (기본: output/*.md)')
+    parser.add_argument('--repeat', type=int, default=10, help='반복 횟수 (기본: 10)')
+    parser.add_argument('--chunk-size', type=int, default=5000, help='청크 크기 (기본: 5000)')
+    args = parser.parse_args()
+
+    files = [Path(f) for f in args.files] or sorted((ROOT / 'output').glob('*.md'))
+    if not files:
+        print("[ERROR] 입력 파일이 없습니다 (output/*.md)")
+        return
+
+    print(f"{'file':<40} {'size':>8} {'chunks':>6} {'legacy':>10} {'linear':>10} {'stream':>10} {'speedup':>8}")
+    print("-" * 98)
+
+    for path in files:
+        text = path.read_text(encoding='utf-8')
+        lines = [line + "\n" for line in text.split("\n")]
+
+        legacy_time, legacy = best_of(lambda: legacy_chunk_text(text, args.chunk_size), args.repeat)
+        linear_time, linear = best_of(lambda: list(iter_chunks([text], args.chunk_size)), args.repeat)
+        # 스트리밍 입력: 줄 단위 조각으로 공급 (페이지 스트림 모사)
+        stream_time, _ = best_of(lambda: list(iter_chunks(lines, args.chunk_size)), args.repeat)
+
+        same = [c['text'] for c in legacy] == [c.text for c in linear] and \
+               [c['overlap'] for c in legacy] == [c.overlap for c in linear]
+
+        print(f"{path.name[:40]:<40} {len(text) // 1024:>6}KB {len(linear):>6} "
+              f"{legacy_time * 1000:>8.1f}ms {linear_time * 1000:>8.1f}ms {stream_time * 1000:>8.1f}ms "
+              f"{legacy_time / linear_time:>7.2f}x{'' if same else '  ⚠️ 결과 불일치'}")
+
+
+if __name__ == "__main__":
+    main()
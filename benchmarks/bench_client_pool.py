@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+클라이언트 재사용 벤치마크
+요청마다 새 Anthropic 클라이언트 생성 (기존 방식) vs 공유 클라이언트 레지스트리 비교
+
+로컬 스텁 서버를 띄워 새 TCP 연결 수와 소요시간을 측정합니다.
+--handshake-ms로 새 연결마다 지연을 주어 원격 TLS 핸드셰이크 비용을 모사합니다.
+
+사용법:
+  python benchmarks/bench_client_pool.py
+  python benchmarks/bench_client_pool.py --requests 400 --workers 20 --handshake-ms 40
+"""
+import sys
+import time
+import argparse
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / 'benchmarks'))
+
+from anthropic import Anthropic
+
+from stub_server import StubServer
+from src.llm import client_pool
+
+MODEL = "claude-haiku-4-5-20251001"
+
+
+def call(client) -> None:
+    client.messages.create(
+        model=MODEL,
+        max_tokens=64,
+        messages=[{"role": "user", "content": "ping"}],
+    )
+
+
+def run(server: StubServer, requests: int, workers: int, shared: bool) -> tuple:
+    """requests회 호출 후 (소요시간, 새 연결 수) 반환"""
+    server.reset_counters()
+    client_pool.close_all()
+    client_pool.configure_pool(workers)
+
+    def task(_):
+        if shared:
+            call(client_pool.get_client("stub-key", base_url=server.base_url))
+        else:
+            client = Anthropic(api_key="stub-key", base_url=server.base_url)
+            call(client)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(task, range(requests)))
+    return time.perf_counter() - start, server.connections
+
+
+def main():
+    parser = argparse.ArgumentParser(description='공유 클라이언트 벤치마크')
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--workers', type=int, default=20)
+    parser.add_argument('--latency-ms', type=float, default=5.0, help='스텁 응답 지연')
+    parser.add_argument('--handshake-ms', type=float, default=30.0, help='새 연결당 지연 (TLS 모사)')
+    args = parser.parse_args()
+
+    with StubServer(latency_ms=args.latency_ms, handshake_ms=args.handshake_ms) as server:
+        print(f"[STUB] {server.base_url} (latency {args.latency_ms}ms, handshake {args.handshake_ms}ms)")
+        print(f"[BENCH] {args.requests} requests, {args.workers} workers")
+        print()
+        print(f"{'mode':<28} {'time':>8} {'req/s':>8} {'connections':>12}")
+        print("-" * 60)
+
+        results = {}
+        for label, shared in (("per-request client", False), ("shared client registry", True)):
+            elapsed, connections = run(server, args.requests, args.workers, shared)
+            results[label] = elapsed
+            print(f"{label:<28} {elapsed:>7.2f}s {args.requests / elapsed:>8.1f} {connections:>12}")
+
+        print()
+        print(f"speedup: {results['per-request client'] / results['shared client registry']:.2f}x")
+
+    client_pool.close_all()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+헤지 요청 벤치마크
+헤지 없음 vs p95 초과 시 중복 요청 (translate_chunks 스레드 엔진 / asyncio 엔진)
+
+로컬 스텁 서버가 --straggler-rate 비율의 요청을 --straggler-factor배 느리게 응답합니다.
+소요시간, 스텁이 받은 요청 수, 헤지 수와 추가 비용을 비교합니다.
+
+사용법:
+  python benchmarks/bench_hedging.py
+  python benchmarks/bench_hedging.py --chunks 200 --workers 16 --straggler-rate 0.05 --straggler-factor 10
+"""
+import io
+import os
+import sys
+import time
+import argparse
+import contextlib
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / 'benchmarks'))
+
+from stub_server import StubServer
+from src.llm import client_pool
+from src.llm.hedging import HedgePolicy, configure_hedging
+from src.llm.pricing import get_model_pricing
+
+TEXT = "The founder pitched the startup to investors. " * 20
+
+
+def run(label: str, engine: str, chunks: list, workers: int, policy, server) -> None:
+    """한 설정으로 번역하고 결과 한 줄 출력"""
+    import translate_pdf
+
+    hedger = configure_hedging(policy)
+    server.reset_counters()
+    # 설정마다 같은 순번의 요청이 느려지도록 난수 초기화
+    server.random.seed(7)
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        if engine == "async":
+            translate_pdf.translate_chunks_async(chunks, api_key=f"{label}-key", max_concurrency=workers,
+                                                 longest_first=False)
+        else:
+            translate_pdf.translate_chunks(chunks, api_key=f"{label}-key", max_workers=workers,
+                                           longest_first=False)
+    elapsed = time.perf_counter() - start
+    hedged = wins = 0
+    cost = 0.0
+    if hedger is not None:
+        summary = hedger.summary(get_model_pricing)
+        hedged, wins, cost = summary['hedged'], summary['hedge_wins'], summary['extra_cost']
+    print(f"{label:<28} {elapsed:>7.2f}s {server.requests:>9} {server.stragglers:>11} "
+          f"{hedged:>7} {wins:>5} {cost:>10.4f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='헤지 요청 벤치마크')
+    parser.add_argument('--chunks', type=int, default=120)
+    parser.add_argument('--workers', type=int, default=8, help='워커 수 / asyncio 동시 요청 수')
+    parser.add_argument('--latency-ms', type=float, default=150.0, help='요청당 기본 지연')
+    parser.add_argument('--straggler-rate', type=float, default=0.05, help='느린 요청 비율')
+    parser.add_argument('--straggler-factor', type=float, default=10.0, help='느린 요청의 지연 배율')
+    parser.add_argument('--budget', type=float, default=0.1, help='헤지 예산 (요청 대비 비율)')
+    args = parser.parse_args()
+
+    chunks = [{'text': f"{TEXT}[{i}]", 'overlap': None} for i in range(args.chunks)]
+    # 스텁의 응답 시간이 짧으므로 임계 시간 하한을 낮춤
+    policy = HedgePolicy(budget=args.budget, min_delay=0.05)
+
+    with StubServer(latency_ms=args.latency_ms, straggler_rate=args.straggler_rate,
+                    straggler_factor=args.straggler_factor, seed=7) as server:
+        os.environ['ANTHROPIC_BASE_URL'] = server.base_url
+        print(f"[STUB] {server.base_url} (latency {args.latency_ms}ms, "
+              f"{args.straggler_rate:.0%} of requests ×{args.straggler_factor:g})")
+        print(f"[BENCH] {args.chunks} chunks, {args.workers} workers, hedge budget {args.budget:.0%}")
+        print()
+        # 클라이언트 생성·SDK 지연 임포트 비용을 첫 측정에서 제외
+        with contextlib.redirect_stdout(io.StringIO()):
+            import translate_pdf
+            translate_pdf.translate_chunks(chunks[:4], api_key="warmup-key", max_workers=args.workers)
+        print(f"{'run':<28} {'time':>8} {'requests':>9} {'stragglers':>11} {'hedged':>7} {'wins':>5} {'extra $':>10}")
+        print("-" * 84)
+
+        run("threads, no hedge", "threads", chunks, args.workers, None, server)
+        run("threads, hedge p95", "threads", chunks, args.workers, policy, server)
+        run("asyncio, no hedge", "async", chunks, args.workers, None, server)
+        run("asyncio, hedge p95", "async", chunks, args.workers, policy, server)
+
+    configure_hedging(None)
+    client_pool.close_all()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+적응형 레이트 리미터 벤치마크
+고정 워커 수로 바로 호출 (기존 방식) vs 공유 레이트 리미터 경유 (translate_chunks)
+
+로컬 스텁 서버가 동시 요청 --max-concurrent 초과분에 429 + retry-after를 돌려줍니다.
+기존 방식은 SDK 기본 재시도(2회), 리미터 방식은 재시도 계층(retry.py)을 사용하며,
+서버가 보낸 429 수와 재시도 후에도 실패한 (원문으로 대체될) 청크 수를 비교합니다.
+
+사용법:
+  python benchmarks/bench_rate_limiter.py
+  python benchmarks/bench_rate_limiter.py --chunks 200 --workers 40 --max-concurrent 8
+"""
+import io
+import os
+import sys
+import time
+import argparse
+import contextlib
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / 'benchmarks'))
+
+from stub_server import StubServer
+from src.llm import client_pool
+
+TEXT = "The founder pitched the startup to investors. " * 20
+
+
+def run_fixed(server: StubServer, chunks: int, workers: int) -> tuple:
+    """리미터 없이 고정 워커로 호출 → (소요시간, 실패 수)"""
+    import translate_pdf
+    from anthropic import Anthropic
+    # 기존 방식: SDK 기본 재시도(2회)만 사용
+    client = Anthropic(api_key="direct-key", base_url=server.base_url, timeout=client_pool.REQUEST_TIMEOUT)
+
+    def task(i):
+        try:
+            client.messages.create(
+                model=translate_pdf.TRANSLATION_MODEL,
+                max_tokens=64000,
+                messages=[{"role": "user", "content": translate_pdf.build_translation_prompt(f"{TEXT} [{i}]")}]
+            )
+            return True
+        except Exception:
+            return False
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        ok = list(executor.map(task, range(1, chunks + 1)))
+    return time.perf_counter() - start, ok.count(False)
+
+
+def run_limited(server: StubServer, chunks: int, workers: int) -> tuple:
+    """translate_chunks (공유 레이트 리미터 경유) → (소요시간, 실패 수, 리미터 요약)"""
+    import translate_pdf
+    from src.llm.rate_limiter import get_limiter
+
+    data = [{'text': f"{TEXT} #{i}", 'overlap': None} for i in range(chunks)]
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        results = translate_pdf.translate_chunks(data, api_key="limited-key", max_workers=workers)
+    elapsed = time.perf_counter() - start
+    failed = sum(1 for original, out in zip(data, results) if out == original['text'])
+    return elapsed, failed, get_limiter("limited-key").summary()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='레이트 리미터 벤치마크')
+    parser.add_argument('--chunks', type=int, default=100)
+    parser.add_argument('--workers', type=int, default=20)
+    parser.add_argument('--max-concurrent', type=int, default=5, help='스텁 서버 동시 처리 한도 (초과 시 429)')
+    parser.add_argument('--latency-ms', type=float, default=200.0, help='스텁 응답 지연')
+    args = parser.parse_args()
+
+    with StubServer(latency_ms=args.latency_ms, max_concurrent=args.max_concurrent) as server:
+        os.environ['ANTHROPIC_BASE_URL'] = server.base_url
+        print(f"[STUB] {server.base_url} (latency {args.latency_ms}ms, 429 above {args.max_concurrent} concurrent)")
+        print(f"[BENCH] {args.chunks} chunks, {args.workers} workers")
+        print()
+        print(f"{'mode':<26} {'time':>8} {'429s':>6} {'failed chunks':>14}")
+        print("-" * 58)
+
+        server.reset_counters()
+        elapsed, failed = run_fixed(server, args.chunks, args.workers)
+        print(f"{'fixed workers':<26} {elapsed:>7.2f}s {server.throttled:>6} {failed:>14}")
+
+        server.reset_counters()
+        elapsed, failed, summary = run_limited(server, args.chunks, args.workers)
+        print(f"{'adaptive rate limiter':<26} {elapsed:>7.2f}s {server.throttled:>6} {failed:>14}")
+        print()
+        print(f"limiter: concurrency {summary['concurrency']} (lowest {summary['lowest_concurrency']}), "
+              f"waited {summary['wait_seconds']}s")
+
+    client_pool.close_all()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+재시도 계층 벤치마크
+재시도 없음 vs 워커 안에서 대기하며 재시도 vs 대기열 맨 뒤로 재제출 (translate_chunks)
+
+로컬 스텁 서버가 --error-rate 비율의 요청에 500을 돌려줍니다.
+원문으로 대체된 청크 수와 소요시간을 비교합니다.
+
+사용법:
+  python benchmarks/bench_retry.py
+  python benchmarks/bench_retry.py --chunks 200 --workers 10 --error-rate 0.3
+"""
+import io
+import os
+import sys
+import time
+import argparse
+import contextlib
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / 'benchmarks'))
+
+from stub_server import StubServer
+from src.llm import client_pool
+
+TEXT = "The founder pitched the startup to investors. " * 20
+
+
+def run_no_retry(chunks: list, workers: int) -> tuple:
+    """재시도 1회 제한 → (소요시간, 실패 수)"""
+    import translate_pdf
+    from src.llm.retry import RetryPolicy
+
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        results = translate_pdf.translate_chunks(chunks, api_key="no-retry-key", max_workers=workers,
+                                                 retry_policy=RetryPolicy(max_attempts=1))
+    return time.perf_counter() - start, sum(1 for c, out in zip(chunks, results) if out == c['text'])
+
+
+def run_blocking(chunks: list, workers: int) -> tuple:
+    """워커가 백오프 동안 sleep하며 재시도 (translate_with_claude) → (소요시간, 실패 수)"""
+    import translate_pdf
+
+    def task(i):
+        return translate_pdf.translate_with_claude(chunks[i]['text'], api_key="blocking-key",
+                                                   chunk_num=i + 1, total_chunks=len(chunks))
+
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(task, range(len(chunks))))
+    return time.perf_counter() - start, results.count(None)
+
+
+def run_requeued(chunks: list, workers: int) -> tuple:
+    """translate_chunks (실패 청크를 대기열 맨 뒤로 재제출) → (소요시간, 실패 수)"""
+    import translate_pdf
+
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        results = translate_pdf.translate_chunks(chunks, api_key="requeued-key", max_workers=workers)
+    return time.perf_counter() - start, sum(1 for c, out in zip(chunks, results) if out == c['text'])
+
+
+def main():
+    parser = argparse.ArgumentParser(description='재시도 계층 벤치마크')
+    parser.add_argument('--chunks', type=int, default=100)
+    parser.add_argument('--workers', type=int, default=5)
+    parser.add_argument('--error-rate', type=float, default=0.3, help='스텁 500 응답 비율')
+    parser.add_argument('--latency-ms', type=float, default=200.0, help='스텁 응답 지연')
+    args = parser.parse_args()
+
+    chunks = [{'text': f"{TEXT} #{i}", 'overlap': None} for i in range(args.chunks)]
+    modes = [
+        ("no retry", run_no_retry),
+        ("retry in worker (sleep)", run_blocking),
+        ("retry re-queued", run_requeued),
+    ]
+
+    print(f"[BENCH] {args.chunks} chunks, {args.workers} workers, {args.error_rate:.0%} 500 responses")
+    print()
+    print(f"{'mode':<26} {'time':>8} {'500s':>6} {'failed chunks':>14}")
+    print("-" * 58)
+    for name, run in modes:
+        # 모드마다 같은 오류 순서를 쓰도록 seed 고정
+        with StubServer(latency_ms=args.latency_ms, error_rate=args.error_rate, seed=1) as server:
+            os.environ['ANTHROPIC_BASE_URL'] = server.base_url
+            elapsed, failed = run(chunks, args.workers)
+            print(f"{name:<26} {elapsed:>7.2f}s {server.errors:>6} {failed:>14}")
+        client_pool.close_all()
+
+
+if __name__ == "__main__":
+    main()
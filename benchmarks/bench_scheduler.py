@@ -0,0 +1,101 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+최장 작업 우선 스케줄러 벤치마크
+문서별 순차 (translate_chunks, 문서 순서) vs 한 워커 풀 (translate_documents, 문서 순서 / 최장 작업 우선)
+
+로컬 스텁 서버의 프롬프트 길이 비례 지연(--per-kchar-ms)으로 큰 청크일수록 오래 걸리는 응답을 모사합니다.
+각 문서 끝부분에 큰 청크를 두어 문서 순서 제출의 꼬리 지연을 재현하고,
+스텁 서버가 모사한 지연 합계 ÷ 워커 수(하한) 대비 소요시간을 출력합니다.
+
+사용법:
+  python benchmarks/bench_scheduler.py
+  python benchmarks/bench_scheduler.py --documents 4 --chunks 40 --workers 8
+"""
+import os
+import io
+import sys
+import time
+import argparse
+import contextlib
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / 'benchmarks'))
+
+from stub_server import StubServer
+from src.llm import client_pool
+
+
+def make_documents(documents: int, chunks: int, large: int) -> dict:
+    """문서당 작은 청크 chunks개 + 끝부분 큰 청크 large개"""
+    small = "The founder pitched the startup to investors. " * 10
+    big = "The founder pitched the startup to investors. " * 250
+    return {
+        f"doc{d + 1}": {
+            'chunks': [{'text': f"{small}[{d}.{i}]", 'overlap': None} for i in range(chunks)]
+                      + [{'text': f"{big}[{d}.L{i}]", 'overlap': None} for i in range(large)],
+            'glossary': None,
+        }
+        for d in range(documents)
+    }
+
+
+def timed(fn) -> float:
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        fn()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description='최장 작업 우선 스케줄러 벤치마크')
+    parser.add_argument('--documents', type=int, default=3)
+    parser.add_argument('--chunks', type=int, default=30, help='문서당 작은 청크 수')
+    parser.add_argument('--large', type=int, default=2, help='문서 끝부분 큰 청크 수')
+    parser.add_argument('--workers', type=int, default=8, help='워커 수')
+    parser.add_argument('--latency-ms', type=float, default=30.0, help='요청당 기본 지연')
+    parser.add_argument('--per-kchar-ms', type=float, default=100.0, help='프롬프트 1000자당 추가 지연')
+    args = parser.parse_args()
+
+    with StubServer(latency_ms=args.latency_ms, latency_per_kchar_ms=args.per_kchar_ms) as server:
+        os.environ['ANTHROPIC_BASE_URL'] = server.base_url
+        import translate_pdf
+
+        docs = make_documents(args.documents, args.chunks, args.large)
+        total = sum(len(doc['chunks']) for doc in docs.values())
+        print(f"[STUB] {server.base_url} (latency {args.latency_ms}ms + {args.per_kchar_ms}ms/1000 chars)")
+        print(f"[BENCH] {args.documents} documents × ({args.chunks} small + {args.large} large) = {total} requests, "
+              f"{args.workers} workers")
+        print()
+        print(f"{'schedule':<40} {'time':>8} {'ideal':>8} {'vs ideal':>9}")
+        print("-" * 68)
+
+        runs = [
+            ("per document, document order", lambda: [
+                translate_pdf.translate_chunks(doc['chunks'], api_key="stub-key", max_workers=args.workers,
+                                               longest_first=False)
+                for doc in docs.values()]),
+            ("one pool, document order", lambda: translate_pdf.translate_documents(
+                docs, api_key="stub-key", max_workers=args.workers, longest_first=False)),
+            ("one pool, longest-first", lambda: translate_pdf.translate_documents(
+                docs, api_key="stub-key", max_workers=args.workers)),
+        ]
+        results = []
+        for label, fn in runs:
+            server.reset_counters()
+            elapsed = timed(fn)
+            # 하한: 모사한 응답 지연 합계 ÷ 워커 수
+            ideal = server.latency_total / args.workers
+            results.append(elapsed)
+            print(f"{label:<40} {elapsed:>7.2f}s {ideal:>7.2f}s {elapsed / ideal:>8.2f}x")
+
+        print()
+        print(f"speedup (longest-first vs per-document order): {results[0] / results[-1]:.2f}x")
+
+    client_pool.close_all()
+
+
+if __name__ == "__main__":
+    main()
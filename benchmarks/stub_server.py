@@ -0,0 +1,361 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+로컬 Anthropic API 스텁 서버 (벤치마크/오프라인 점검용)
+
+- POST /v1/messages: 고정 응답 (usage 포함), "stream": true이면 SSE 이벤트로 나누어 전송
+- HTTP/1.1 keep-alive 지원, 새 TCP 연결 수 집계
+- handshake_ms: 새 연결마다 지연을 주어 원격 TLS 핸드셰이크 비용을 모사
+- latency_per_kchar_ms: 프롬프트 1000자당 추가 지연 (긴 청크일수록 오래 걸리는 생성 시간 모사)
+- straggler_rate / straggler_factor: 이 비율의 요청은 지연이 factor배 (느린 꼬리 요청 모사, seed로 재현 가능)
+- max_concurrent: 동시 처리 요청이 이 수를 넘으면 429 + retry-after 응답 (레이트 리밋 모사)
+- error_rate: 이 비율의 요청에 500 응답 (일시적 서버 오류 모사, seed로 재현 가능)
+- 프롬프트 캐시: cache_control이 붙은 system 블록은 처음에 캐시 쓰기, 이후 캐시 읽기로 usage 보고
+- Message Batches: POST /v1/messages/batches, GET .../{id}, GET .../{id}/results (JSONL)
+  batch_seconds 후 처리 완료, error_rate 비율의 요청은 errored, batch_expire_rate 비율은 expired 결과
+  결과 순서는 요청 순서와 다르게 섞고 (실제 API처럼), 응답 텍스트 끝에 custom_id를 붙여 재조립 순서를 확인할 수 있음
+
+사용법 (단독 실행):
+  python benchmarks/stub_server.py --port 8765
+  ANTHROPIC_BASE_URL=http://127.0.0.1:8765 python translate_pdf.py ...
+"""
+import json
+import time
+import random
+import itertools
+from datetime import datetime, timedelta, timezone
+import threading
+import argparse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Messages API 최소 구현"""
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        server = self.server
+        with server.lock:
+            server.connections += 1
+        if server.handshake_ms:
+            time.sleep(server.handshake_ms / 1000.0)
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status: int, payload: dict, headers: dict = None) -> None:
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_sse(self, message: dict) -> None:
+        """메시지를 스트리밍 이벤트(message_start → content_block_delta → message_stop)로 전송"""
+        text = message["content"][0]["text"]
+        start = dict(message, content=[], stop_reason=None,
+                     usage=dict(message["usage"], output_tokens=1))
+        events = [
+            ("message_start", {"type": "message_start", "message": start}),
+            ("content_block_start", {"type": "content_block_start", "index": 0,
+                                     "content_block": {"type": "text", "text": ""}}),
+        ]
+        # 글자 몇 개씩 나누어 델타 전송
+        for i in range(0, len(text), 4):
+            events.append(("content_block_delta", {"type": "content_block_delta", "index": 0,
+                                                   "delta": {"type": "text_delta", "text": text[i:i + 4]}}))
+        events += [
+            ("content_block_stop", {"type": "content_block_stop", "index": 0}),
+            ("message_delta", {"type": "message_delta",
+                               "delta": {"stop_reason": message["stop_reason"], "stop_sequence": None},
+                               "usage": {"output_tokens": message["usage"]["output_tokens"]}}),
+            ("message_stop", {"type": "message_stop"}),
+        ]
+        body = "".join(f"event: {name}\ndata: {json.dumps(data)}\n\n" for name, data in events).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_json(self) -> dict:
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+        return json.loads(raw or b"{}")
+
+    def do_GET(self):
+        server = self.server
+        parts = self.path.split("?")[0].strip("/").split("/")
+        # v1/messages/batches/{id}[/results]
+        if len(parts) in (4, 5) and parts[:3] == ["v1", "messages", "batches"]:
+            batch = server.get_batch(parts[3])
+            if batch is None:
+                self._send_json(404, {"type": "error", "error": {"type": "not_found_error", "message": parts[3]}})
+            elif len(parts) == 4:
+                self._send_json(200, server.batch_object(batch, self.headers.get("Host")))
+            elif batch["results"] is None:
+                self._send_json(400, {"type": "error", "error": {"type": "invalid_request_error",
+                                                                 "message": "batch still processing"}})
+            else:
+                body = "".join(json.dumps(line) + "\n" for line in batch["results"]).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/binary")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            return
+        self._send_json(404, {"type": "error", "error": {"type": "not_found_error", "message": self.path}})
+
+    def do_POST(self):
+        request = self._read_json()
+        server = self.server
+        with server.lock:
+            server.requests += 1
+
+        if self.path.split("?")[0] == "/v1/messages/batches":
+            batch = server.create_batch(request.get("requests", []))
+            self._send_json(200, server.batch_object(batch, self.headers.get("Host")))
+            return
+
+        if self.path.split("?")[0] != "/v1/messages":
+            self._send_json(404, {"type": "error", "error": {"type": "not_found_error", "message": self.path}})
+            return
+
+        with server.lock:
+            server.in_progress += 1
+            over_limit = server.max_concurrent and server.in_progress > server.max_concurrent
+            if over_limit:
+                server.in_progress -= 1
+                server.throttled += 1
+        if over_limit:
+            self._send_json(
+                429,
+                {"type": "error", "error": {"type": "rate_limit_error", "message": "stub rate limit"}},
+                headers={"retry-after": "1", "retry-after-ms": str(int(server.retry_after_ms))}
+            )
+            return
+
+        with server.lock:
+            failed = server.error_rate and server.random.random() < server.error_rate
+            if failed:
+                server.in_progress -= 1
+                server.errors += 1
+        if failed:
+            self._send_json(500, {"type": "error", "error": {"type": "api_error", "message": "stub server error"}})
+            return
+
+        try:
+            prompt_chars = sum(len(json.dumps(m.get("content", ""))) for m in request.get("messages", []))
+            latency_ms = server.latency_ms + server.latency_per_kchar_ms * prompt_chars / 1000.0
+            if latency_ms:
+                with server.lock:
+                    if server.straggler_rate and server.random.random() < server.straggler_rate:
+                        latency_ms *= server.straggler_factor
+                        server.stragglers += 1
+                    server.latency_total += latency_ms / 1000.0
+                time.sleep(latency_ms / 1000.0)
+            cache_write, cache_read = server.prompt_cache_usage(request.get("system"))
+            message = stub_message(request.get("model", "stub"), prompt_chars, cache_write, cache_read)
+            if request.get("stream"):
+                self._send_sse(message)
+            else:
+                self._send_json(200, message)
+        except (BrokenPipeError, ConnectionResetError):
+            # 클라이언트가 응답 전에 연결을 끊음 (헤지에서 진 요청 취소 등)
+            self.close_connection = True
+        finally:
+            with server.lock:
+                server.in_progress -= 1
+
+
+def stub_message(model: str, prompt_chars: int, cache_write: int = 0, cache_read: int = 0,
+                 text: str = "스텁 응답입니다.") -> dict:
+    """Messages API 응답 형식의 고정 메시지"""
+    return {
+        "id": "msg_stub",
+        "type": "message",
+        "role": "assistant",
+        "model": model,
+        "content": [{"type": "text", "text": text}],
+        "stop_reason": "end_turn",
+        "stop_sequence": None,
+        "usage": {
+            "input_tokens": max(1, prompt_chars // 4),
+            "output_tokens": 8,
+            "cache_creation_input_tokens": cache_write,
+            "cache_read_input_tokens": cache_read,
+        },
+    }
+
+
+class StubServer(ThreadingHTTPServer):
+    """연결/요청 수를 집계하는 스텁 서버 (with 문으로 백그라운드 실행)"""
+    daemon_threads = True
+    # 동시 연결이 많아도 accept 대기열에서 연결이 거부되지 않도록
+    request_queue_size = 256
+
+    def __init__(self, port: int = 0, latency_ms: float = 0.0, handshake_ms: float = 0.0,
+                 handler=StubHandler, max_concurrent: int = 0, retry_after_ms: float = 200.0,
+                 error_rate: float = 0.0, seed: int = 0, batch_seconds: float = 0.5, batch_expire_rate: float = 0.0,
+                 latency_per_kchar_ms: float = 0.0, straggler_rate: float = 0.0, straggler_factor: float = 1.0):
+        super().__init__(("127.0.0.1", port), handler)
+        self.lock = threading.Lock()
+        self.connections = 0
+        self.requests = 0
+        self.in_progress = 0
+        self.throttled = 0
+        self.errors = 0
+        self.latency_ms = latency_ms
+        self.latency_per_kchar_ms = latency_per_kchar_ms
+        self.latency_total = 0.0    # 모사한 응답 지연 합계 (초)
+        self.straggler_rate = straggler_rate
+        self.straggler_factor = straggler_factor
+        self.stragglers = 0
+        self.handshake_ms = handshake_ms
+        self.max_concurrent = max_concurrent
+        self.retry_after_ms = retry_after_ms
+        self.error_rate = error_rate
+        self.random = random.Random(seed)
+        self.prompt_cache = set()
+        self.batch_seconds = batch_seconds
+        self.batch_expire_rate = batch_expire_rate
+        self.batches = {}
+        self.batch_requests = 0
+        self._batch_ids = itertools.count(1)
+        self._thread = None
+
+    def prompt_cache_usage(self, system) -> tuple:
+        """system 블록의 (cache_creation_input_tokens, cache_read_input_tokens) 모사"""
+        if not isinstance(system, list):
+            return 0, 0
+        cached = [block.get("text", "") for block in system if block.get("cache_control")]
+        if not cached:
+            return 0, 0
+        prefix = "".join(cached)
+        tokens = max(1, len(prefix) // 4)
+        with self.lock:
+            if prefix in self.prompt_cache:
+                return 0, tokens
+            self.prompt_cache.add(prefix)
+        return tokens, 0
+
+    def create_batch(self, requests: list) -> dict:
+        """배치 등록 (batch_seconds 후 완료)"""
+        with self.lock:
+            batch_id = f"msgbatch_stub{next(self._batch_ids):04d}"
+            self.batch_requests += len(requests)
+            batch = {
+                "id": batch_id,
+                "requests": requests,
+                "created": datetime.now(timezone.utc),
+                "ready_at": time.time() + self.batch_seconds,
+                "results": None,
+            }
+            self.batches[batch_id] = batch
+        return batch
+
+    def get_batch(self, batch_id: str):
+        """배치 조회 (처리 시간이 지났으면 결과 생성)"""
+        with self.lock:
+            batch = self.batches.get(batch_id)
+        if batch is not None and batch["results"] is None and time.time() >= batch["ready_at"]:
+            results = []
+            for item in batch["requests"]:
+                params = item.get("params", {})
+                with self.lock:
+                    draw = self.random.random()
+                if self.error_rate and draw < self.error_rate:
+                    result = {"type": "errored", "error": {"type": "error", "error": {
+                        "type": "api_error", "message": "stub batch error"}}}
+                elif self.batch_expire_rate and draw < self.error_rate + self.batch_expire_rate:
+                    result = {"type": "expired"}
+                else:
+                    prompt_chars = sum(len(json.dumps(m.get("content", ""))) for m in params.get("messages", []))
+                    cache_write, cache_read = self.prompt_cache_usage(params.get("system"))
+                    result = {"type": "succeeded", "message": stub_message(
+                        params.get("model", "stub"), prompt_chars, cache_write, cache_read,
+                        text=f"스텁 응답입니다. ({item.get('custom_id')})")}
+                results.append({"custom_id": item.get("custom_id"), "result": result})
+            with self.lock:
+                self.random.shuffle(results)
+            batch["results"] = results
+        return batch
+
+    def batch_object(self, batch: dict, host: str) -> dict:
+        """MessageBatch 응답 형식"""
+        ended = batch["results"] is not None
+        counts = {"processing": 0, "succeeded": 0, "errored": 0, "canceled": 0, "expired": 0}
+        if ended:
+            for line in batch["results"]:
+                counts[line["result"]["type"]] += 1
+        else:
+            counts["processing"] = len(batch["requests"])
+        created = batch["created"]
+        return {
+            "id": batch["id"],
+            "type": "message_batch",
+            "processing_status": "ended" if ended else "in_progress",
+            "request_counts": counts,
+            "created_at": created.isoformat(),
+            "expires_at": (created + timedelta(hours=24)).isoformat(),
+            "ended_at": datetime.now(timezone.utc).isoformat() if ended else None,
+            "archived_at": None,
+            "cancel_initiated_at": None,
+            "results_url": f"http://{host}/v1/messages/batches/{batch['id']}/results" if ended else None,
+        }
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def reset_counters(self) -> None:
+        with self.lock:
+            self.connections = 0
+            self.requests = 0
+            self.throttled = 0
+            self.errors = 0
+            self.latency_total = 0.0
+            self.stragglers = 0
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+        self.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='로컬 Anthropic API 스텁 서버')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency-ms', type=float, default=0.0, help='요청당 응답 지연')
+    parser.add_argument('--handshake-ms', type=float, default=0.0, help='새 연결당 지연 (TLS 모사)')
+    parser.add_argument('--latency-per-kchar-ms', type=float, default=0.0, help='프롬프트 1000자당 추가 지연')
+    parser.add_argument('--straggler-rate', type=float, default=0.0, help='지연이 factor배인 요청 비율 (0-1)')
+    parser.add_argument('--straggler-factor', type=float, default=1.0, help='느린 요청의 지연 배율')
+    parser.add_argument('--max-concurrent', type=int, default=0, help='초과 시 429 응답 (0 = 무제한)')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='500 응답 비율 (0-1)')
+    parser.add_argument('--batch-seconds', type=float, default=0.5, help='배치 처리 완료까지 걸리는 초')
+    parser.add_argument('--batch-expire-rate', type=float, default=0.0, help='expired 배치 결과 비율 (0-1)')
+    args = parser.parse_args()
+
+    server = StubServer(args.port, args.latency_ms, args.handshake_ms, max_concurrent=args.max_concurrent,
+                        error_rate=args.error_rate, batch_seconds=args.batch_seconds,
+                        batch_expire_rate=args.batch_expire_rate, latency_per_kchar_ms=args.latency_per_kchar_ms,
+                        straggler_rate=args.straggler_rate, straggler_factor=args.straggler_factor)
+    print(f"[STUB] Listening on {server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
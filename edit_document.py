@@ -29,6 +29,9 @@ except ImportError:
     pass
 
 from src.editing.edit_orchestrator_v2 import EditOrchestratorV2
+from src.llm.rate_limiter import configure_limits
+from src.llm.response_cache import open_response_cache, configure_response_cache
+from src.llm.budget import configure_budget
 
 
 def print_header():
@@ -51,6 +54,7 @@ def parse_args():
   python edit_full_documents_v2.py output/output_laf_translated.md
   python edit_full_documents_v2.py output/output_laf_translated.md --pass1-only
   python edit_full_documents_v2.py output/output_laf_translated.md --workers 5
+  python edit_full_documents_v2.py output/output_laf_translated.md --budget-usd 2
         """
     )
     
@@ -61,6 +65,26 @@ def parse_args():
                        help='병렬 처리 워커 수 (기본: 10)')
     parser.add_argument('--no-diff', action='store_true',
                        help='비교 리포트 생성 안 함')
+    parser.add_argument('--batch', action='store_true',
+                       help='Message Batches API로 각 Pass의 청크를 배치 작업 하나로 제출 (50%% 할인, 실시간 아님)')
+    parser.add_argument('--batch-poll', type=float, default=30.0,
+                       help='배치 완료 확인 간격 초 (기본: 30)')
+    parser.add_argument('--rpm-limit', type=int, default=None,
+                       help='분당 요청 수 한도 (기본: 환경변수 ANTHROPIC_RPM_LIMIT 또는 응답 헤더 기준)')
+    parser.add_argument('--itpm-limit', type=int, default=None,
+                       help='분당 입력 토큰 한도 (기본: 환경변수 ANTHROPIC_ITPM_LIMIT 또는 응답 헤더 기준)')
+    parser.add_argument('--otpm-limit', type=int, default=None,
+                       help='분당 출력 토큰 한도 (기본: 환경변수 ANTHROPIC_OTPM_LIMIT 또는 응답 헤더 기준)')
+    parser.add_argument('--no-response-cache', action='store_true',
+                       help='LLM 응답 캐시 사용 안 함 (항상 API 호출)')
+    parser.add_argument('--purge-response-cache', action='store_true',
+                       help='실행 전 LLM 응답 캐시 전체 삭제')
+    parser.add_argument('--response-cache-mb', type=int, default=512,
+                       help='LLM 응답 캐시 최대 크기 MB (기본: 512)')
+    parser.add_argument('--budget-usd', type=float, default=None,
+                       help='비용 예산 USD: 다음 요청이 예산을 넘기면 새 요청을 중단하고 남은 청크는 원본 사용')
+    parser.add_argument('--estimate-only', action='store_true',
+                       help='예상 토큰/비용만 출력하고 종료 (API 호출 없음)')
     
     return parser.parse_args()
 
@@ -87,11 +111,35 @@ def main():
     else:
         print(f"   모드: 2-Pass 편집 (교정 + 윤문)")
     
-    print(f"   워커: {args.workers}개")
+    if args.batch:
+        print(f"   처리: Message Batches API (완료 확인 {args.batch_poll:g}초 간격)")
+    else:
+        print(f"   워커: {args.workers}개")
     print()
     
+    # 공유 레이트 리미터 한도 (미지정 항목은 환경변수 또는 첫 응답 헤더로 결정)
+    configure_limits(
+        requests_per_minute=args.rpm_limit,
+        input_tokens_per_minute=args.itpm_limit,
+        output_tokens_per_minute=args.otpm_limit
+    )
+    
+    # 비용 예산 (요청마다 예상 비용을 예약하고 실제 usage로 정산, 넘기면 새 요청 중단)
+    if args.budget_usd is not None:
+        if args.budget_usd <= 0:
+            print("❌ 오류: --budget-usd는 0보다 커야 합니다")
+            sys.exit(1)
+        budget = configure_budget(args.budget_usd)
+    else:
+        budget = None
+    
+    # LLM 응답 캐시 (같은 입력을 다시 편집하면 API를 호출하지 않음)
+    response_cache = open_response_cache(
+        args.no_response_cache, args.purge_response_cache, args.response_cache_mb
+    )
+    
     # 오케스트레이터 초기화
-    orchestrator = EditOrchestratorV2()
+    orchestrator = EditOrchestratorV2(use_batch=args.batch, batch_poll_interval=args.batch_poll)
     
     # 문서 로드
     try:
@@ -104,6 +152,21 @@ def main():
         print(f"❌ 문서 로드 실패: {e}")
         sys.exit(1)
     
+    # 사전 비용 추정 (API 호출 없음)
+    estimate = orchestrator.estimate_cost(doc.content, enable_pass2=not args.pass1_only)
+    print(f"💵 예상 비용: 요청 {estimate['requests']}회, input ≈{estimate['input_tokens']:,} tok, "
+          f"output ≈{estimate['output_tokens']:,} tok → ≈${estimate['cost']:.4f} (캐시 할인 전 상한)")
+    if budget is not None:
+        if estimate['cost'] > budget.limit:
+            print(f"⚠️  예상 비용이 예산 ${budget.limit:.2f}을 넘습니다 → 예산이 소진되면 남은 청크는 원본을 사용합니다")
+        else:
+            print(f"   예산 ${budget.limit:.2f} 안에서 편집합니다 (예상 비용은 예산의 {estimate['cost'] / budget.limit:.0%})")
+    if args.estimate_only:
+        if response_cache is not None:
+            response_cache.close()
+            configure_response_cache(None)
+        return
+    
     # 진행률 콜백
     def progress_callback(stage: str, progress: float):
         """진행률 추적"""
@@ -130,6 +193,10 @@ def main():
         import traceback
         traceback.print_exc()
         sys.exit(1)
+    finally:
+        if response_cache is not None:
+            response_cache.close()
+            configure_response_cache(None)
     
     # 출력 폴더 구조 생성
     # output_edited/
@@ -206,6 +273,9 @@ def main():
     
     print(f"\n💰 비용:")
     print(f"   총 비용: ${result.get('total_cost', 0):.4f} USD")
+    if budget is not None and budget.stopped:
+        print(f"   ⚠️  예산 ${budget.limit:.2f} 소진으로 일부 청크는 편집하지 않고 원본을 사용했습니다")
+        print(f"      --budget-usd를 늘려 다시 실행하면 완료된 청크는 응답 캐시에서 재사용합니다")
     
     print(f"\n⏱️  시간:")
     print(f"   총 소요: {result.get('processing_time', 0):.1f}초")
@@ -2,12 +2,12 @@
 # 출판 편집자 수준의 2-Pass 편집 시스템
 
 import os
+import re
 import time
 import json
 from typing import Dict, List, Any, Optional, Callable
 from pathlib import Path
 from datetime import datetime
-from concurrent.futures import ThreadPoolExecutor, as_completed
 from collections import defaultdict
 
 try:
@@ -16,35 +16,24 @@ try:
 except ImportError:
     HAS_ANTHROPIC = False
 
-from .prompts.proofreading_prompt import get_proofreading_prompt
-from .prompts.polishing_prompt import get_polishing_prompt
+from .prompts.proofreading_prompt import get_proofreading_system, get_proofreading_input
+from .prompts.polishing_prompt import get_polishing_system, get_polishing_input
 from .utils.diff_generator import DiffGenerator, generate_markdown_diff
 from .models.document import Document
+from ..llm.client_pool import get_client, configure_pool
+from ..llm.rate_limiter import get_limiter, estimate_tokens
+from ..llm.prompt_cache import cached_system, cache_usage, input_cost, min_cache_tokens
+from ..llm.pricing import get_model_pricing, usage_cost
+from ..llm.budget import (
+    BudgetExceeded, OutputReserveExceeded, budget_slot, get_budget, format_budget,
+    reserve_output, capped_params, check_output_reserve
+)
+from ..llm.batch import run_batch, BATCH_PRICE_MULTIPLIER, DEFAULT_POLL_INTERVAL
+from ..llm.response_cache import get_response_cache
+from ..llm.retry import run_requeued, describe_error, print_failure_report
 
-# 모델별 가격
-PRICING_USD_PER_MTOK = {
-    "claude-3-5-sonnet-20241022": {
-        "input": float(os.getenv("CLAUDE_SONNET_35_INPUT_MTOK", "3.00")),
-        "output": float(os.getenv("CLAUDE_SONNET_35_OUTPUT_MTOK", "15.00")),
-    },
-    "claude-3-5-sonnet-20240620": {
-        "input": float(os.getenv("CLAUDE_SONNET_35_INPUT_MTOK", "3.00")),
-        "output": float(os.getenv("CLAUDE_SONNET_35_OUTPUT_MTOK", "15.00")),
-    },
-    "claude-3-7-sonnet-20250219": {
-        "input": float(os.getenv("CLAUDE_SONNET_37_INPUT_MTOK", "3.00")),
-        "output": float(os.getenv("CLAUDE_SONNET_37_OUTPUT_MTOK", "15.00")),
-    },
-    "claude-haiku-4-5-20251001": {
-        "input": float(os.getenv("CLAUDE_HAIKU_45_INPUT_MTOK", "1.00")),
-        "output": float(os.getenv("CLAUDE_HAIKU_45_OUTPUT_MTOK", "5.00")),
-    },
-}
-
-
-def _get_model_pricing(model_name: str) -> dict:
-    """모델별 가격 정보"""
-    return PRICING_USD_PER_MTOK.get(model_name, {"input": 0.0, "output": 0.0})
+# 섹션 경계: 레이아웃 모드 번역본의 장/절 제목(## 장, ### 절)과 --no-layout 번역본의 ## Section N
+SECTION_HEADING_RE = re.compile(r'^#{2,3} ')
 
 
 class EditOrchestratorV2:
@@ -55,10 +44,17 @@ class EditOrchestratorV2:
     Pass 2: 창의적 윤문 (문장 구조, 가독성, 리듬감)
     """
     
-    def __init__(self):
-        """초기화"""
+    def __init__(self, use_batch: bool = False, batch_poll_interval: float = DEFAULT_POLL_INTERVAL):
+        """
+        초기화
+        
+        use_batch: 각 Pass의 청크를 Message Batches API 배치 작업 하나로 제출 (50% 할인, 실시간 아님)
+        batch_poll_interval: 배치 완료 확인 간격 (초)
+        """
         self.api_key = os.getenv('ANTHROPIC_API_KEY')
         self.diff_generator = DiffGenerator()
+        self.use_batch = use_batch
+        self.batch_poll_interval = batch_poll_interval
         
         if not HAS_ANTHROPIC:
             print("⚠️  anthropic 패키지가 설치되지 않았습니다.")
@@ -102,23 +98,31 @@ class EditOrchestratorV2:
         텍스트를 청크로 분할
         
         마크다운 구조를 유지하면서 분할:
-        - ## Section 단위로 우선 분할
+        - 장/절 제목(## , ### — --no-layout 번역본은 ## Section N) 단위로 우선 분할
+          (이어지는 제목 줄은 한 섹션에 묶음 → 장 제목 바로 뒤 절 제목이 따로 떨어지지 않음)
         - 너무 크면 단락 단위로 추가 분할
+        
+        섹션 경계가 제목에 고정되므로 앞 장이 바뀌어도 뒤 장의 청크(와 응답 캐시 키)는 그대로입니다.
         """
-        # Section 단위로 분할
+        # 제목 단위로 분할
         sections = []
         current_section = []
+        has_body = False
         
         lines = text.split('\n')
         
         for line in lines:
-            # Section 헤더 감지
-            if line.startswith('## Section'):
-                if current_section:
+            # 섹션 제목 감지 (본문이 나온 뒤의 제목에서만 새 섹션 시작)
+            if SECTION_HEADING_RE.match(line):
+                if has_body:
                     sections.append('\n'.join(current_section))
-                current_section = [line]
+                    current_section = []
+                    has_body = False
+                current_section.append(line)
             else:
                 current_section.append(line)
+                if line.strip():
+                    has_body = True
         
         if current_section:
             sections.append('\n'.join(current_section))
@@ -146,53 +150,267 @@ class EditOrchestratorV2:
         
         return chunks
     
-    def _call_claude(self, prompt: str, model: str = "claude-3-7-sonnet-20250219",
-                    temperature: float = 0.3) -> tuple:
+    def _request_claude(self, prompt: str, model: str, temperature: float,
+                        expected_output_tokens: Optional[int] = None,
+                        system: Optional[str] = None) -> tuple:
         """
-        Claude API 호출
+        Claude API 1회 호출 (실패 시 예외 발생)
+        
+        번역과 같은 공유 레이트 리미터에서 예산을 예약합니다.
+        expected_output_tokens: 예상 출력 토큰 (기본: 프롬프트 추정치). 여유 배율을 곱해 예약하고 응답 후 실제 usage로 정산하며,
+            예산이 있으면 max_tokens도 예약량으로 낮춰 보냅니다 (그 한도에서 잘리면 OutputReserveExceeded)
+        system: 청크 공통 시스템 프롬프트 (프롬프트 캐시 표시를 붙여 전송)
+        응답 캐시가 지정되어 있으면 같은 요청은 API를 호출하지 않고 캐시된 응답을 반환합니다 (usage 0).
         
         Returns:
-            (응답 텍스트, input_tokens, output_tokens)
+            (응답 텍스트, input_tokens, output_tokens, cache_write_tokens, cache_read_tokens)
         """
         if not self.api_key or not HAS_ANTHROPIC:
-            return ("", 0, 0)
+            return ("", 0, 0, 0, 0)
+        
+        params = self._claude_params(prompt, model, temperature, system)
+        cache = get_response_cache()
+        cached = cache.get(params) if cache is not None else None
+        if cached is not None:
+            return (cached['text'], 0, 0, 0, 0)
+        
+        client = get_client(self.api_key)
+        
+        input_estimate = estimate_tokens(prompt) + (estimate_tokens(system) if system else 0)
+        output_estimate = reserve_output(expected_output_tokens or input_estimate, params['max_tokens'])
+        send_params = capped_params(params, output_estimate)
+        # 비용 예산(configure_budget)이 있으면 예상 비용을 예약하고 실제 usage로 정산
+        with budget_slot(model, input_estimate, output_estimate) as slot:
+            def create():
+                # 보낸 뒤 실패하면 입력 추정치로 정산
+                slot.mark_sent()
+                return client.messages.with_raw_response.create(**send_params)
+            response = get_limiter(self.api_key).call(create, input_estimate, output_estimate)
+            result = self._parse_response(response)
+            slot.record(*result[1:])
+        check_output_reserve(response, send_params)
+        
+        if cache is not None:
+            cache.put(params, *result)
+        return result
+    
+    @staticmethod
+    def _claude_params(prompt: str, model: str, temperature: float, system: Optional[str] = None) -> dict:
+        """Messages API 요청 파라미터 (응답 캐시 키와 배치 요청에도 그대로 사용)"""
+        params = {
+            "model": model,
+            "max_tokens": 16000,
+            "temperature": temperature,
+            "messages": [{"role": "user", "content": prompt}],
+        }
+        if system:
+            # 모델의 최소 캐시 길이보다 짧은 프리픽스는 캐시 표시 생략
+            params["system"] = cached_system(system, estimate_tokens(system) >= min_cache_tokens(model))
+        return params
+    
+    @staticmethod
+    def _parse_response(response) -> tuple:
+        """
+        응답 메시지에서 텍스트(코드블록 제거)와 토큰 사용량 추출
         
+        Returns:
+            (응답 텍스트, input_tokens, output_tokens, cache_write_tokens, cache_read_tokens)
+        """
+        # 토큰 사용량 추출
+        input_tok = 0
+        output_tok = 0
         try:
-            client = Anthropic(api_key=self.api_key)
-            
-            response = client.messages.create(
-                model=model,
-                max_tokens=16000,
-                temperature=temperature,
-                messages=[{"role": "user", "content": prompt}]
+            usage_obj = getattr(response, "usage", None)
+            if usage_obj:
+                input_tok = int(getattr(usage_obj, "input_tokens", 0) or 0)
+                output_tok = int(getattr(usage_obj, "output_tokens", 0) or 0)
+        except:
+            pass
+        cache_write_tok, cache_read_tok = cache_usage(response)
+        
+        result_text = response.content[0].text
+        
+        # 마크다운 코드블록 제거
+        if "```" in result_text:
+            # ```markdown 또는 ``` 로 감싸진 경우
+            import re
+            match = re.search(r'```(?:markdown)?\n(.*?)\n```', result_text, re.DOTALL)
+            if match:
+                result_text = match.group(1)
+        
+        return (result_text.strip(), input_tok, output_tok, cache_write_tok, cache_read_tok)
+    
+    def _process_chunks(self, chunks: List[str], build_prompt: Callable[[str], str],
+                        model: str, temperature: float, max_workers: int,
+                        system: Optional[str] = None) -> Dict[str, Any]:
+        """
+        청크 병렬 처리 (pass1/pass2 공통)
+        
+        재시도 가능한 실패는 워커에서 대기하지 않고 백오프 후 대기열 맨 뒤로 다시 제출하며,
+        최종 실패한 청크는 원본을 사용하고 실패 목록에 기록합니다.
+        system(청크 공통 시스템 프롬프트)은 프롬프트 캐시 프리픽스로 모든 청크가 공유합니다.
+        
+        Returns:
+            {'chunks': 결과 청크 리스트, 'input_tokens', 'output_tokens',
+             'cache_write_tokens', 'cache_read_tokens', 'failures': 실패 목록}
+        """
+        if self.use_batch:
+            return self._process_chunks_batch(chunks, build_prompt, model, temperature, system)
+        
+        results = {}
+        failures = []
+        totals = {'input_tokens': 0, 'output_tokens': 0, 'cache_write_tokens': 0, 'cache_read_tokens': 0}
+        completed_count = 0
+        
+        def process_chunk(chunk):
+            if not chunk.strip():
+                return (chunk, 0, 0, 0, 0)
+            return self._request_claude(
+                build_prompt(chunk),
+                model,
+                temperature,
+                expected_output_tokens=estimate_tokens(chunk),
+                system=system
             )
+        
+        def on_retry(i, error, attempt, delay):
+            print(f"  ↻ 청크 {i+1:2d} 재시도 예정 ({attempt}회 실패, {delay:.1f}s 후): {describe_error(error)}",
+                  flush=True)
+        
+        def on_done(i, chunk, result, error, attempts, elapsed):
+            nonlocal completed_count
+            completed_count += 1
+            pending = len(chunks) - completed_count
             
-            # 토큰 사용량 추출
-            input_tok = 0
-            output_tok = 0
-            try:
-                usage_obj = getattr(response, "usage", None)
-                if usage_obj:
-                    input_tok = int(getattr(usage_obj, "input_tokens", 0) or 0)
-                    output_tok = int(getattr(usage_obj, "output_tokens", 0) or 0)
-            except:
-                pass
-            
-            result_text = response.content[0].text
-            
-            # 마크다운 코드블록 제거
-            if "```" in result_text:
-                # ```markdown 또는 ``` 로 감싸진 경우
-                import re
-                match = re.search(r'```(?:markdown)?\n(.*?)\n```', result_text, re.DOTALL)
-                if match:
-                    result_text = match.group(1)
+            if error is not None:
+                results[i] = chunk
+                failures.append({'chunk': i + 1, 'attempts': attempts, 'error': describe_error(error)})
+                print(f"  ✗ [{completed_count:2d}/{len(chunks)}] 청크 {i+1:2d} 실패 → 원본 사용 "
+                      f"({attempts}회 시도) | 남은작업: {pending:2d}", flush=True)
+                return
             
-            return (result_text.strip(), input_tok, output_tok)
+            text, input_tok, output_tok, cache_write_tok, cache_read_tok = result
+            results[i] = text or chunk
+            totals['input_tokens'] += input_tok
+            totals['output_tokens'] += output_tok
+            totals['cache_write_tokens'] += cache_write_tok
+            totals['cache_read_tokens'] += cache_read_tok
             
-        except Exception as e:
-            print(f"⚠️  Claude API 호출 실패: {e}")
-            return ("", 0, 0)
+            print(f"  ✓ [{completed_count:2d}/{len(chunks)}] 청크 {i+1:2d} 완료 "
+                  f"({len(results[i]):5d} chars, {elapsed:5.1f}s) | 남은작업: {pending:2d}",
+                  flush=True)
+        
+        run_requeued(enumerate(chunks), process_chunk, on_done, max_workers, on_retry=on_retry)
+        
+        return {
+            'chunks': [results[i] for i in range(len(chunks))],
+            **totals,
+            'failures': failures
+        }
+    
+    def _process_chunks_batch(self, chunks: List[str], build_prompt: Callable[[str], str],
+                              model: str, temperature: float, system: Optional[str] = None) -> Dict[str, Any]:
+        """
+        청크를 Message Batches API 배치 작업 하나로 처리 (_process_chunks()와 같은 반환 형식)
+        
+        배치 ID는 디스크에 보관되어 중단 후 다시 실행하면 같은 배치를 이어서 기다립니다.
+        응답 캐시에 있는 청크는 제출하지 않습니다.
+        """
+        results = {}
+        failures = []
+        totals = {'input_tokens': 0, 'output_tokens': 0, 'cache_write_tokens': 0, 'cache_read_tokens': 0}
+        cache = get_response_cache()
+        requests = []
+        
+        for i, chunk in enumerate(chunks):
+            if not chunk.strip() or not self.api_key or not HAS_ANTHROPIC:
+                results[i] = chunk
+                continue
+            params = self._claude_params(build_prompt(chunk), model, temperature, system)
+            cached = cache.get(params) if cache is not None else None
+            if cached is not None:
+                results[i] = cached['text']
+                continue
+            requests.append((i, params, reserve_output(estimate_tokens(chunk), params['max_tokens'])))
+        
+        if len(requests) < len(chunks):
+            print(f"  💾 {len(chunks) - len(requests)}개 청크는 캐시 또는 빈 청크로 제출 생략")
+        outcomes = {}
+        if requests:
+            # 배치 전체를 한 번에 예약 (예산을 넘기면 제출하지 않음), 결과의 usage 합계로 정산
+            input_estimate = sum(estimate_tokens(params['messages'][0]['content']) for _, params, _ in requests)
+            if system:
+                input_estimate += len(requests) * estimate_tokens(system)
+            output_estimate = sum(reserve for _, _, reserve in requests)
+            try:
+                with budget_slot(model, input_estimate, output_estimate, BATCH_PRICE_MULTIPLIER) as slot:
+                    # 제출 후 중단되어도 배치는 계속 처리되므로 입력 추정치로 정산
+                    slot.mark_sent()
+                    outcomes = run_batch(
+                        self.api_key,
+                        [(f"chunk-{i:05d}", capped_params(params, reserve)) for i, params, reserve in requests],
+                        label=f"edit {len(requests)} chunks",
+                        poll_interval=self.batch_poll_interval
+                    )
+                    usages = [self._parse_response(outcome['message'])[1:]
+                              for outcome in outcomes.values() if 'message' in outcome]
+                    slot.record(*(sum(column) for column in zip((0, 0, 0, 0), *usages)))
+            except BudgetExceeded as e:
+                outcomes = {f"chunk-{i:05d}": {'error': describe_error(e), 'attempts': 0} for i, _, _ in requests}
+        
+        for i, params, reserve in requests:
+            outcome = outcomes.get(f"chunk-{i:05d}") or {'error': "배치 결과 없음", 'attempts': 1}
+            if 'message' in outcome:
+                try:
+                    check_output_reserve(outcome['message'], capped_params(params, reserve))
+                except OutputReserveExceeded as e:
+                    outcome = {'error': describe_error(e), 'attempts': outcome['attempts']}
+            if 'message' not in outcome:
+                results[i] = chunks[i]
+                failures.append({'chunk': i + 1, 'attempts': outcome['attempts'], 'error': outcome['error']})
+                continue
+            text, input_tok, output_tok, cache_write_tok, cache_read_tok = self._parse_response(outcome['message'])
+            if cache is not None:
+                cache.put(params, text, input_tok, output_tok, cache_write_tok, cache_read_tok)
+            results[i] = text or chunks[i]
+            totals['input_tokens'] += input_tok
+            totals['output_tokens'] += output_tok
+            totals['cache_write_tokens'] += cache_write_tok
+            totals['cache_read_tokens'] += cache_read_tok
+        
+        print(f"  ✓ 배치 완료: {len(requests) - len(failures)}/{len(requests)}개 청크 성공", flush=True)
+        
+        return {
+            'chunks': [results[i] for i in range(len(chunks))],
+            **totals,
+            'failures': failures
+        }
+    
+    def estimate_cost(self, text: str, enable_pass2: bool = True) -> Dict[str, Any]:
+        """
+        편집 전 예상 토큰/비용 (API 호출 없음)
+        
+        요청 예약과 같은 추정치(시스템 프롬프트 + 청크 프롬프트 입력, 청크 크기 × 여유 배율 출력)로 계산하며
+        프롬프트 캐시·응답 캐시 할인은 반영하지 않습니다 (실제 비용의 상한).
+        Pass 2 입력은 Pass 1 결과 대신 원문 크기로 가정합니다.
+        
+        Returns:
+            {'requests', 'input_tokens', 'output_tokens', 'cost'}
+        """
+        passes = [(get_proofreading_system(), get_proofreading_input)]
+        if enable_pass2:
+            passes.append((get_polishing_system(), get_polishing_input))
+        chunks = [chunk for chunk in self._split_into_chunks(text, max_chars=4000) if chunk.strip()]
+        
+        estimate = {'requests': 0, 'input_tokens': 0, 'output_tokens': 0}
+        for system, build_prompt in passes:
+            for chunk in chunks:
+                estimate['requests'] += 1
+                estimate['input_tokens'] += estimate_tokens(system) + estimate_tokens(build_prompt(chunk))
+                estimate['output_tokens'] += reserve_output(estimate_tokens(chunk), 16000)
+        estimate['cost'] = usage_cost("claude-3-7-sonnet-20250219", estimate['input_tokens'], estimate['output_tokens'],
+                                      multiplier=BATCH_PRICE_MULTIPLIER if self.use_batch else 1.0)
+        return estimate
     
     def pass1_proofread(self, text: str, max_workers: int = 10) -> Dict[str, Any]:
         """
@@ -206,69 +424,39 @@ class EditOrchestratorV2:
         print("=" * 80)
         
         start_time = time.time()
+        configure_pool(max_workers)
         
         # 청크 분할
         chunks = self._split_into_chunks(text, max_chars=4000)
-        print(f"\n[교정] {len(chunks)}개 청크 병렬 처리 중 ({max_workers}개 워커)...")
-        
-        # 병렬 처리
-        results = {}
-        total_input_tokens = 0
-        total_output_tokens = 0
-        completed_count = 0
-        
-        def process_chunk(chunk_info):
-            i, chunk = chunk_info
-            chunk_start = time.time()
-            
-            if not chunk.strip():
-                return (i, chunk, 0, 0, time.time() - chunk_start)
-            
-            prompt = get_proofreading_prompt(chunk)
-            corrected, input_tok, output_tok = self._call_claude(
-                prompt,
-                model="claude-3-7-sonnet-20250219",
-                temperature=0.2  # 낮은 temperature로 일관성 확보
-            )
-            
-            if not corrected:
-                corrected = chunk
-            
-            elapsed = time.time() - chunk_start
-            return (i, corrected, input_tok, output_tok, elapsed)
-        
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            futures = {
-                executor.submit(process_chunk, (i, chunk)): i
-                for i, chunk in enumerate(chunks)
-            }
-            
-            for future in as_completed(futures):
-                i, corrected, input_tok, output_tok, elapsed = future.result()
-                completed_count += 1
-                pending = len(chunks) - completed_count
-                
-                results[i] = corrected
-                total_input_tokens += input_tok
-                total_output_tokens += output_tok
-                
-                print(f"  ✓ [{completed_count:2d}/{len(chunks)}] 청크 {i+1:2d} 완료 "
-                      f"({len(corrected):5d} chars, {elapsed:5.1f}s) | 남은작업: {pending:2d}",
-                      flush=True)
+        if self.use_batch:
+            print(f"\n[교정] {len(chunks)}개 청크를 배치 작업으로 제출 (Message Batches API)...")
+        else:
+            print(f"\n[교정] {len(chunks)}개 청크 병렬 처리 중 ({max_workers}개 워커)...")
+        
+        # 병렬 처리 (낮은 temperature로 일관성 확보)
+        processed = self._process_chunks(
+            chunks, get_proofreading_input,
+            model="claude-3-7-sonnet-20250219", temperature=0.2, max_workers=max_workers,
+            system=get_proofreading_system()
+        )
         
         # 재결합
-        corrected_text = '\n\n'.join([results[i] for i in range(len(chunks))])
+        corrected_text = '\n\n'.join(processed['chunks'])
         
         processing_time = time.time() - start_time
         
         print(f"\n✅ Pass 1 완료 ({processing_time:.1f}초)")
+        print_failure_report(processed['failures'])
         
         return {
             'text': corrected_text,
-            'input_tokens': total_input_tokens,
-            'output_tokens': total_output_tokens,
+            'input_tokens': processed['input_tokens'],
+            'output_tokens': processed['output_tokens'],
+            'cache_write_tokens': processed['cache_write_tokens'],
+            'cache_read_tokens': processed['cache_read_tokens'],
             'processing_time': processing_time,
-            'model': 'claude-3-7-sonnet-20250219'
+            'model': 'claude-3-7-sonnet-20250219',
+            'failed_chunks': processed['failures']
         }
     
     def pass2_polish(self, text: str, max_workers: int = 10) -> Dict[str, Any]:
@@ -283,69 +471,39 @@ class EditOrchestratorV2:
         print("=" * 80)
         
         start_time = time.time()
+        configure_pool(max_workers)
         
         # 청크 분할
         chunks = self._split_into_chunks(text, max_chars=4000)
-        print(f"\n[윤문] {len(chunks)}개 청크 병렬 처리 중 ({max_workers}개 워커)...")
-        
-        # 병렬 처리
-        results = {}
-        total_input_tokens = 0
-        total_output_tokens = 0
-        completed_count = 0
-        
-        def process_chunk(chunk_info):
-            i, chunk = chunk_info
-            chunk_start = time.time()
-            
-            if not chunk.strip():
-                return (i, chunk, 0, 0, time.time() - chunk_start)
-            
-            prompt = get_polishing_prompt(chunk)
-            polished, input_tok, output_tok = self._call_claude(
-                prompt,
-                model="claude-3-7-sonnet-20250219",
-                temperature=0.5  # 약간 높은 temperature로 창의성 확보
-            )
-            
-            if not polished:
-                polished = chunk
-            
-            elapsed = time.time() - chunk_start
-            return (i, polished, input_tok, output_tok, elapsed)
-        
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            futures = {
-                executor.submit(process_chunk, (i, chunk)): i
-                for i, chunk in enumerate(chunks)
-            }
-            
-            for future in as_completed(futures):
-                i, polished, input_tok, output_tok, elapsed = future.result()
-                completed_count += 1
-                pending = len(chunks) - completed_count
-                
-                results[i] = polished
-                total_input_tokens += input_tok
-                total_output_tokens += output_tok
-                
-                print(f"  ✓ [{completed_count:2d}/{len(chunks)}] 청크 {i+1:2d} 완료 "
-                      f"({len(polished):5d} chars, {elapsed:5.1f}s) | 남은작업: {pending:2d}",
-                      flush=True)
+        if self.use_batch:
+            print(f"\n[윤문] {len(chunks)}개 청크를 배치 작업으로 제출 (Message Batches API)...")
+        else:
+            print(f"\n[윤문] {len(chunks)}개 청크 병렬 처리 중 ({max_workers}개 워커)...")
+        
+        # 병렬 처리 (약간 높은 temperature로 창의성 확보)
+        processed = self._process_chunks(
+            chunks, get_polishing_input,
+            model="claude-3-7-sonnet-20250219", temperature=0.5, max_workers=max_workers,
+            system=get_polishing_system()
+        )
         
         # 재결합
-        polished_text = '\n\n'.join([results[i] for i in range(len(chunks))])
+        polished_text = '\n\n'.join(processed['chunks'])
         
         processing_time = time.time() - start_time
         
         print(f"\n✅ Pass 2 완료 ({processing_time:.1f}초)")
+        print_failure_report(processed['failures'])
         
         return {
             'text': polished_text,
-            'input_tokens': total_input_tokens,
-            'output_tokens': total_output_tokens,
+            'input_tokens': processed['input_tokens'],
+            'output_tokens': processed['output_tokens'],
+            'cache_write_tokens': processed['cache_write_tokens'],
+            'cache_read_tokens': processed['cache_read_tokens'],
             'processing_time': processing_time,
-            'model': 'claude-3-7-sonnet-20250219'
+            'model': 'claude-3-7-sonnet-20250219',
+            'failed_chunks': processed['failures']
         }
     
     def edit_document(self, doc: Document, enable_pass2: bool = True,
@@ -400,22 +558,20 @@ class EditOrchestratorV2:
         total_time = time.time() - start_time
         
         # 토큰 사용량 집계
-        usage_by_model = defaultdict(lambda: {"input_tokens": 0, "output_tokens": 0, "requests": 0})
-        
-        model = pass1_result['model']
-        usage_by_model[model]["input_tokens"] += pass1_result['input_tokens']
-        usage_by_model[model]["output_tokens"] += pass1_result['output_tokens']
-        usage_by_model[model]["requests"] += 1
-        
-        if pass2_result:
-            model = pass2_result['model']
-            usage_by_model[model]["input_tokens"] += pass2_result['input_tokens']
-            usage_by_model[model]["output_tokens"] += pass2_result['output_tokens']
+        usage_by_model = defaultdict(lambda: {"input_tokens": 0, "output_tokens": 0,
+                                              "cache_write_tokens": 0, "cache_read_tokens": 0, "requests": 0})
+        
+        for pass_result in (pass1_result, pass2_result):
+            if not pass_result:
+                continue
+            model = pass_result['model']
+            for field in ("input_tokens", "output_tokens", "cache_write_tokens", "cache_read_tokens"):
+                usage_by_model[model][field] += pass_result[field]
             usage_by_model[model]["requests"] += 1
         
         # 비용 계산
         print("\n" + "=" * 80)
-        print("💰 토큰 사용량 및 예상 비용")
+        print("💰 토큰 사용량 및 예상 비용" + (f" (배치 단가 ×{BATCH_PRICE_MULTIPLIER:g})" if self.use_batch else ""))
         print("=" * 80)
         
         grand_input = 0
@@ -425,22 +581,45 @@ class EditOrchestratorV2:
         for model, agg in usage_by_model.items():
             inp = agg["input_tokens"]
             outp = agg["output_tokens"]
+            cache_write = agg["cache_write_tokens"]
+            cache_read = agg["cache_read_tokens"]
             reqs = agg["requests"]
-            grand_input += inp
+            grand_input += inp + cache_write + cache_read
             grand_output += outp
             
-            price = _get_model_pricing(model)
-            cost = (inp / 1_000_000.0) * price["input"] + (outp / 1_000_000.0) * price["output"]
+            price = get_model_pricing(model)
+            if self.use_batch:
+                price = {k: v * BATCH_PRICE_MULTIPLIER for k, v in price.items()}
+            input_usd = input_cost(inp, cache_write, cache_read, price["input"])
+            cost = input_usd + (outp / 1_000_000.0) * price["output"]
             grand_cost += cost
             
             print(f"\n{model} ({reqs}회 호출)")
             print(f"  Input:  {inp:>10,} tokens × ${price['input']:.2f}/M = ${(inp/1_000_000)*price['input']:.4f}")
+            if cache_write or cache_read:
+                print(f"  Cache:  쓰기 {cache_write:,} tok, 읽기 {cache_read:,} tok "
+                      f"= ${input_usd - (inp/1_000_000)*price['input']:.4f} "
+                      f"(프롬프트 캐시 적중률 {cache_read / max(1, cache_write + cache_read):.0%})")
             print(f"  Output: {outp:>10,} tokens × ${price['output']:.2f}/M = ${(outp/1_000_000)*price['output']:.4f}")
             print(f"  소계: ${cost:.4f}")
         
         print(f"\n💰 총 예상 비용: ${grand_cost:.4f} USD")
         print(f"   (Input: {grand_input:,} tok | Output: {grand_output:,} tok)")
         print(f"\n⏱️  총 소요시간: {total_time:.1f}초")
+        if self.api_key:
+            rl = get_limiter(self.api_key).summary()
+            print(f"🚦 레이트 리미터: 429/529 {rl['throttled']}회, 대기 {rl['wait_seconds']}초, "
+                  f"동시성 한도 {rl['concurrency']} (최저 {rl['lowest_concurrency']})")
+        cache = get_response_cache()
+        if cache is not None:
+            rc = cache.summary(get_model_pricing)
+            print(f"💾 응답 캐시: 적중 {rc['hits']}회, 미스 {rc['misses']}회, "
+                  f"절감 input {rc['saved_input_tokens']:,} tok (프롬프트 캐시 읽기 {rc['saved_cache_read_tokens']:,}) "
+                  f"/ output {rc['saved_output_tokens']:,} tok "
+                  f"(≈${rc['saved_cost']:.4f})")
+        budget = get_budget()
+        if budget is not None:
+            print(f"🧾 예산: {format_budget(budget.summary())}")
         print("=" * 80)
         
         # 변경사항 통계
@@ -40,19 +40,28 @@ POLISHING_PROMPT_TEMPLATE = """{persona}
 ⚠️  전문 용어는 그대로 유지
 ⚠️  저자의 스타일 존중
 
-【텍스트】
-{text}
-
 【출력】
 윤문된 텍스트만 출력하세요.
 설명, 주석, 마크다운 코드블록 불필요합니다.
 원문과 같은 구조(제목, 단락 등)를 유지하세요.
 """
 
+# 청크마다 달라지는 부분 (시스템 프롬프트 뒤에 사용자 메시지로 전달)
+POLISHING_INPUT_TEMPLATE = """【텍스트】
+{text}
+
+【출력】
+윤문된 텍스트만 출력하세요.
+"""
+
+def get_polishing_system() -> str:
+    """윤문 시스템 프롬프트 (편집자 페르소나 포함, 모든 청크 공통, 프롬프트 캐시 대상)"""
+    return POLISHING_PROMPT_TEMPLATE.format(persona=get_full_persona())
+
+def get_polishing_input(text: str) -> str:
+    """윤문 요청별 입력"""
+    return POLISHING_INPUT_TEMPLATE.format(text=text)
+
 def get_polishing_prompt(text: str) -> str:
-    """윤문 프롬프트 생성"""
-    persona = get_full_persona()
-    return POLISHING_PROMPT_TEMPLATE.format(
-        persona=persona,
-        text=text
-    )
+    """윤문 프롬프트 전체 (시스템 프롬프트 + 요청별 입력)"""
+    return f"{get_polishing_system()}\n{get_polishing_input(text)}"
@@ -1,13 +1,16 @@
 # Pass 1: 기계적 교정 프롬프트
 # 맞춤법, 띄어쓰기, 문장부호 등 규칙 기반 수정
 
-from .editor_persona import EDITOR_PERSONA
+from .editor_persona import get_full_persona
 
-PROOFREADING_PROMPT_TEMPLATE = """당신은 20년 경력의 출판사 교정자입니다.
+# 윤문(Pass 2)과 같은 페르소나·프로세스·예시를 앞에 두어 프리픽스가 Sonnet 최소 캐시 길이(1,024 토큰)를 넘도록 함
+PROOFREADING_PROMPT_TEMPLATE = """{persona}
 
 【작업: Pass 1 - 기계적 교정】
+이번 작업에서는 교정자로서 편집 프로세스의 1️⃣ 단계만 수행합니다.
 맞춤법, 띄어쓰기, 문장부호만 수정하세요.
 문장 구조나 표현은 절대 변경하지 마세요.
+위 편집 예시(문장 분리, 능동태 전환 등)는 Pass 2 윤문용이므로 이번 작업에 적용하지 마세요.
 
 【교정 규칙】
 
@@ -37,14 +40,27 @@ PROOFREADING_PROMPT_TEMPLATE = """당신은 20년 경력의 출판사 교정자
 - 톤 변경 금지
 - 오직 맞춤법/띄어쓰기/문장부호만 수정
 
-【텍스트】
+【출력】
+교정된 텍스트만 출력하세요.
+설명, 주석, 마크다운 코드블록 불필요합니다.
+"""
+
+# 청크마다 달라지는 부분 (시스템 프롬프트 뒤에 사용자 메시지로 전달)
+PROOFREADING_INPUT_TEMPLATE = """【텍스트】
 {text}
 
 【출력】
 교정된 텍스트만 출력하세요.
-설명, 주석, 마크다운 코드블록 불필요합니다.
 """
 
+def get_proofreading_system() -> str:
+    """교정 시스템 프롬프트 (모든 청크 공통, 편집자 페르소나 포함으로 프롬프트 캐시 대상)"""
+    return PROOFREADING_PROMPT_TEMPLATE.format(persona=get_full_persona())
+
+def get_proofreading_input(text: str) -> str:
+    """교정 요청별 입력"""
+    return PROOFREADING_INPUT_TEMPLATE.format(text=text)
+
 def get_proofreading_prompt(text: str) -> str:
-    """교정 프롬프트 생성"""
-    return PROOFREADING_PROMPT_TEMPLATE.format(text=text)
+    """교정 프롬프트 전체 (시스템 프롬프트 + 요청별 입력)"""
+    return f"{get_proofreading_system()}\n{get_proofreading_input(text)}"
@@ -0,0 +1,8 @@
+# LLM API 공용 모듈
+# 작성일: 2026-10-17
+# 목적: 번역(translate_pdf.py)과 편집(src/editing) 경로가 공유하는 Claude API 인프라
+
+# 모듈은 필요할 때 직접 임포트하세요
+# 예: from src.llm.client_pool import get_client
+
+__all__ = []
@@ -0,0 +1,183 @@
+# Message Batches 실행기
+# 작성일: 2026-10-17
+# 목적: 대량 요청을 하나의 배치 작업으로 제출하고 완료까지 폴링 (배치 할인, 레이트 리밋 경쟁 없음)
+#       제출한 배치 ID는 디스크에 보관하여 중단 후 재실행하면 같은 배치를 이어서 기다림
+
+import json
+import time
+import hashlib
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from .client_pool import get_client
+from .response_cache import request_key
+from .retry import call_with_retry
+
+
+# 배치 요청 단가 배율 (표준 가격의 50%)
+BATCH_PRICE_MULTIPLIER = 0.5
+# 완료 여부 확인 간격 (초)
+DEFAULT_POLL_INTERVAL = 30.0
+# 오류/만료된 요청을 다시 제출하는 최대 배치 수 (첫 제출 포함)
+MAX_BATCH_ROUNDS = 2
+# 다시 제출할 만한 배치 결과 오류 유형
+RETRYABLE_BATCH_ERRORS = ("api_error", "overloaded_error", "rate_limit_error", "timeout_error")
+
+
+class BatchJobStore:
+    """
+    제출한 배치 작업 기록 (JSON 파일, 스레드 안전)
+
+    - 키: batch_job_key(requests) — 같은 요청 묶음을 다시 실행하면 같은 키
+    - 값: {'batch_id', 'label', 'requests', 'created'}
+    - 결과를 모두 받으면 기록 삭제
+    """
+
+    def __init__(self, path: str = ".cache/batch_jobs.json"):
+        """초기화"""
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def _load(self) -> Dict[str, dict]:
+        try:
+            return json.loads(self.path.read_text(encoding='utf-8'))
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def _save(self, jobs: Dict[str, dict]) -> None:
+        # 쓰는 도중 중단되어도 기존 기록이 깨지지 않도록 임시 파일에 쓴 뒤 교체
+        tmp = self.path.with_suffix('.tmp')
+        tmp.write_text(json.dumps(jobs, ensure_ascii=False, indent=2), encoding='utf-8')
+        tmp.replace(self.path)
+
+    def get(self, key: str) -> Optional[dict]:
+        """작업 기록 조회"""
+        with self._lock:
+            return self._load().get(key)
+
+    def put(self, key: str, record: dict) -> None:
+        """작업 기록 저장"""
+        with self._lock:
+            jobs = self._load()
+            jobs[key] = record
+            self._save(jobs)
+
+    def remove(self, key: str) -> None:
+        """작업 기록 삭제"""
+        with self._lock:
+            jobs = self._load()
+            if jobs.pop(key, None) is not None:
+                self._save(jobs)
+
+
+def batch_job_key(requests: List[Tuple[str, Dict[str, Any]]]) -> str:
+    """요청 묶음 (custom_id, params) 전체의 SHA-256"""
+    digest = hashlib.sha256()
+    for custom_id, params in requests:
+        digest.update(custom_id.encode('utf-8'))
+        digest.update(request_key(params).encode('ascii'))
+    return digest.hexdigest()
+
+
+def _describe_result(result) -> Tuple[str, bool]:
+    """성공하지 못한 배치 결과의 (오류 설명, 재제출 가능 여부)"""
+    if result.type == "errored":
+        error = getattr(getattr(result, 'error', None), 'error', None)
+        error_type = getattr(error, 'type', 'error')
+        message = getattr(error, 'message', '')
+        return f"batch {error_type}: {message}", error_type in RETRYABLE_BATCH_ERRORS
+    if result.type == "expired":
+        return "batch expired (24시간 내 처리되지 않음)", True
+    return f"batch {result.type}", False
+
+
+def _submit_or_resume(client, requests: List[Tuple[str, Dict[str, Any]]], store: BatchJobStore, label: str):
+    """저장된 배치가 있으면 이어서 사용, 없거나 결과를 받을 수 없으면 새로 제출"""
+    key = batch_job_key(requests)
+    record = store.get(key)
+    if record:
+        try:
+            batch = call_with_retry(lambda: client.messages.batches.retrieve(record['batch_id']), label="Batch")
+            if batch.archived_at is None and batch.processing_status != "canceling":
+                print(f"[BATCH] Resuming {batch.id} ({record.get('requests', len(requests))} requests, "
+                      f"status: {batch.processing_status})")
+                return key, batch
+        except Exception as e:
+            print(f"[WARNING] Saved batch {record['batch_id']} unavailable: {e}")
+        store.remove(key)
+
+    batch = call_with_retry(
+        lambda: client.messages.batches.create(
+            requests=[{"custom_id": custom_id, "params": params} for custom_id, params in requests]
+        ),
+        label="Batch"
+    )
+    store.put(key, {'batch_id': batch.id, 'label': label, 'requests': len(requests), 'created': time.time()})
+    print(f"[BATCH] Submitted {len(requests)} requests as {batch.id}")
+    return key, batch
+
+
+def _wait_for_batch(client, batch, poll_interval: float):
+    """processing_status가 ended가 될 때까지 폴링"""
+    start = time.time()
+    while batch.processing_status != "ended":
+        time.sleep(poll_interval)
+        batch = call_with_retry(lambda: client.messages.batches.retrieve(batch.id), label="Batch")
+        counts = batch.request_counts
+        print(f"[BATCH] {batch.id}: 처리 중 {counts.processing}, 성공 {counts.succeeded}, "
+              f"오류 {counts.errored + counts.expired + counts.canceled} "
+              f"(경과 {time.time() - start:.0f}초)", flush=True)
+    return batch
+
+
+def run_batch(
+    api_key: str,
+    requests: List[Tuple[str, Dict[str, Any]]],
+    label: str = "",
+    poll_interval: float = DEFAULT_POLL_INTERVAL,
+    store: Optional[BatchJobStore] = None,
+    max_rounds: int = MAX_BATCH_ROUNDS
+) -> Dict[str, dict]:
+    """
+    요청 묶음을 Message Batches API로 실행하고 결과 반환
+
+    - requests: (custom_id, Messages API 파라미터) 리스트. custom_id는 [a-zA-Z0-9_-] 64자 이내
+    - 같은 요청 묶음이 이미 제출되어 있으면 (이전 실행이 중단된 경우) 새로 제출하지 않고 이어서 폴링
+    - 일시적 오류나 만료로 실패한 요청은 max_rounds까지 새 배치로 다시 제출
+
+    Returns:
+        {custom_id: {'message': Message 또는 'error': 오류 설명, 'attempts': 제출 횟수}}
+        (결과 순서는 요청 순서와 무관)
+    """
+    if not requests:
+        return {}
+    client = get_client(api_key)
+    store = store or BatchJobStore()
+    outcomes: Dict[str, dict] = {}
+    pending = list(requests)
+
+    for round_num in range(1, max_rounds + 1):
+        key, batch = _submit_or_resume(client, pending, store, label)
+        batch = _wait_for_batch(client, batch, poll_interval)
+
+        by_id = dict(pending)
+        retry = []
+        for entry in client.messages.batches.results(batch.id):
+            result = entry.result
+            if result.type == "succeeded":
+                outcomes[entry.custom_id] = {'message': result.message, 'attempts': round_num}
+                continue
+            error, retryable = _describe_result(result)
+            outcomes[entry.custom_id] = {'error': error, 'attempts': round_num}
+            if retryable and entry.custom_id in by_id:
+                retry.append((entry.custom_id, by_id[entry.custom_id]))
+        store.remove(key)
+
+        if not retry or round_num == max_rounds:
+            break
+        print(f"[BATCH] Resubmitting {len(retry)} failed requests")
+        pending = retry
+
+    return outcomes
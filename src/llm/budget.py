@@ -0,0 +1,241 @@
+# 비용 예산 관리
+# 작성일: 2026-10-17
+# 목적: 요청마다 보내기 전에 예상 비용을 예약하고 응답의 실제 usage로 정산하여 실행 중 지출을 추적하고,
+#       설정한 USD 예산을 넘길 것 같으면 진행 중 요청의 정산을 기다리거나(일시 정지) 새 요청을 중단
+
+import time
+import asyncio
+import threading
+from typing import Any, Dict, Optional
+
+from .pricing import usage_cost
+from .rate_limiter import estimate_tokens
+
+
+# 진행 중 요청의 정산을 기다리는 폴링 간격 (비동기 경로)
+POLL_INTERVAL = 0.05
+
+# 출력 토큰 예약 = 예상 출력 × 여유 배율 (예산이 있으면 요청의 max_tokens도 이 값으로 제한)
+OUTPUT_RESERVE_MARGIN = 1.5
+MIN_OUTPUT_RESERVE = 512
+
+
+class BudgetExceeded(Exception):
+    """예산을 넘길 요청이라 보내지 않음 (재시도 대상 아님)"""
+
+
+class OutputReserveExceeded(Exception):
+    """예산 모드에서 응답이 예약한 출력 토큰(max_tokens)에 도달해 잘림 (잘린 결과는 쓰지 않음, 재시도 대상 아님)"""
+
+
+class BudgetSlot:
+    """
+    요청 1회분의 예산 예약 (with / async with 문)
+
+    진입 시 예상 비용을 예약하고(예산이 모자라면 대기 또는 BudgetExceeded),
+    종료 시 record()로 기록한 실제 usage로 정산합니다. 기록 없이 예외로 끝나면
+    mark_sent()로 요청을 보낸 경우 입력 추정치 + on_text()로 받은 출력으로, 보내기 전이면 0으로 정산합니다.
+    """
+
+    def __init__(self, governor: Optional['CostGovernor'], model: str, input_tokens: int, output_tokens: int,
+                 multiplier: float = 1.0):
+        """초기화 (governor가 None이면 아무것도 하지 않는 슬롯)"""
+        self.governor = governor
+        self.model = model
+        self.input_tokens = input_tokens
+        self.output_tokens = output_tokens
+        self.multiplier = multiplier
+        self.reserved = 0.0
+        self.actual: Optional[float] = None
+        self.sent = False
+        self.received_tokens = 0
+
+    def record(self, input_tokens: int, output_tokens: int, cache_write_tokens: int = 0,
+               cache_read_tokens: int = 0) -> None:
+        """실제 usage 기록 (취소된 스트림은 추정치로 기록)"""
+        self.actual = usage_cost(self.model, input_tokens, output_tokens, cache_write_tokens, cache_read_tokens,
+                                 self.multiplier)
+
+    def mark_sent(self) -> None:
+        """요청을 실제로 보냄 (이후 usage 기록 없이 끝나도 과금된 것으로 정산)"""
+        self.sent = True
+
+    def on_text(self, text: str) -> None:
+        """스트리밍 텍스트 델타 수신 (usage 없이 끝날 때 받은 출력 토큰 추정용)"""
+        self.received_tokens += estimate_tokens(text) if text else 0
+
+    def __enter__(self):
+        if self.governor is not None:
+            self.reserved = self.governor.acquire(self._estimate())
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self.governor is not None:
+            actual = self.actual
+            if actual is None and self.sent:
+                # 보낸 뒤 실패·취소된 요청도 입력과 이미 받은 출력은 과금될 수 있음 (추정치로 정산)
+                actual = usage_cost(self.model, self.input_tokens, self.received_tokens, multiplier=self.multiplier)
+            self.governor.settle(self.reserved, actual or 0.0)
+        return False
+
+    async def __aenter__(self):
+        if self.governor is not None:
+            self.reserved = await self.governor.acquire_async(self._estimate())
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return self.__exit__(exc_type, exc, tb)
+
+    def _estimate(self) -> float:
+        return usage_cost(self.model, self.input_tokens, self.output_tokens, multiplier=self.multiplier)
+
+
+class CostGovernor:
+    """
+    USD 예산 관리자 (프로세스 전역, 번역과 편집이 공유)
+
+    - 요청 전: 예상 비용(예상 입력/출력 토큰 × 단가)을 예약
+    - 지출 + 예약 + 이번 요청 > 예산이면:
+      진행 중 요청이 있으면 정산될 때까지 대기 (실제 비용은 보통 예약보다 적음),
+      없으면 중단 → BudgetExceeded, 이후 모든 요청도 즉시 BudgetExceeded
+    - 응답 후: 실제 usage(프롬프트 캐시 할인 포함)로 정산
+    """
+
+    def __init__(self, limit_usd: float):
+        """초기화"""
+        self.limit = float(limit_usd)
+        self._cond = threading.Condition()
+        self.spent = 0.0
+        self.reserved = 0.0
+        self.in_flight = 0
+        self.stopped = False
+        self.stats = {'requests': 0, 'paused': 0, 'pause_seconds': 0.0, 'refused': 0}
+
+    def _try_acquire(self, amount: float) -> Optional[float]:
+        """예약 시도 (락 보유 상태). 성공 시 예약액, 대기해야 하면 None"""
+        if self.stopped:
+            self.stats['refused'] += 1
+            raise BudgetExceeded(f"budget ${self.limit:.2f} exhausted (spent ${self.spent:.4f})")
+        if self.spent + self.reserved + amount <= self.limit:
+            self.reserved += amount
+            self.in_flight += 1
+            self.stats['requests'] += 1
+            return amount
+        if self.in_flight == 0:
+            # 진행 중 요청이 없으면 기다려도 남은 예산이 늘지 않음
+            self.stopped = True
+            self.stats['refused'] += 1
+            print(f"[BUDGET] 다음 요청(≈${amount:.4f})이 예산 ${self.limit:.2f}을 넘깁니다 "
+                  f"(지출 ${self.spent:.4f}) → 새 요청 중단", flush=True)
+            raise BudgetExceeded(f"next request (≈${amount:.4f}) would exceed budget ${self.limit:.2f} "
+                                 f"(spent ${self.spent:.4f})")
+        return None
+
+    def acquire(self, amount: float) -> float:
+        """예상 비용 예약 (스레드용, 필요하면 진행 중 요청의 정산까지 대기). 예약액 반환"""
+        start = time.monotonic()
+        with self._cond:
+            paused = False
+            while True:
+                reserved = self._try_acquire(amount)
+                if reserved is not None:
+                    break
+                if not paused:
+                    paused = True
+                    self.stats['paused'] += 1
+                self._cond.wait()
+            if paused:
+                self.stats['pause_seconds'] += time.monotonic() - start
+            return reserved
+
+    async def acquire_async(self, amount: float) -> float:
+        """acquire()의 asyncio 버전 (이벤트 루프를 막지 않음)"""
+        start = time.monotonic()
+        paused = False
+        while True:
+            with self._cond:
+                reserved = self._try_acquire(amount)
+                if reserved is not None:
+                    if paused:
+                        self.stats['pause_seconds'] += time.monotonic() - start
+                    return reserved
+                if not paused:
+                    paused = True
+                    self.stats['paused'] += 1
+            await asyncio.sleep(POLL_INTERVAL)
+
+    def settle(self, reserved: float, actual: float) -> None:
+        """예약 해제 및 실제 비용 반영"""
+        with self._cond:
+            self.in_flight -= 1
+            # 부동소수 오차가 남지 않도록 진행 중 요청이 없으면 0으로
+            self.reserved = max(0.0, self.reserved - reserved) if self.in_flight else 0.0
+            self.spent += actual
+            self._cond.notify_all()
+
+    def summary(self) -> Dict[str, Any]:
+        """예산 요약 (한도, 지출, 남은 예산, 일시 정지 횟수/시간, 보내지 않은 요청 수, 중단 여부)"""
+        with self._cond:
+            return {
+                'limit': self.limit,
+                'spent': self.spent,
+                'remaining': max(0.0, self.limit - self.spent),
+                'requests': self.stats['requests'],
+                'paused': self.stats['paused'],
+                'pause_seconds': round(self.stats['pause_seconds'], 1),
+                'refused': self.stats['refused'],
+                'stopped': self.stopped,
+            }
+
+
+_governor: Optional[CostGovernor] = None
+
+
+def configure_budget(limit_usd: Optional[float]) -> Optional[CostGovernor]:
+    """프로세스 전역 예산 지정 (None이면 예산 제한 없음)"""
+    global _governor
+    _governor = CostGovernor(limit_usd) if limit_usd is not None else None
+    return _governor
+
+
+def get_budget() -> Optional[CostGovernor]:
+    """프로세스 전역 CostGovernor (configure_budget으로 지정하지 않았으면 None)"""
+    return _governor
+
+
+def budget_slot(model: str, input_tokens: int, output_tokens: int, multiplier: float = 1.0) -> BudgetSlot:
+    """전역 예산의 요청 1회 예약 슬롯 (예산이 없으면 아무것도 하지 않는 슬롯)"""
+    return BudgetSlot(_governor, model, input_tokens, output_tokens, multiplier)
+
+
+def reserve_output(predicted_tokens: int, max_tokens: int) -> int:
+    """요청 1회의 출력 토큰 예약량: 예상 출력 × OUTPUT_RESERVE_MARGIN (MIN_OUTPUT_RESERVE 이상, max_tokens 이하)"""
+    return min(max_tokens, max(MIN_OUTPUT_RESERVE, int(predicted_tokens * OUTPUT_RESERVE_MARGIN)))
+
+
+def capped_params(params: Dict[str, Any], output_tokens: int) -> Dict[str, Any]:
+    """
+    전송용 요청 파라미터
+
+    예산이 있으면 max_tokens를 예약한 출력 토큰으로 낮춰 요청 1회의 비용이 예약을 넘지 않게 합니다.
+    응답 캐시 키에는 원래 params를 그대로 씁니다.
+    """
+    if _governor is None or params['max_tokens'] <= output_tokens:
+        return params
+    return dict(params, max_tokens=output_tokens)
+
+
+def check_output_reserve(message, params: Dict[str, Any]) -> None:
+    """max_tokens를 낮춰 보낸 요청이 그 한도에서 잘렸으면 OutputReserveExceeded"""
+    if getattr(message, 'stop_reason', None) == "max_tokens" and _governor is not None:
+        raise OutputReserveExceeded(f"response truncated at the reserved output of {params['max_tokens']:,} tokens")
+
+
+def format_budget(summary: Dict[str, Any]) -> str:
+    """실행 요약용 한 줄"""
+    line = (f"${summary['spent']:.4f} / ${summary['limit']:.2f} 사용 (남은 ${summary['remaining']:.4f})")
+    if summary['paused']:
+        line += f", 정산 대기 {summary['paused']}회 ({summary['pause_seconds']}초)"
+    if summary['stopped']:
+        line += f", 예산 소진으로 보내지 않은 요청 {summary['refused']}회"
+    return line
@@ -0,0 +1,130 @@
+# Anthropic 클라이언트 레지스트리
+# 작성일: 2026-10-17
+# 목적: 프로세스 전역에서 API 키별 클라이언트 하나를 공유하여 HTTP keep-alive/TLS 세션 재사용
+#       (asyncio 엔진용 비동기 클라이언트 생성 포함)
+
+import threading
+from typing import Dict, Optional, Tuple, Any
+
+
+# 워커 수를 모를 때의 기본 커넥션 풀 크기
+DEFAULT_POOL_SIZE = 20
+# 워커 수 외 여유 커넥션 (용어집 추출 등 동시 호출분)
+POOL_HEADROOM = 4
+# 요청 타임아웃 (초). 명시하지 않으면 SDK가 큰 max_tokens의 비스트리밍 요청을
+# "10분 초과 가능"으로 보고 호출 전에 거부함 (청크 번역은 max_tokens=64000 사용)
+REQUEST_TIMEOUT = 600.0
+# SDK 자체 재시도는 끔: 재시도는 retry.py가 담당하고, 모든 429/529 응답이
+# 공유 레이트 리미터(AIMD)에 관측되어야 함
+SDK_MAX_RETRIES = 0
+
+_lock = threading.Lock()
+_clients: Dict[Tuple[str, Optional[str]], Any] = {}
+_client_pool_sizes: Dict[Tuple[str, Optional[str]], int] = {}
+_pool_size = DEFAULT_POOL_SIZE
+
+
+def configure_pool(max_workers: int) -> int:
+    """
+    커넥션 풀 크기를 워커 수에 맞춤
+
+    풀은 커지기만 합니다 (여러 단계가 서로 다른 워커 수를 쓰더라도
+    가장 큰 값 기준으로 유지). 이미 만든 클라이언트의 풀이 더 작으면
+    다음 get_client() 호출 시 새 크기로 다시 만듭니다.
+
+    Returns:
+        적용된 풀 크기
+    """
+    global _pool_size
+    with _lock:
+        _pool_size = max(_pool_size, max_workers + POOL_HEADROOM)
+        return _pool_size
+
+
+def _build_http_client(pool_size: int):
+    """풀 크기를 지정한 SDK 기본 HTTP 클라이언트 (httpx 미설치 시 None → SDK 기본값)"""
+    try:
+        import httpx
+        from anthropic import DefaultHttpxClient
+    except ImportError:
+        return None
+
+    return DefaultHttpxClient(
+        limits=httpx.Limits(
+            max_connections=pool_size,
+            max_keepalive_connections=pool_size,
+        )
+    )
+
+
+def get_client(api_key: str, base_url: Optional[str] = None):
+    """
+    API 키(와 base_url)별 공유 Anthropic 클라이언트 반환
+
+    Anthropic 클라이언트는 스레드 안전하므로 모든 워커 스레드가 같은 인스턴스를 사용합니다.
+    매 요청마다 새 클라이언트를 만들면 커넥션 풀이 버려져 요청마다 TCP/TLS 핸드셰이크가 발생합니다.
+
+    Raises:
+        ImportError: anthropic 패키지 미설치
+    """
+    from anthropic import Anthropic
+
+    key = (api_key, base_url)
+    with _lock:
+        client = _clients.get(key)
+        if client is not None and _client_pool_sizes[key] >= _pool_size:
+            return client
+
+        # 기존 클라이언트는 진행 중인 요청이 끝날 수 있도록 닫지 않고 교체만 함
+        kwargs = {'api_key': api_key, 'timeout': REQUEST_TIMEOUT, 'max_retries': SDK_MAX_RETRIES}
+        if base_url:
+            kwargs['base_url'] = base_url
+        http_client = _build_http_client(_pool_size)
+        if http_client is not None:
+            kwargs['http_client'] = http_client
+
+        client = Anthropic(**kwargs)
+        _clients[key] = client
+        _client_pool_sizes[key] = _pool_size
+        return client
+
+
+def create_async_client(api_key: str, max_connections: int, base_url: Optional[str] = None):
+    """
+    asyncio 엔진용 AsyncAnthropic 클라이언트 생성
+
+    비동기 클라이언트의 커넥션 풀은 이벤트 루프에 묶이므로 레지스트리에 넣지 않고
+    번역 실행(asyncio.run) 하나당 하나를 만들어 공유합니다. 사용 후 `await client.close()`.
+
+    Raises:
+        ImportError: anthropic 패키지 미설치
+    """
+    from anthropic import AsyncAnthropic
+
+    kwargs = {'api_key': api_key, 'timeout': REQUEST_TIMEOUT, 'max_retries': SDK_MAX_RETRIES}
+    if base_url:
+        kwargs['base_url'] = base_url
+    try:
+        import httpx
+        from anthropic import DefaultAsyncHttpxClient
+        kwargs['http_client'] = DefaultAsyncHttpxClient(
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+            )
+        )
+    except ImportError:
+        pass
+    return AsyncAnthropic(**kwargs)
+
+
+def close_all() -> None:
+    """모든 공유 클라이언트 종료 (커넥션 풀 해제)"""
+    with _lock:
+        for client in _clients.values():
+            try:
+                client.close()
+            except Exception:
+                pass
+        _clients.clear()
+        _client_pool_sizes.clear()
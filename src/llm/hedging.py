@@ -0,0 +1,337 @@
+# 헤지 요청 (꼬리 지연 완화)
+# 작성일: 2026-10-17
+# 목적: 이번 실행에서 관측한 p95 응답 시간을 넘긴 요청에 같은 요청을 하나 더 보내
+#       먼저 끝난 쪽을 쓰고 늦은 쪽은 취소하여, 느린 소수 요청이 전체 실행 시간을 늘리는 것을 줄임
+#       (헤지 수는 전체 요청 대비 예산으로 제한하고 추가 비용을 집계)
+
+import math
+import time
+import asyncio
+import threading
+from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from .rate_limiter import estimate_tokens
+
+
+# 헤지용 스레드 풀 크기 (스레드 엔진에서 원 요청과 중복 요청이 워커 밖에서 실행됨)
+HEDGE_THREADS = 128
+# summary(since=...)에서 증가분으로 계산하는 항목
+SUMMARY_COUNTERS = ('requests', 'hedged', 'hedge_wins', 'denied',
+                    'extra_input_tokens', 'extra_output_tokens', 'extra_cost')
+
+
+@dataclass
+class HedgePolicy:
+    """
+    헤지 정책
+
+    임계 시간 = max(min_delay, 관측한 (응답 시간 ÷ 예상 출력 토큰)의 quantile 분위수 × 이 요청의 예상 출력 토큰)
+    응답 시간은 출력 길이에 비례하므로 큰 청크가 느린 것만으로 헤지되지 않도록 출력 토큰당 시간으로 비교합니다.
+    """
+    quantile: float = 0.95
+    budget: float = 0.05        # 헤지 요청 상한 (지금까지의 요청 수 대비 비율)
+    min_samples: int = 10       # 이보다 적게 관측했으면 헤지하지 않음
+    min_delay: float = 2.0      # 임계 시간 하한 (초)
+    max_concurrent: int = 4     # 동시에 진행 중인 중복 요청 상한 (커넥션 풀 여유분)
+
+
+class HedgeCancelled(Exception):
+    """헤지 경쟁에서 진 요청을 중단할 때 요청 함수 안에서 발생"""
+
+
+class HedgedCall:
+    """
+    요청 1회분의 취소 신호와 진행 상황 (요청 함수에 전달)
+
+    요청 함수는 요청 직전에 check()를, 스트리밍 텍스트가 도착할 때마다 on_text()를 호출합니다.
+    """
+
+    def __init__(self):
+        self.cancelled = threading.Event()
+        self.received_tokens = 0    # 지금까지 받은 출력 토큰 (추정)
+        self.started = time.monotonic()
+
+    def check(self) -> None:
+        """경쟁이 이미 끝났으면 HedgeCancelled"""
+        if self.cancelled.is_set():
+            raise HedgeCancelled()
+
+    def on_text(self, text: str) -> None:
+        """스트리밍 텍스트 델타 수신 (취소되었으면 스트림 중단)"""
+        self.check()
+        self.received_tokens += estimate_tokens(text) if text else 0
+
+
+class Hedger:
+    """
+    p95 초과 요청 헤지
+
+    - call(): 스레드용. 원 요청을 헤지 스레드 풀에서 실행하고 임계 시간까지 기다린 뒤,
+      끝나지 않았고 예산이 남았으면 중복 요청을 보내 먼저 성공한 결과를 반환
+    - call_async(): asyncio용 (진 쪽 태스크는 cancel)
+    - 진 요청 비용: 끝까지 받았으면 실제 usage, 취소했으면 입력 토큰 전체 + 받은 출력 토큰 (상한 추정)
+    - 관측 수가 min_samples 미만인 동안은 헤지하지 않음 (원 요청을 기다리며 min_delay마다 임계 시간 재계산)
+    """
+
+    def __init__(self, policy: Optional[HedgePolicy] = None):
+        """초기화"""
+        self.policy = policy or HedgePolicy()
+        self._lock = threading.Lock()
+        self._rates: List[float] = []
+        self._in_flight = 0
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self.stats = {'requests': 0, 'hedged': 0, 'hedge_wins': 0, 'denied': 0}
+        self.extra_usage: Dict[str, Dict[str, int]] = {}
+
+    def threshold(self, expected_tokens: int) -> Optional[float]:
+        """이 요청의 헤지 임계 시간 (초), 관측이 부족하면 None"""
+        with self._lock:
+            if len(self._rates) < self.policy.min_samples:
+                return None
+            rates = sorted(self._rates)
+        index = min(len(rates) - 1, max(0, math.ceil(self.policy.quantile * len(rates)) - 1))
+        return max(self.policy.min_delay, rates[index] * max(1, expected_tokens))
+
+    def observe(self, elapsed: float, expected_tokens: int) -> None:
+        """완료된 요청의 응답 시간 기록"""
+        with self._lock:
+            self._rates.append(elapsed / max(1, expected_tokens))
+
+    def _reserve(self, can_hedge: Optional[Callable[[], bool]]) -> bool:
+        """헤지 예산과 동시 중복 요청 상한 확인 후 1회 예약"""
+        if can_hedge is not None and not can_hedge():
+            with self._lock:
+                self.stats['denied'] += 1
+            return False
+        with self._lock:
+            allowed = math.floor(self.policy.budget * self.stats['requests'])
+            if self.stats['hedged'] >= allowed or self._in_flight >= self.policy.max_concurrent:
+                self.stats['denied'] += 1
+                return False
+            self.stats['hedged'] += 1
+            self._in_flight += 1
+            return True
+
+    def _hedge_finished(self) -> None:
+        with self._lock:
+            self._in_flight = max(0, self._in_flight - 1)
+
+    def _record_extra(self, model: str, input_tokens: int, output_tokens: int) -> None:
+        with self._lock:
+            usage = self.extra_usage.setdefault(model, {'input_tokens': 0, 'output_tokens': 0, 'requests': 0})
+            usage['input_tokens'] += int(input_tokens or 0)
+            usage['output_tokens'] += int(output_tokens or 0)
+            usage['requests'] += 1
+
+    def _record_loser(self, call: HedgedCall, result, model: str, input_tokens: int,
+                      usage_of: Callable[[Any], tuple]) -> None:
+        """진 요청의 비용 기록 (끝까지 받은 결과가 있으면 실제 usage, 없으면 취소 시점 추정)"""
+        if result is not None:
+            actual_input, actual_output = usage_of(result)
+            self._record_extra(model, actual_input, actual_output)
+        else:
+            self._record_extra(model, input_tokens, call.received_tokens)
+
+    def _announce(self, label: str, delay: float) -> None:
+        prefix = f"{label} " if label else ""
+        print(f"⑂ {prefix}p{self.policy.quantile * 100:.0f} 응답 시간({delay:.1f}s) 초과 → 중복 요청", flush=True)
+
+    def _pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=HEDGE_THREADS, thread_name_prefix="hedge")
+            return self._executor
+
+    def call(
+        self,
+        request: Callable[[HedgedCall], Any],
+        expected_tokens: int,
+        input_tokens: int,
+        model: str,
+        usage_of: Callable[[Any], tuple],
+        can_hedge: Optional[Callable[[], bool]] = None,
+        label: str = ""
+    ):
+        """
+        request(call)을 헤지하며 실행 (스레드용)
+
+        Args:
+            request: HedgedCall을 받아 요청 1회를 보내는 함수 (실패 시 예외)
+            expected_tokens: 예상 출력 토큰 (임계 시간 계산)
+            input_tokens: 예상 입력 토큰 (취소된 요청의 비용 추정)
+            model: 비용 집계용 모델 이름
+            usage_of: 결과 → (input_tokens, output_tokens)
+            can_hedge: False를 반환하면 이번에는 헤지하지 않음 (레이트 리미터 포화 등)
+
+        Returns:
+            먼저 성공한 요청의 결과
+        Raises:
+            두 요청 모두 실패하면 먼저 관측한 오류
+        """
+        with self._lock:
+            self.stats['requests'] += 1
+        pool = self._pool()
+        calls = [HedgedCall()]
+        futures = [pool.submit(request, calls[0])]
+        # 관측이 쌓이면 임계 시간이 생기므로 원 요청을 기다리는 동안 다시 계산
+        while True:
+            delay = self.threshold(expected_tokens)
+            waited = time.monotonic() - calls[0].started
+            done, _ = wait(futures, timeout=self.policy.min_delay if delay is None else max(0.0, delay - waited))
+            if done or (delay is not None and time.monotonic() - calls[0].started >= delay):
+                break
+        if done or not self._reserve(can_hedge):
+            result = futures[0].result()
+            self.observe(time.monotonic() - calls[0].started, expected_tokens)
+            return result
+
+        self._announce(label, delay)
+        calls.append(HedgedCall())
+        futures.append(pool.submit(request, calls[1]))
+        futures[1].add_done_callback(lambda _: self._hedge_finished())
+
+        winner = None
+        errors = []
+        pending = set(futures)
+        while pending and winner is None:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            # 동시에 끝났으면 원 요청 우선
+            for k, future in enumerate(futures):
+                if future not in done:
+                    continue
+                if future.exception() is not None:
+                    errors.append(future.exception())
+                elif winner is None:
+                    winner = k
+                else:
+                    self._record_loser(calls[k], future.result(), model, input_tokens, usage_of)
+
+        if winner is None:
+            raise errors[0]
+        for k, future in enumerate(futures):
+            if future in pending:
+                calls[k].cancelled.set()
+                self._record_loser(calls[k], None, model, input_tokens, usage_of)
+        if winner == 1:
+            with self._lock:
+                self.stats['hedge_wins'] += 1
+        self.observe(time.monotonic() - calls[winner].started, expected_tokens)
+        return futures[winner].result()
+
+    async def call_async(
+        self,
+        request: Callable[[HedgedCall], Awaitable[Any]],
+        expected_tokens: int,
+        input_tokens: int,
+        model: str,
+        usage_of: Callable[[Any], tuple],
+        can_hedge: Optional[Callable[[], bool]] = None,
+        label: str = ""
+    ):
+        """call()의 asyncio 버전 (request는 HedgedCall을 받는 코루틴 함수)"""
+        with self._lock:
+            self.stats['requests'] += 1
+        calls = [HedgedCall()]
+        tasks = [asyncio.ensure_future(request(calls[0]))]
+        try:
+            while True:
+                delay = self.threshold(expected_tokens)
+                waited = time.monotonic() - calls[0].started
+                done, _ = await asyncio.wait(
+                    tasks, timeout=self.policy.min_delay if delay is None else max(0.0, delay - waited))
+                if done or (delay is not None and time.monotonic() - calls[0].started >= delay):
+                    break
+            if not done and self._reserve(can_hedge):
+                self._announce(label, delay)
+                calls.append(HedgedCall())
+                tasks.append(asyncio.ensure_future(request(calls[1])))
+                tasks[1].add_done_callback(lambda _: self._hedge_finished())
+            if len(tasks) == 1:
+                result = await tasks[0]
+                self.observe(time.monotonic() - calls[0].started, expected_tokens)
+                return result
+        except asyncio.CancelledError:
+            for task in tasks:
+                task.cancel()
+            raise
+
+        winner = None
+        errors = []
+        pending = set(tasks)
+        try:
+            while pending and winner is None:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for k, task in enumerate(tasks):
+                    if task not in done:
+                        continue
+                    if task.exception() is not None:
+                        errors.append(task.exception())
+                    elif winner is None:
+                        winner = k
+                    else:
+                        self._record_loser(calls[k], task.result(), model, input_tokens, usage_of)
+        finally:
+            for k, task in enumerate(tasks):
+                if task in pending:
+                    calls[k].cancelled.set()
+                    task.cancel()
+                    # 취소된 태스크의 예외를 회수 (미회수 경고 방지)
+                    task.add_done_callback(lambda t: t.cancelled() or t.exception())
+                    if winner is not None:
+                        self._record_loser(calls[k], None, model, input_tokens, usage_of)
+
+        if winner is None:
+            raise errors[0]
+        if winner == 1:
+            with self._lock:
+                self.stats['hedge_wins'] += 1
+        self.observe(time.monotonic() - calls[winner].started, expected_tokens)
+        return tasks[winner].result()
+
+    def summary(self, pricing: Optional[Callable[[str], dict]] = None,
+                since: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        실행 요약 (요청/헤지/헤지 승리/예산 초과로 생략한 수, 추가 토큰과 비용)
+
+        since: 이전에 받은 summary() — 지정하면 그 이후 증가분만 (번역 단계별 요약용)
+        """
+        current = self._totals(pricing)
+        if since is None:
+            return current
+        return {key: value - since.get(key, 0) if key in SUMMARY_COUNTERS else value
+                for key, value in current.items()}
+
+    def _totals(self, pricing: Optional[Callable[[str], dict]]) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self.stats)
+            extra = {model: dict(usage) for model, usage in self.extra_usage.items()}
+        cost = 0.0
+        if pricing is not None:
+            for model, usage in extra.items():
+                price = pricing(model)
+                cost += (usage['input_tokens'] / 1_000_000.0) * float(price.get('input', 0) or 0)
+                cost += (usage['output_tokens'] / 1_000_000.0) * float(price.get('output', 0) or 0)
+        return dict(
+            stats,
+            budget=self.policy.budget,
+            extra_input_tokens=sum(usage['input_tokens'] for usage in extra.values()),
+            extra_output_tokens=sum(usage['output_tokens'] for usage in extra.values()),
+            extra_cost=cost,
+        )
+
+
+_hedger: Optional[Hedger] = None
+
+
+def configure_hedging(policy: Optional[HedgePolicy]) -> Optional[Hedger]:
+    """프로세스 전역 헤지 정책 지정 (None이면 헤지하지 않음)"""
+    global _hedger
+    _hedger = Hedger(policy) if policy is not None else None
+    return _hedger
+
+
+def get_hedger() -> Optional[Hedger]:
+    """프로세스 전역 Hedger (configure_hedging으로 지정하지 않았으면 None)"""
+    return _hedger
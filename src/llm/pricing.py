@@ -0,0 +1,52 @@
+# 모델 가격표
+# 작성일: 2026-10-17
+# 목적: 번역(translate_pdf.py)과 편집(src/editing)에 따로 있던 모델별 가격표를 하나로 모으고,
+#       사용량 → 비용 계산을 사전 추정·예산 관리·실행 요약이 같은 식으로 하게 함
+
+import os
+from typing import Dict
+
+from .prompt_cache import input_cost
+
+
+# 모델별 가격(USD per 1M tokens). 필요 시 환경변수로 덮어쓰기 지원.
+# - 공식 가격: https://www.anthropic.com/pricing
+# - Claude Haiku 4.5: $1.00/M input, $5.00/M output
+# - 환경변수로 덮어쓰기: CLAUDE_HAIKU_45_INPUT_MTOK, CLAUDE_HAIKU_45_OUTPUT_MTOK 등
+PRICING_USD_PER_MTOK = {
+    "claude-haiku-4-5-20251001": {
+        "input": float(os.getenv("CLAUDE_HAIKU_45_INPUT_MTOK", "1.00")),
+        "output": float(os.getenv("CLAUDE_HAIKU_45_OUTPUT_MTOK", "5.00")),
+    },
+    "claude-3-5-sonnet-20241022": {
+        "input": float(os.getenv("CLAUDE_SONNET_35_INPUT_MTOK", "3.00")),
+        "output": float(os.getenv("CLAUDE_SONNET_35_OUTPUT_MTOK", "15.00")),
+    },
+    "claude-3-5-sonnet-20240620": {
+        "input": float(os.getenv("CLAUDE_SONNET_35_INPUT_MTOK", "3.00")),
+        "output": float(os.getenv("CLAUDE_SONNET_35_OUTPUT_MTOK", "15.00")),
+    },
+    "claude-3-7-sonnet-20250219": {
+        "input": float(os.getenv("CLAUDE_SONNET_37_INPUT_MTOK", "3.00")),
+        "output": float(os.getenv("CLAUDE_SONNET_37_OUTPUT_MTOK", "15.00")),
+    },
+}
+
+
+def get_model_pricing(model_name: str) -> Dict[str, float]:
+    """모델별 가격 정보를 반환. 미등록 모델은 0으로 채워 반환."""
+    return PRICING_USD_PER_MTOK.get(model_name, {"input": 0.0, "output": 0.0})
+
+
+def usage_cost(model_name: str, input_tokens: int, output_tokens: int, cache_write_tokens: int = 0,
+               cache_read_tokens: int = 0, multiplier: float = 1.0) -> float:
+    """
+    사용량의 비용 (USD)
+
+    multiplier: 배치 할인 등 단가 배율
+    """
+    price = get_model_pricing(model_name)
+    return multiplier * (
+        input_cost(input_tokens, cache_write_tokens, cache_read_tokens, price.get("input", 0))
+        + (output_tokens / 1_000_000.0) * float(price.get("output", 0) or 0)
+    )
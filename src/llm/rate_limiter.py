@@ -0,0 +1,460 @@
+# 적응형 레이트 리미터
+# 작성일: 2026-10-17
+# 목적: 번역/편집이 API 키별 분당 요청·입력 토큰·출력 토큰 한도를 공유하고,
+#       429/529 응답과 retry-after 헤더에 따라 동시 요청 수를 AIMD로 조절
+
+import os
+import time
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+
+# 동시 요청 수 상한 (워커/세마포어 수와 별개로 리미터가 추가로 제한)
+DEFAULT_MAX_CONCURRENCY = 64
+# retry-after 없는 429/529 이후 전체 요청 일시 정지 시간 (초)
+DEFAULT_THROTTLE_PAUSE = 1.0
+# 동시성 슬롯이 빌 때까지 기다리는 폴링 간격 (비동기 경로)
+POLL_INTERVAL = 0.05
+
+# 응답 헤더의 한도 → 버킷 이름
+LIMIT_HEADERS = {
+    'anthropic-ratelimit-requests-limit': 'requests',
+    'anthropic-ratelimit-input-tokens-limit': 'input_tokens',
+    'anthropic-ratelimit-output-tokens-limit': 'output_tokens',
+}
+
+# 레이트 리밋(429) / 과부하(529)
+THROTTLE_STATUS = (429, 529)
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    요청 전 토큰 예약용 대략적 추정 (UTF-8 3바이트당 1토큰)
+
+    영문은 약간 많게, 한글은 1자당 1토큰으로 잡습니다.
+    실제 usage로 요청 후 정산하므로 정확할 필요는 없습니다.
+    """
+    return max(1, len(text.encode('utf-8')) // 3)
+
+
+def classify_error(exc: BaseException) -> Tuple[bool, Optional[float]]:
+    """
+    API 예외 분류
+
+    Returns:
+        (레이트 리밋/과부하 여부, retry-after 초 또는 None)
+    """
+    status = getattr(exc, 'status_code', None)
+    throttled = status in THROTTLE_STATUS
+    retry_after = None
+    response = getattr(exc, 'response', None)
+    headers = getattr(response, 'headers', None)
+    if headers is not None:
+        try:
+            if headers.get('retry-after-ms'):
+                retry_after = float(headers['retry-after-ms']) / 1000.0
+            elif headers.get('retry-after'):
+                retry_after = float(headers['retry-after'])
+        except (TypeError, ValueError):
+            retry_after = None
+    return throttled, retry_after
+
+
+def _usage_of(message) -> Tuple[Optional[int], Optional[int]]:
+    """
+    응답 메시지의 (input_tokens, output_tokens), 없으면 (None, None)
+
+    프롬프트 캐시 쓰기 토큰은 입력 토큰 한도에 포함되므로 input에 더합니다 (캐시 읽기는 제외).
+    """
+    usage = getattr(message, 'usage', None)
+    if usage is None:
+        return None, None
+    try:
+        input_tokens = int(getattr(usage, 'input_tokens', 0) or 0)
+        input_tokens += int(getattr(usage, 'cache_creation_input_tokens', 0) or 0)
+        return input_tokens, int(getattr(usage, 'output_tokens', 0) or 0)
+    except (TypeError, ValueError):
+        return None, None
+
+
+class TokenBucket:
+    """분당 한도를 초당 속도로 연속 충전하는 토큰 버킷 (한도 0 = 무제한)"""
+
+    def __init__(self, per_minute: float = 0):
+        """초기화"""
+        self.capacity = float(per_minute or 0)
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    @property
+    def unlimited(self) -> bool:
+        return self.capacity <= 0
+
+    def _refill(self, now: float) -> None:
+        if self.unlimited:
+            return
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.capacity / 60.0)
+        self.updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """amount를 꺼내기까지 기다려야 하는 초 (0 = 즉시 가능)"""
+        if self.unlimited:
+            return 0.0
+        self._refill(now)
+        # 한도보다 큰 요청은 가득 찬 버킷 하나로 허용 (영원히 막히지 않도록)
+        amount = min(amount, self.capacity)
+        if self.level >= amount:
+            return 0.0
+        return (amount - self.level) * 60.0 / self.capacity
+
+    def take(self, amount: float) -> None:
+        if not self.unlimited:
+            self.level -= amount
+
+    def refund(self, amount: float) -> None:
+        """예약량과 실제 사용량의 차이 정산 (음수면 추가 차감)"""
+        if not self.unlimited:
+            self.level = min(self.capacity, self.level + amount)
+
+    def set_capacity(self, per_minute: float) -> None:
+        if per_minute <= 0:
+            return
+        if self.unlimited:
+            self.level = per_minute
+        self.capacity = float(per_minute)
+        self.level = min(self.level, self.capacity)
+
+
+class RateLimitSlot:
+    """
+    요청 1회분의 예약 (with / async with 문)
+
+    진입 시 리미터에서 동시성 슬롯과 예상 토큰을 예약하고,
+    종료 시 record()로 기록한 실제 usage로 정산합니다.
+    블록 안에서 발생한 예외가 429/529이면 리미터가 동시성을 줄입니다.
+    """
+
+    def __init__(self, limiter: 'AdaptiveRateLimiter', input_tokens: int, output_tokens: int):
+        """초기화"""
+        self.limiter = limiter
+        self.input_tokens = input_tokens
+        self.output_tokens = output_tokens
+        self.actual_input: Optional[int] = None
+        self.actual_output: Optional[int] = None
+        self.started = 0.0
+
+    def record(self, message, headers=None) -> None:
+        """응답 메시지의 실제 usage (와 응답 헤더의 한도) 기록"""
+        self.actual_input, self.actual_output = _usage_of(message)
+        if headers is not None:
+            self.limiter.update_limits(headers)
+
+    def _release(self, exc: Optional[BaseException]) -> None:
+        throttled, retry_after = False, None
+        if exc is not None:
+            throttled, retry_after = classify_error(exc)
+            headers = getattr(getattr(exc, 'response', None), 'headers', None)
+            if headers is not None:
+                self.limiter.update_limits(headers)
+        self.limiter.release(
+            self.input_tokens, self.output_tokens,
+            self.actual_input, self.actual_output,
+            throttled=throttled, retry_after=retry_after, started=self.started
+        )
+
+    def __enter__(self):
+        self.started = self.limiter.acquire(self.input_tokens, self.output_tokens)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._release(exc)
+        return False
+
+    async def __aenter__(self):
+        self.started = await self.limiter.acquire_async(self.input_tokens, self.output_tokens)
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self._release(exc)
+        return False
+
+
+class AdaptiveRateLimiter:
+    """
+    분당 요청/입력 토큰/출력 토큰 토큰 버킷 + AIMD 동시성 제어
+
+    - 요청 전: 동시성 슬롯 1개, 요청 1건, 예상 입력/출력 토큰을 예약 (부족하면 대기)
+    - 성공: 실제 usage로 정산, 동시성 한도 +1/한도 (가법 증가)
+    - 429/529: 동시성 한도 반감 (곱셈 감소, 직전 감소 이후 시작된 요청의 실패에만 반응),
+      retry-after 동안 모든 요청 일시 정지
+    - call()/call_stream()/call_async()/call_stream_async(): 예약 → 요청 1회 → 정산 (재시도는 src/llm/retry.py가 담당)
+    - 응답 헤더의 anthropic-ratelimit-*-limit 값으로 버킷 한도 자동 설정
+
+    스레드(translate_chunks, 편집 워커)와 asyncio 엔진 모두에서 사용할 수 있습니다.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: float = 0,
+        input_tokens_per_minute: float = 0,
+        output_tokens_per_minute: float = 0,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        min_concurrency: int = 1
+    ):
+        """초기화 (분당 한도 0 = 무제한, 응답 헤더로 알게 되면 적용)"""
+        self._cond = threading.Condition()
+        self.buckets = {
+            'requests': TokenBucket(requests_per_minute),
+            'input_tokens': TokenBucket(input_tokens_per_minute),
+            'output_tokens': TokenBucket(output_tokens_per_minute),
+        }
+        self.max_concurrency = max(1, max_concurrency)
+        self.min_concurrency = max(1, min(min_concurrency, self.max_concurrency))
+        self.limit = float(self.max_concurrency)
+        self.in_flight = 0
+        self.blocked_until = 0.0
+        self._last_decrease = float('-inf')
+        self.stats = {
+            'requests': 0,
+            'throttled': 0,
+            'wait_seconds': 0.0,
+            'lowest_limit': self.max_concurrency,
+        }
+
+    def _try_acquire(self, input_tokens: int, output_tokens: int) -> float:
+        """예약 시도 (락 보유 상태). 성공 시 0, 아니면 다시 시도할 때까지의 초"""
+        now = time.monotonic()
+        if now < self.blocked_until:
+            return self.blocked_until - now
+        if self.in_flight >= int(self.limit):
+            return POLL_INTERVAL
+
+        wait = max(
+            self.buckets['requests'].wait_time(1, now),
+            self.buckets['input_tokens'].wait_time(input_tokens, now),
+            self.buckets['output_tokens'].wait_time(output_tokens, now),
+        )
+        if wait > 0:
+            return wait
+
+        self.buckets['requests'].take(1)
+        self.buckets['input_tokens'].take(input_tokens)
+        self.buckets['output_tokens'].take(output_tokens)
+        self.in_flight += 1
+        self.stats['requests'] += 1
+        return 0.0
+
+    def acquire(self, input_tokens: int, output_tokens: int) -> float:
+        """예약될 때까지 대기 (스레드용). 예약 시각(monotonic) 반환"""
+        start = time.monotonic()
+        with self._cond:
+            while True:
+                wait = self._try_acquire(input_tokens, output_tokens)
+                if wait <= 0:
+                    break
+                self._cond.wait(timeout=wait)
+            now = time.monotonic()
+            self.stats['wait_seconds'] += now - start
+            return now
+
+    async def acquire_async(self, input_tokens: int, output_tokens: int) -> float:
+        """예약될 때까지 대기 (asyncio용, 이벤트 루프를 막지 않음). 예약 시각 반환"""
+        start = time.monotonic()
+        while True:
+            with self._cond:
+                wait = self._try_acquire(input_tokens, output_tokens)
+                if wait <= 0:
+                    now = time.monotonic()
+                    self.stats['wait_seconds'] += now - start
+                    return now
+            await asyncio.sleep(min(wait, 1.0))
+
+    def release(
+        self,
+        input_tokens: int,
+        output_tokens: int,
+        actual_input: Optional[int] = None,
+        actual_output: Optional[int] = None,
+        throttled: bool = False,
+        retry_after: Optional[float] = None,
+        started: float = 0.0
+    ) -> None:
+        """요청 종료: 토큰 정산 및 AIMD 동시성 조절"""
+        with self._cond:
+            self.in_flight = max(0, self.in_flight - 1)
+            if actual_input is not None:
+                self.buckets['input_tokens'].refund(input_tokens - actual_input)
+            if actual_output is not None:
+                self.buckets['output_tokens'].refund(output_tokens - actual_output)
+
+            now = time.monotonic()
+            if throttled:
+                self.stats['throttled'] += 1
+                pause = retry_after if retry_after else DEFAULT_THROTTLE_PAUSE
+                self.blocked_until = max(self.blocked_until, now + pause)
+                # 직전 감소 이전에 시작된 요청의 실패는 이미 반영된 것으로 보고 무시 (윈도우당 1회 감소)
+                if started >= self._last_decrease:
+                    self.limit = max(float(self.min_concurrency), self.limit / 2.0)
+                    self._last_decrease = now
+                    self.stats['lowest_limit'] = min(self.stats['lowest_limit'], int(self.limit))
+            elif actual_input is not None:
+                self.limit = min(float(self.max_concurrency), self.limit + 1.0 / self.limit)
+            self._cond.notify_all()
+
+    def has_capacity(self) -> bool:
+        """지금 대기 없이 요청 1건을 더 보낼 수 있는지 (헤지 여부 판단용, 예약하지 않음)"""
+        with self._cond:
+            return time.monotonic() >= self.blocked_until and self.in_flight < int(self.limit)
+
+    def update_limits(self, headers) -> None:
+        """응답 헤더의 분당 한도를 버킷에 반영"""
+        with self._cond:
+            for header, name in LIMIT_HEADERS.items():
+                value = headers.get(header)
+                if not value:
+                    continue
+                try:
+                    limit = float(value)
+                except (TypeError, ValueError):
+                    continue
+                # 설정값이 더 낮으면 유지 (다른 프로세스와 예산을 나눠 쓰는 경우)
+                bucket = self.buckets[name]
+                if bucket.unlimited or limit < bucket.capacity:
+                    bucket.set_capacity(limit)
+
+    def slot(self, input_tokens: int, output_tokens: int) -> RateLimitSlot:
+        """요청 1회 예약 컨텍스트 (with / async with)"""
+        return RateLimitSlot(self, input_tokens, output_tokens)
+
+    def call(self, request: Callable[[], Any], input_tokens: int, output_tokens: int):
+        """
+        리미터를 거쳐 API 1회 호출 (스레드용)
+
+        request: 원시 응답을 반환하는 함수 (예: lambda: client.messages.with_raw_response.create(...))
+        Returns: 파싱된 응답 메시지
+        Raises: API 예외 (429/529는 리미터에 반영된 뒤 그대로 전달)
+        """
+        with self.slot(input_tokens, output_tokens) as slot:
+            raw = request()
+            message = raw.parse()
+            slot.record(message, raw.headers)
+        return message
+
+    def call_stream(self, open_stream: Callable[[], Any], input_tokens: int, output_tokens: int,
+                    on_text: Optional[Callable[[str], None]] = None):
+        """
+        리미터를 거쳐 스트리밍 API 1회 호출 (스레드용)
+
+        open_stream: 스트림 컨텍스트 매니저를 반환하는 함수 (예: lambda: client.messages.stream(...))
+        on_text: 텍스트 델타가 도착할 때마다 호출 (진행 표시 등)
+        Returns: 스트림이 끝난 뒤 조립된 최종 메시지
+        Raises: API 예외 (스트림 도중 끊기면 연결 오류로 전달되어 재시도 대상)
+        """
+        with self.slot(input_tokens, output_tokens) as slot:
+            with open_stream() as stream:
+                if on_text is not None:
+                    for text in stream.text_stream:
+                        on_text(text)
+                message = stream.get_final_message()
+                slot.record(message, stream.response.headers)
+        return message
+
+    async def call_async(self, request: Callable[[], Awaitable[Any]], input_tokens: int, output_tokens: int):
+        """call()의 asyncio 버전 (request는 원시 응답을 반환하는 코루틴 함수)"""
+        async with self.slot(input_tokens, output_tokens) as slot:
+            raw = await request()
+            message = await raw.parse()
+            slot.record(message, raw.headers)
+        return message
+
+    async def call_stream_async(self, open_stream: Callable[[], Any], input_tokens: int, output_tokens: int,
+                                on_text: Optional[Callable[[str], None]] = None):
+        """call_stream()의 asyncio 버전 (open_stream은 비동기 스트림 컨텍스트 매니저를 반환)"""
+        async with self.slot(input_tokens, output_tokens) as slot:
+            async with open_stream() as stream:
+                if on_text is not None:
+                    async for text in stream.text_stream:
+                        on_text(text)
+                message = await stream.get_final_message()
+                slot.record(message, stream.response.headers)
+        return message
+
+    def summary(self) -> Dict[str, Any]:
+        """실행 요약 (호출 수, 429/529 수, 대기 시간, 동시성 한도)"""
+        with self._cond:
+            return {
+                'requests': self.stats['requests'],
+                'throttled': self.stats['throttled'],
+                'wait_seconds': round(self.stats['wait_seconds'], 1),
+                'concurrency': int(self.limit),
+                'lowest_concurrency': self.stats['lowest_limit'],
+                'limits': {name: int(bucket.capacity) for name, bucket in self.buckets.items()},
+            }
+
+
+_lock = threading.Lock()
+_limiters: Dict[str, AdaptiveRateLimiter] = {}
+_defaults: Dict[str, float] = {}
+
+
+def configure_limits(
+    requests_per_minute: Optional[float] = None,
+    input_tokens_per_minute: Optional[float] = None,
+    output_tokens_per_minute: Optional[float] = None,
+    max_concurrency: Optional[int] = None
+) -> None:
+    """
+    이후 생성되는 (그리고 이미 생성된) 공유 리미터의 한도 설정
+
+    None 항목은 환경변수(ANTHROPIC_RPM_LIMIT, ANTHROPIC_ITPM_LIMIT,
+    ANTHROPIC_OTPM_LIMIT, ANTHROPIC_MAX_CONCURRENCY) 또는 기본값을 사용합니다.
+    """
+    values = {
+        'requests_per_minute': requests_per_minute,
+        'input_tokens_per_minute': input_tokens_per_minute,
+        'output_tokens_per_minute': output_tokens_per_minute,
+        'max_concurrency': max_concurrency,
+    }
+    with _lock:
+        for name, value in values.items():
+            if value is not None:
+                _defaults[name] = value
+        for limiter in _limiters.values():
+            _apply_defaults(limiter)
+
+
+def _default(name: str, env: str, fallback: float) -> float:
+    if name in _defaults:
+        return _defaults[name]
+    try:
+        return float(os.getenv(env, fallback))
+    except ValueError:
+        return fallback
+
+
+def _apply_defaults(limiter: AdaptiveRateLimiter) -> None:
+    with limiter._cond:
+        limiter.max_concurrency = max(1, int(_default('max_concurrency', 'ANTHROPIC_MAX_CONCURRENCY', DEFAULT_MAX_CONCURRENCY)))
+        limiter.limit = min(limiter.limit, float(limiter.max_concurrency))
+        limiter.buckets['requests'].set_capacity(_default('requests_per_minute', 'ANTHROPIC_RPM_LIMIT', 0))
+        limiter.buckets['input_tokens'].set_capacity(_default('input_tokens_per_minute', 'ANTHROPIC_ITPM_LIMIT', 0))
+        limiter.buckets['output_tokens'].set_capacity(_default('output_tokens_per_minute', 'ANTHROPIC_OTPM_LIMIT', 0))
+
+
+def get_limiter(api_key: str) -> AdaptiveRateLimiter:
+    """
+    API 키별 공유 리미터 반환
+
+    레이트 리밋은 API 키(조직) 단위이므로 번역과 편집이 같은 프로세스에서
+    실행되면 같은 리미터에서 예산을 나눠 씁니다.
+    """
+    with _lock:
+        limiter = _limiters.get(api_key)
+        if limiter is None:
+            limiter = AdaptiveRateLimiter()
+            _apply_defaults(limiter)
+            limiter.limit = float(limiter.max_concurrency)
+            limiter.stats['lowest_limit'] = limiter.max_concurrency
+            _limiters[api_key] = limiter
+        return limiter
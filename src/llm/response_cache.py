@@ -0,0 +1,239 @@
+# LLM 응답 캐시
+# 작성일: 2026-10-17
+# 목적: (모델, 요청 파라미터, 전체 프롬프트) 해시 단위로 Claude 응답을 디스크에 보관하여
+#       같은 입력을 다시 실행할 때 API 호출과 비용을 건너뜀
+
+import json
+import sqlite3
+import hashlib
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Callable, Dict, Any, Optional
+
+from .prompt_cache import input_cost
+
+
+# 응답 형식이나 후처리가 바뀌면 올려서 기존 캐시를 자동 무효화
+RESPONSE_CACHE_VERSION = "v1"
+
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+DEFAULT_MAX_ENTRIES = 200_000
+
+
+def request_key(params: Dict[str, Any]) -> str:
+    """
+    요청 파라미터 전체(model, max_tokens, temperature, messages 등)의 SHA-256
+
+    키 순서와 무관하도록 정렬된 JSON으로 직렬화합니다.
+    """
+    payload = json.dumps(
+        {'version': RESPONSE_CACHE_VERSION, 'params': params},
+        sort_keys=True, ensure_ascii=False, separators=(',', ':'), default=str
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class ResponseCache:
+    """
+    Claude 응답 캐시 (SQLite 단일 파일, 스레드 안전)
+
+    - 키: request_key(params)
+    - 값: 응답 텍스트와 당시 usage — 입력/출력과 프롬프트 캐시 쓰기/읽기 토큰 (적중 시 절감된 토큰/비용 집계에 사용)
+    - 전체 크기가 max_bytes를, 항목 수가 max_entries를 넘으면 오래 사용되지 않은 항목부터 제거 (LRU)
+    """
+
+    def __init__(self, cache_dir: str = ".cache", max_bytes: int = DEFAULT_MAX_BYTES,
+                 max_entries: int = DEFAULT_MAX_ENTRIES):
+        """초기화"""
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.db_path = self.cache_dir / "response_cache.sqlite3"
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.saved_by_model: Dict[str, Dict[str, int]] = defaultdict(
+            lambda: {"input_tokens": 0, "output_tokens": 0, "cache_write_tokens": 0, "cache_read_tokens": 0}
+        )
+        self._lock = threading.Lock()
+
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                model TEXT NOT NULL,
+                text TEXT NOT NULL,
+                input_tokens INTEGER NOT NULL,
+                output_tokens INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                created REAL NOT NULL,
+                last_access REAL NOT NULL,
+                cache_write_tokens INTEGER NOT NULL DEFAULT 0,
+                cache_read_tokens INTEGER NOT NULL DEFAULT 0
+            );
+            CREATE INDEX IF NOT EXISTS idx_responses_last_access ON responses(last_access);
+        """)
+        # 프롬프트 캐시 토큰 열이 없던 이전 캐시 파일은 열만 추가 (기존 항목은 0)
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(responses)")}
+        for column in ("cache_write_tokens", "cache_read_tokens"):
+            if column not in columns:
+                self._conn.execute(f"ALTER TABLE responses ADD COLUMN {column} INTEGER NOT NULL DEFAULT 0")
+        self._conn.commit()
+
+    def get(self, params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        캐시된 응답 조회 (적중 시 접근 시각 갱신, 적중/미스와 절감 토큰 집계)
+
+        Returns:
+            {'text': str, 'model': str, 'input_tokens': int, 'output_tokens': int,
+             'cache_write_tokens': int, 'cache_read_tokens': int} 또는 None
+        """
+        key = request_key(params)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT model, text, input_tokens, output_tokens, cache_write_tokens, cache_read_tokens "
+                "FROM responses WHERE key = ?",
+                (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (time.time(), key))
+            self._conn.commit()
+            self.hits += 1
+            model, text, input_tokens, output_tokens, cache_write_tokens, cache_read_tokens = row
+            saved = self.saved_by_model[model]
+            saved["input_tokens"] += input_tokens
+            saved["output_tokens"] += output_tokens
+            saved["cache_write_tokens"] += cache_write_tokens
+            saved["cache_read_tokens"] += cache_read_tokens
+        return {'text': text, 'model': model, 'input_tokens': input_tokens, 'output_tokens': output_tokens,
+                'cache_write_tokens': cache_write_tokens, 'cache_read_tokens': cache_read_tokens}
+
+    def put(self, params: Dict[str, Any], text: str, input_tokens: int = 0, output_tokens: int = 0,
+            cache_write_tokens: int = 0, cache_read_tokens: int = 0) -> None:
+        """
+        응답 저장 후 한도 초과분 제거 (빈 응답은 저장하지 않음)
+
+        input_tokens는 캐시되지 않은 입력, cache_write_tokens/cache_read_tokens는 프롬프트 캐시 쓰기/읽기 토큰
+        (적중 시 각각의 단가로 절감 비용을 계산)
+        """
+        if not text:
+            return
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses "
+                "(key, model, text, input_tokens, output_tokens, size, created, last_access, "
+                "cache_write_tokens, cache_read_tokens) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (request_key(params), str(params.get('model', '')), text,
+                 int(input_tokens or 0), int(output_tokens or 0),
+                 len(text.encode('utf-8')), now, now,
+                 int(cache_write_tokens or 0), int(cache_read_tokens or 0))
+            )
+            self._conn.commit()
+        self.evict()
+
+    def evict(self) -> int:
+        """max_bytes/max_entries를 넘는 만큼 LRU 순서로 제거. 제거된 항목 수 반환"""
+        with self._lock:
+            count, total = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+            excess_entries = count - self.max_entries
+            excess_bytes = total - self.max_bytes
+            if excess_entries <= 0 and excess_bytes <= 0:
+                return 0
+
+            victims = []
+            for key, size in self._conn.execute("SELECT key, size FROM responses ORDER BY last_access"):
+                if excess_entries <= 0 and excess_bytes <= 0:
+                    break
+                victims.append((key,))
+                excess_entries -= 1
+                excess_bytes -= size
+
+            self._conn.executemany("DELETE FROM responses WHERE key = ?", victims)
+            self._conn.commit()
+        return len(victims)
+
+    def purge(self) -> int:
+        """캐시 전체 삭제. 삭제된 항목 수 반환"""
+        with self._lock:
+            count = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+            self._conn.execute("VACUUM")
+        return count
+
+    def summary(self, pricing: Optional[Callable[[str], dict]] = None) -> Dict[str, Any]:
+        """
+        적중/미스와 절감 토큰 요약
+
+        saved_input_tokens는 프롬프트 캐시 쓰기/읽기를 포함한 입력 합계 (내역은 saved_cache_write_tokens,
+        saved_cache_read_tokens)
+        pricing: 모델명 → {'input': $/MTok, 'output': $/MTok} (지정 시 saved_cost 포함, 캐시 토큰은 캐시 단가로)
+        """
+        with self._lock:
+            saved = {model: dict(agg) for model, agg in self.saved_by_model.items()}
+        result = {
+            'hits': self.hits,
+            'misses': self.misses,
+            'saved_input_tokens': sum(agg['input_tokens'] + agg['cache_write_tokens'] + agg['cache_read_tokens']
+                                      for agg in saved.values()),
+            'saved_cache_write_tokens': sum(agg['cache_write_tokens'] for agg in saved.values()),
+            'saved_cache_read_tokens': sum(agg['cache_read_tokens'] for agg in saved.values()),
+            'saved_output_tokens': sum(agg['output_tokens'] for agg in saved.values()),
+            'saved_by_model': saved,
+        }
+        if pricing is not None:
+            cost = 0.0
+            for model, agg in saved.items():
+                price = pricing(model)
+                cost += input_cost(agg['input_tokens'], agg['cache_write_tokens'], agg['cache_read_tokens'],
+                                   price.get('input', 0))
+                cost += (agg['output_tokens'] / 1_000_000.0) * float(price.get('output', 0) or 0)
+            result['saved_cost'] = cost
+        return result
+
+    def close(self) -> None:
+        """DB 연결 종료"""
+        with self._lock:
+            self._conn.close()
+
+
+_cache: Optional[ResponseCache] = None
+
+
+def configure_response_cache(cache: Optional[ResponseCache]) -> None:
+    """프로세스 전역 응답 캐시 지정 (None이면 캐시 미사용)"""
+    global _cache
+    _cache = cache
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """프로세스 전역 응답 캐시 (configure_response_cache로 지정하지 않았으면 None)"""
+    return _cache
+
+
+def open_response_cache(disabled: bool = False, purge: bool = False,
+                        max_mb: int = DEFAULT_MAX_BYTES // (1024 * 1024)) -> Optional[ResponseCache]:
+    """
+    CLI 옵션에 따라 응답 캐시를 열고 전역 캐시로 지정
+
+    Returns:
+        ResponseCache 또는 None (disabled). 사용 후 close()와 configure_response_cache(None)
+    """
+    if disabled and not purge:
+        return None
+    cache = ResponseCache(max_bytes=max_mb * 1024 * 1024)
+    if purge:
+        purged = cache.purge()
+        print(f"[CACHE] Purged {purged} cached responses")
+    if disabled:
+        cache.close()
+        return None
+    configure_response_cache(cache)
+    return cache
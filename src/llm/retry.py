@@ -0,0 +1,219 @@
+# API 호출 재시도 계층
+# 작성일: 2026-10-17
+# 목적: 재시도 가능한 오류를 분류하고, 상한 있는 지수 백오프 + 지터로 재시도
+#       워커 풀에서는 실패한 작업을 대기열 맨 뒤로 다시 넣어 워커를 막지 않음
+
+import time
+import heapq
+import random
+import asyncio
+from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+from .rate_limiter import classify_error
+
+
+# 다시 시도하면 성공할 수 있는 상태 코드 (타임아웃, 충돌, 서버 오류)
+TRANSIENT_STATUS = (408, 409, 500, 502, 503, 504)
+
+
+@dataclass
+class RetryPolicy:
+    """
+    재시도 정책
+
+    지연 = max(retry-after, U(0, min(max_delay, base_delay × 2^(시도-1))))  (full jitter)
+    """
+    max_attempts: int = 5
+    base_delay: float = 1.0
+    max_delay: float = 30.0
+
+    def delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """attempt번째 실패 후 다음 시도까지 기다릴 초"""
+        backoff = min(self.max_delay, self.base_delay * (2 ** (attempt - 1)))
+        return max(retry_after or 0.0, random.uniform(0, backoff))
+
+
+DEFAULT_RETRY_POLICY = RetryPolicy()
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """
+    재시도 가능한 오류인지 분류
+
+    - 재시도: 429 레이트 리밋, 529 과부하, 408/409/5xx, 연결 오류/타임아웃
+    - 즉시 실패: 400 잘못된 요청, 401/403 인증, 404, 413 요청 초과 등 그 밖의 4xx와 코드 오류
+    """
+    throttled, _ = classify_error(exc)
+    if throttled or getattr(exc, 'status_code', None) in TRANSIENT_STATUS:
+        return True
+    try:
+        import anthropic
+    except ImportError:
+        return False
+    return isinstance(exc, anthropic.APIConnectionError)
+
+
+def describe_error(exc: BaseException) -> str:
+    """실패 보고서용 한 줄 오류 설명"""
+    status = getattr(exc, 'status_code', None)
+    name = type(exc).__name__
+    message = str(exc).splitlines()[0] if str(exc) else ""
+    if len(message) > 120:
+        message = message[:117] + "..."
+    return f"{name} ({status}): {message}" if status else f"{name}: {message}"
+
+
+def call_with_retry(fn: Callable[[], Any], policy: Optional[RetryPolicy] = None, label: str = ""):
+    """
+    fn()을 재시도 정책에 따라 호출 (호출 스레드에서 대기)
+
+    워커 풀 밖의 단건 호출(용어집 추출 등)에 사용합니다.
+
+    Raises:
+        재시도할 수 없는 오류, 또는 마지막 시도의 오류
+    """
+    policy = policy or DEFAULT_RETRY_POLICY
+    attempt = 0
+    while True:
+        attempt += 1
+        try:
+            return fn()
+        except Exception as e:
+            if attempt >= policy.max_attempts or not is_retryable(e):
+                raise
+            _, retry_after = classify_error(e)
+            delay = policy.delay(attempt, retry_after)
+            prefix = f"{label} " if label else ""
+            print(f"  ↻ {prefix}재시도 {attempt}/{policy.max_attempts - 1} ({delay:.1f}s 후): {describe_error(e)}", flush=True)
+            time.sleep(delay)
+
+
+async def call_with_retry_async(fn: Callable[[], Awaitable[Any]], policy: Optional[RetryPolicy] = None,
+                                label: str = "", semaphore: Optional[asyncio.Semaphore] = None):
+    """
+    call_with_retry()의 asyncio 버전 (백오프 동안 이벤트 루프를 막지 않음)
+
+    semaphore 지정 시 각 시도만 세마포어 안에서 실행 → 백오프 대기 중에는 슬롯을 다른 작업에 양보
+
+    Raises:
+        재시도할 수 없는 오류, 또는 마지막 시도의 오류
+    """
+    policy = policy or DEFAULT_RETRY_POLICY
+    attempt = 0
+    while True:
+        attempt += 1
+        try:
+            if semaphore is None:
+                return await fn()
+            async with semaphore:
+                return await fn()
+        except Exception as e:
+            if attempt >= policy.max_attempts or not is_retryable(e):
+                raise
+            _, retry_after = classify_error(e)
+            delay = policy.delay(attempt, retry_after)
+            prefix = f"{label} " if label else ""
+            print(f"  ↻ {prefix}재시도 {attempt}/{policy.max_attempts - 1} ({delay:.1f}s 후): {describe_error(e)}", flush=True)
+            await asyncio.sleep(delay)
+
+
+def run_requeued(
+    tasks: Iterable[Tuple[Any, Any]],
+    work: Callable[[Any], Any],
+    on_done: Callable[[Any, Any, Any, Optional[BaseException], int, float], None],
+    max_workers: int,
+    policy: Optional[RetryPolicy] = None,
+    max_in_flight: Optional[int] = None,
+    on_retry: Optional[Callable[[Any, BaseException, int, float], None]] = None,
+    on_submit: Optional[Callable[[Any], None]] = None
+) -> None:
+    """
+    재시도 재대기열이 있는 스레드 풀 실행기
+
+    - tasks: (key, payload) 스트림 (제너레이터 가능, 동시 제출은 max_in_flight로 제한)
+    - work(payload): 1회 시도. 실패 시 예외 발생
+    - 재시도 가능한 실패는 백오프 시각이 지나면 대기열 맨 뒤로 다시 제출
+      (워커가 sleep하며 묶이지 않으므로 그동안 다른 작업이 진행됨)
+    - on_done(key, payload, result, error, attempts, elapsed): 성공 또는 최종 실패 시 메인 스레드에서 호출
+    - on_retry(key, error, attempt, delay): 재시도 예약 시 호출
+    - on_submit(key): 새 작업을 처음 제출할 때 호출
+    """
+    policy = policy or DEFAULT_RETRY_POLICY
+    max_in_flight = max_in_flight or max_workers * 2
+    attempts: Dict[Any, int] = {}
+    delayed: List[Tuple[float, int, Any, Any]] = []   # (재제출 시각, 순번, key, payload)
+    sequence = 0
+    task_iter = iter(tasks)
+    exhausted = False
+
+    def attempt(key, payload):
+        start = time.time()
+        try:
+            return key, payload, work(payload), None, time.time() - start
+        except Exception as e:
+            return key, payload, None, e, time.time() - start
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = set()
+
+        while True:
+            # 1) 백오프가 끝난 재시도 작업 제출 (새 작업보다 뒤에 서지 않도록 먼저)
+            now = time.time()
+            while delayed and delayed[0][0] <= now:
+                _, _, key, payload = heapq.heappop(delayed)
+                pending.add(executor.submit(attempt, key, payload))
+
+            # 2) 동시 제출 한도까지 새 작업 제출
+            while not exhausted and len(pending) < max_in_flight:
+                try:
+                    key, payload = next(task_iter)
+                except StopIteration:
+                    exhausted = True
+                    break
+                attempts[key] = 0
+                if on_submit:
+                    on_submit(key)
+                pending.add(executor.submit(attempt, key, payload))
+
+            if not pending and not delayed and exhausted:
+                break
+
+            timeout = max(0.0, delayed[0][0] - time.time()) if delayed else None
+            if not pending:
+                time.sleep(timeout)
+                continue
+
+            done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            for future in done:
+                key, payload, result, error, elapsed = future.result()
+                attempts[key] += 1
+                if error is not None and attempts[key] < policy.max_attempts and is_retryable(error):
+                    _, retry_after = classify_error(error)
+                    delay = policy.delay(attempts[key], retry_after)
+                    sequence += 1
+                    heapq.heappush(delayed, (time.time() + delay, sequence, key, payload))
+                    if on_retry:
+                        on_retry(key, error, attempts[key], delay)
+                    continue
+                on_done(key, payload, result, error, attempts[key], elapsed)
+
+
+def print_failure_report(failures: List[dict], what: str = "청크") -> None:
+    """
+    원문으로 대체된 작업 목록 출력
+
+    failures 항목: {'chunk': 번호, 'attempts': 시도 횟수, 'error': 오류 설명,
+                    ('document': 문서 이름), ('start', 'end'): 원문 오프셋}
+    """
+    if not failures:
+        return
+    print(f"[FAILURES] {len(failures)}개 {what}가 원문으로 대체되었습니다:")
+    for failure in sorted(failures, key=lambda f: (f.get('document') or "", f['chunk'])):
+        document = f"{failure['document']} " if failure.get('document') else ""
+        span = ""
+        if failure.get('start') is not None and failure.get('end') is not None:
+            span = f" [원문 {failure['start']:,}-{failure['end']:,}]"
+        print(f"  ✗ {document}{what} {failure['chunk']}{span}: {failure['attempts']}회 시도, {failure['error']}")
+    print()
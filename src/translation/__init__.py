@@ -0,0 +1,8 @@
+# 번역 모듈 패키지
+# 작성일: 2026-10-17
+# 목적: translate_pdf.py 번역 파이프라인 보조 모듈 (추출, 청킹 등)
+
+# 모듈은 필요할 때 직접 임포트하세요
+# 예: from src.translation.pdf_extractor import iter_pages_parallel
+
+__all__ = []
@@ -0,0 +1,207 @@
+# 증분 청커
+# 작성일: 2026-10-17
+# 목적: 텍스트 조각 스트림을 한 번의 선형 패스로 문장 경계 청크로 분할
+
+import re
+from dataclasses import dataclass
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
+
+
+# 문장 분리 (개선된 정규식 - 약어, URL 등 고려)
+SENTENCE_PATTERN = r'(?<!\w\.\w.)(?<![A-Z][a-z]\.)(?<=\.|\?|\!)\s+'
+_SENTENCE_RE = re.compile(SENTENCE_PATTERN)
+# 경계 판정에 필요한 최대 lookbehind 길이 (여유분 포함)
+LOOKBEHIND = 8
+
+# (문장, 시작 오프셋, 끝 오프셋, 크기)
+Sentence = Tuple[str, int, int, int]
+
+
+@dataclass
+class Chunk:
+    """
+    청크 단위
+
+    start/end는 입력 스트림 전체를 이어 붙인 원문 기준 오프셋이며,
+    text는 원문[start:end] 구간의 문장들을 공백 하나로 이은 것입니다.
+    (첫 청크가 아니면 text 앞부분에 overlap 문장들이 포함됨)
+    """
+    index: int
+    text: str
+    overlap: Optional[str]
+    start: int
+    end: int
+
+    def to_dict(self) -> dict:
+        """translate_chunks()가 받는 딕셔너리 형식으로 변환"""
+        return {
+            'text': self.text,
+            'overlap': self.overlap,
+            'start': self.start,
+            'end': self.end,
+        }
+
+
+class IncrementalChunker:
+    """
+    선형 시간 증분 청커
+
+    - feed()로 텍스트 조각(페이지 등)을 넣으면 완성된 청크를 즉시 반환
+    - 조각 끝의 미완성 문장만 다음 조각까지 보관 (전체 문장 목록을 만들지 않음)
+    - 현재 청크 크기는 누적 카운터로 유지 (경계마다 재계산하지 않음)
+    - 분할 결과는 기존 chunk_text()와 동일
+    - measure 지정 시 문자 수 대신 해당 함수(예: 토큰 추정기)로 크기 측정
+    """
+
+    def __init__(
+        self,
+        chunk_size: int = 5000,
+        overlap_sentences: int = 2,
+        measure: Optional[Callable[[str], int]] = None
+    ):
+        """초기화"""
+        self.chunk_size = chunk_size
+        self.overlap_sentences = overlap_sentences
+        self.measure = measure or len
+
+        # 아직 끝나지 않은 문장 (조각 목록으로 보관하여 반복 문자열 결합 방지)
+        self._carry_parts: List[str] = []
+        self._carry_len = 0
+        self._tail = ""            # 미완성 문장의 마지막 LOOKBEHIND자
+        self._carry_offset = 0     # 미완성 문장 첫 글자의 원문 오프셋
+        self._current: List[Sentence] = []
+        self._current_size = 0
+        self._overlap: List[Sentence] = []
+        self._emitted = 0
+
+    def feed(self, fragment: str) -> List[Chunk]:
+        """텍스트 조각 추가. 이번 조각으로 완성된 청크 목록 반환"""
+        # 이전 조각에서 이미 검사한 구간에는 경계가 생기지 않으므로
+        # 새 조각 + lookbehind용 꼬리(LOOKBEHIND자)만 먼저 확인
+        tail = self._tail
+        probe = tail + fragment
+        if _SENTENCE_RE.search(probe, len(tail)) is None:
+            if fragment:
+                self._carry_parts.append(fragment)
+                self._carry_len += len(fragment)
+                self._tail = probe[-LOOKBEHIND:]
+            return []
+
+        buffer = "".join(self._carry_parts) + fragment
+        base = self._carry_offset
+        completed = []
+
+        # 핫 루프: 크기 한도 이내면 누적 카운터만 갱신 (청크 경계에서만 메서드 호출)
+        current = self._current
+        current_size = self._current_size
+        limit = self.chunk_size
+        measure = self.measure
+        segment_start = 0
+        for match in _SENTENCE_RE.finditer(buffer, self._carry_len):
+            text = buffer[segment_start:match.start()]
+            begin = base + segment_start
+            if segment_start == 0:
+                # 경계 패턴이 \s+를 모두 소비하므로 앞뒤 공백은 버퍼 첫 문장에만 존재
+                stripped = text.lstrip()
+                begin += len(text) - len(stripped)
+                text = stripped.rstrip()
+            if text:
+                size = measure(text)
+                sentence = (text, begin, begin + len(text), size)
+                if current_size + size > limit and current:
+                    self._current_size = current_size
+                    completed.append(self._start_new_chunk(sentence))
+                    current = self._current
+                    current_size = self._current_size
+                else:
+                    current.append(sentence)
+                    current_size += size
+            segment_start = match.end()
+        self._current_size = current_size
+
+        rest = buffer[segment_start:]
+        self._carry_parts = [rest] if rest else []
+        self._carry_len = len(rest)
+        self._tail = rest[-LOOKBEHIND:]
+        self._carry_offset = base + segment_start
+        return completed
+
+    def finish(self) -> List[Chunk]:
+        """남은 문장과 마지막 청크 방출"""
+        completed = []
+
+        buffer = "".join(self._carry_parts)
+        chunk = self._add_segment(buffer, 0, len(buffer), self._carry_offset)
+        if chunk:
+            completed.append(chunk)
+        self._carry_offset += len(buffer)
+        self._carry_parts = []
+        self._carry_len = 0
+        self._tail = ""
+
+        # 마지막 청크
+        if self._current:
+            completed.append(self._emit(self._overlap if self._emitted > 0 else []))
+            self._current = []
+            self._current_size = 0
+
+        return completed
+
+    def _add_segment(self, buffer: str, start: int, end: int, base: int) -> Optional[Chunk]:
+        """
+        buffer[start:end] 구간을 문장으로 추가 (앞뒤 공백 제거, 빈 문장 무시)
+
+        청크 크기를 넘으면 현재 청크를 완성하여 반환합니다.
+        """
+        raw = buffer[start:end]
+        text = raw.strip()
+        if not text:
+            return None
+
+        size = self.measure(text)
+        begin = base + start + (len(raw) - len(raw.lstrip()))
+        sentence = (text, begin, begin + len(text), size)
+
+        # 청크 크기 초과 시 새 청크 시작
+        if self._current_size + size > self.chunk_size and self._current:
+            return self._start_new_chunk(sentence)
+
+        self._current.append(sentence)
+        self._current_size += size
+        return None
+
+    def _start_new_chunk(self, sentence: Sentence) -> Chunk:
+        """현재 청크를 완성하고, 오버랩 문장 + sentence로 새 청크 시작"""
+        chunk = self._emit(self._overlap)
+
+        # 오버랩을 위해 마지막 N개 문장 저장 (N개 문장 크기만 다시 계산)
+        n = self.overlap_sentences
+        self._overlap = self._current[-n:] if n > 0 else []
+        self._current = self._overlap + [sentence]
+        self._current_size = sum(s[3] for s in self._overlap) + sentence[3]
+        return chunk
+
+    def _emit(self, overlap: List[Sentence]) -> Chunk:
+        """현재 문장들로 청크 생성"""
+        chunk = Chunk(
+            index=self._emitted,
+            text=" ".join([s[0] for s in self._current]),
+            overlap=" ".join([s[0] for s in overlap]) if overlap else None,
+            start=self._current[0][1],
+            end=self._current[-1][2],
+        )
+        self._emitted += 1
+        return chunk
+
+
+def iter_chunks(
+    fragments: Iterable[str],
+    chunk_size: int = 5000,
+    overlap_sentences: int = 2,
+    measure: Optional[Callable[[str], int]] = None
+) -> Iterator[Chunk]:
+    """텍스트 조각 스트림을 청크 스트림으로 변환"""
+    chunker = IncrementalChunker(chunk_size, overlap_sentences, measure)
+    for fragment in fragments:
+        yield from chunker.feed(fragment)
+    yield from chunker.finish()
@@ -0,0 +1,141 @@
+# 문서 내 반복 문단 제거
+# 작성일: 2026-10-17
+# 목적: 추출 텍스트에서 여러 번 나오는 문단(머리글, 꼬리말, 저작권 문구, 반복 사이드바)을
+#       자리표시자로 바꿔 한 번만 번역하고, 번역 후 자리표시자를 번역문으로 되돌림
+
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+
+# 번역 요청에 그대로 남아야 하는 자리표시자 (모델이 번역하지 않도록 입력에 안내 문구 추가)
+PLACEHOLDER = "⟦DUP {}⟧"
+PLACEHOLDER_RE = re.compile(r"⟦DUP (\d+)⟧")
+# 이보다 짧은 문단(쪽 번호, 장 첫 글자 등)은 반복되어도 제거하지 않음
+MIN_PARAGRAPH_CHARS = 12
+MIN_REPEATS = 2
+
+_BLANK_LINE_RE = re.compile(r"(\n[ \t]*\n)")
+_LINE_RE = re.compile(r"(\n)")
+# 문장이 끝난 줄 (마침표/물음표/느낌표/말줄임표 뒤에 닫는 따옴표·괄호 허용)
+_SENTENCE_END_RE = re.compile(r"[.!?…。][\"'”’)\]]*\s*$")
+# 목록 항목으로 시작하는 줄 (글머리 기호 또는 번호)
+_LIST_ITEM_RE = re.compile(r"^\s*(?:[◾•▪■●◦‣*\-–]|\d+[.)])\s")
+
+
+def normalize_paragraph(paragraph: str) -> str:
+    """비교용 정규화 (연속 공백 → 한 칸, 앞뒤 공백 제거)"""
+    return " ".join(paragraph.split())
+
+
+def split_blocks(text: str, line_mode: bool) -> List[str]:
+    """
+    [블록, 구분자, 블록, 구분자, ..., 블록] 분할 (이어 붙이면 원문과 같음)
+
+    - 빈 줄이 있는 텍스트: 빈 줄로 구분된 문단
+    - 줄 단위 텍스트(PDF 추출): 줄을 이어 붙여 문장이 끝난 줄에서 블록을 닫음 (리플로우)
+      → 제목·목록 항목처럼 문장이 끝나지 않은 줄은 다음 줄과 한 블록이 되어 단독으로 반복 판정되지 않음
+    """
+    if not line_mode:
+        return _BLANK_LINE_RE.split(text)
+    lines = _LINE_RE.split(text)
+    parts = []
+    block = ""
+    for i in range(0, len(lines), 2):
+        block += lines[i]
+        separator = lines[i + 1] if i + 1 < len(lines) else None
+        if separator is None:
+            parts.append(block)
+        elif _SENTENCE_END_RE.search(lines[i]):
+            parts.extend((block, separator))
+            block = ""
+        else:
+            block += separator
+    return parts
+
+
+def _complete_block(block: str) -> bool:
+    """줄 단위 블록이 반복 판정 대상인지: 문장으로 끝나고 목록 항목이 아님 (목록 중간을 잘라내지 않도록)"""
+    return bool(_SENTENCE_END_RE.search(block)) and not _LIST_ITEM_RE.match(block)
+
+
+@dataclass
+class DedupResult:
+    """반복 문단 제거 결과"""
+    text: str                                   # 반복 문단이 자리표시자로 바뀐 원문
+    paragraphs: List[str] = field(default_factory=list)   # 자리표시자 번호 → 원문 문단
+    counts: List[int] = field(default_factory=list)       # 자리표시자 번호 → 등장 횟수
+    saved_chars: int = 0                        # 두 번째 등장부터 번역하지 않게 된 글자 수
+    index: Dict[str, int] = field(default_factory=dict)    # 정규화한 문단 → 자리표시자 번호
+    line_mode: bool = False                     # 줄 단위 리플로우 블록으로 비교했는지 (split_blocks)
+
+    @property
+    def occurrences(self) -> int:
+        """자리표시자로 바뀐 문단 총 등장 횟수"""
+        return sum(self.counts)
+
+    def substitute(self, text: str) -> str:
+        """다른 텍스트(장/절 본문 등)의 반복 문단을 같은 자리표시자로 교체 (문단 구분은 원문 기준)"""
+        if not self.index:
+            return text
+        parts = split_blocks(text, self.line_mode)
+        for i in range(0, len(parts), 2):
+            index = self.index.get(normalize_paragraph(parts[i]))
+            if index is not None:
+                parts[i] = PLACEHOLDER.format(index)
+        return "".join(parts)
+
+    def expand(self, translated: str, translations: List[str]) -> str:
+        """번역문의 자리표시자를 반복 문단 번역으로 되돌림 (번역이 없으면 원문)"""
+        def replace(match):
+            index = int(match.group(1))
+            if index < len(translations) and translations[index]:
+                return translations[index]
+            return self.paragraphs[index] if index < len(self.paragraphs) else match.group(0)
+        return PLACEHOLDER_RE.sub(replace, translated)
+
+
+def missing_placeholders(source: str, translated: str) -> List[int]:
+    """원문 청크에는 있지만 번역문에서 사라진 자리표시자 번호"""
+    kept = Counter(PLACEHOLDER_RE.findall(translated))
+    missing = []
+    for index, count in Counter(PLACEHOLDER_RE.findall(source)).items():
+        if kept[index] < count:
+            missing.append(int(index))
+    return sorted(missing)
+
+
+def deduplicate_paragraphs(text: str, min_chars: int = MIN_PARAGRAPH_CHARS,
+                           min_repeats: int = MIN_REPEATS) -> DedupResult:
+    """
+    전체 추출 텍스트에서 반복 문단을 자리표시자로 교체
+
+    - 문단: 빈 줄로 구분된 블록. PDF 추출 텍스트처럼 빈 줄이 거의 없으면 줄을 리플로우해
+      문장이 끝나는 줄까지를 한 블록으로 보고, 문장으로 끝나는 블록만 비교 (제목·목록 항목은 제외)
+    - 정규화한 문단이 min_repeats번 이상, min_chars자 이상이면 모든 등장을 같은 자리표시자로 교체
+    - 구분자(줄바꿈)는 그대로 유지하므로 자리표시자를 되돌리면 원래 배치와 같음
+    """
+    line_mode = len(_BLANK_LINE_RE.findall(text)) < 2
+    parts = split_blocks(text, line_mode)
+    # parts: [문단, 구분자, 문단, 구분자, ...]
+    keys = [normalize_paragraph(part) if i % 2 == 0 and (not line_mode or _complete_block(part)) else None
+            for i, part in enumerate(parts)]
+    counts = Counter(key for key in keys if key and len(key) >= min_chars)
+    repeated = {key for key, count in counts.items() if count >= min_repeats}
+    if not repeated:
+        return DedupResult(text=text)
+
+    result = DedupResult(text="", line_mode=line_mode)
+    index_of = result.index
+    for i, key in enumerate(keys):
+        if key not in repeated:
+            continue
+        if key not in index_of:
+            index_of[key] = len(result.paragraphs)
+            result.paragraphs.append(parts[i].strip())
+            result.counts.append(counts[key])
+            result.saved_chars += len(parts[i]) * (counts[key] - 1)
+        parts[i] = PLACEHOLDER.format(index_of[key])
+    result.text = "".join(parts)
+    return result
@@ -0,0 +1,59 @@
+# 용어집 준수 검사
+# 작성일: 2026-10-17
+# 목적: 번역이 끝난 청크마다 원문에 나온 용어집 용어의 지정 번역이 번역문에 들어 있는지
+#       다중 패턴 매처로 빠르게 확인하여, 어긋난 청크만 골라 다시 번역할 수 있게 함
+
+from typing import Dict, List, Tuple
+
+from src.translation.term_matcher import GlossaryMatcher, TermMatcher
+
+
+# 지정 번역에 허용된 대안 구분자 (예: "창업자/설립자")
+ALTERNATIVE_SEPARATOR = "/"
+
+
+class GlossaryChecker:
+    """
+    원문 용어 적중 대비 번역문의 지정 번역 누락 검사
+
+    - 원문: 용어집 영문 용어 Aho-Corasick (단어 경계)
+    - 번역문: 지정 한국어 번역 Aho-Corasick (공백 무시, 조사가 붙어도 일치)
+    - 대안 번역("창업자/설립자")은 하나라도 있으면 준수로 판단
+    """
+
+    def __init__(self, key_terms: Dict[str, str]):
+        """용어집으로 원문/번역문 매처를 한 번 생성"""
+        self.source = GlossaryMatcher(key_terms)
+        patterns = []
+        self._pattern_entry: List[int] = []
+        for index, (_, korean) in enumerate(self.source.entries):
+            for alternative in str(korean).split(ALTERNATIVE_SEPARATOR):
+                if alternative.strip():
+                    patterns.append(alternative.strip())
+                    self._pattern_entry.append(index)
+        self.target = TermMatcher(patterns, word_boundaries=False, ignore_spaces=True)
+
+    def missing_terms(self, source: str, translated: str) -> List[Tuple[str, str]]:
+        """원문에 나오지만 번역문에 지정 번역이 없는 용어 [(영문, 한글)]"""
+        hits = self.source.matcher.find(source)
+        if not hits or not translated:
+            return []
+        present = {self._pattern_entry[i] for i in self.target.find(translated)}
+        return [self.source.entries[index] for index in hits if index not in present]
+
+    def check(self, sources: List[str], translations: List[str]) -> Dict[int, List[Tuple[str, str]]]:
+        """
+        청크별 검사
+
+        Returns:
+            {청크 번호(1부터): 누락 용어 목록} — 누락이 없는 청크는 제외
+        """
+        flagged = {}
+        for i, (source, translated) in enumerate(zip(sources, translations), 1):
+            # 원문 그대로 대체된 청크(번역 실패)는 검사 대상이 아님
+            if translated == source:
+                continue
+            missing = self.missing_terms(source, translated)
+            if missing:
+                flagged[i] = missing
+        return flagged
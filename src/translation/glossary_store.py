@@ -0,0 +1,163 @@
+# 용어집 저장소
+# 작성일: 2026-10-17
+# 목적: 문서별 용어집 추출 결과를 문서 해시로 보관해 재실행 시 모델 호출을 건너뛰고,
+#       분야별(startup, law, medicine 등) 누적 용어집과 수동 고정 용어로 시리즈 전체의 번역을 통일
+
+import re
+import json
+import time
+import hashlib
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+
+# 모든 분야에 적용되는 수동 고정 용어 키
+ALL_DOMAINS = "*"
+# 분야를 알 수 없는 추출 결과 (추출 실패 포함)는 분야 용어집에 합치지 않음
+UNKNOWN_DOMAIN = "unknown"
+DEFAULT_OVERRIDES_PATH = "glossary_overrides.json"
+
+
+def normalize_domain(domain: Optional[str]) -> str:
+    """분야명 정규화 (소문자, 영숫자 외 문자 → '_')"""
+    name = re.sub(r"[^0-9a-z가-힣]+", "_", (domain or "").strip().lower()).strip("_")
+    return name or UNKNOWN_DOMAIN
+
+
+def document_key(sample: str, model: str) -> str:
+    """용어집 추출 입력(문서 샘플)과 모델의 SHA-256"""
+    digest = hashlib.sha256(model.encode('utf-8'))
+    digest.update(b"\0")
+    digest.update(sample.encode('utf-8'))
+    return digest.hexdigest()
+
+
+class GlossaryStore:
+    """
+    문서별 용어집 캐시 + 분야별 누적 용어집 (JSON 파일, 스레드 안전)
+
+    - documents: 문서 키 → {'domain', 'key_terms', 'document', 'model', 'created'}
+    - domains: 분야 → {영문 용어: {'ko': 번역, 'count': 등장 문서 수}}
+      같은 용어는 먼저 들어온 번역을 유지 (시리즈 안에서 번역이 바뀌지 않도록)
+    - 수동 고정 용어 (overrides 파일): {"*": {...}, "startup": {...}} — 항상 최우선
+    - domain 지정 시 추출된 분야 대신 그 분야로 저장·병합 (시리즈 전체를 한 분야 용어집으로)
+    """
+
+    def __init__(self, path: str = ".cache/glossary_store.json",
+                 overrides_path: Optional[str] = DEFAULT_OVERRIDES_PATH,
+                 domain: Optional[str] = None):
+        """초기화 (overrides 파일이 없으면 고정 용어 없음)"""
+        self.path = Path(path)
+        self.domain = normalize_domain(domain) if domain else None
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.overrides_path = Path(overrides_path) if overrides_path else None
+        self._lock = threading.Lock()
+
+    def _load(self) -> Dict[str, dict]:
+        try:
+            data = json.loads(self.path.read_text(encoding='utf-8'))
+        except (FileNotFoundError, ValueError):
+            data = {}
+        data.setdefault('documents', {})
+        data.setdefault('domains', {})
+        return data
+
+    def _save(self, data: Dict[str, dict]) -> None:
+        # 쓰는 도중 중단되어도 기존 기록이 깨지지 않도록 임시 파일에 쓴 뒤 교체
+        tmp = self.path.with_suffix('.tmp')
+        tmp.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding='utf-8')
+        tmp.replace(self.path)
+
+    def overrides(self, domain: str) -> Dict[str, str]:
+        """분야에 적용되는 수동 고정 용어 ('*' 다음 분야별 항목이 덮어씀)"""
+        if self.overrides_path is None or not self.overrides_path.exists():
+            return {}
+        try:
+            data = json.loads(self.overrides_path.read_text(encoding='utf-8'))
+        except ValueError as e:
+            print(f"[WARNING] {self.overrides_path}: 고정 용어 파일을 읽을 수 없습니다 ({e})")
+            return {}
+        pinned = dict(data.get(ALL_DOMAINS) or {})
+        for name, terms in data.items():
+            if name != ALL_DOMAINS and normalize_domain(name) == domain:
+                pinned.update(terms or {})
+        return pinned
+
+    def get_document(self, key: str) -> Optional[Dict[str, Any]]:
+        """저장된 문서 용어집 (없으면 None)"""
+        with self._lock:
+            return self._load()['documents'].get(key)
+
+    def put_document(self, key: str, glossary: Dict[str, Any], document: str = "", model: str = "") -> None:
+        """문서 용어집 저장 + 분야 용어집에 새 용어 추가"""
+        domain = self.domain or normalize_domain(glossary.get('domain'))
+        terms = glossary.get('key_terms') or {}
+        with self._lock:
+            data = self._load()
+            data['documents'][key] = {
+                'domain': domain,
+                'key_terms': terms,
+                'document': document,
+                'model': model,
+                'created': time.time(),
+            }
+            if domain != UNKNOWN_DOMAIN:
+                merged = data['domains'].setdefault(domain, {})
+                for term, korean in terms.items():
+                    entry = merged.setdefault(term, {'ko': korean, 'count': 0})
+                    entry['count'] += 1
+            self._save(data)
+
+    def domain_terms(self, domain: str) -> Dict[str, str]:
+        """분야 누적 용어집 {영문: 한글}"""
+        with self._lock:
+            entries = self._load()['domains'].get(normalize_domain(domain), {})
+        return {term: entry['ko'] for term, entry in entries.items()}
+
+    def resolve(self, glossary: Dict[str, Any], text: str) -> Dict[str, Any]:
+        """
+        문서 용어집 + 분야 누적 용어집 + 수동 고정 용어 병합
+
+        - 분야 용어집 중 이 문서 본문에 나오는 용어만 추가 (프롬프트가 분야 전체 용어로 커지지 않도록)
+        - 문서 추출 번역과 분야 번역이 다르면 분야 번역 사용 (시리즈 일관성)
+        - 고정 용어는 본문에 나오면 항상 추가·우선
+
+        Returns:
+            {'domain', 'key_terms', 'sources': {'document': n, 'domain': n, 'pinned': n}}
+        """
+        domain = self.domain or normalize_domain(glossary.get('domain'))
+        lowered = text.lower()
+        terms = dict(glossary.get('key_terms') or {})
+        from_document = len(terms)
+
+        from_domain = 0
+        if domain != UNKNOWN_DOMAIN:
+            for term, korean in self.domain_terms(domain).items():
+                if term in terms:
+                    terms[term] = korean
+                elif term.lower() in lowered:
+                    terms[term] = korean
+                    from_domain += 1
+
+        pinned = 0
+        for term, korean in self.overrides(domain).items():
+            if term in terms or term.lower() in lowered:
+                terms[term] = korean
+                pinned += 1
+
+        return {
+            **glossary,
+            'domain': domain,
+            'key_terms': terms,
+            'sources': {'document': from_document, 'domain': from_domain, 'pinned': pinned},
+        }
+
+    def purge(self) -> int:
+        """문서 용어집 캐시 삭제 (분야 누적 용어집은 유지). 삭제한 문서 수 반환"""
+        with self._lock:
+            data = self._load()
+            count = len(data['documents'])
+            data['documents'] = {}
+            self._save(data)
+        return count
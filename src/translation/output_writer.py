@@ -0,0 +1,91 @@
+# 순서 보장 증분 출력
+# 작성일: 2026-10-17
+# 목적: 완료 순서가 뒤섞여 도착하는 청크 번역 결과를 재정렬 버퍼에 모았다가,
+#       앞선 청크가 모두 끝나는 즉시 출력 파일에 이어 써서 실행 도중에도 결과를 사용할 수 있게 함
+
+import os
+import threading
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+def default_section(index: int, text: str) -> str:
+    """기본 섹션 형식 (generate_markdown과 동일)"""
+    return f"## Section {index}\n\n{text}\n\n"
+
+
+def structured_section(headings: List[Tuple[int, str]], text: str) -> str:
+    """장/절 구조 섹션 형식 (이 청크에서 시작하는 제목 — 수준 1 → ##, 2 → ### — 다음 본문)"""
+    return "".join(f"{'#' * (level + 1)} {title}\n\n" for level, title in headings) + f"{text}\n\n"
+
+
+class OrderedOutputWriter:
+    """
+    청크 결과 재정렬 버퍼 + 추가 쓰기 파일 (스레드 안전)
+
+    - add(i, text): i번 청크(1부터) 결과 등록. 다음 차례부터 연속된 청크가 모이면 즉시 파일에 추가
+    - 앞 청크가 아직 끝나지 않았으면 메모리에 보관 (보관량은 동시 제출 수 정도)
+    - 쓸 때마다 flush + fsync → 프로세스가 중단되어도 이미 쓴 섹션은 남음
+    """
+
+    def __init__(self, path, header: str = "",
+                 format_section: Callable[[int, str], str] = default_section,
+                 start_index: int = 1):
+        """파일을 새로 만들고 header를 씀 (기존 파일은 덮어씀)"""
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.format_section = format_section
+        self.next_index = start_index
+        self.written = 0
+        self._pending: Dict[int, str] = {}
+        self._lock = threading.Lock()
+        self._file = open(self.path, 'w', encoding='utf-8')
+        if header:
+            self._append(header)
+
+    def _append(self, text: str) -> None:
+        self._file.write(text)
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    @property
+    def buffered(self) -> int:
+        """앞 청크를 기다리며 보관 중인 청크 수"""
+        with self._lock:
+            return len(self._pending)
+
+    def add(self, index: int, text: str) -> int:
+        """
+        청크 결과 등록
+
+        Returns:
+            이번 호출로 파일에 쓴 섹션 수 (앞 청크를 기다리는 중이면 0)
+        """
+        with self._lock:
+            if self._file.closed or index < self.next_index:
+                return 0
+            self._pending[index] = text
+            parts = []
+            while self.next_index in self._pending:
+                parts.append(self.format_section(self.next_index, self._pending.pop(self.next_index)))
+                self.next_index += 1
+            if parts:
+                self._append("".join(parts))
+                self.written += len(parts)
+            return len(parts)
+
+    def close(self, footer: Optional[str] = None) -> None:
+        """파일 닫기 (footer 지정 시 마지막에 추가). 보관 중인 청크는 쓰지 않음"""
+        with self._lock:
+            if self._file.closed:
+                return
+            if footer:
+                self._append(footer)
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
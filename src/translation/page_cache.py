@@ -0,0 +1,203 @@
+# 페이지 추출 캐시 유틸리티
+# 작성일: 2026-10-17
+# 목적: (PDF SHA-256, 페이지 번호, 추출기 버전) 단위로 추출 텍스트와 줄별 글꼴 크기를 디스크에 보관
+
+import json
+import sqlite3
+import hashlib
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+
+
+# 추출 로직이 바뀌면 올려서 기존 캐시를 자동 무효화 (v2: 줄별 글꼴 크기 추가)
+EXTRACTOR_VERSION = "v2"
+
+
+def file_sha256(path, block_size: int = 1 << 20) -> str:
+    """파일 내용의 SHA-256 (1MB 블록 단위 스트리밍)"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def extractor_version() -> str:
+    """캐시 키에 사용할 추출기 버전 (pdfplumber 버전 포함)"""
+    try:
+        import pdfplumber
+        return f"pdfplumber-{pdfplumber.__version__}-{EXTRACTOR_VERSION}"
+    except ImportError:
+        return f"pdfplumber-unknown-{EXTRACTOR_VERSION}"
+
+
+class PageCache:
+    """
+    콘텐츠 주소 기반 페이지 추출 캐시 (SQLite 단일 파일)
+
+    - 키: (pdf_sha256, page_index, extractor_version)
+    - 값: (페이지 텍스트, 줄별 글꼴 크기) — 글꼴 크기는 장/절 제목 인식용 (layout 열, JSON)
+    - 문서 단위 메타데이터(페이지 수, PDF 메타데이터)도 함께 저장
+    - 전체 크기가 max_bytes를 넘으면 오래 사용되지 않은 페이지부터 제거 (LRU)
+    """
+
+    def __init__(self, cache_dir: str = ".cache", max_bytes: int = 256 * 1024 * 1024):
+        """초기화"""
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.db_path = self.cache_dir / "page_cache.sqlite3"
+        self.max_bytes = max_bytes
+        self.version = extractor_version()
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS documents (
+                pdf_sha TEXT NOT NULL,
+                version TEXT NOT NULL,
+                total_pages INTEGER NOT NULL,
+                metadata TEXT,
+                PRIMARY KEY (pdf_sha, version)
+            );
+            CREATE TABLE IF NOT EXISTS pages (
+                pdf_sha TEXT NOT NULL,
+                version TEXT NOT NULL,
+                page_index INTEGER NOT NULL,
+                text TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                last_access REAL NOT NULL,
+                PRIMARY KEY (pdf_sha, version, page_index)
+            );
+            CREATE INDEX IF NOT EXISTS idx_pages_last_access ON pages(last_access);
+        """)
+        # v1 캐시 파일에는 layout 열이 없으므로 추가 (v1 행은 버전이 달라 조회되지 않음)
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(pages)")}
+        if 'layout' not in columns:
+            self._conn.execute("ALTER TABLE pages ADD COLUMN layout TEXT")
+        self._conn.commit()
+
+    def get_document(self, pdf_sha: str) -> Optional[Dict[str, Any]]:
+        """문서 정보 조회: {'total_pages': int, 'metadata': dict} 또는 None"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT total_pages, metadata FROM documents WHERE pdf_sha = ? AND version = ?",
+                (pdf_sha, self.version)
+            ).fetchone()
+        if not row:
+            return None
+        return {'total_pages': row[0], 'metadata': json.loads(row[1]) if row[1] else {}}
+
+    def put_document(self, pdf_sha: str, total_pages: int, metadata: Optional[dict]) -> None:
+        """문서 정보 저장"""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO documents VALUES (?, ?, ?, ?)",
+                (pdf_sha, self.version, total_pages,
+                 json.dumps(metadata or {}, ensure_ascii=False, default=str))
+            )
+            self._conn.commit()
+
+    def get_pages(self, pdf_sha: str, page_indices: Iterable[int]) -> Dict[int, Tuple[str, List[float]]]:
+        """캐시된 페이지 (텍스트, 줄별 글꼴 크기) 조회 (적중한 페이지만 반환, 접근 시각 갱신)"""
+        indices = list(page_indices)
+        found: Dict[int, Tuple[str, List[float]]] = {}
+        now = time.time()
+
+        with self._lock:
+            # SQLite 변수 개수 제한을 피하기 위해 나누어 조회
+            for offset in range(0, len(indices), 500):
+                batch = indices[offset:offset + 500]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._conn.execute(
+                    f"SELECT page_index, text, layout FROM pages "
+                    f"WHERE pdf_sha = ? AND version = ? AND page_index IN ({placeholders})",
+                    (pdf_sha, self.version, *batch)
+                ).fetchall()
+                found.update((i, (text, json.loads(layout) if layout else [])) for i, text, layout in rows)
+
+            if found:
+                self._conn.executemany(
+                    "UPDATE pages SET last_access = ? WHERE pdf_sha = ? AND version = ? AND page_index = ?",
+                    [(now, pdf_sha, self.version, i) for i in found]
+                )
+                self._conn.commit()
+
+        self.hits += len(found)
+        self.misses += len(indices) - len(found)
+        return found
+
+    def put_pages(self, pdf_sha: str, pages: Dict[int, Tuple[str, List[float]]]) -> None:
+        """페이지 (텍스트, 줄별 글꼴 크기) 저장 후 크기 한도 초과분 제거"""
+        if not pages:
+            return
+        now = time.time()
+        rows = []
+        for i, (text, sizes) in pages.items():
+            layout = json.dumps(sizes)
+            rows.append((pdf_sha, self.version, i, text, len(text.encode('utf-8')) + len(layout), now, layout))
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO pages "
+                "(pdf_sha, version, page_index, text, size, last_access, layout) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+            self._conn.commit()
+        self.evict()
+
+    def total_bytes(self) -> int:
+        """캐시된 페이지 텍스트 + 글꼴 크기 총 크기 (bytes)"""
+        with self._lock:
+            row = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM pages").fetchone()
+        return int(row[0])
+
+    def evict(self) -> int:
+        """max_bytes를 넘는 만큼 LRU 순서로 페이지 제거. 제거된 페이지 수 반환"""
+        excess = self.total_bytes() - self.max_bytes
+        if excess <= 0:
+            return 0
+
+        removed = 0
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT pdf_sha, version, page_index, size FROM pages ORDER BY last_access"
+            )
+            victims = []
+            for pdf_sha, version, page_index, size in rows:
+                if excess <= 0:
+                    break
+                victims.append((pdf_sha, version, page_index))
+                excess -= size
+
+            self._conn.executemany(
+                "DELETE FROM pages WHERE pdf_sha = ? AND version = ? AND page_index = ?",
+                victims
+            )
+            # 페이지가 하나도 남지 않은 문서 정보 정리
+            self._conn.execute(
+                "DELETE FROM documents WHERE NOT EXISTS ("
+                "SELECT 1 FROM pages WHERE pages.pdf_sha = documents.pdf_sha "
+                "AND pages.version = documents.version)"
+            )
+            self._conn.commit()
+            removed = len(victims)
+
+        return removed
+
+    def purge(self) -> int:
+        """캐시 전체 삭제. 삭제된 페이지 수 반환"""
+        with self._lock:
+            count = self._conn.execute("SELECT COUNT(*) FROM pages").fetchone()[0]
+            self._conn.execute("DELETE FROM pages")
+            self._conn.execute("DELETE FROM documents")
+            self._conn.commit()
+            self._conn.execute("VACUUM")
+        return count
+
+    def close(self) -> None:
+        """DB 연결 종료"""
+        with self._lock:
+            self._conn.close()
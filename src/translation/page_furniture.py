@@ -0,0 +1,121 @@
+# 머리글/꼬리말/쪽 번호 제거
+# 작성일: 2026-10-17
+# 목적: 페이지 위·아래 가장자리에서 주변 페이지와 같은 위치에 반복되는 줄(책 제목·장 제목 머리글,
+#       쪽 번호, 인쇄용 슬러그)을 찾아 청킹 전에 제거하여 문장 중간에 끼어드는 잡음과 토큰 낭비를 줄임
+
+import re
+from collections import deque
+from typing import Callable, Deque, Iterable, Iterator, List, Optional, Tuple
+
+from src.translation.token_estimator import heuristic_tokens
+
+
+# 페이지 위/아래에서 검사하는 줄 수
+EDGE_LINES = 3
+# 앞뒤로 비교하는 페이지 수 (홀수/짝수 페이지 머리글이 번갈아 나와도 ±2, ±4에서 일치)
+WINDOW_PAGES = 4
+# 같은 위치에 같은 줄이 있어야 하는 주변 페이지 수 (장 첫 페이지의 "CHAPTER 6" 같은 줄은 멀리 떨어져 있어 제외됨)
+MIN_MATCHES = 2
+
+_DIGITS_RE = re.compile(r"\d+")
+
+
+def line_signature(line: str) -> str:
+    """비교용 줄 서명 (숫자 → '#', 소문자, 연속 공백 한 칸) — 쪽 번호가 달라도 같은 서명"""
+    return " ".join(_DIGITS_RE.sub("#", line).lower().split())
+
+
+class _PageProfile:
+    """페이지 가장자리 줄 서명"""
+    __slots__ = ('text', 'lines', 'top', 'bottom')
+
+    def __init__(self, text: str):
+        self.text = text
+        self.lines = text.split("\n") if text else []
+        self.top = [line_signature(line) for line in self.lines[:EDGE_LINES]]
+        self.bottom = [line_signature(line) for line in reversed(self.lines[-EDGE_LINES:])]
+
+
+class PageFurnitureStripper:
+    """
+    주변 페이지 빈도 분석 기반 머리글/꼬리말/쪽 번호 제거기
+
+    - 각 페이지의 위·아래 EDGE_LINES줄을 서명으로 바꾸고, 앞뒤 WINDOW_PAGES쪽의 같은 위치 서명과 비교
+    - 같은 서명이 MIN_MATCHES쪽 이상에 있으면 가장자리 줄로 판단 (가장자리부터 연속된 줄만 제거)
+    - 한 줄 정규식 대신 위치 + 반복 빈도로 판단하므로 책마다 다른 머리글 형식도 처리
+    - strip()은 페이지 스트림을 WINDOW_PAGES쪽만 앞서 읽으므로 스트리밍 파이프라인에도 사용 가능
+    """
+
+    def __init__(self, window: int = WINDOW_PAGES, min_matches: int = MIN_MATCHES,
+                 measure: Optional[Callable[[str], float]] = None):
+        """measure: 제거된 줄의 토큰 수 측정 함수 (기본 휴리스틱, TokenEstimator.estimate 권장)"""
+        self.window = window
+        self.min_matches = min_matches
+        self.measure = measure or heuristic_tokens
+        self.pages = 0
+        self.removed_lines = 0
+        self.removed_chars = 0
+        self.removed_tokens = 0.0
+        self.kept_chars = 0
+        # 페이지 순서대로 (위에서 제거한 줄 수, 아래에서 제거한 줄 수) — 줄별 글꼴 크기 정렬용
+        self.edges: List[Tuple[int, int]] = []
+
+    def _edge_count(self, signatures: List[str], neighbors: List[List[str]], limit: int) -> int:
+        """가장자리부터 연속으로 반복되는 줄 수"""
+        count = 0
+        while count < min(len(signatures), limit):
+            signature = signatures[count]
+            if not signature:
+                break
+            matches = sum(1 for other in neighbors if count < len(other) and other[count] == signature)
+            if matches < self.min_matches:
+                break
+            count += 1
+        return count
+
+    def _strip_at(self, profiles: Deque[_PageProfile], i: int) -> str:
+        page = profiles[i]
+        self.pages += 1
+        if not page.lines:
+            self.edges.append((0, 0))
+            return page.text
+        neighbors = [profiles[j] for j in range(max(0, i - self.window), min(len(profiles), i + self.window + 1))
+                     if j != i]
+        top = self._edge_count(page.top, [other.top for other in neighbors], len(page.lines))
+        bottom = self._edge_count(page.bottom, [other.bottom for other in neighbors], len(page.lines) - top)
+        self.edges.append((top, bottom))
+        if not top and not bottom:
+            self.kept_chars += len(page.text)
+            return page.text
+
+        kept = page.lines[top:len(page.lines) - bottom]
+        removed = "\n".join(page.lines[:top] + page.lines[len(page.lines) - bottom:])
+        self.removed_lines += top + bottom
+        self.removed_chars += len(removed)
+        self.removed_tokens += self.measure(removed)
+        text = "\n".join(kept)
+        self.kept_chars += len(text)
+        return text
+
+    def strip(self, pages: Iterable[str]) -> Iterator[str]:
+        """페이지 텍스트 스트림에서 가장자리 줄을 제거해 같은 순서로 yield (빈 페이지는 그대로)"""
+        profiles: Deque[_PageProfile] = deque()
+        base = 0        # profiles[0]의 페이지 번호
+        next_out = 0    # 다음에 내보낼 페이지 번호
+        for text in pages:
+            profiles.append(_PageProfile(text))
+            while next_out + self.window < base + len(profiles):
+                yield self._strip_at(profiles, next_out - base)
+                next_out += 1
+                while next_out - base > self.window:
+                    profiles.popleft()
+                    base += 1
+        while next_out < base + len(profiles):
+            yield self._strip_at(profiles, next_out - base)
+            next_out += 1
+
+    def summary(self) -> Tuple[int, int, float, float]:
+        """(제거 줄 수, 제거 글자 수, 제거 토큰 수, 원문 대비 제거 비율)"""
+        total = self.removed_chars + self.kept_chars
+        ratio = self.removed_chars / total if total else 0.0
+        return self.removed_lines, self.removed_chars, self.removed_tokens, ratio
@@ -0,0 +1,145 @@
+# 번역 실행 저널
+# 작성일: 2026-10-17
+# 목적: 청크 번역 결과를 완료 즉시 추가 전용 JSONL 파일에 기록하여,
+#       중단된 실행을 다시 시작하면 끝난 청크는 건너뛰고 남은 청크만 API로 보냄
+
+import os
+import json
+import time
+import hashlib
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+
+# 저널 형식이 바뀌면 올려서 기존 저널을 무시
+JOURNAL_VERSION = 1
+
+
+def source_hash(text: str, context: Optional[str] = None) -> str:
+    """청크 원문과 맥락(overlap)의 SHA-256 (청크 경계가 바뀌면 다른 값)"""
+    digest = hashlib.sha256(text.encode('utf-8'))
+    digest.update(b"\0")
+    digest.update((context or "").encode('utf-8'))
+    return digest.hexdigest()
+
+
+class TranslationJournal:
+    """
+    실행별 추가 전용 청크 저널 (스레드 안전)
+
+    한 줄에 JSON 레코드 하나:
+    - {'type': 'run', 'run': n, 'started': 시각, 'version', ...run_info}: 실행 시작
+    - {'type': 'chunk', 'run': n, 'chunk': 번호, 'source_sha256', 'text', 'model', 'usage', 'elapsed'}
+
+    - 첫 실행 기록의 run_info(PDF 해시, 모델 등)가 현재와 다르면 저널을 새로 시작
+    - 청크는 번호와 원문 해시가 모두 같을 때 재사용 (청크 설정이 바뀌면 다시 번역)
+      번호가 달라도 원문 해시가 같은 기록이 있으면 재사용 (장/절 단위 청킹에서 앞 장의 청크 수가 바뀐 경우)
+    - 마지막 줄이 기록 도중 끊겼으면 무시
+    - 기록할 때마다 flush + fsync
+    """
+
+    def __init__(self, path, run_info: Optional[Dict[str, Any]] = None, fresh: bool = False):
+        """저널을 읽고 이번 실행의 시작 기록을 추가 (fresh=True면 기존 저널 삭제)"""
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.run_info = dict(run_info or {})
+        self.entries: Dict[int, dict] = {}
+        self._by_source: Dict[str, dict] = {}
+        self.runs = 0
+        # 이전 실행별 마지막 청크 완료 시점의 경과 시간 (run 번호 → 초)
+        self._run_elapsed: Dict[int, float] = {}
+        self._lock = threading.Lock()
+        self.started = time.time()
+
+        if fresh:
+            self.path.unlink(missing_ok=True)
+        else:
+            self._load()
+
+        needs_newline = self.path.exists() and self.path.stat().st_size > 0 and not self._ends_with_newline()
+        self._file = open(self.path, 'a', encoding='utf-8')
+        if needs_newline:
+            self._file.write("\n")
+        self.runs += 1
+        self._append({'type': 'run', 'run': self.runs, 'started': self.started,
+                      'version': JOURNAL_VERSION, **self.run_info})
+
+    def _ends_with_newline(self) -> bool:
+        with open(self.path, 'rb') as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b"\n"
+
+    def _load(self) -> None:
+        if not self.path.exists():
+            return
+        records = []
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    continue
+        header = next((r for r in records if r.get('type') == 'run'), None)
+        if header is None or header.get('version') != JOURNAL_VERSION or any(
+                header.get(k) != v for k, v in self.run_info.items()):
+            if records:
+                print(f"[JOURNAL] {self.path.name}: 다른 입력/설정의 저널이므로 새로 시작합니다")
+            self.path.unlink(missing_ok=True)
+            return
+        for record in records:
+            if record.get('type') == 'run':
+                self.runs = max(self.runs, int(record.get('run') or 0))
+            elif record.get('type') == 'chunk' and record.get('text'):
+                self.entries[int(record['chunk'])] = record
+                self._by_source[record.get('source_sha256')] = record
+                run = int(record.get('run') or 0)
+                self._run_elapsed[run] = max(self._run_elapsed.get(run, 0.0), float(record.get('elapsed') or 0))
+
+    def _append(self, record: dict) -> None:
+        self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    @property
+    def previous_elapsed(self) -> float:
+        """이전 실행들이 청크 번역에 쓴 시간 합계 (초)"""
+        return sum(self._run_elapsed.values())
+
+    def lookup(self, index: int, source_sha256: str) -> Optional[dict]:
+        """이전 실행에서 완료된 청크 기록 (원문 해시가 일치할 때만, 같은 번호 우선)"""
+        entry = self.entries.get(index)
+        if entry is None or entry.get('source_sha256') != source_sha256:
+            return self._by_source.get(source_sha256)
+        return entry
+
+    def record(self, index: int, source_sha256: str, text: str, model: Optional[str],
+               usage: Optional[dict]) -> None:
+        """완료된 청크 기록 (원문으로 대체된 청크는 기록하지 않음)"""
+        entry = {
+            'type': 'chunk',
+            'run': self.runs,
+            'chunk': index,
+            'source_sha256': source_sha256,
+            'text': text,
+            'model': model,
+            'usage': usage or {},
+            'elapsed': round(time.time() - self.started, 3),
+        }
+        with self._lock:
+            if self._file.closed:
+                return
+            self._append(entry)
+            self.entries[index] = entry
+            self._by_source[source_sha256] = entry
+
+    def close(self) -> None:
+        """파일 닫기"""
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+
+    def discard(self) -> None:
+        """저널 삭제 (최종 결과를 저장한 뒤 호출)"""
+        self.close()
+        self.path.unlink(missing_ok=True)
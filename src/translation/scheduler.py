@@ -0,0 +1,72 @@
+# 최장 작업 우선 스케줄러
+# 작성일: 2026-10-17
+# 목적: 청크마다 입력 크기와 보정된 출력 비율로 처리 시간을 추정해 큰 청크부터 제출하여,
+#       문서 순서상 마지막에 제출된 큰 청크 하나가 전체 실행 시간을 늘리는 꼬리 지연을 줄임
+#       (여러 문서의 청크를 한 워커 풀에서 함께 정렬)
+#       증분 출력 파일이 있으면 문서 순서 구간(window) 안에서만 정렬해 앞부분이 먼저 끝나도록 함
+
+import heapq
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from src.translation.token_estimator import heuristic_tokens, DEFAULT_OUTPUT_RATIO
+
+
+# 입력 토큰 1개의 처리 시간 (출력 토큰 1개 대비) — 응답 시간은 대부분 출력 토큰 생성에 비례
+INPUT_WEIGHT = 0.05
+
+
+def chunk_cost(text: str, context: Optional[str] = None, estimator=None) -> float:
+    """
+    청크 1회 번역의 예상 처리 시간 (출력 토큰 환산)
+
+    estimator(TokenEstimator) 지정 시 이전 실행 usage로 보정된 출력 비율과 입력 토큰 추정을 사용
+    """
+    if estimator is not None:
+        return estimator.predict_output(text) + INPUT_WEIGHT * estimator.predict_input(text, context)
+    source = heuristic_tokens(text)
+    return DEFAULT_OUTPUT_RATIO * source + INPUT_WEIGHT * (source + heuristic_tokens(context or ""))
+
+
+def makespan(costs: Sequence[float], workers: int) -> float:
+    """목록 순서대로 먼저 비는 워커에 배정할 때의 전체 완료 시각 (워커 풀 실행 모사)"""
+    finish = [0.0] * max(1, min(workers, len(costs)))
+    for cost in costs:
+        heapq.heapreplace(finish, finish[0] + cost)
+    return max(finish) if costs else 0.0
+
+
+def order_longest_first(items: Sequence[Any], costs: Sequence[float], workers: int,
+                        window: Optional[int] = None) -> Tuple[List[Any], Dict[str, float]]:
+    """
+    예상 처리 시간이 긴 작업부터 정렬 (같으면 원래 순서)
+
+    window 지정 시 문서 순서로 window개씩 끊은 구간 안에서만 정렬합니다.
+    OrderedOutputWriter는 앞선 청크가 모두 끝나야 다음 청크를 쓰므로, 전체를 정렬하면
+    짧은 첫 청크(서문 등)가 맨 마지막에 제출되어 실행이 끝날 때까지 부분 파일이 비어 있게 됩니다.
+    구간을 동시 제출 수 정도로 잡으면 부분 파일은 문서 순서대로 자라고 꼬리 지연만 구간 안에서 줄입니다.
+
+    Returns:
+        (정렬된 작업, {'ordered': 정렬 후 예상 완료 시각, 'in_order': 원래 순서의 예상 완료 시각,
+                       'ideal': 하한 max(전체/워커, 가장 큰 작업)})
+    """
+    size = window if window and window > 0 else len(items)
+    order = []
+    for begin in range(0, len(items), max(1, size)):
+        block = range(begin, min(begin + size, len(items)))
+        order.extend(sorted(block, key=lambda k: -costs[k]))
+    ordered_costs = [costs[k] for k in order]
+    total = sum(costs)
+    stats = {
+        'ordered': makespan(ordered_costs, workers),
+        'in_order': makespan(list(costs), workers),
+        'ideal': max(total / max(1, workers), max(costs, default=0.0)),
+    }
+    return [items[k] for k in order], stats
+
+
+def format_schedule(count: int, documents: int, stats: Dict[str, float], window: Optional[int] = None) -> str:
+    """스케줄 요약 (예상 완료 시각을 하한 대비 배수로)"""
+    ideal = stats['ideal'] or 1.0
+    scope = f" (within windows of {window} in document order)" if window and window < count else ""
+    return (f"Longest-first over {count} chunks from {documents} document(s){scope}: predicted makespan "
+            f"{stats['ordered'] / ideal:.2f}× ideal (document order: {stats['in_order'] / ideal:.2f}×)")
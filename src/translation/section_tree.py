@@ -0,0 +1,187 @@
+# 장/절 구조 인식
+# 작성일: 2026-10-17
+# 목적: pdfplumber가 주는 줄별 글꼴 크기로 본문보다 큰 제목 줄(장·절 제목)을 찾아 장/절 트리를 만들고,
+#       청킹이 장/절 경계를 넘지 않게 하여 한 장의 내용이 바뀌어도 다른 장의 청크(와 캐시 키)가 그대로 유지되게 함
+
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+
+# 본문 글꼴 대비 제목 줄 최소 배율 (본문 10.8pt → 약 13pt 이상)
+HEADING_RATIO = 1.2
+# 장 첫 글자 장식(드롭 캡) 최소 배율 — 제목으로 보지 않고 다음 줄 앞에 붙임 ("I" + "f you want" → "If you want")
+DROP_CAP_RATIO = 2.0
+# 제목으로 인정하는 최소 글자 수 (큰 글꼴의 쪽 번호, 장 번호 숫자, 장식 기호 제외)
+MIN_HEADING_LETTERS = 3
+# 구분하는 제목 수준 수 (더 작은 제목 글꼴은 가장 깊은 수준으로)
+MAX_LEVELS = 3
+# 제목 수준으로 인정하는 글꼴 크기의 최소 등장 페이지 수
+# (표지·속표지의 책 제목·저자명처럼 한 페이지에만 나오는 장식 크기는 제목이 아니라 앞부분 본문으로 취급)
+MIN_HEADING_PAGES = 2
+
+
+@dataclass
+class Section:
+    """
+    장/절 하나 (제목 줄 다음부터 다음 제목 줄 전까지의 본문)
+
+    본문 없이 연달아 나온 제목(장 제목 바로 뒤의 절 제목 등)은 한 섹션의 headings에 함께 보관합니다.
+    """
+    number: str                         # 계층 번호 ("3", "3.2"), 첫 제목 앞부분은 "0"
+    headings: List[Tuple[int, str]]     # [(수준, 제목)] — 수준 1 = 장
+    text: str                           # 본문 (제목 줄 제외, 줄마다 줄바꿈)
+    page: int                           # 시작 페이지 (0부터)
+
+    @property
+    def level(self) -> int:
+        """섹션 수준 (마지막 제목의 수준, 앞부분은 0)"""
+        return self.headings[-1][0] if self.headings else 0
+
+    @property
+    def title(self) -> str:
+        """제목 (여러 개면 ' / '로 연결)"""
+        return " / ".join(title for _, title in self.headings)
+
+
+@dataclass
+class SectionTree:
+    """문서 장/절 트리 (섹션은 문서 순서, 수준으로 계층 표현)"""
+    sections: List[Section] = field(default_factory=list)
+    body_size: float = 0.0
+    levels: Dict[float, int] = field(default_factory=dict)    # 제목 글꼴 크기 → 수준
+
+    def count(self, level: int) -> int:
+        """해당 수준의 제목 수"""
+        return sum(1 for section in self.sections for lv, _ in section.headings if lv == level)
+
+    @property
+    def heading_count(self) -> int:
+        """전체 제목 수 (0이면 구조를 찾지 못한 문서)"""
+        return sum(len(section.headings) for section in self.sections)
+
+    def outline(self) -> List[str]:
+        """들여쓴 목차 줄 (번호, 제목, 시작 페이지, 본문 글자 수)"""
+        lines = []
+        for section in self.sections:
+            indent = "  " * max(0, section.level - 1)
+            title = section.title or "(front matter)"
+            lines.append(f"{indent}[{section.number}] {title} — p.{section.page + 1}, {len(section.text):,} chars")
+        return lines
+
+
+def _letters(text: str) -> int:
+    return sum(1 for char in text if char.isalpha())
+
+
+def body_font_size(lines: Sequence[Tuple[int, str, float]]) -> float:
+    """본문 글꼴 크기 (글자 수 기준 가장 많이 쓰인 줄 크기)"""
+    weights: Counter = Counter()
+    for _, text, size in lines:
+        if size > 0:
+            weights[size] += len(text.strip())
+    return weights.most_common(1)[0][0] if weights else 0.0
+
+
+def build_section_tree(
+    pages: Sequence[str],
+    layouts: Dict[int, List[float]],
+    edges: Optional[Sequence[Tuple[int, int]]] = None
+) -> SectionTree:
+    """
+    페이지 텍스트 + 줄별 글꼴 크기로 장/절 트리 생성
+
+    - 본문 크기의 HEADING_RATIO배 이상이고 글자가 MIN_HEADING_LETTERS개 이상인 줄을 제목으로 판단
+    - 제목 글꼴 크기를 큰 순서로 수준 1(장), 2(절), ...에 대응 (아카이브의 정규식 패턴 대신 책마다 다른 형식에 대응)
+      여러 페이지(MIN_HEADING_PAGES 이상)에 나오는 크기만 수준으로 삼고, 한 페이지에만 나오는 표지 장식 크기는 본문으로 취급
+    - 상위 제목 없이 나온 하위 제목은 가장 가까운 상위 제목 바로 아래 번호 (첫 장 앞이면 "0.1", "0.2", ...)
+    - 같은 페이지에서 연속된 같은 크기의 제목 줄은 한 제목으로 병합 ("DON'T RAISE MONEY FOR THE" + "WRONG PEOPLE")
+    - edges: PageFurnitureStripper.edges — 제거된 머리글/꼬리말 줄은 제목·본문에서 제외
+
+    Args:
+        pages: 페이지 텍스트 (추출 원본, 0부터)
+        layouts: {페이지_인덱스: 줄별 글꼴 크기} (페이지 텍스트의 줄과 같은 순서)
+        edges: 페이지별 (위 제거 줄 수, 아래 제거 줄 수)
+
+    Returns:
+        SectionTree (제목이 없으면 앞부분 섹션 하나)
+    """
+    lines: List[Tuple[int, str, float]] = []
+    for index, page_text in enumerate(pages):
+        page_lines = page_text.split("\n") if page_text else []
+        sizes = layouts.get(index) or []
+        if len(sizes) != len(page_lines):
+            sizes = [0.0] * len(page_lines)
+        top, bottom = edges[index] if edges is not None and index < len(edges) else (0, 0)
+        for j in range(top, len(page_lines) - bottom):
+            lines.append((index, page_lines[j], sizes[j]))
+
+    body_size = body_font_size(lines)
+    heading_limit = body_size * HEADING_RATIO if body_size else float("inf")
+
+    def is_heading_line(text: str, size: float) -> bool:
+        return size >= heading_limit and _letters(text) >= MIN_HEADING_LETTERS
+
+    heading_pages: Dict[float, set] = {}
+    for page, text, size in lines:
+        if is_heading_line(text, size):
+            heading_pages.setdefault(size, set()).add(page)
+    heading_sizes = sorted((size for size, found in heading_pages.items() if len(found) >= MIN_HEADING_PAGES),
+                           reverse=True)
+    levels = {size: min(rank + 1, MAX_LEVELS) for rank, size in enumerate(heading_sizes)}
+
+    def is_heading(text: str, size: float) -> bool:
+        return size in levels and is_heading_line(text, size)
+    tree = SectionTree(body_size=body_size, levels=levels)
+
+    counters = [0] * (MAX_LEVELS + 1)
+    number = "0"
+    headings: List[Tuple[int, str]] = []
+    body: List[str] = []
+    start_page = 0
+    previous_heading: Optional[Tuple[int, float]] = None    # 직전 줄이 제목이면 (페이지, 크기)
+    drop_cap = ""
+
+    def close_section() -> None:
+        if headings or any(line.strip() for line in body):
+            tree.sections.append(Section(number, list(headings), "".join(line + "\n" for line in body), start_page))
+
+    for page, text, size in lines:
+        if is_heading(text, size):
+            title = " ".join(text.split())
+            if previous_heading == (page, size) and headings:
+                level, merged = headings[-1]
+                headings[-1] = (level, f"{merged} {title}")
+                continue
+            if any(line.strip() for line in body):
+                close_section()
+                headings, body = [], []
+            if not headings:
+                start_page = page
+            level = levels[size]
+            # 번호 깊이: 가장 가까운 상위 제목 바로 아래 (빠진 중간 수준은 번호에 넣지 않음, 첫 장 앞은 "0.n")
+            parent = max((lv for lv in range(1, level) if counters[lv]), default=0)
+            depth = parent + 1 if parent or level == 1 else 2
+            counters[depth] += 1
+            for deeper in range(depth + 1, MAX_LEVELS + 1):
+                counters[deeper] = 0
+            number = ".".join(str(counters[lv]) for lv in range(1, depth + 1))
+            headings.append((level, title))
+            previous_heading = (page, size)
+            continue
+
+        previous_heading = None
+        stripped = text.strip()
+        if len(stripped) == 1 and stripped.isalpha() and body_size and size >= body_size * DROP_CAP_RATIO:
+            drop_cap = stripped
+            continue
+        if drop_cap:
+            text, drop_cap = drop_cap + text.lstrip(), ""
+        if not headings and not body:
+            start_page = page
+        body.append(text)
+
+    if drop_cap:
+        body.append(drop_cap)
+    close_section()
+    return tree
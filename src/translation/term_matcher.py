@@ -0,0 +1,113 @@
+# 용어집 다중 패턴 매처
+# 작성일: 2026-10-17
+# 목적: 문서 용어집 전체로 Aho-Corasick 오토마톤을 한 번 만들고, 청크마다 텍스트를 한 번만 훑어
+#       실제로 등장하는 용어만 골라 프롬프트에 넣음 (용어 수와 무관하게 청크 길이에 비례)
+
+from collections import deque
+from typing import Dict, List, Tuple
+
+
+def normalize_term_text(text: str, ignore_spaces: bool = False) -> str:
+    """매칭용 정규화 (소문자, 곱은 따옴표 → ', 줄바꿈 포함 연속 공백 → 한 칸, ignore_spaces면 공백 제거)"""
+    return ("" if ignore_spaces else " ").join(text.lower().replace("’", "'").split())
+
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum()
+
+
+class TermMatcher:
+    """
+    Aho-Corasick 오토마톤 기반 용어 검색기
+
+    - 패턴: 용어집의 영문 용어 (대소문자·공백·따옴표 차이 무시)
+    - 단어 경계에서 시작·끝나는 일치만 인정 ("VC"가 "VCs"에는 일치, "ovc"에는 불일치)
+      끝 경계 뒤의 복수형 s/es는 허용
+    - word_boundaries=False, ignore_spaces=True: 한국어 번역문 검사용
+      (조사가 붙은 "텀시트를", 띄어쓰기가 다른 "벤처 캐피털"도 일치)
+    - find(): 청크에 나오는 용어를 용어집 순서대로 반환
+    """
+
+    def __init__(self, terms: List[str], word_boundaries: bool = True, ignore_spaces: bool = False):
+        """용어 목록으로 오토마톤 생성 (goto 테이블 + 실패 링크 + 출력 링크)"""
+        self.terms = list(terms)
+        self.word_boundaries = word_boundaries
+        self.ignore_spaces = ignore_spaces
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[int]] = [[]]
+
+        for index, term in enumerate(self.terms):
+            pattern = normalize_term_text(term, ignore_spaces)
+            if not pattern:
+                continue
+            state = 0
+            for char in pattern:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][char] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append([])
+                state = next_state
+            self._output[state].append(index)
+
+        # 너비 우선으로 실패 링크 계산, 실패 상태의 출력을 이어 붙임
+        self._lengths = [len(normalize_term_text(term, ignore_spaces)) for term in self.terms]
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[next_state] = target if target != next_state else 0
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+
+    def _ends_at_boundary(self, text: str, end: int) -> bool:
+        if end >= len(text) or not _is_word_char(text[end]):
+            return True
+        for suffix in ("s", "es"):
+            after = end + len(suffix)
+            if text.startswith(suffix, end) and (after >= len(text) or not _is_word_char(text[after])):
+                return True
+        return False
+
+    def find(self, text: str) -> List[int]:
+        """텍스트에 나오는 용어 번호 (용어집 순서, 중복 없음)"""
+        normalized = normalize_term_text(text, self.ignore_spaces)
+        found = set()
+        state = 0
+        for position, char in enumerate(normalized):
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+            for index in self._output[state]:
+                if index in found:
+                    continue
+                if self.word_boundaries:
+                    start = position + 1 - self._lengths[index]
+                    if start > 0 and _is_word_char(normalized[start - 1]):
+                        continue
+                    if not self._ends_at_boundary(normalized, position + 1):
+                        continue
+                found.add(index)
+        return sorted(found)
+
+
+class GlossaryMatcher:
+    """용어집 {영문: 한글}용 TermMatcher 래퍼"""
+
+    def __init__(self, key_terms: Dict[str, str]):
+        self.entries: List[Tuple[str, str]] = list(key_terms.items())
+        self.matcher = TermMatcher([term for term, _ in self.entries])
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def select(self, text: str) -> List[Tuple[str, str]]:
+        """텍스트에 나오는 용어집 항목 [(영문, 한글)]"""
+        return [self.entries[index] for index in self.matcher.find(text)]
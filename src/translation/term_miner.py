@@ -0,0 +1,161 @@
+# 용어 후보 추출
+# 작성일: 2026-10-17
+# 목적: 전체 원문을 로컬에서 한 번 훑어 C-value로 전문 용어 후보를 순위화하고,
+#       상위 후보와 짧은 문맥만 용어집 추출 모델에 보내 (고정 앞/중간/끝 샘플 대신) 프롬프트를 줄임
+
+import re
+import math
+from collections import Counter, defaultdict
+from typing import Dict, List, NamedTuple
+
+
+# 모델에 보내는 후보 수와 문맥 길이
+MAX_CANDIDATES = 80
+SNIPPET_CHARS = 140
+# 후보 n-gram 최대 단어 수와 최소 등장 횟수
+MAX_WORDS = 4
+MIN_FREQUENCY = 2
+
+# 후보의 처음/끝에 올 수 없는 기능어와 일반 명사 (용어 경계 판단용)
+STOPWORDS = frozenset("""
+a about above after again against all also am an and any are aren't as at be because been before being below
+between both but by can can't cannot could couldn't did didn't do does doesn't doing don't down during each even
+ever every few for from further get gets getting got had hadn't has hasn't have haven't having he he'd he'll he's
+her here here's hers herself him himself his how how's however i i'd i'll i'm i've if in into is isn't it it's its
+itself just let's like made make makes making many may me might more most much must mustn't my myself need no nor
+not now of off on once one only or other others ought our ours ourselves out over own really same say said says
+shall shan't she she'd she'll she's should shouldn't so some something such than that that's the their theirs them
+themselves then there there's these they they'd they'll they're they've thing things this those though through
+time times to too under until up upon us very was wasn't way ways we we'd we'll we're we've well were weren't what
+what's when when's where where's whether which while who who's whom why why's will with without won't would
+wouldn't yes yet you you'd you'll you're you've your yours yourself yourselves lot lots kind sort able back still
+first second new old good great big small long little right left next last another every else enough around
+two three four five six seven eight nine ten hundred hundreds thousand thousands million millions billion
+year years month months week weeks day days later ago almost certainly
+""".split())
+
+_WORD_RE = re.compile(r"[A-Za-z][A-Za-z0-9]*(?:['’\-][A-Za-z0-9]+)*")
+# 용어가 걸쳐 있을 수 없는 경계 (문장 부호, 괄호, 따옴표)
+_PHRASE_SPLIT_RE = re.compile(r"[.,;:!?()\[\]{}\"“”‘—–•…/]+|\s'|'\s")
+_HYPHEN_BREAK_RE = re.compile(r"(\w)-\n(\w)")
+_POSSESSIVE_RE = re.compile(r"['’]s$")
+
+
+class TermCandidate(NamedTuple):
+    """용어 후보"""
+    term: str           # 가장 흔한 표기
+    frequency: int      # 전체 등장 횟수
+    score: float        # C-value
+    snippet: str        # 첫 등장 문맥
+
+
+def _reflow(text: str) -> str:
+    """PDF 줄바꿈 복원 (줄 끝 하이픈 결합, 줄바꿈 → 공백)"""
+    return _HYPHEN_BREAK_RE.sub(r"\1\2", text).replace("\n", " ")
+
+
+def _is_acronym(word: str) -> bool:
+    letters = [c for c in word if c.isalpha()]
+    return len(letters) >= 2 and all(c.isupper() for c in letters)
+
+
+def _has_lowercase(word: str) -> bool:
+    return any(c.islower() for c in word)
+
+
+def mine_terms(text: str, max_candidates: int = MAX_CANDIDATES) -> List[TermCandidate]:
+    """
+    전체 텍스트에서 전문 용어 후보를 C-value 순으로 반환
+
+    - 구 경계(문장 부호) 안에서 1~MAX_WORDS단어 n-gram을 세고, 처음/끝이 기능어인 후보는 제외
+    - 여러 단어 후보: C-value = log2(n+1) × (빈도 − 더 긴 후보에 포함된 평균 빈도)
+      ("product market" 처럼 "product market fit"의 일부로만 쓰이는 조각은 점수가 낮아짐)
+    - 한 단어 후보: 본문 속 약어(MVP, VC)나 문장 중간에서도 대문자로 쓰이는 고유명사만 (일반 단어 배제)
+      (앞뒤 단어도 대문자인 제목 줄의 단어는 약어로 보지 않음)
+    - 소유격('s)은 떼고 세며, PDF 자간 오류로 생긴 한 글자 조각("e arly")이 들어간 후보는 제외
+    - 문맥: 첫 등장 위치 앞뒤 SNIPPET_CHARS자
+    """
+    flat = _reflow(text)
+    counts: Counter = Counter()
+    surfaces: Dict[str, Counter] = defaultdict(Counter)
+    first_seen: Dict[str, int] = {}
+    capitalized: Counter = Counter()     # 문장 첫 단어가 아닌 곳에서 대문자로 시작한 횟수
+    mid_sentence: Counter = Counter()    # 문장 첫 단어가 아닌 등장 횟수
+    acronyms: Counter = Counter()        # 앞뒤 단어는 대문자가 아닌데 전부 대문자로 쓰인 횟수
+
+    offset = 0
+    sentence_start = True
+    separators = list(_PHRASE_SPLIT_RE.finditer(flat))
+    for separator in separators + [None]:
+        end = separator.start() if separator is not None else len(flat)
+        phrase = flat[offset:end]
+        matches = list(_WORD_RE.finditer(phrase))
+        words = [_POSSESSIVE_RE.sub("", m.group(0)) for m in matches]
+        lowered = [w.lower().replace("’", "'") for w in words]
+        caps = [_is_acronym(w) for w in words]
+        for i in range(len(words)):
+            if i > 0 or not sentence_start:
+                mid_sentence[lowered[i]] += 1
+                if words[i][0].isupper():
+                    capitalized[lowered[i]] += 1
+            if caps[i] and not (i > 0 and caps[i - 1]) and not (i + 1 < len(words) and caps[i + 1]):
+                acronyms[lowered[i]] += 1
+            if lowered[i] in STOPWORDS or (len(lowered[i]) == 1 and words[i].islower()):
+                continue
+            for n in range(1, min(MAX_WORDS, len(words) - i) + 1):
+                last = lowered[i + n - 1]
+                if len(last) == 1 and words[i + n - 1].islower():
+                    break
+                if last in STOPWORDS:
+                    continue
+                key = " ".join(lowered[i:i + n])
+                counts[key] += 1
+                surfaces[key][" ".join(words[i:i + n])] += 1
+                if key not in first_seen:
+                    first_seen[key] = offset + matches[i].start()
+        if separator is not None:
+            # 다음 구의 첫 단어가 문장 첫 단어인지 (마침표/물음표/느낌표 뒤)
+            sentence_start = any(c in ".!?" for c in separator.group(0)) or (sentence_start and not words)
+            offset = separator.end()
+
+    candidates = {key: f for key, f in counts.items() if f >= MIN_FREQUENCY}
+
+    # 더 긴 후보에 포함된 빈도 집계 (C-value 중첩 보정)
+    nested_sum: Counter = Counter()
+    nested_count: Counter = Counter()
+    for key, f in candidates.items():
+        parts = key.split(" ")
+        for n in range(1, len(parts)):
+            for i in range(len(parts) - n + 1):
+                sub = " ".join(parts[i:i + n])
+                if sub in candidates:
+                    nested_sum[sub] += f
+                    nested_count[sub] += 1
+
+    scored = []
+    for key, f in candidates.items():
+        length = key.count(" ") + 1
+        surface = surfaces[key].most_common(1)[0][0]
+        if length == 1:
+            proper = mid_sentence[key] and capitalized[key] / mid_sentence[key] >= 0.8
+            if len(key) < 2 or not (acronyms[key] or (proper and _has_lowercase(surface))):
+                continue
+        nested = nested_sum[key] / nested_count[key] if nested_count[key] else 0.0
+        score = math.log2(length + 1) * (f - nested)
+        if score <= 0:
+            continue
+        scored.append((score, f, key, surface))
+
+    scored.sort(key=lambda item: (-item[0], -item[1], item[2]))
+    result = []
+    for score, f, key, surface in scored[:max_candidates]:
+        start = first_seen[key]
+        left = max(0, start - SNIPPET_CHARS // 2)
+        snippet = " ".join(flat[left:left + SNIPPET_CHARS].split())
+        result.append(TermCandidate(surface, f, round(score, 2), snippet))
+    return result
+
+
+def format_candidates(candidates: List[TermCandidate]) -> str:
+    """모델에 보낼 후보 목록 (한 줄에 용어, 빈도, 문맥)"""
+    return "\n".join(f"- {c.term} (×{c.frequency}): …{c.snippet}…" for c in candidates)
@@ -0,0 +1,150 @@
+# 토큰 추정기
+# 작성일: 2026-10-17
+# 목적: API 호출 없이 청크의 입력/출력 토큰 수를 추정하고, 실제 usage로 보정
+
+import re
+import json
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+
+# 보정 데이터가 부족할 때 사용하는 기본값
+DEFAULT_SCALE = 1.0            # 휴리스틱 → 실제 입력 토큰 배율
+DEFAULT_OVERHEAD = 3000        # 청크와 무관한 프롬프트 고정 토큰 (페르소나, 예시 등)
+DEFAULT_OUTPUT_RATIO = 1.6     # 원문 휴리스틱 토큰 대비 한국어 출력 토큰 비율
+MIN_OBSERVATIONS = 3           # 회귀 적용에 필요한 최소 관측 수
+
+_HANGUL_RE = re.compile(r'[가-힣㄰-㆏]')
+
+
+def heuristic_tokens(text: str) -> float:
+    """
+    문자 종류별 휴리스틱 토큰 수
+
+    - ASCII (영문, 숫자, 기호): 약 4자당 1토큰
+    - 한글: 약 1자당 1토큰
+    - 기타 비ASCII (따옴표, 대시 등): 1자당 1토큰
+    """
+    if not text:
+        return 0.0
+    ascii_chars = len(text.encode('ascii', 'ignore'))
+    hangul_chars = len(_HANGUL_RE.findall(text))
+    other_chars = len(text) - ascii_chars - hangul_chars
+    return ascii_chars / 4.0 + hangul_chars * 1.0 + other_chars * 1.0
+
+
+class TokenEstimator:
+    """
+    실제 usage로 보정되는 오프라인 토큰 추정기
+
+    - 입력: input_tokens ≈ overhead + scale × h(청크 + 컨텍스트) (최소제곱 회귀)
+    - 출력: output_tokens ≈ output_ratio × h(청크 원문)
+    - 관측치는 모델별 누적 합계로 JSON 파일에 저장되어 다음 실행에서 재사용
+    """
+
+    def __init__(self, model: str, calibration_path: str = ".cache/token_calibration.json"):
+        """초기화"""
+        self.model = model
+        self.calibration_path = Path(calibration_path)
+        self.sums = self._load()
+
+    def _load(self) -> Dict[str, float]:
+        """모델별 누적 관측 합계 로드"""
+        empty = {'n': 0, 'x': 0.0, 'y': 0.0, 'xx': 0.0, 'xy': 0.0, 'src': 0.0, 'out': 0.0}
+        if not self.calibration_path.exists():
+            return empty
+        try:
+            with open(self.calibration_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            return {**empty, **data.get(self.model, {})}
+        except (OSError, ValueError):
+            return empty
+
+    def save(self) -> None:
+        """누적 관측 합계 저장 (다른 모델의 보정값은 유지)"""
+        data: Dict[str, Any] = {}
+        if self.calibration_path.exists():
+            try:
+                with open(self.calibration_path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                data = {}
+        data[self.model] = self.sums
+        self.calibration_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.calibration_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+
+    def observe(self, text: str, context: Optional[str], input_tokens: int, output_tokens: int) -> None:
+        """번역 1회의 실제 usage 기록"""
+        if not input_tokens:
+            return
+        x = heuristic_tokens(text) + heuristic_tokens(context or "")
+        s = self.sums
+        s['n'] += 1
+        s['x'] += x
+        s['y'] += input_tokens
+        s['xx'] += x * x
+        s['xy'] += x * input_tokens
+        if output_tokens:
+            s['src'] += heuristic_tokens(text)
+            s['out'] += output_tokens
+
+    @property
+    def scale(self) -> float:
+        """휴리스틱 → 실제 입력 토큰 배율 (회귀 기울기, 0.5~2.0으로 제한)"""
+        s = self.sums
+        n = s['n']
+        if n < MIN_OBSERVATIONS:
+            return DEFAULT_SCALE
+        denom = n * s['xx'] - s['x'] ** 2
+        if denom <= 0:
+            return DEFAULT_SCALE
+        slope = (n * s['xy'] - s['x'] * s['y']) / denom
+        return min(2.0, max(0.5, slope))
+
+    @property
+    def overhead(self) -> float:
+        """청크와 무관한 프롬프트 고정 토큰 (회귀 절편)"""
+        s = self.sums
+        if s['n'] < MIN_OBSERVATIONS:
+            return DEFAULT_OVERHEAD
+        return max(0.0, (s['y'] - self.scale * s['x']) / s['n'])
+
+    @property
+    def output_ratio(self) -> float:
+        """원문 휴리스틱 토큰당 출력 토큰"""
+        s = self.sums
+        if s['n'] < MIN_OBSERVATIONS or s['src'] <= 0:
+            return DEFAULT_OUTPUT_RATIO
+        return s['out'] / s['src']
+
+    def estimate(self, text: str) -> int:
+        """텍스트의 예상 입력 토큰 수"""
+        return int(round(self.scale * heuristic_tokens(text)))
+
+    def predict_input(self, text: str, context: Optional[str] = None) -> int:
+        """프롬프트 고정 부분을 포함한 청크 1회 호출의 예상 입력 토큰"""
+        return int(round(self.overhead + self.scale * (heuristic_tokens(text) + heuristic_tokens(context or ""))))
+
+    def predict_output(self, text: str) -> int:
+        """청크 원문의 예상 출력 토큰"""
+        return int(round(self.output_ratio * heuristic_tokens(text)))
+
+    def source_budget(self, input_budget: int, output_budget: int) -> int:
+        """
+        청크 원문 한도 (estimate() 단위)
+
+        입력 예산과, 예상 출력이 output_budget을 넘지 않는 원문 크기 중 작은 값
+        """
+        by_output = output_budget * self.scale / self.output_ratio
+        return max(1, int(min(input_budget, by_output)))
+
+    def summary(self) -> Dict[str, Any]:
+        """현재 보정 상태 요약"""
+        return {
+            'model': self.model,
+            'observations': int(self.sums['n']),
+            'scale': round(self.scale, 3),
+            'overhead': int(self.overhead),
+            'output_ratio': round(self.output_ratio, 3),
+        }
@@ -0,0 +1,302 @@
+# 번역 메모리
+# 작성일: 2026-10-17
+# 목적: 원문 구간 → 검수된 한국어 번역을 책/실행을 넘어 보관하여,
+#       같은 원문은 API 없이 재사용하고 비슷한 원문(MinHash LSH)은 참고 번역으로 프롬프트에 제공
+
+import re
+import array
+import random
+import sqlite3
+import hashlib
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+
+# MinHash 서명 길이 = 밴드 수 × 밴드당 행 수
+NUM_PERM = 64
+LSH_BANDS = 16
+LSH_ROWS = NUM_PERM // LSH_BANDS
+# 단어 n-gram 크기
+SHINGLE_SIZE = 3
+# 유사 구간으로 인정하는 최소 추정 자카드 유사도
+DEFAULT_SIMILARITY = 0.5
+# 프롬프트에 넣는 참고 번역 수 (구간 하나가 청크 크기이므로 입력 토큰이 크게 늘지 않도록)
+DEFAULT_MAX_REFERENCES = 1
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_rng = random.Random(20261017)
+_PERMUTATIONS = [(_rng.randrange(1, _MERSENNE_PRIME), _rng.randrange(0, _MERSENNE_PRIME)) for _ in range(NUM_PERM)]
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def normalize_segment(text: str) -> str:
+    """공백 차이를 무시하도록 정규화 (연속 공백 → 한 칸, 앞뒤 공백 제거)"""
+    return " ".join(text.split())
+
+
+def segment_hash(text: str) -> str:
+    """정규화한 원문의 SHA-256"""
+    return hashlib.sha256(normalize_segment(text).encode('utf-8')).hexdigest()
+
+
+def _shingles(text: str) -> set:
+    words = _WORD_RE.findall(text.lower())
+    if len(words) < SHINGLE_SIZE:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1)}
+
+
+def minhash_signature(text: str) -> List[int]:
+    """단어 3-gram 집합의 MinHash 서명 (NUM_PERM개 값)"""
+    hashes = [int.from_bytes(hashlib.blake2b(s.encode('utf-8'), digest_size=8).digest(), 'little')
+              for s in _shingles(text)]
+    if not hashes:
+        return [_MERSENNE_PRIME] * NUM_PERM
+    return [min((a * h + b) % _MERSENNE_PRIME for h in hashes) for a, b in _PERMUTATIONS]
+
+
+def _band_buckets(signature: List[int]) -> List[int]:
+    """밴드별 버킷 값 (SQLite INTEGER 범위)"""
+    buckets = []
+    for band in range(LSH_BANDS):
+        rows = signature[band * LSH_ROWS:(band + 1) * LSH_ROWS]
+        digest = hashlib.blake2b(repr(rows).encode('ascii'), digest_size=8).digest()
+        buckets.append(int.from_bytes(digest, 'little') >> 1)
+    return buckets
+
+
+def _similarity(a: List[int], b: List[int]) -> float:
+    """두 서명의 일치 비율 (자카드 유사도 추정치)"""
+    return sum(1 for x, y in zip(a, b) if x == y) / NUM_PERM
+
+
+class TranslationMemory:
+    """
+    번역 메모리 (SQLite 단일 파일, 스레드 안전)
+
+    - segments: 정규화 원문 해시 → 원문, 번역문, 모델, 당시 usage, 출처 문서, MinHash 서명
+    - bands: LSH 밴드 버킷 → 구간 (같은 버킷을 공유하는 구간만 유사도 계산)
+    - 적중/참조/미적중과 완전 일치로 절감된 토큰 집계 (요청 성공 시에만 세므로 재시도는 중복 집계되지 않음)
+    """
+
+    def __init__(self, cache_dir: str = ".cache", similarity: float = DEFAULT_SIMILARITY,
+                 max_references: int = DEFAULT_MAX_REFERENCES, document: Optional[str] = None):
+        """초기화 (document: 새로 저장하는 구간의 출처 문서 이름)"""
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.db_path = self.cache_dir / "translation_memory.sqlite3"
+        self.similarity = similarity
+        self.max_references = max_references
+        self.document = document
+        self.exact_hits = 0
+        self.fuzzy_hits = 0
+        self.misses = 0
+        self.saved_by_model: Dict[str, Dict[str, int]] = defaultdict(lambda: {"input_tokens": 0, "output_tokens": 0})
+        self._lock = threading.Lock()
+
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS segments (
+                id INTEGER PRIMARY KEY,
+                source_hash TEXT NOT NULL UNIQUE,
+                source TEXT NOT NULL,
+                target TEXT NOT NULL,
+                model TEXT NOT NULL,
+                input_tokens INTEGER NOT NULL,
+                output_tokens INTEGER NOT NULL,
+                document TEXT,
+                signature BLOB NOT NULL,
+                created REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS bands (
+                band INTEGER NOT NULL,
+                bucket INTEGER NOT NULL,
+                segment_id INTEGER NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_bands_bucket ON bands(band, bucket);
+        """)
+        self._conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM segments").fetchone()[0]
+
+    def lookup(self, source: str) -> Optional[Dict[str, Any]]:
+        """
+        같은 원문(공백 차이 무시)의 번역 조회
+
+        Returns:
+            {'text', 'model', 'input_tokens', 'output_tokens', 'document'} 또는 None
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT target, model, input_tokens, output_tokens, document FROM segments WHERE source_hash = ?",
+                (segment_hash(source),)
+            ).fetchone()
+        if row is None:
+            return None
+        text, model, input_tokens, output_tokens, document = row
+        return {'text': text, 'model': model, 'input_tokens': input_tokens,
+                'output_tokens': output_tokens, 'document': document}
+
+    def find_similar(self, source: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        비슷한 원문의 번역 (같은 원문 제외, 유사도 높은 순)
+
+        Returns:
+            [{'source', 'target', 'similarity', 'document'}] (최대 limit개, 기본 max_references)
+        """
+        limit = self.max_references if limit is None else limit
+        if limit <= 0:
+            return []
+        signature = minhash_signature(source)
+        own_hash = segment_hash(source)
+        with self._lock:
+            candidates = set()
+            for band, bucket in enumerate(_band_buckets(signature)):
+                for (segment_id,) in self._conn.execute(
+                        "SELECT segment_id FROM bands WHERE band = ? AND bucket = ?", (band, bucket)):
+                    candidates.add(segment_id)
+            scored = []
+            for segment_id in candidates:
+                row = self._conn.execute(
+                    "SELECT source_hash, source, target, document, signature FROM segments WHERE id = ?",
+                    (segment_id,)
+                ).fetchone()
+                if row is None or row[0] == own_hash:
+                    continue
+                score = _similarity(signature, array.array('Q', row[4]).tolist())
+                if score >= self.similarity:
+                    scored.append({'source': row[1], 'target': row[2], 'similarity': score, 'document': row[3]})
+        scored.sort(key=lambda match: match['similarity'], reverse=True)
+        return scored[:limit]
+
+    def add(self, source: str, target: str, model: str = "", input_tokens: int = 0, output_tokens: int = 0,
+            document: Optional[str] = None) -> None:
+        """번역 구간 저장 (같은 원문이 있으면 번역문 갱신, 빈 번역은 저장하지 않음)"""
+        if not source.strip() or not target:
+            return
+        key = segment_hash(source)
+        document = document or self.document
+        with self._lock:
+            existing = self._conn.execute("SELECT id FROM segments WHERE source_hash = ?", (key,)).fetchone()
+            if existing is not None:
+                self._conn.execute(
+                    "UPDATE segments SET target = ?, model = ?, input_tokens = ?, output_tokens = ?, document = ? "
+                    "WHERE id = ?",
+                    (target, model, int(input_tokens or 0), int(output_tokens or 0), document, existing[0])
+                )
+                self._conn.commit()
+                return
+        # 서명 계산은 락 밖에서 (구간당 수십 ms)
+        signature = minhash_signature(source)
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT OR IGNORE INTO segments (source_hash, source, target, model, input_tokens, output_tokens, "
+                "document, signature, created) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, source, target, model, int(input_tokens or 0), int(output_tokens or 0), document,
+                 array.array('Q', signature).tobytes(), time.time())
+            )
+            if cursor.rowcount:
+                self._conn.executemany(
+                    "INSERT INTO bands (band, bucket, segment_id) VALUES (?, ?, ?)",
+                    [(band, bucket, cursor.lastrowid) for band, bucket in enumerate(_band_buckets(signature))]
+                )
+            self._conn.commit()
+
+    def record_hit(self, entry: Dict[str, Any]) -> None:
+        """완전 일치로 API 호출을 건너뛴 청크 집계 (저장 당시 usage만큼 절감)"""
+        with self._lock:
+            self.exact_hits += 1
+            saved = self.saved_by_model[entry.get('model') or ""]
+            saved["input_tokens"] += int(entry.get('input_tokens') or 0)
+            saved["output_tokens"] += int(entry.get('output_tokens') or 0)
+
+    def record_request(self, referenced: bool) -> None:
+        """API로 번역한 청크 집계 (referenced: 유사 구간을 참고 번역으로 넣었는지)"""
+        with self._lock:
+            if referenced:
+                self.fuzzy_hits += 1
+            else:
+                self.misses += 1
+
+    def purge(self) -> int:
+        """번역 메모리 전체 삭제. 삭제된 구간 수 반환"""
+        with self._lock:
+            count = self._conn.execute("SELECT COUNT(*) FROM segments").fetchone()[0]
+            self._conn.execute("DELETE FROM segments")
+            self._conn.execute("DELETE FROM bands")
+            self._conn.commit()
+            self._conn.execute("VACUUM")
+        return count
+
+    def summary(self, pricing: Optional[Callable[[str], dict]] = None) -> Dict[str, Any]:
+        """
+        완전 일치/유사 참조/미적중과 절감 토큰 요약
+
+        pricing: 모델명 → {'input': $/MTok, 'output': $/MTok} (지정 시 saved_cost 포함)
+        """
+        with self._lock:
+            saved = {model: dict(agg) for model, agg in self.saved_by_model.items()}
+            total = self.exact_hits + self.fuzzy_hits + self.misses
+            result = {
+                'exact_hits': self.exact_hits,
+                'fuzzy_hits': self.fuzzy_hits,
+                'misses': self.misses,
+                'exact_rate': self.exact_hits / total if total else 0.0,
+                'fuzzy_rate': self.fuzzy_hits / total if total else 0.0,
+                'saved_input_tokens': sum(agg['input_tokens'] for agg in saved.values()),
+                'saved_output_tokens': sum(agg['output_tokens'] for agg in saved.values()),
+            }
+        if pricing is not None:
+            cost = 0.0
+            for model, agg in saved.items():
+                price = pricing(model)
+                cost += (agg['input_tokens'] / 1_000_000.0) * float(price.get('input', 0) or 0)
+                cost += (agg['output_tokens'] / 1_000_000.0) * float(price.get('output', 0) or 0)
+            result['saved_cost'] = cost
+        return result
+
+    def close(self) -> None:
+        """DB 연결 종료"""
+        with self._lock:
+            self._conn.close()
+
+
+_memory: Optional[TranslationMemory] = None
+
+
+def configure_translation_memory(memory: Optional[TranslationMemory]) -> None:
+    """프로세스 전역 번역 메모리 지정 (None이면 사용 안 함)"""
+    global _memory
+    _memory = memory
+
+
+def get_translation_memory() -> Optional[TranslationMemory]:
+    """프로세스 전역 번역 메모리 (configure_translation_memory로 지정하지 않았으면 None)"""
+    return _memory
+
+
+def open_translation_memory(disabled: bool = False, purge: bool = False,
+                            similarity: float = DEFAULT_SIMILARITY,
+                            document: Optional[str] = None) -> Optional[TranslationMemory]:
+    """
+    CLI 옵션에 따라 번역 메모리를 열고 전역 메모리로 지정
+
+    Returns:
+        TranslationMemory 또는 None (disabled). 사용 후 close()와 configure_translation_memory(None)
+    """
+    if disabled and not purge:
+        return None
+    memory = TranslationMemory(similarity=similarity, document=document)
+    if purge:
+        purged = memory.purge()
+        print(f"[TM] Purged {purged} translation memory segments")
+    if disabled:
+        memory.close()
+        return None
+    configure_translation_memory(memory)
+    return memory
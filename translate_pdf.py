@@ -7,11 +7,43 @@ Complete PDF Translation Pipeline with Claude API
 import sys
 import os
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 import json
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import asyncio
 from collections import defaultdict
+from functools import lru_cache
+
+from src.translation.chunker import iter_chunks as iter_text_chunks
+from src.translation.output_writer import OrderedOutputWriter, default_section, structured_section
+from src.translation.run_journal import TranslationJournal, source_hash
+from src.translation.page_furniture import PageFurnitureStripper
+from src.translation.section_tree import build_section_tree
+from src.translation.scheduler import chunk_cost, order_longest_first, format_schedule
+from src.translation.glossary_store import GlossaryStore, document_key
+from src.translation.term_miner import mine_terms, format_candidates
+from src.translation.term_matcher import GlossaryMatcher
+from src.translation.glossary_check import GlossaryChecker
+from src.translation.token_estimator import DEFAULT_OUTPUT_RATIO, heuristic_tokens
+from src.translation.dedup import deduplicate_paragraphs, missing_placeholders, PLACEHOLDER_RE
+from src.translation.translation_memory import (
+    open_translation_memory, configure_translation_memory, get_translation_memory
+)
+from src.llm.client_pool import get_client, configure_pool, create_async_client
+from src.llm.rate_limiter import get_limiter, estimate_tokens
+from src.llm.prompt_cache import cached_system, cache_usage, input_cost, min_cache_tokens
+from src.llm.pricing import get_model_pricing, usage_cost
+from src.llm.batch import run_batch, BATCH_PRICE_MULTIPLIER, DEFAULT_POLL_INTERVAL
+from src.llm.response_cache import open_response_cache, configure_response_cache, get_response_cache
+from src.llm.hedging import HedgePolicy, configure_hedging, get_hedger
+from src.llm.budget import (
+    BudgetExceeded, OutputReserveExceeded, budget_slot, configure_budget, get_budget, format_budget,
+    reserve_output, capped_params, check_output_reserve
+)
+from src.llm.retry import (
+    RetryPolicy, DEFAULT_RETRY_POLICY, call_with_retry, call_with_retry_async, run_requeued,
+    describe_error, print_failure_report
+)
 
 # Set encoding for Windows
 if sys.platform == 'win32':
@@ -32,28 +64,16 @@ def get_api_key() -> Optional[str]:
     return os.getenv('ANTHROPIC_API_KEY')
 
 
-# 모델별 가격(USD per 1M tokens). 필요 시 환경변수로 덮어쓰기 지원.
-# - 공식 가격: https://www.anthropic.com/pricing
-# - Claude Haiku 4.5: $1.00/M input, $5.00/M output (2025-01-01 기준)
-# - 환경변수로 덮어쓰기: CLAUDE_HAIKU_45_INPUT_MTOK, CLAUDE_HAIKU_45_OUTPUT_MTOK
-PRICING_USD_PER_MTOK = {
-    "claude-haiku-4-5-20251001": {
-        "input": float(os.getenv("CLAUDE_HAIKU_45_INPUT_MTOK", "1.00")),
-        "output": float(os.getenv("CLAUDE_HAIKU_45_OUTPUT_MTOK", "5.00")),
-    },
-    # 다른 모델 추가 가능
-    "claude-3-5-sonnet-20241022": {
-        "input": float(os.getenv("CLAUDE_SONNET_35_INPUT_MTOK", "3.00")),
-        "output": float(os.getenv("CLAUDE_SONNET_35_OUTPUT_MTOK", "15.00")),
-    },
-}
+# 청크 번역 모델
+TRANSLATION_MODEL = "claude-haiku-4-5-20251001"
+GLOSSARY_MODEL = "claude-haiku-4-5-20251001"
+TRANSLATION_MAX_TOKENS = 64000
+# 용어 후보가 이보다 적으면 (짧은 문서) 고정 샘플링으로 용어집 추출
+MIN_TERM_CANDIDATES = 10
 
-def _get_model_pricing(model_name: str) -> dict:
-    """모델별 가격 정보를 반환. 미등록 모델은 0으로 채워 반환."""
-    return PRICING_USD_PER_MTOK.get(model_name, {"input": 0.0, "output": 0.0})
 
-
-def extract_glossary(text: str, api_key: str, sample_size: int = 30000) -> dict:
+def extract_glossary(text: str, api_key: str, sample_size: int = 30000,
+                     store: Optional[GlossaryStore] = None, document: str = "") -> dict:
     """
     전체 텍스트에서 핵심 용어 추출 및 번역
     
@@ -61,14 +81,23 @@ def extract_glossary(text: str, api_key: str, sample_size: int = 30000) -> dict:
     이를 통해 어떤 분야의 문서가 와도 일관된 용어 번역을 보장합니다.
     
     전략:
-    - 텍스트 샘플링: 처음 15k + 중간 10k + 끝 5k chars
+    - 로컬 용어 후보 추출: 전체 텍스트를 C-value로 분석해 상위 후보 + 첫 등장 문맥만 전송
+      (src/translation/term_miner.py, 고정 샘플에 없는 장의 용어도 포함되고 프롬프트는 절반 이하)
+    - 후보가 거의 없는 짧은 텍스트: 처음 15k + 중간 10k + 끝 5k chars 샘플링
     - Haiku 모델 사용으로 비용 최소화 (~$0.01)
     - JSON 응답으로 파싱 간편화
+
+    용어집 저장소 (store 지정 시):
+    - 같은 샘플(같은 문서)의 추출 결과가 있으면 API를 호출하지 않음
+    - 새 추출 결과는 문서 해시로 저장하고 분야 누적 용어집에 합침
+    - 분야 누적 용어집과 수동 고정 용어를 병합해 반환 (GlossaryStore.resolve)
     
     Args:
         text: 전체 텍스트
         api_key: Anthropic API 키
         sample_size: 샘플링할 총 크기 (기본 30000)
+        store: GlossaryStore 인스턴스 (None이면 매번 추출)
+        document: 저장소에 기록할 문서 이름
     
     Returns:
         {
@@ -76,24 +105,43 @@ def extract_glossary(text: str, api_key: str, sample_size: int = 30000) -> dict:
             "key_terms": {"영문": "한글", ...}
         }
     """
+    candidates = mine_terms(text)
+    if len(candidates) >= MIN_TERM_CANDIDATES:
+        sample = format_candidates(candidates)
+        sample_title = "전체 문서에서 통계적으로 뽑은 용어 후보 (빈도, 첫 등장 문맥)"
+        pick_instruction = "후보 목록에서 번역을 통일해야 할 전문 용어·고유명사 20-30개를 고르세요 (일반 표현은 제외)"
+    else:
+        # 샘플링 전략: 처음, 중간, 끝에서 고르게
+        total_len = len(text)
+        sample = (
+            text[:15000] +  # 처음 (도입부, 주요 개념)
+            text[total_len//2:total_len//2+10000] +  # 중간 (핵심 내용)
+            text[-5000:]  # 끝 (결론, 요약)
+        )
+        sample_title = "분석 대상 텍스트 샘플"
+        pick_instruction = "자주 등장하거나 중요한 전문 용어 20-30개를 추출하세요"
+
+    key = None
+    if store is not None:
+        key = document_key(sample, GLOSSARY_MODEL)
+        cached = store.get_document(key)
+        if cached is not None:
+            print(f"[CACHE] Glossary loaded from glossary store (no API call)", flush=True)
+            return store.resolve(cached, text)
+
     print(f"[ANALYZING] Extracting key terms from document...", flush=True)
-    
-    # 샘플링 전략: 처음, 중간, 끝에서 고르게
-    total_len = len(text)
-    sample = (
-        text[:15000] +  # 처음 (도입부, 주요 개념)
-        text[total_len//2:total_len//2+10000] +  # 중간 (핵심 내용)
-        text[-5000:]  # 끝 (결론, 요약)
-    )
+    if len(candidates) >= MIN_TERM_CANDIDATES:
+        print(f"[ANALYZING] {len(candidates)} term candidates mined from {len(text):,} chars "
+              f"→ {len(sample):,} char prompt sample", flush=True)
     
     prompt = f"""이 문서를 분석하여 핵심 전문 용어를 추출하세요.
 
-【분석 대상 텍스트 샘플】
+【{sample_title}】
 {sample}
 
 【작업】
 1. 문서의 분야/주제를 파악하세요 (예: startup, medicine, law, technology, finance 등)
-2. 자주 등장하거나 중요한 전문 용어 20-30개를 추출하세요
+2. {pick_instruction}
 3. 각 용어의 적절한 한국어 번역을 제시하세요
 
 【번역 원칙】
@@ -118,14 +166,22 @@ JSON만 출력하세요 (설명 없이):
 }}"""
 
     try:
-        from anthropic import Anthropic
-        client = Anthropic(api_key=api_key)
+        client = get_client(api_key)
         
-        response = client.messages.create(
-            model="claude-haiku-4-5-20251001",  # 저렴한 모델
-            max_tokens=2000,
-            messages=[{"role": "user", "content": prompt}]
-        )
+        def request():
+            with budget_slot(GLOSSARY_MODEL, estimate_tokens(prompt), 2000) as slot:
+                def create():
+                    slot.mark_sent()
+                    return client.messages.with_raw_response.create(
+                        model=GLOSSARY_MODEL,  # 저렴한 모델
+                        max_tokens=2000,
+                        messages=[{"role": "user", "content": prompt}]
+                    )
+                response = get_limiter(api_key).call(create, estimate_tokens(prompt), 2000)
+                _record_budget(slot, response)
+            return response
+
+        response = call_with_retry(request, label="Glossary")
         
         # JSON 파싱
         result_text = response.content[0].text
@@ -139,66 +195,214 @@ JSON만 출력하세요 (설명 없이):
         glossary = json.loads(result_text.strip())
         
         print(f"[OK] Glossary extracted successfully", flush=True)
-        return glossary
         
     except Exception as e:
         print(f"[WARNING] Glossary extraction failed: {e}", flush=True)
         print(f"[INFO] Proceeding without custom glossary", flush=True)
-        return {"domain": "unknown", "key_terms": {}}
+        glossary = {"domain": "unknown", "key_terms": {}}
+        key = None  # 실패 결과는 저장하지 않음 (고정 용어만 적용)
+
+    if store is None:
+        return glossary
+    if key is not None:
+        store.put_document(key, glossary, document, GLOSSARY_MODEL)
+    return store.resolve(glossary, text)
+
+
+def iter_pdf_pages(pdf_path, workers: int = 1, cache=None, info: Optional[dict] = None,
+                   layout: Optional[dict] = None) -> Iterator[Tuple[int, str]]:
+    """
+    PDF 페이지를 추출되는 대로 페이지 순서에 맞춰 yield하는 제너레이터
+
+    extract_pdf()와 스트리밍 파이프라인이 공유하는 추출 엔진입니다.
+    - 캐시 적중 페이지는 즉시, 나머지는 추출 완료 시 순서대로 반환
+    - 병렬 모드에서는 먼저 끝난 구간을 재정렬 버퍼에 보관했다가 순서대로 방출
+    - 추출이 끝나면 처리량(pages/sec) 요약 출력
+
+    Args:
+        pdf_path: PDF 파일 경로
+        workers: 추출 프로세스 수 (1 = 순차, 0 = CPU 코어 수)
+        cache: PageCache 인스턴스 (None이면 캐시 미사용)
+        info: 전달 시 {'metadata': ..., 'total_pages': int}를 채워 넣음
+              (pdfplumber 미설치 시 {'error': ...})
+        layout: 전달 시 {페이지_인덱스: 줄별 글꼴 크기}를 채워 넣음 (장/절 구조 인식용)
+
+    Yields:
+        (페이지_인덱스, 페이지_텍스트) - 빈 페이지는 ""
+    """
+    info = info if info is not None else {}
+    layout = layout if layout is not None else {}
+
+    try:
+        import pdfplumber
+    except ImportError:
+        print("[ERROR] pdfplumber not installed: pip install pdfplumber")
+        info['error'] = "pdfplumber not installed"
+        return
+
+    from src.translation.pdf_extractor import iter_pages_parallel, format_throughput, extract_page
+
+    if workers == 0:
+        workers = os.cpu_count() or 1
+
+    start_time = time.time()
+
+    def print_info(total_pages, metadata):
+        print(f"[PDF Info]")
+        print(f"  Pages: {total_pages}")
+        if metadata:
+            print(f"  Title: {metadata.get('Title', 'N/A')}")
+        print()
 
+    # 캐시 조회
+    pdf_sha = None
+    doc_info = None
+    cached = {}
+    if cache is not None:
+        from src.translation.page_cache import file_sha256
+        pdf_sha = file_sha256(pdf_path)
+        doc_info = cache.get_document(pdf_sha)
+        if doc_info:
+            cached = cache.get_pages(pdf_sha, range(doc_info['total_pages']))
+
+    if doc_info and len(cached) == doc_info['total_pages']:
+        info['metadata'] = doc_info['metadata']
+        info['total_pages'] = doc_info['total_pages']
+        print_info(info['total_pages'], info['metadata'])
+        print(f"[CACHE] All {info['total_pages']} pages loaded from extraction cache")
+        for i in range(info['total_pages']):
+            text, layout[i] = cached[i]
+            yield i, text
+        print(f"[OK] Loaded {len(cached)} pages from cache in {time.time() - start_time:.2f}s")
+        print()
+        return
+
+    with pdfplumber.open(pdf_path) as pdf:
+        metadata = pdf.metadata
+        total_pages = len(pdf.pages)
+        info['metadata'] = metadata
+        info['total_pages'] = total_pages
+        missing = [i for i in range(total_pages) if i not in cached]
+
+        print_info(total_pages, metadata)
+        if cached:
+            print(f"[CACHE] {len(cached)}/{total_pages} pages cached, extracting {len(missing)}")
+        print(f"[EXTRACTING] Processing {len(missing)} pages...")
+        print()
+
+        if cache is not None:
+            cache.put_document(pdf_sha, total_pages, metadata)
+
+        if workers > 1 and len(missing) > 1:
+            batches = None
+        else:
+            workers = 1
+            batches = (
+                {i: extract_page(pdf.pages[i])}
+                for i in missing
+            )
+
+        if batches is None:
+            print(f"[PARALLEL] Using {workers} extraction processes", flush=True)
+            batches = iter_pages_parallel(pdf_path, missing, workers=workers)
+
+        # 재정렬 버퍼: 캐시 적중 페이지 + 순서보다 먼저 끝난 페이지
+        buffer = dict(cached)
+        next_index = 0
+        extracted = 0
+
+        for batch in batches:
+            if cache is not None:
+                cache.put_pages(pdf_sha, batch)
+            buffer.update(batch)
+
+            # 진행 상황 표시 (순차: 매 5페이지마다, 병렬: 구간 완료마다)
+            extracted += len(batch)
+            if workers > 1 or extracted % 5 == 0 or extracted == len(missing):
+                progress = (extracted / len(missing)) * 100
+                print(f"  [{extracted:3d}/{len(missing)}] {progress:5.1f}% complete", flush=True)
+
+            while next_index in buffer:
+                text, layout[next_index] = buffer.pop(next_index)
+                yield next_index, text
+                next_index += 1
+
+        # 추출할 페이지가 없었던 경우 (캐시 적중분만 남음)
+        while next_index in buffer:
+            text, layout[next_index] = buffer.pop(next_index)
+            yield next_index, text
+            next_index += 1
+
+    print()
+    summary = format_throughput(extracted, time.time() - start_time, workers)
+    if cached:
+        summary += f", {len(cached)} from cache"
+    print(f"[OK] Extracted {summary}")
+    print()
 
-def extract_pdf(pdf_path):
+
+def extract_pdf(pdf_path, workers: int = 1, cache=None, stripper=None, layout: Optional[dict] = None):
     """
     Extract text from PDF with progress tracking
 
     이 함수는 PDF 파일에서 텍스트를 추출합니다:
     1. PDF 메타데이터 수집 (페이지 수, 제목 등)
-    2. 각 페이지별 텍스트 추출
+    2. 각 페이지별 텍스트 추출 (workers > 1이면 프로세스 풀 병렬 추출)
     3. 진행률 표시 (매 5페이지마다)
-    4. 전체 텍스트와 메타데이터 반환
+    4. 전체 텍스트와 메타데이터 반환 (페이지 텍스트는 마지막에 한 번만 결합)
+
+    병렬 모드:
+    - 페이지 범위를 워커 수의 4배 구간으로 나눠 각 프로세스가 PDF를 독립적으로 엶
+    - 완료 순서와 무관하게 원래 페이지 순서 보장
+    - 추출 처리량(pages/sec) 출력으로 순차 대비 개선 확인
+
+    추출 캐시 (cache 지정 시):
+    - (PDF SHA-256, 페이지 번호, 추출기 버전) 키로 페이지 텍스트 조회
+    - 캐시에 없는 페이지만 추출 후 저장 → 반복 실행 시 거의 즉시 완료
+    - 모든 페이지가 캐시에 있으면 PDF를 열지 않음
+
+    머리글/꼬리말 제거 (stripper 지정 시):
+    - 결합 전에 주변 페이지와 같은 위치에 반복되는 가장자리 줄(머리글, 쪽 번호)을 제거
+    - 반환되는 페이지 목록은 원본 그대로, 전체 텍스트만 제거 후 결합
+    - 페이지별 제거 줄 수는 stripper.edges에 남음 (장/절 구조 인식에서 같은 줄 제외)
 
     Args:
         pdf_path: PDF 파일 경로
+        workers: 추출 프로세스 수 (기본 1 = 순차, 0 = CPU 코어 수)
+        cache: PageCache 인스턴스 (None이면 캐시 미사용)
+        stripper: PageFurnitureStripper 인스턴스 (None이면 추출 텍스트 그대로 결합)
+        layout: 전달 시 {페이지_인덱스: 줄별 글꼴 크기}를 채워 넣음 (build_section_tree 입력)
 
     Returns:
         tuple: (전체_텍스트, 메타데이터, 페이지_목록) 또는 추출 실패 시 (None, None, None)
     """
-    try:
-        import pdfplumber
+    info = {}
+    pages = [page_text for _, page_text in iter_pdf_pages(pdf_path, workers, cache, info, layout)]
+    if 'error' in info:
+        return None, None, None
 
-        with pdfplumber.open(pdf_path) as pdf:
-            text = ""
-            metadata = pdf.metadata
-            pages = []
+    page_texts = stripper.strip(pages) if stripper is not None else pages
+    text = "".join(page_text + "\n" for page_text in page_texts if page_text)
+    return text, info['metadata'], pages
 
-            print(f"[PDF Info]")
-            print(f"  Pages: {len(pdf.pages)}")
-            if metadata:
-                print(f"  Title: {metadata.get('Title', 'N/A')}")
-            print()
-            print(f"[EXTRACTING] Processing {len(pdf.pages)} pages...")
-            print()
 
-            for i, page in enumerate(pdf.pages, 1):
-                page_text = page.extract_text()
-                if page_text:
-                    text += page_text + "\n"
-                pages.append(page_text if page_text else "")
-                
-                # 진행 상황 표시 (매 5페이지마다)
-                if i % 5 == 0 or i == len(pdf.pages):
-                    progress = (i / len(pdf.pages)) * 100
-                    print(f"  [{i:3d}/{len(pdf.pages)}] {progress:5.1f}% complete", flush=True)
-            
-            print()
-            return text, metadata, pages
+def iter_chunks(
+    fragments: Iterable[str],
+    chunk_size: int = 5000,
+    overlap_sentences: int = 2,
+    measure=None
+) -> Iterator[dict]:
+    """
+    텍스트 조각(페이지 등) 스트림을 받아 청크가 완성되는 즉시 yield (chunk_text의 증분 버전)
 
-    except ImportError:
-        print("[ERROR] pdfplumber not installed: pip install pdfplumber")
-        return None, None, None
+    Yields:
+        dict: {'text': 청크_내용, 'overlap': 이전_컨텍스트, 'start': int, 'end': int}
+    """
+    for chunk in iter_text_chunks(fragments, chunk_size, overlap_sentences, measure):
+        yield chunk.to_dict()
 
 
-def chunk_text(text, chunk_size=5000, overlap_sentences=2):
+def chunk_text(text, chunk_size=5000, overlap_sentences=2, measure=None):
     """
     스마트 청킹: 문장 경계를 감지하여 의미 단위 기반 분할
 
@@ -216,189 +420,149 @@ def chunk_text(text, chunk_size=5000, overlap_sentences=2):
     3. 컨텍스트 오버랩 (2문장):
        - 이전 청크의 마지막 N개 문장을 새 청크 시작에 포함
        - 번역 일관성 보장 및 청크 경계 부드럽게 처리
-       - 각 청크는 {'text': '...', 'overlap': '...'} 형식으로 반환
+       - 각 청크는 {'text': '...', 'overlap': '...', 'start': int, 'end': int} 형식으로 반환
+       - start/end: 원문 기준 청크 구간 오프셋 (text == 원문[start:end]의 문장들)
+
+    4. 선형 시간 증분 처리 (src/translation/chunker.py):
+       - 정규식 finditer로 문장을 하나씩 처리 (전체 문장 리스트를 만들지 않음)
+       - 청크 크기는 누적 카운터로 유지
+       - 스트리밍 파이프라인은 같은 청커(iter_chunks)를 페이지 스트림에 직접 연결
+
+    5. 토큰 예산 모드 (measure 지정 시):
+       - 문자 수 대신 measure(문장)으로 크기를 재고 chunk_size를 토큰 한도로 해석
+       - TokenEstimator.estimate + source_budget()과 함께 사용 (--token-budget)
 
     성능:
     - 11개 청크 생성 (50,898자 문서): <1초
     - 오버랩으로 인한 크기 증가: ~5-10%
+    - 벤치마크: python benchmarks/bench_chunker.py
 
     Args:
         text (str): 분할할 텍스트
         chunk_size (int): 각 청크의 목표 크기 (기본 5000자)
         overlap_sentences (int): 청크 간 오버랩 문장 수 (기본 2)
+        measure (Optional[Callable]): 문장 크기 측정 함수 (기본 len = 문자 수)
 
     Returns:
-        List[dict]: {'text': 청크_내용, 'overlap': 이전_컨텍스트} 형식의 청크 리스트
+        List[dict]: {'text': 청크_내용, 'overlap': 이전_컨텍스트, 'start': int, 'end': int} 형식의 청크 리스트
     """
     print(f"[CHUNKING] Smart chunking with sentence boundaries...", flush=True)
-    
-    import re
-    
-    # 문장 분리 (개선된 정규식 - 약어, URL 등 고려)
-    sentence_pattern = r'(?<!\w\.\w.)(?<![A-Z][a-z]\.)(?<=\.|\?|\!)\s+'
-    sentences = re.split(sentence_pattern, text)
-    
-    chunks = []
-    current_chunk = []
-    current_size = 0
-    overlap_buffer = []  # 오버랩을 위한 최근 문장 저장
-    
-    for sentence in sentences:
-        sentence = sentence.strip()
-        if not sentence:
-            continue
-            
-        sentence_size = len(sentence)
-        
-        # 청크 크기 초과 시 새 청크 시작
-        if current_size + sentence_size > chunk_size and current_chunk:
-            # 현재 청크 저장
-            chunk_text = " ".join(current_chunk)
-            chunks.append({
-                'text': chunk_text,
-                'overlap': " ".join(overlap_buffer) if overlap_buffer else None
-            })
-            
-            # 오버랩을 위해 마지막 N개 문장 저장
-            overlap_buffer = current_chunk[-overlap_sentences:] if len(current_chunk) >= overlap_sentences else current_chunk[:]
-            
-            # 새 청크 시작 (오버랩 문장으로 시작)
-            current_chunk = overlap_buffer[:] + [sentence]
-            current_size = sum(len(s) for s in current_chunk)
-        else:
-            current_chunk.append(sentence)
-            current_size += sentence_size
-    
-    # 마지막 청크
-    if current_chunk:
-        chunk_text = " ".join(current_chunk)
-        chunks.append({
-            'text': chunk_text,
-            'overlap': " ".join(overlap_buffer) if overlap_buffer and len(chunks) > 0 else None
-        })
-    
+
+    chunks = list(iter_chunks([text], chunk_size, overlap_sentences, measure))
+
     print(f"[OK] Created {len(chunks)} chunks with context overlap", flush=True)
     return chunks
 
 
-def translate_with_claude(
-    text: str,
-    source_lang: str = "English",
-    target_lang: str = "Korean",
-    api_key: Optional[str] = None,
-    chunk_num: int = 0,
-    total_chunks: int = 0,
-    context: Optional[str] = None,
-    glossary: Optional[dict] = None
-) -> Optional[dict]:
+def chunk_sections(texts: List[str], chunk_size=5000, overlap_sentences=2, measure=None) -> List[dict]:
     """
-    전문 번역가 수준의 프롬프트를 사용한 Claude API 기반 번역
+    장/절 단위 청킹: 섹션(build_section_tree의 장/절 본문)마다 청커를 새로 시작
 
-    이 함수는 20년 경력의 출판 번역가 페르소나를 활용하여 고품질 번역을 수행합니다:
+    - 청크가 장/절 경계를 넘지 않고, 섹션 첫 청크는 앞 섹션의 overlap 없이 시작
+      → 한 장의 내용이나 추출 설정이 바뀌어도 다른 장 청크의 원문·맥락은 그대로
+        (응답 캐시·번역 메모리·실행 저널 키가 유지되어 바뀐 장만 다시 번역)
+    - 청크마다 'section' (섹션 번호, 1부터) 추가
+    - start/end는 섹션 본문을 순서대로 이어 붙인 텍스트 기준 오프셋
 
-    1. 전문 번역가 프롬프트 구조:
-       - 페르소나: 20년 경력 출판 번역가 (비즈니스/스타트업 분야 베스트셀러 다수)
-       - 톤: 정중하고 친근한 존댓말 (경어체)
-       - 대상 독자: 스타트업/비즈니스에 관심 있는 지적 독자층
+    Args:
+        texts (List[str]): 섹션 본문 (문서 순서)
+        chunk_size, overlap_sentences, measure: chunk_text()와 동일
 
-    2. 5가지 번역 철학:
-       a) 의미의 충실성 > 직역
-          - 원문의 핵심 메시지와 뉘앙스 완벽 전달
-          - 단어 하나하나보다 문장 전체 의도 파악
-          - 영어 구조를 그대로 따르지 말고 한국어로 다시 생각
+    Returns:
+        List[dict]: {'text', 'overlap', 'start', 'end', 'section'} 형식의 청크 리스트
+    """
+    print(f"[CHUNKING] Section-aware chunking ({len(texts)} sections, sentence boundaries)...", flush=True)
 
-       b) 자연스러운 한국어 (번역체 제거)
-          - "~되어지다", "~에 의해", "것이다" 등 금지
-          - 능동태 우선, 수동태는 필요한 경우에만
+    chunks = []
+    base = 0
+    for number, section_text in enumerate(texts, 1):
+        for chunk in iter_chunks([section_text], chunk_size, overlap_sentences, measure):
+            chunk['start'] += base
+            chunk['end'] += base
+            chunk['section'] = number
+            chunks.append(chunk)
+        base += len(section_text)
+
+    print(f"[OK] Created {len(chunks)} chunks within {len(texts)} sections (no chunk crosses a section boundary)",
+          flush=True)
+    return chunks
 
-       c) 읽기 쉬운 문장
-          - 한 문장에 하나의 핵심 아이디어
-          - 긴 문장은 2-3개로 분리
-          - 불필요한 수식어 제거
 
-       d) 맥락과 흐름
-          - 문장 간 자연스러운 연결
-          - 앞뒤 문맥을 고려한 번역
-          - 단락의 전체 흐름 유지
+def chunk_headings(chunks: List[dict], section_titles: List[List[Tuple[int, str]]]) -> dict:
+    """
+    청크 번호(1부터) → 그 청크에서 시작하는 장/절 제목 [(수준, 제목)]
 
-       e) 톤과 뉘앙스 보존
-          - 저자의 개인적 이야기는 따뜻함
-          - 통계/데이터는 객관적임
-          - 조언/교훈은 직설적이면서 실용적
+    본문이 비어 청크가 없는 섹션의 제목은 다음 청크 앞에 함께 붙입니다.
+    """
+    headings = {}
+    next_section = 1
+    for i, chunk in enumerate(chunks, 1):
+        section = chunk.get('section')
+        if section is None or section < next_section:
+            continue
+        headings[i] = [heading for number in range(next_section, section + 1)
+                       for heading in section_titles[number - 1]]
+        next_section = section + 1
+    return headings
 
-    3. 컨텍스트 인식 번역:
-       - 이전 청크의 마지막 문장들을 참고정보로 제공
-       - 번역 일관성 보장 (용어, 톤, 구조)
-       - 청크 경계의 어색함 제거
 
-    4. 30개 핵심 용어 사전 내장:
-       - startup → 스타트업
-       - founder → 창업자
-       - venture capital → 벤처캐피탈 (VC 허용)
-       - ... 등 30개 비즈니스 용어
+def build_translation_system(glossary: Optional[dict] = None) -> str:
+    """
+    청크 번역의 정적 시스템 프롬프트 (페르소나, 번역 철학, 스타일 가이드, 용어집, 예시, 체크리스트)
 
-    5. 최종 체크리스트:
-       - 자연스러운 발음
-       - 번역체 표현 제거
-       - 한국 독자의 이해 용이성
-       - 전문성과 가독성 균형
-       - 원문의 톤과 뉘앙스 보존
+    문서 안에서는 모든 청크가 같은 문자열을 쓰므로 API 프롬프트 캐시의 프리픽스로 사용됩니다.
+    청크마다 달라지는 부분(이전 맥락, 이 청크에 나오는 용어, 원문)은 build_translation_input() 참조.
+    용어집 전체를 넣어야 프리픽스가 번역 모델의 최소 캐시 길이를 넘으면 전체 용어 목록을 여기에 넣습니다
+    (prefix_glossary_listing). 그보다 짧으면 용어 목록은 청크별 입력에 해당 청크에 나오는 것만 넣습니다.
+    """
+    domain = None
+    listing = None
+    if glossary and glossary.get("key_terms"):
+        domain = glossary.get("domain", "unknown")
+        listing = prefix_glossary_listing(glossary)
+    return _render_translation_system(domain, listing)
 
-    성능:
-    - 청크당 소요시간: 4-6초 (병렬 처리 시)
-    - 모델: claude-haiku-4-5-20251001
-    - 최대 토큰: 64,000
 
-    Args:
-        text (str): 번역할 텍스트
-        source_lang (str): 원문 언어 (기본 "English")
-        target_lang (str): 목표 언어 (기본 "Korean")
-        api_key (Optional[str]): Anthropic API 키
-        chunk_num (int): 현재 청크 번호 (진행률 표시용)
-        total_chunks (int): 전체 청크 수 (진행률 표시용)
-        context (Optional[str]): 이전 청크의 오버랩 텍스트 (컨텍스트 인식용)
+def _render_translation_system(domain: Optional[str], listing: Optional[str]) -> str:
+    """
+    시스템 프롬프트 본문
 
-    Returns:
-        Optional[dict]: {
-            'text': 번역문,
-            'usage': {'input_tokens': int, 'output_tokens': int, 'total_tokens': int},
-            'model': str
-        } 또는 실패 시 None
+    domain: 용어집 분야 (None이면 용어집 섹션 생략)
+    listing: 프리픽스에 넣을 전체 용어 목록 (None이면 청크별 입력의 용어를 따르라는 안내만)
     """
-    if not api_key:
-        return None
+    glossary_section = ""
+    if domain is not None and listing is not None:
+        glossary_section = f"""
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+【이 문서의 핵심 용어집 - 반드시 준수!】
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
-    try:
-        from anthropic import Anthropic
+문서 분야: {domain}
 
-        client = Anthropic(api_key=api_key)
-        model_name = "claude-haiku-4-5-20251001"
+아래 용어가 원문에 나오면 제시된 번역을 그대로 사용하세요 (절대 변경하지 마세요):
+{listing}
+⚠️ 용어집 용어들은 이 문서 전체에서 일관되게 사용해야 합니다!
+⚠️ 같은 용어를 다르게 번역하지 마세요!
 
-        # 용어집 섹션 생성
-        glossary_section = ""
-        if glossary and glossary.get("key_terms"):
-            terms = glossary["key_terms"]
-            domain = glossary.get("domain", "unknown")
-            glossary_section = f"""
+"""
+    elif domain is not None:
+        glossary_section = f"""
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 【이 문서의 핵심 용어집 - 반드시 준수!】
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
 문서 분야: {domain}
 
-필수 용어 번역 (절대 변경하지 마세요):
-"""
-            for eng, kor in list(terms.items())[:30]:  # 최대 30개
-                glossary_section += f"{eng} → {kor}\n"
-            
-            glossary_section += """
-⚠️ 위 용어들은 이 문서 전체에서 일관되게 사용해야 합니다!
+번역 요청마다 "📌 이 청크의 필수 용어"에 그 텍스트에 나오는 용어집 항목이 제공됩니다.
+해당 용어는 제시된 번역을 그대로 사용하세요 (절대 변경하지 마세요).
+
+⚠️ 용어집 용어들은 이 문서 전체에서 일관되게 사용해야 합니다!
 ⚠️ 같은 용어를 다르게 번역하지 마세요!
 
 """
-        
-        # 프로 번역가 수준의 프롬프트
-        prompt = f"""당신은 20년 경력의 전문 출판 번역가입니다. 다양한 분야의 베스트셀러를 다수 번역했으며, 독자들로부터 "원문보다 더 잘 읽힌다"는 평가를 받습니다.
+    
+    # 프로 번역가 수준의 프롬프트
+    return f"""당신은 20년 경력의 전문 출판 번역가입니다. 다양한 분야의 베스트셀러를 다수 번역했으며, 독자들로부터 "원문보다 더 잘 읽힌다"는 평가를 받습니다.
 
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 【번역 철학】
@@ -465,23 +629,6 @@ def translate_with_claude(
 ✅ 좋은 번역:
 "B2B 영업에서 성공하려면 관계 구축이 핵심입니다."
 
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-【번역할 텍스트】 (Chunk {chunk_num}/{total_chunks})
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-{"" if not context else f'''
-⚠️ 이전 맥락 (참고용 - 번역하지 마세요):
----
-{context}
----
-
-💡 위 내용은 이미 번역된 부분입니다. 흐름과 맥락을 이해하는 데만 사용하세요.
-
-'''}
-📝 이제 아래 텍스트를 번역하세요:
----
-{text}
----
-
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 【최종 체크리스트】
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
@@ -499,216 +646,638 @@ def translate_with_claude(
 
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
-번역문만 출력하세요. 설명이나 주석은 불필요합니다."""
+번역 요청마다 【번역할 텍스트】의 원문만 번역하세요. 번역문만 출력하고, 설명이나 주석은 붙이지 마세요."""
 
-        message = client.messages.create(
-            model=model_name,
-            max_tokens=64000,
-            messages=[{"role": "user", "content": prompt}]
-        )
 
-        result_text = message.content[0].text
-        # usage 안전 추출 (SDK 버전별 속성/딕트 차이 대응)
-        input_tokens = 0
-        output_tokens = 0
-        try:
-            usage_obj = getattr(message, "usage", None)
-            if usage_obj is not None:
-                # 객체 속성 스타일
-                if hasattr(usage_obj, "input_tokens"):
-                    input_tokens = int(getattr(usage_obj, "input_tokens") or 0)
-                if hasattr(usage_obj, "output_tokens"):
-                    output_tokens = int(getattr(usage_obj, "output_tokens") or 0)
-                # 딕셔너리 스타일
-                if isinstance(usage_obj, dict):
-                    input_tokens = int(usage_obj.get("input_tokens") or input_tokens or 0)
-                    output_tokens = int(usage_obj.get("output_tokens") or output_tokens or 0)
-        except Exception:
-            # usage 파싱 실패 시 0으로 처리
-            input_tokens = input_tokens or 0
-            output_tokens = output_tokens or 0
-
-        return {
-            "text": result_text,
-            "usage": {
-                "input_tokens": input_tokens,
-                "output_tokens": output_tokens,
-                "total_tokens": (input_tokens or 0) + (output_tokens or 0),
-            },
-            "model": model_name,
-        }
+def build_translation_input(
+    text: str,
+    context: Optional[str] = None,
+    references: Optional[List[dict]] = None,
+    terms: Optional[List[Tuple[str, str]]] = None,
+    missed_terms: Optional[List[Tuple[str, str]]] = None
+) -> str:
+    """
+    청크 번역의 요청별 입력 (이전 맥락, 번역 메모리 참고 번역, 이 청크의 용어, 원문)
 
-    except ImportError:
-        print("[ERROR] anthropic not installed: pip install anthropic")
-        return None
-    except Exception as e:
-        print(f"[ERROR] Translation failed: {e}")
-        return None
+    청크 번호는 넣지 않습니다. 응답 캐시 키가 요청 본문 전체의 해시이므로, 번호가 들어가면
+    한 장의 청크 수가 바뀔 때 뒤따르는 모든 청크의 캐시 키가 바뀝니다.
 
+    references: 번역 메모리의 유사 구간 [{'source', 'target', 'similarity'}]
+    terms: 이 청크에 나오는 용어집 항목 [(영문, 한글)] (chunk_glossary_terms)
+    missed_terms: 재번역 시 이전 번역에서 지정 번역이 빠졌던 용어 [(영문, 한글)] (enforce_glossary)
+    """
+    # 반복 문단 자리표시자(⟦DUP n⟧)는 번역 후 일괄 치환하므로 그대로 남아야 함
+    placeholder_note = ""
+    if PLACEHOLDER_RE.search(text):
+        placeholder_note = "\n⚠️ ⟦DUP 숫자⟧ 표시는 반복되는 문단의 자리입니다. 번역하지 말고 같은 위치에 그대로 두세요."
+
+    reference_section = ""
+    if references:
+        reference_section = "\n📚 번역 메모리 (비슷한 원문의 기존 번역 - 용어와 문체를 맞추는 데 참고하고, 원문이 다른 부분은 아래 원문대로 번역하세요):\n"
+        for ref in references:
+            reference_section += f"""--- 참고 원문 (유사도 {ref['similarity']:.0%}) ---
+{ref['source']}
+--- 참고 번역 ---
+{ref['target']}
+---
+"""
 
-def translate_chunks(
-    chunks: List[dict],
+    term_section = ""
+    if terms:
+        term_section = "\n📌 이 청크의 필수 용어 (용어집 - 절대 변경하지 마세요):\n"
+        term_section += "".join(f"{eng} → {kor}\n" for eng, kor in terms)
+    if missed_terms:
+        term_section += "\n🔁 재번역: 이전 번역에서 아래 용어의 지정 번역이 빠졌습니다. 이번에는 반드시 지정 번역을 쓰세요:\n"
+        term_section += "".join(f"{eng} → {kor}\n" for eng, kor in missed_terms)
+
+    return f"""━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+【번역할 텍스트】
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+{"" if not context else f'''
+⚠️ 이전 맥락 (참고용 - 번역하지 마세요):
+---
+{context}
+---
+
+💡 위 내용은 이미 번역된 부분입니다. 흐름과 맥락을 이해하는 데만 사용하세요.
+
+'''}{reference_section}{term_section}
+📝 이제 아래 텍스트를 번역하세요:{placeholder_note}
+---
+{text}
+---
+
+번역문만 출력하세요. 설명이나 주석은 불필요합니다."""
+
+
+def build_translation_prompt(
+    text: str,
     source_lang: str = "English",
     target_lang: str = "Korean",
-    api_key: Optional[str] = None,
-    max_workers: int = 20,
-    glossary: Optional[dict] = None
-) -> List[str]:
+    context: Optional[str] = None,
+    glossary: Optional[dict] = None,
+    references: Optional[List[dict]] = None
+) -> str:
     """
-    병렬 처리를 사용한 모든 청크의 효율적 번역
+    청크 번역 프롬프트 전체 (시스템 프롬프트 + 요청별 입력을 한 문자열로)
 
-    이 함수는 ThreadPoolExecutor를 사용하여 여러 청크를 동시에 번역합니다:
+    API 호출은 두 부분을 나누어 보냅니다 (_translation_params). 이 함수는 토큰 추정,
+    벤치마크 등 프롬프트 전체 길이가 필요한 곳에서 사용합니다.
+    프롬프트 구성과 번역 원칙은 translate_with_claude() 설명 참조.
+    """
+    return (build_translation_system(glossary) + "\n\n"
+            + build_translation_input(text, context, references,
+                                      chunk_glossary_terms(glossary, text)))
 
-    1. 병렬 처리 메커니즘:
-       - ThreadPoolExecutor(max_workers=5)로 5개 스레드 동시 실행
-       - as_completed()를 사용하여 완료된 작업부터 처리
-       - 순차 처리 대비 5-6배 성능 향상
 
-    2. 성능 최적화:
-       - 순차 처리 (기존): 11개 청크 × 24.9초 = 273.9초 (4.5분)
-       - 병렬 처리 (현재): 11개 청크 ÷ 5 workers = 45-50초 (1분)
-       - Speedup: 5-6배 향상
+def prefix_glossary_listing(glossary: Optional[dict]) -> Optional[str]:
+    """
+    시스템 프리픽스에 넣을 전체 용어 목록 (None이면 청크별 입력에 해당 용어만)
 
-    3. 실시간 진행률 표시:
-       - 각 청크 완료 시 즉시 진행 상황 출력
-       - 포맷: [완료/전체] Chunk N 완료 (크기, 소요시간)
-       - 남은 작업 수 표시
+    용어집 전체를 넣은 프리픽스가 번역 모델의 최소 캐시 길이(Haiku 4.5: 4,096 토큰)를 넘을 때만
+    전체 목록을 넣습니다. 그러면 청크마다 반복되는 용어가 캐시 읽기(기본 단가의 0.1배)로 처리되고,
+    짧은 용어집은 청크에 나오는 용어만 보내는 편이 더 저렴합니다.
+    """
+    if not glossary or not glossary.get("key_terms"):
+        return None
+    return _prefix_listing(tuple(glossary["key_terms"].items()), glossary.get("domain", "unknown"))
 
-    4. 에러 처리:
-       - 번역 실패 시 원본 텍스트 사용
-       - 부분 실패해도 전체 프로세스 계속 진행
 
-    5. 최종 통계:
-       - 총 소요시간, 청크당 평균시간
-       - 병렬도 (워커 개수)
-       - 적용된 가이드라인
+@lru_cache(maxsize=16)
+def _prefix_listing(entries: Tuple[Tuple[str, str], ...], domain: str) -> Optional[str]:
+    """용어집별 prefix_glossary_listing() 결과 (문서당 한 번 계산)"""
+    listing = "".join(f"{eng} → {kor}\n" for eng, kor in entries)
+    system = _render_translation_system(domain, listing)
+    return listing if heuristic_tokens(system) >= min_cache_tokens(TRANSLATION_MODEL) else None
 
-    워커 개수 권장사항:
-    - max_workers=3: 안정적 (API 레이트 한계 고려)
-    - max_workers=5: 빠른 처리 (기본값, 권장)
-    - max_workers>5: API 오류 위험 (권장하지 않음)
 
-    컨텍스트 인식:
-    - 각 청크는 이전 청크의 마지막 문장들과 함께 전달됨
-    - 번역 일관성 보장
-    - 청크 경계의 어색함 제거
+def chunk_glossary_terms(glossary: Optional[dict], text: str) -> List[Tuple[str, str]]:
+    """청크별 입력에 넣을 용어 (전체 용어 목록이 시스템 프리픽스에 있으면 없음)"""
+    if prefix_glossary_listing(glossary) is not None:
+        return []
+    return select_glossary_terms(glossary, text)
 
-    성능 지표 예시:
-    ```
-    [완료] 11개 청크 번역 완료!
-      • 소요시간: 47.3초
-      • 평균시간: 4.3초/청크
-      • 병렬도: 5개 워커
-      • 적용규칙: TRANSLATION_GUIDELINE.md
-    ```
 
-    Args:
-        chunks (List[dict]): chunk_text()에서 반환한 청크 리스트
-        source_lang (str): 원문 언어 (기본 "English")
-        target_lang (str): 목표 언어 (기본 "Korean")
-        api_key (Optional[str]): Anthropic API 키
-        max_workers (int): 동시 실행 워커 개수 (기본 5)
+@lru_cache(maxsize=16)
+def _system_cacheable(system: str) -> bool:
+    """시스템 프리픽스가 번역 모델의 최소 캐시 길이 이상인지 (짧으면 캐시 표시 생략)"""
+    return heuristic_tokens(system) >= min_cache_tokens(TRANSLATION_MODEL)
 
-    Returns:
-        List[str]: 번역된 청크들을 원래 순서대로 정렬한 리스트
+
+def describe_prefix_cache(glossary: Optional[dict]) -> str:
+    """번역 시스템 프리픽스의 프롬프트 캐시 사용 여부 (실행 시작 시 [CACHE] 줄)"""
+    system = build_translation_system(glossary)
+    tokens = heuristic_tokens(system)
+    minimum = min_cache_tokens(TRANSLATION_MODEL)
+    if tokens < minimum:
+        return (f"시스템 프리픽스 ≈{tokens:,.0f} tok < {TRANSLATION_MODEL} 최소 캐시 길이 {minimum:,} tok "
+                f"→ 번역 요청은 프롬프트 캐시를 사용하지 않음 (캐시 표시 생략)")
+    scope = ", 용어집 전체 포함" if prefix_glossary_listing(glossary) is not None else ""
+    return f"시스템 프리픽스 ≈{tokens:,.0f} tok{scope} → 두 번째 요청부터 프롬프트 캐시에서 읽음"
+
+
+def _print_prefix_cache(glossaries: Dict[str, Optional[dict]]) -> None:
+    """문서별 [CACHE] 줄 출력 (문서가 하나면 이름 생략)"""
+    multiple = len(glossaries) > 1
+    for name, glossary in glossaries.items():
+        print(f"[CACHE] {f'{name} ' if multiple else ''}{describe_prefix_cache(glossary)}")
+
+
+@lru_cache(maxsize=16)
+def _glossary_matcher(entries: Tuple[Tuple[str, str], ...]) -> GlossaryMatcher:
+    """용어집별 Aho-Corasick 매처 (문서당 한 번 생성)"""
+    return GlossaryMatcher(dict(entries))
+
+
+def select_glossary_terms(glossary: Optional[dict], text: str) -> List[Tuple[str, str]]:
     """
-    start_time = time.time()
-    
-    print(f"[TRANSLATING] {len(chunks)} chunks (with context-aware translation)...")
-    print(f"[PARALLEL] Using {max_workers} workers for faster processing")
-    print(f"[STATUS] Starting translation...\n")
+    청크에 나오는 용어집 항목만 선택 [(영문, 한글)]
 
-    # 결과를 인덱스와 함께 저장하기 위한 딕셔너리
-    results = {}
-    completed_count = 0
-    # 토큰 사용량 집계: 모델별 input/output/requests
-    usage_by_model = defaultdict(lambda: {"input_tokens": 0, "output_tokens": 0, "requests": 0})
+    용어집 전체로 만든 Aho-Corasick 오토마톤으로 청크를 한 번만 훑으므로
+    용어집이 커도 모든 용어가 적용되고, 프롬프트에는 해당 청크의 용어만 들어갑니다.
+    """
+    if not glossary or not glossary.get("key_terms"):
+        return []
+    return _glossary_matcher(tuple(glossary["key_terms"].items())).select(text)
 
-    def translate_chunk_wrapper(chunk_info):
-        """각 스레드에서 실행될 번역 함수"""
-        i, chunk_data = chunk_info
-        chunk_start = time.time()
-        
-        # chunk_data는 딕셔너리: {'text': '...', 'overlap': '...'}
-        chunk_text = chunk_data['text'] if isinstance(chunk_data, dict) else chunk_data
-        context = chunk_data.get('overlap') if isinstance(chunk_data, dict) else None
-        
-        translated = translate_with_claude(
-            chunk_text,
-            source_lang,
-            target_lang,
-            api_key,
-            chunk_num=i,
-            total_chunks=len(chunks),
-            context=context,
-            glossary=glossary
+
+def _prepare_translation(
+    text: str,
+    context: Optional[str],
+    glossary: Optional[dict],
+    missed_terms: Optional[List[Tuple[str, str]]] = None
+) -> tuple:
+    """
+    청크 번역 요청 준비 → (system, prompt, params, memory_hit, referenced)
+
+    번역 메모리에 같은 원문이 있으면 memory_hit에 저장된 번역(API 호출 불필요, 나머지는 None),
+    비슷한 원문이 있으면 그 번역을 prompt에 참고 번역으로 넣고 referenced=True
+    재번역(missed_terms 지정)은 용어가 어긋난 기존 번역을 다시 쓰지 않도록 완전 일치를 건너뜀
+    """
+    memory = get_translation_memory()
+    references = []
+    if memory is not None:
+        entry = memory.lookup(text) if not missed_terms else None
+        if entry is not None:
+            return None, None, None, entry, False
+        references = memory.find_similar(text)
+    system = build_translation_system(glossary)
+    prompt = build_translation_input(text, context, references,
+                                     chunk_glossary_terms(glossary, text), missed_terms)
+    return system, prompt, _translation_params(system, prompt), None, bool(references)
+
+
+def _memory_hit_result(entry: dict) -> dict:
+    """번역 메모리 완전 일치를 translate_with_claude() 반환 형식으로 변환 (절감 토큰 집계)"""
+    get_translation_memory().record_hit(entry)
+    return _cached_translation_result(entry)
+
+
+def _remember_translation(source: str, text: str, model_name: str, input_tokens: int, output_tokens: int,
+                          referenced: bool) -> None:
+    """번역 성공 시 번역 메모리에 저장하고 참조/미적중 집계"""
+    memory = get_translation_memory()
+    if memory is None:
+        return
+    memory.record_request(referenced)
+    memory.add(source, text, model_name, input_tokens, output_tokens)
+
+
+def _total_input(usage: dict) -> int:
+    """프롬프트 캐시 쓰기/읽기를 포함한 입력 토큰 합계"""
+    return (int(usage.get("input_tokens") or 0) + int(usage.get("cache_write_tokens") or 0)
+            + int(usage.get("cache_read_tokens") or 0))
+
+
+def _cache_translation(cache, params: dict, result: dict) -> None:
+    """번역 결과를 응답 캐시에 저장 (프롬프트 캐시 쓰기/읽기 토큰 포함 → 적중 시 절감 비용에 반영)"""
+    usage = result['usage']
+    cache.put(params, result['text'], usage['input_tokens'], usage['output_tokens'],
+              usage['cache_write_tokens'], usage['cache_read_tokens'])
+
+
+def _message_usage(message) -> Tuple[int, int]:
+    """응답 메시지의 (프롬프트 캐시 포함 입력 토큰, 출력 토큰) — 헤지에서 진 요청의 비용 집계용"""
+    usage = _translation_result(message, TRANSLATION_MODEL)['usage']
+    return _total_input(usage), usage['output_tokens']
+
+
+def _record_budget(slot, message) -> None:
+    """응답 usage(프롬프트 캐시 쓰기/읽기 포함)를 예산 슬롯에 기록"""
+    usage = _translation_result(message, TRANSLATION_MODEL)['usage']
+    slot.record(usage['input_tokens'], usage['output_tokens'], usage['cache_write_tokens'], usage['cache_read_tokens'])
+
+
+def _translation_params(system: str, prompt: str) -> dict:
+    """
+    청크 번역 요청 파라미터 (응답 캐시 키에도 그대로 사용)
+
+    정적 시스템 프롬프트에는 프롬프트 캐시 표시를 붙여 청크 사이에 재사용합니다
+    (번역 모델의 최소 캐시 길이보다 짧으면 표시 생략).
+    """
+    return {
+        "model": TRANSLATION_MODEL,
+        "max_tokens": TRANSLATION_MAX_TOKENS,
+        "system": cached_system(system, _system_cacheable(system)),
+        "messages": [{"role": "user", "content": prompt}],
+    }
+
+
+def _output_reserve(text: str, estimator=None) -> int:
+    """
+    청크 번역의 출력 토큰 예약량 (레이트 리미터·예산 예약, 예산이 있으면 요청의 max_tokens)
+
+    보정된 추정기의 예상 출력(추정기가 없으면 기본 출력 비율)에 여유 배율을 곱합니다.
+    """
+    if estimator is not None:
+        predicted = estimator.predict_output(text)
+    else:
+        predicted = int(DEFAULT_OUTPUT_RATIO * heuristic_tokens(text))
+    return reserve_output(predicted, TRANSLATION_MAX_TOKENS)
+
+
+def _cached_translation_result(cached: dict) -> dict:
+    """응답 캐시 적중 결과를 translate_with_claude() 반환 형식으로 변환 (이번 실행의 usage는 0)"""
+    return {
+        "text": cached["text"],
+        "usage": {"input_tokens": 0, "output_tokens": 0, "cache_write_tokens": 0, "cache_read_tokens": 0,
+                  "total_tokens": 0},
+        "model": cached["model"],
+        "cached": True,
+    }
+
+
+def _translation_result(message, model_name: str) -> dict:
+    """API 응답 메시지를 translate_with_claude() 반환 형식으로 변환"""
+    result_text = message.content[0].text
+    # usage 안전 추출 (SDK 버전별 속성/딕트 차이 대응)
+    input_tokens = 0
+    output_tokens = 0
+    try:
+        usage_obj = getattr(message, "usage", None)
+        if usage_obj is not None:
+            # 객체 속성 스타일
+            if hasattr(usage_obj, "input_tokens"):
+                input_tokens = int(getattr(usage_obj, "input_tokens") or 0)
+            if hasattr(usage_obj, "output_tokens"):
+                output_tokens = int(getattr(usage_obj, "output_tokens") or 0)
+            # 딕셔너리 스타일
+            if isinstance(usage_obj, dict):
+                input_tokens = int(usage_obj.get("input_tokens") or input_tokens or 0)
+                output_tokens = int(usage_obj.get("output_tokens") or output_tokens or 0)
+    except Exception:
+        # usage 파싱 실패 시 0으로 처리
+        input_tokens = input_tokens or 0
+        output_tokens = output_tokens or 0
+    # 프롬프트 캐시 쓰기/읽기 토큰 (input_tokens에는 포함되지 않음)
+    cache_write_tokens, cache_read_tokens = cache_usage(message)
+
+    return {
+        "text": result_text,
+        "usage": {
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "cache_write_tokens": cache_write_tokens,
+            "cache_read_tokens": cache_read_tokens,
+            "total_tokens": (input_tokens or 0) + (output_tokens or 0),
+        },
+        "model": model_name,
+    }
+
+
+def translate_with_claude(
+    text: str,
+    source_lang: str = "English",
+    target_lang: str = "Korean",
+    api_key: Optional[str] = None,
+    chunk_num: int = 0,
+    total_chunks: int = 0,
+    context: Optional[str] = None,
+    glossary: Optional[dict] = None,
+    retry_policy: Optional[RetryPolicy] = None
+) -> Optional[dict]:
+    """
+    전문 번역가 수준의 프롬프트를 사용한 Claude API 기반 번역
+
+    이 함수는 20년 경력의 출판 번역가 페르소나를 활용하여 고품질 번역을 수행합니다:
+
+    1. 전문 번역가 프롬프트 구조:
+       - 페르소나: 20년 경력 출판 번역가 (비즈니스/스타트업 분야 베스트셀러 다수)
+       - 톤: 정중하고 친근한 존댓말 (경어체)
+       - 대상 독자: 스타트업/비즈니스에 관심 있는 지적 독자층
+
+    2. 5가지 번역 철학:
+       a) 의미의 충실성 > 직역
+          - 원문의 핵심 메시지와 뉘앙스 완벽 전달
+          - 단어 하나하나보다 문장 전체 의도 파악
+          - 영어 구조를 그대로 따르지 말고 한국어로 다시 생각
+
+       b) 자연스러운 한국어 (번역체 제거)
+          - "~되어지다", "~에 의해", "것이다" 등 금지
+          - 능동태 우선, 수동태는 필요한 경우에만
+
+       c) 읽기 쉬운 문장
+          - 한 문장에 하나의 핵심 아이디어
+          - 긴 문장은 2-3개로 분리
+          - 불필요한 수식어 제거
+
+       d) 맥락과 흐름
+          - 문장 간 자연스러운 연결
+          - 앞뒤 문맥을 고려한 번역
+          - 단락의 전체 흐름 유지
+
+       e) 톤과 뉘앙스 보존
+          - 저자의 개인적 이야기는 따뜻함
+          - 통계/데이터는 객관적임
+          - 조언/교훈은 직설적이면서 실용적
+
+    3. 컨텍스트 인식 번역:
+       - 이전 청크의 마지막 문장들을 참고정보로 제공
+       - 번역 일관성 보장 (용어, 톤, 구조)
+       - 청크 경계의 어색함 제거
+
+    4. 청크별 용어집 적용:
+       - 문서 용어집(extract_glossary + 저장된 용어집/수동 지정) 전체로 만든 Aho-Corasick 오토마톤으로
+         청크를 한 번 훑어 그 청크에 나오는 용어만 요청 입력에 넣음 (select_glossary_terms)
+       - 용어집 크기와 관계없이 모든 용어가 적용되고, 프롬프트에는 해당 청크의 용어만 들어감
+       - 단, 용어집 전체를 넣은 시스템 프리픽스가 모델의 최소 캐시 길이(4,096 토큰)를 넘으면
+         전체 목록을 프리픽스에 넣고 캐시에서 읽음 (prefix_glossary_listing, 청크별 용어 생략)
+       - 예: founder → 창업자, venture capital → 벤처캐피탈
+
+    프롬프트 캐시:
+       - 시스템 프리픽스가 모델의 최소 캐시 길이보다 짧으면 캐시 표시를 붙이지 않음
+         (용어집이 작은 문서의 프리픽스는 약 1.3k 토큰이라 번역 요청은 캐시되지 않음, 실행 시작 시 [CACHE] 줄에 표시)
+
+    5. 최종 체크리스트:
+       - 자연스러운 발음
+       - 번역체 표현 제거
+       - 한국 독자의 이해 용이성
+       - 전문성과 가독성 균형
+       - 원문의 톤과 뉘앙스 보존
+
+    성능:
+    - 청크당 소요시간: 4-6초 (병렬 처리 시)
+    - 모델: claude-haiku-4-5-20251001
+    - 최대 토큰: 64,000
+
+    Args:
+        text (str): 번역할 텍스트
+        source_lang (str): 원문 언어 (기본 "English")
+        target_lang (str): 목표 언어 (기본 "Korean")
+        api_key (Optional[str]): Anthropic API 키
+        chunk_num (int): 현재 청크 번호 (진행률 표시용)
+        total_chunks (int): 전체 청크 수 (진행률 표시용)
+        context (Optional[str]): 이전 청크의 오버랩 텍스트 (컨텍스트 인식용)
+        glossary (Optional[dict]): 문서 용어집 {'domain', 'key_terms'} (청크에 나오는 용어만 프롬프트에 포함)
+        retry_policy (Optional[RetryPolicy]): 재시도 정책 (기본: 최대 5회, 지수 백오프 + 지터)
+
+    Returns:
+        Optional[dict]: {
+            'text': 번역문,
+            'usage': {'input_tokens': int, 'output_tokens': int, 'total_tokens': int},
+            'model': str
+        } 또는 실패 시 None
+    """
+    if not api_key:
+        return None
+
+    try:
+        return call_with_retry(
+            lambda: _request_translation(
+                text, source_lang, target_lang, api_key, chunk_num, total_chunks, context, glossary
+            ),
+            retry_policy,
+            label=f"Chunk {chunk_num}"
         )
-        
-        elapsed = time.time() - chunk_start
-        return (i, translated, elapsed)
 
-    # ThreadPoolExecutor로 병렬 처리
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        futures = {
-            executor.submit(translate_chunk_wrapper, (i, chunk)): i 
-            for i, chunk in enumerate(chunks, 1)
-        }
-        
-        # 완료된 작업부터 처리
-        for future in as_completed(futures):
-            i, translated, elapsed = future.result()
-            completed_count += 1
-            pending_count = len(futures) - completed_count
-            
-            # translated: None | str | dict
-            text_out = None
-            model_name = None
-            if isinstance(translated, dict):
-                text_out = translated.get("text")
-                usage = translated.get("usage") or {}
-                model_name = translated.get("model")
-                # 집계
-                if model_name:
-                    usage_by_model[model_name]["input_tokens"] += int(usage.get("input_tokens") or 0)
-                    usage_by_model[model_name]["output_tokens"] += int(usage.get("output_tokens") or 0)
-                    usage_by_model[model_name]["requests"] += 1
-            else:
-                text_out = translated
+    except ImportError:
+        print("[ERROR] anthropic not installed: pip install anthropic")
+        return None
+    except Exception as e:
+        print(f"[ERROR] Translation failed: {describe_error(e)}")
+        return None
 
-            if text_out:
-                results[i] = text_out
-                print(f"✓ [{completed_count:2d}/{len(chunks)}] Chunk {i:2d} 완료 ({len(text_out):5d} chars, {elapsed:5.1f}s) | 남은작업: {pending_count:2d}", flush=True)
-            else:
-                # 원본 텍스트 사용
-                original_text = chunks[i-1]['text'] if isinstance(chunks[i-1], dict) else chunks[i-1]
-                results[i] = original_text
-                print(f"✗ [{completed_count:2d}/{len(chunks)}] Chunk {i:2d} SKIP (원본 사용) | 남은작업: {pending_count:2d}", flush=True)
 
-    # 원래 순서대로 정렬
-    translated_chunks = [results[i] for i in range(1, len(chunks) + 1)]
+def _request_translation(
+    text: str,
+    source_lang: str,
+    target_lang: str,
+    api_key: str,
+    chunk_num: int = 0,
+    total_chunks: int = 0,
+    context: Optional[str] = None,
+    glossary: Optional[dict] = None,
+    missed_terms: Optional[List[Tuple[str, str]]] = None,
+    estimator=None
+) -> dict:
+    """
+    청크 번역 1회 시도 (재시도 없음, 실패 시 예외)
+
+    translate_with_claude()는 이 함수를 재시도로 감싸고,
+    translate_chunks()는 워커 풀의 재대기열로 재시도합니다.
+    헤지 정책(configure_hedging)이 있으면 p95 응답 시간을 넘긴 요청에 중복 요청을 보내 먼저 끝난 결과를 씁니다.
+    예산이 있으면 max_tokens를 출력 예약량으로 낮춰 보내고, 그 한도에서 잘린 응답은 OutputReserveExceeded로 실패합니다.
+    """
+    model_name = TRANSLATION_MODEL
+
+    system, prompt, params, memory_hit, referenced = _prepare_translation(text, context, glossary, missed_terms)
+    if memory_hit is not None:
+        return _memory_hit_result(memory_hit)
+
+    cache = get_response_cache()
+    cached = cache.get(params) if cache is not None else None
+    if cached is not None:
+        _remember_translation(text, cached['text'], cached['model'], _total_input(cached),
+                              cached['output_tokens'], referenced)
+        return _cached_translation_result(cached)
+
+    client = get_client(api_key)
+    limiter = get_limiter(api_key)
+    # 공유 레이트 리미터·예산에서 예상 토큰 예약 (출력은 보정된 예상 출력 × 여유 배율, 응답 후 실제 usage로 정산)
+    input_estimate = estimate_tokens(system) + estimate_tokens(prompt)
+    output_estimate = _output_reserve(text, estimator)
+    send_params = capped_params(params, output_estimate)
+
+    def send(call=None):
+        if call is not None:
+            # 예산 정산을 기다리는 동안 헤지 경쟁이 끝났으면 예약하지 않음
+            call.check()
+        with budget_slot(model_name, input_estimate, output_estimate) as slot:
+            # 최대 64k 출력 토큰을 한 번에 기다리지 않도록 스트리밍으로 받아 조립
+            def open_stream():
+                if call is not None:
+                    # 리미터에서 기다리는 동안 헤지 경쟁이 끝났으면 보내지 않음
+                    call.check()
+                # 보낸 뒤 실패·취소된 스트림은 입력과 이미 받은 출력으로 정산
+                slot.mark_sent()
+                return client.messages.stream(**send_params)
+
+            def on_text(text):
+                if call is not None:
+                    call.on_text(text)
+                slot.on_text(text)
+
+            message = limiter.call_stream(open_stream, input_estimate, output_estimate, on_text=on_text)
+            _record_budget(slot, message)
+        check_output_reserve(message, send_params)
+        return message
+
+    hedger = get_hedger()
+    if hedger is None:
+        message = send()
+    else:
+        message = hedger.call(send, output_estimate, input_estimate, model_name, _message_usage,
+                              can_hedge=limiter.has_capacity, label=f"Chunk {chunk_num:2d}")
+
+    result = _translation_result(message, model_name)
+    if cache is not None:
+        _cache_translation(cache, params, result)
+    _remember_translation(text, result['text'], model_name, _total_input(result['usage']),
+                          result['usage']['output_tokens'], referenced)
+    return result
 
-    elapsed = time.time() - start_time
+
+def _new_usage_table():
+    """모델별 input/output/프롬프트 캐시 쓰기·읽기/requests 집계 테이블"""
+    return defaultdict(lambda: {"input_tokens": 0, "output_tokens": 0,
+                                "cache_write_tokens": 0, "cache_read_tokens": 0, "requests": 0})
+
+
+def _record_translation(translated, usage_by_model, estimator, original_text: str, context: Optional[str]) -> Optional[str]:
+    """
+    번역 결과의 usage를 집계하고 (추정기 보정 포함) 번역문 반환
+
+    translated: None | str | translate_with_claude()의 dict
+    """
+    if not isinstance(translated, dict):
+        return translated
+    if translated.get("cached"):
+        # 응답 캐시 적중: API를 호출하지 않았으므로 사용량/추정기 보정에서 제외
+        return translated.get("text")
+
+    usage = translated.get("usage") or {}
+    model_name = translated.get("model")
+    if model_name:
+        usage_by_model[model_name]["input_tokens"] += int(usage.get("input_tokens") or 0)
+        usage_by_model[model_name]["output_tokens"] += int(usage.get("output_tokens") or 0)
+        usage_by_model[model_name]["cache_write_tokens"] += int(usage.get("cache_write_tokens") or 0)
+        usage_by_model[model_name]["cache_read_tokens"] += int(usage.get("cache_read_tokens") or 0)
+        usage_by_model[model_name]["requests"] += 1
+    if estimator is not None and model_name == estimator.model:
+        # 추정기는 프롬프트 전체 길이를 학습하므로 캐시된 프리픽스 토큰도 입력에 포함
+        estimator.observe(
+            original_text, context,
+            int(usage.get("input_tokens") or 0)
+            + int(usage.get("cache_write_tokens") or 0)
+            + int(usage.get("cache_read_tokens") or 0),
+            int(usage.get("output_tokens") or 0)
+        )
+    return translated.get("text")
+
+
+def _restore_journal_entry(entry: dict, usage_by_model) -> str:
+    """
+    저널에 기록된 이전 실행의 청크 결과 반환
+
+    비용 요약이 문서 전체를 포함하도록 기록된 usage를 집계에 더합니다 (추정기 보정에서는 제외).
+    """
+    usage = entry.get('usage') or {}
+    model_name = entry.get('model')
+    if model_name and any(usage.get(key) for key in ("input_tokens", "output_tokens")):
+        for key in ("input_tokens", "output_tokens", "cache_write_tokens", "cache_read_tokens"):
+            usage_by_model[model_name][key] += int(usage.get(key) or 0)
+        usage_by_model[model_name]["requests"] += 1
+    return entry['text']
+
+
+def _journal_translation(journal, index: int, original_text: str, context: Optional[str], translated, text_out: str) -> None:
+    """완료된 청크를 저널에 기록 (응답 캐시 적중은 usage 0으로 기록)"""
+    if journal is None or not text_out:
+        return
+    usage = translated.get('usage') if isinstance(translated, dict) else None
+    model_name = translated.get('model') if isinstance(translated, dict) else None
+    journal.record(index, source_hash(original_text, context), text_out, model_name, usage)
+
+
+def _add_usage(first: Optional[dict], second: Optional[dict]) -> dict:
+    """두 usage 딕셔너리의 토큰 합 (같은 청크의 번역 + 재번역을 저널에 한 번에 기록)"""
+    keys = ("input_tokens", "output_tokens", "cache_write_tokens", "cache_read_tokens", "total_tokens")
+    return {key: int((first or {}).get(key) or 0) + int((second or {}).get(key) or 0) for key in keys}
+
+
+def _print_translation_summary(count: int, elapsed: float, parallelism: str, usage_by_model, estimator=None, limiter=None,
+                               price_multiplier: float = 1.0, resumed: Optional[dict] = None,
+                               hedge_since: Optional[dict] = None) -> None:
+    """
+    번역 완료 통계와 토큰/비용 요약 출력
+
+    price_multiplier: 배치 할인 등 단가 배율
+    resumed: 저널에서 복원한 {'chunks': 청크 수, 'elapsed': 이전 실행 소요 초} (비용/시간은 이전 실행 포함)
+    hedge_since: 번역 시작 시점의 Hedger.summary() (헤지 요청과 추가 비용은 이번 번역분만 집계, None이면 헤지 줄 생략)
+    """
     print()
     print(f"{'='*70}")
-    print(f"[완료] {len(chunks)}개 청크 번역 완료!")
-    print(f"  • 소요시간: {elapsed:.1f}초")
-    print(f"  • 평균시간: {elapsed/len(chunks):.1f}초/청크")
-    print(f"  • 병렬도: {max_workers}개 워커")
+    print(f"[완료] {count}개 청크 번역 완료!")
+    if resumed and resumed.get('chunks'):
+        previous = resumed.get('elapsed', 0.0)
+        elapsed += previous
+        print(f"  • 재개: 이전 실행에서 {resumed['chunks']}개 청크 복원 (비용/시간은 이전 실행 포함)")
+        print(f"  • 소요시간: {elapsed:.1f}초 (이번 실행 {elapsed - previous:.1f}초 + 이전 실행 {previous:.1f}초)")
+    else:
+        print(f"  • 소요시간: {elapsed:.1f}초")
+    print(f"  • 평균시간: {elapsed/count:.1f}초/청크")
+    print(f"  • 병렬도: {parallelism}")
     print(f"  • 적용규칙: TRANSLATION_GUIDELINE.md")
+    if estimator is not None:
+        cal = estimator.summary()
+        print(f"  • 토큰 추정기 보정: 관측 {cal['observations']}회, scale={cal['scale']}, "
+              f"고정 프롬프트≈{cal['overhead']:,} tok, 출력비율={cal['output_ratio']}")
+    if limiter is not None:
+        rl = limiter.summary()
+        print(f"  • 레이트 리미터: 429/529 {rl['throttled']}회, 대기 {rl['wait_seconds']}초, "
+              f"동시성 한도 {rl['concurrency']} (최저 {rl['lowest_concurrency']})")
+    cache = get_response_cache()
+    if cache is not None:
+        rc = cache.summary(get_model_pricing)
+        print(f"  • 응답 캐시: 적중 {rc['hits']}회, 미스 {rc['misses']}회, "
+              f"절감 input {rc['saved_input_tokens']:,} tok (프롬프트 캐시 읽기 {rc['saved_cache_read_tokens']:,}) "
+              f"/ output {rc['saved_output_tokens']:,} tok "
+              f"(≈${rc['saved_cost']:.4f})")
+    memory = get_translation_memory()
+    if memory is not None:
+        tm = memory.summary(get_model_pricing)
+        print(f"  • 번역 메모리: 완전 일치 {tm['exact_hits']}회 ({tm['exact_rate']:.0%}), "
+              f"유사 참조 {tm['fuzzy_hits']}회 ({tm['fuzzy_rate']:.0%}), 미적중 {tm['misses']}회, "
+              f"절감 input {tm['saved_input_tokens']:,} tok / output {tm['saved_output_tokens']:,} tok "
+              f"(≈${tm['saved_cost']:.4f})")
+    hedger = get_hedger()
+    hedge = hedger.summary(get_model_pricing, since=hedge_since) if hedger and hedge_since is not None else None
+    if hedge is not None:
+        print(f"  • 헤지 요청: {hedge['hedged']}회 / 요청 {hedge['requests']}회 (예산 {hedge['budget']:.0%}, "
+              f"예산·리미터로 생략 {hedge['denied']}회), 중복 요청이 먼저 끝남 {hedge['hedge_wins']}회, "
+              f"추가 input {hedge['extra_input_tokens']:,} tok / output {hedge['extra_output_tokens']:,} tok "
+              f"(≈${hedge['extra_cost']:.4f})")
+    budget = get_budget()
+    if budget is not None:
+        print(f"  • 예산: {format_budget(budget.summary())}")
     # 토큰/비용 요약 (공식 가격 기준)
     if usage_by_model:
-        print(f"  • 토큰 사용량 및 예상 비용 (Anthropic 공식 가격 기준):")
+        discount = "" if price_multiplier == 1.0 else f", 단가 ×{price_multiplier:g} 적용"
+        print(f"  • 토큰 사용량 및 예상 비용 (Anthropic 공식 가격 기준{discount}):")
         grand_input = 0
         grand_output = 0
         grand_cost = 0.0
         for model, agg in usage_by_model.items():
             inp = agg["input_tokens"]
             outp = agg["output_tokens"]
+            cache_write = agg.get("cache_write_tokens", 0)
+            cache_read = agg.get("cache_read_tokens", 0)
             reqs = agg["requests"]
-            grand_input += inp
+            grand_input += inp + cache_write + cache_read
             grand_output += outp
-            price = _get_model_pricing(model)
-            cost = (inp / 1_000_000.0) * float(price.get("input", 0) or 0) + (outp / 1_000_000.0) * float(price.get("output", 0) or 0)
+            price = {k: float(v or 0) * price_multiplier for k, v in get_model_pricing(model).items()}
+            input_usd = input_cost(inp, cache_write, cache_read, price.get("input", 0))
+            cost = input_usd + (outp / 1_000_000.0) * float(price.get("output", 0) or 0)
             grand_cost += cost
             if (price.get("input", 0) or 0) == 0 and (price.get("output", 0) or 0) == 0:
                 print(f"    - {model}: input={inp:,} tok, output={outp:,} tok, requests={reqs}")
@@ -716,65 +1285,1222 @@ def translate_chunks(
             else:
                 print(f"    - {model} ({reqs}회 호출)")
                 print(f"      Input:  {inp:>10,} tokens × ${price['input']:.2f}/M = ${(inp/1_000_000)*price['input']:.4f}")
+                if cache_write or cache_read:
+                    print(f"      Cache:  쓰기 {cache_write:,} tok, 읽기 {cache_read:,} tok "
+                          f"= ${input_usd - (inp/1_000_000)*price['input']:.4f} "
+                          f"(프롬프트 캐시 적중률 {cache_read / max(1, cache_write + cache_read):.0%})")
                 print(f"      Output: {outp:>10,} tokens × ${price['output']:.2f}/M = ${(outp/1_000_000)*price['output']:.4f}")
                 print(f"      소계: ${cost:.4f}")
         print()
-        print(f"    💰 총 예상 비용: ${grand_cost:.4f} USD")
+        if hedge is not None and hedge['extra_cost']:
+            # 헤지에서 진 요청도 과금되므로 총 비용에 포함
+            grand_cost += hedge['extra_cost']
+            print(f"    💰 총 예상 비용: ${grand_cost:.4f} USD (헤지 추가 비용 ${hedge['extra_cost']:.4f} 포함)")
+        else:
+            print(f"    💰 총 예상 비용: ${grand_cost:.4f} USD")
         print(f"       (Input: {grand_input:,} tok | Output: {grand_output:,} tok)")
     print(f"{'='*70}")
     print()
 
-    return translated_chunks
+
+def estimate_translation_cost(
+    chunks: List[dict],
+    estimator,
+    journal: Optional[TranslationJournal] = None,
+    extra: Optional[List[str]] = None,
+    glossary_text: str = "",
+    price_multiplier: float = 1.0
+) -> dict:
+    """
+    번역 전 예상 토큰/비용 (API 호출 없음)
+
+    청크마다 보정된 토큰 추정기(이전 실행의 실제 usage로 학습한 입력 배율/고정 프롬프트/출력 비율)로
+    입력 토큰을 예측하고, 출력은 요청 때 예약하는 양(예상 출력 × 여유 배율)과 같게 잡아
+    프롬프트 캐시·응답 캐시·번역 메모리 할인 없이 계산합니다 (실제 비용의 상한).
+    저널에서 복원할 청크는 제외합니다.
+
+    Args:
+        chunks: 번역할 청크
+        estimator: TokenEstimator
+        journal: 실행 저널 (이전 실행에서 완료된 청크는 비용 0)
+        extra: 청크 전에 따로 번역하는 짧은 텍스트 (반복 문단, 장/절 제목)
+        glossary_text: 용어집 추출에 쓸 원문 (빈 문자열이면 용어집 추출 비용 제외)
+        price_multiplier: 청크 번역의 단가 배율 (--batch 할인)
+
+    Returns:
+        {'requests', 'resumed', 'input_tokens', 'output_tokens', 'cost'}
+    """
+    estimate = {'requests': 0, 'resumed': 0, 'input_tokens': 0, 'output_tokens': 0, 'cost': 0.0}
+
+    def add(model: str, input_tokens: int, output_tokens: int, multiplier: float = 1.0) -> None:
+        estimate['requests'] += 1
+        estimate['input_tokens'] += input_tokens
+        estimate['output_tokens'] += output_tokens
+        estimate['cost'] += usage_cost(model, input_tokens, output_tokens, multiplier=multiplier)
+
+    if glossary_text:
+        add(GLOSSARY_MODEL, estimate_tokens(glossary_text[:30000]), 2000)
+    for text in extra or []:
+        add(TRANSLATION_MODEL, estimator.predict_input(text), _output_reserve(text, estimator))
+    for i, chunk_data in enumerate(chunks, 1):
+        chunk_text = chunk_data['text'] if isinstance(chunk_data, dict) else chunk_data
+        context = chunk_data.get('overlap') if isinstance(chunk_data, dict) else None
+        if journal is not None and journal.lookup(i, source_hash(chunk_text, context)) is not None:
+            estimate['resumed'] += 1
+            continue
+        add(TRANSLATION_MODEL, estimator.predict_input(chunk_text, context), _output_reserve(chunk_text, estimator),
+            price_multiplier)
+    return estimate
+
+
+def print_cost_estimate(estimate: dict, estimator) -> None:
+    """사전 비용 추정 출력 (예산이 있으면 초과 여부 경고)"""
+    cal = estimator.summary()
+    resumed = f", 저널에서 복원할 청크 {estimate['resumed']}개 제외" if estimate['resumed'] else ""
+    print(f"[ESTIMATE] 요청 {estimate['requests']}회{resumed}: input ≈{estimate['input_tokens']:,} tok, "
+          f"output ≈{estimate['output_tokens']:,} tok → ≈${estimate['cost']:.4f} "
+          f"(캐시 할인 전 상한, 추정기 관측 {cal['observations']}회)")
+    budget = get_budget()
+    if budget is not None:
+        if estimate['cost'] > budget.limit:
+            print(f"[BUDGET] 예상 비용이 예산 ${budget.limit:.2f}을 넘습니다 → 예산이 소진되면 새 요청을 중단하고 "
+                  f"완료된 청크는 저널에 남깁니다 (--budget-usd를 늘려 다시 실행하면 이어서 번역)")
+        else:
+            print(f"[BUDGET] 예산 ${budget.limit:.2f} 안에서 번역합니다 (예상 비용은 예산의 {estimate['cost'] / budget.limit:.0%})")
+
+
+def translate_chunks(
+    chunks: Iterable[dict],
+    source_lang: str = "English",
+    target_lang: str = "Korean",
+    api_key: Optional[str] = None,
+    max_workers: int = 20,
+    glossary: Optional[dict] = None,
+    estimator=None,
+    retry_policy: Optional[RetryPolicy] = None,
+    report: Optional[dict] = None,
+    writer=None,
+    journal=None,
+    longest_first: bool = True
+) -> List[str]:
+    """
+    병렬 처리를 사용한 모든 청크의 효율적 번역
+
+    이 함수는 ThreadPoolExecutor를 사용하여 여러 청크를 동시에 번역합니다:
+
+    1. 병렬 처리 메커니즘:
+       - ThreadPoolExecutor(max_workers=5)로 5개 스레드 동시 실행
+       - 완료된 작업부터 처리 (재시도 대기열은 run_requeued가 관리)
+       - 순차 처리 대비 5-6배 성능 향상
+
+    2. 성능 최적화:
+       - 순차 처리 (기존): 11개 청크 × 24.9초 = 273.9초 (4.5분)
+       - 병렬 처리 (현재): 11개 청크 ÷ 5 workers = 45-50초 (1분)
+       - Speedup: 5-6배 향상
+
+    3. 실시간 진행률 표시:
+       - 각 청크 완료 시 즉시 진행 상황 출력
+       - 포맷: [완료/전체] Chunk N 완료 (크기, 소요시간)
+       - 남은 작업 수 표시
+
+    4. 에러 처리:
+       - 재시도 가능한 오류(429/529, 5xx, 연결 오류)는 지수 백오프 + 지터 후 재시도
+       - 재시도 청크는 워커에서 대기하지 않고 풀 대기열 맨 뒤로 다시 제출됨
+       - 재시도 한도를 넘거나 재시도할 수 없는 오류는 원본 텍스트 사용
+       - 부분 실패해도 전체 프로세스 계속 진행, 마지막에 원문으로 대체된 청크 목록 출력
+
+    5. 최종 통계:
+       - 총 소요시간, 청크당 평균시간
+       - 병렬도 (워커 개수)
+       - 적용된 가이드라인
+
+    레이트 리밋:
+    - 모든 호출은 API 키별 공유 레이트 리미터(src/llm/rate_limiter.py)를 거침
+    - 분당 요청/입력 토큰/출력 토큰 예산을 지키고, 429/529 응답 시 동시 요청 수를 자동으로 줄임
+    - 따라서 max_workers는 동시 요청의 상한일 뿐, 실제 동시성은 리미터가 조절
+
+    스트리밍 입력:
+    - chunks는 리스트뿐 아니라 iter_chunks() 같은 제너레이터도 가능
+    - 청크가 만들어지는 즉시 풀에 제출되어 PDF 추출과 API 호출이 겹쳐 진행됨
+    - 동시 제출은 max_workers의 2배로 제한 → 원문 텍스트가 메모리에 쌓이지 않음
+
+    컨텍스트 인식:
+    - 각 청크는 이전 청크의 마지막 문장들과 함께 전달됨
+    - 번역 일관성 보장
+    - 청크 경계의 어색함 제거
+
+    증분 출력:
+    - 응답은 스트리밍으로 받아 조립 (최대 64k 출력 토큰을 한 번의 응답으로 기다리지 않음)
+    - writer(OrderedOutputWriter) 지정 시 앞선 청크가 모두 끝난 청크부터 순서대로 파일에 이어 씀
+      → 실행 도중에도 앞부분 번역을 사용할 수 있고, 중단되어도 완료된 부분은 남음
+
+    재개:
+    - journal(TranslationJournal) 지정 시 완료된 청크를 즉시 저널에 기록
+    - 이전 실행의 저널에 번호와 원문 해시가 같은 청크가 있으면 API를 호출하지 않고 복원
+    - 비용/시간 요약은 복원된 청크의 이전 실행 usage와 소요시간을 포함
+
+    최장 작업 우선 스케줄링 (longest_first, 리스트 입력):
+    - 청크마다 예상 처리 시간(보정된 출력 비율 × 원문 토큰)을 계산해 큰 청크부터 제출
+    - 마지막에 제출된 큰 청크 하나가 전체 소요시간을 결정하는 꼬리 지연 방지
+    - 결과 순서와 writer의 파일 쓰기 순서는 그대로 (청크 번호 순)
+    - writer가 있으면 문서 순서로 동시 제출 수만큼 끊은 구간 안에서만 정렬
+      (전체를 정렬하면 짧은 첫 청크가 마지막에 제출되어 부분 파일이 끝까지 비어 있음)
+    - 여러 문서를 한 워커 풀에서 함께 정렬하려면 translate_documents() 사용
+
+    성능 지표 예시:
+    ```
+    [완료] 11개 청크 번역 완료!
+      • 소요시간: 47.3초
+      • 평균시간: 4.3초/청크
+      • 병렬도: 5개 워커
+      • 적용규칙: TRANSLATION_GUIDELINE.md
+    ```
+
+    Args:
+        chunks (Iterable[dict]): chunk_text()의 청크 리스트 또는 iter_chunks() 스트림
+        source_lang (str): 원문 언어 (기본 "English")
+        target_lang (str): 목표 언어 (기본 "Korean")
+        api_key (Optional[str]): Anthropic API 키
+        max_workers (int): 동시 실행 워커 개수 (기본 5)
+        estimator (Optional[TokenEstimator]): 전달 시 청크별 실제 usage로 토큰 추정기 보정
+        retry_policy (Optional[RetryPolicy]): 재시도 정책 (기본: 최대 5회, 지수 백오프 + 지터)
+        report (Optional[dict]): 전달 시 {'failures': [원문으로 대체된 청크 정보]}를 채워 넣음
+        writer (Optional[OrderedOutputWriter]): 전달 시 완료된 청크를 순서대로 파일에 추가
+        journal (Optional[TranslationJournal]): 전달 시 완료 청크 기록 및 이전 실행 결과 복원
+        longest_first (bool): 리스트 입력을 예상 처리 시간이 긴 청크부터 제출 (기본 True)
+
+    Returns:
+        List[str]: 번역된 청크들을 원래 순서대로 정렬한 리스트
+    """
+    results = translate_documents(
+        {'document': {'chunks': chunks, 'glossary': glossary, 'writer': writer, 'journal': journal}},
+        source_lang, target_lang, api_key,
+        max_workers=max_workers,
+        estimator=estimator,
+        retry_policy=retry_policy,
+        report=report,
+        longest_first=longest_first
+    )
+    return results['document']
+
+
+def translate_documents(
+    documents: dict,
+    source_lang: str = "English",
+    target_lang: str = "Korean",
+    api_key: Optional[str] = None,
+    max_workers: int = 20,
+    estimator=None,
+    retry_policy: Optional[RetryPolicy] = None,
+    report: Optional[dict] = None,
+    longest_first: bool = True
+) -> dict:
+    """
+    스레드 풀 번역 엔진: 여러 문서의 청크를 워커 풀 하나에서 번역 (translate_chunks()의 다중 문서 버전)
+
+    - 청크가 모두 리스트로 주어지면 문서와 관계없이 예상 처리 시간이 긴 청크부터 제출 (최장 작업 우선)
+      예상 처리 시간 = 보정된 출력 비율 × 원문 토큰 + 입력 토큰 가중치 (src/translation/scheduler.py)
+      → 문서 순서상 마지막에 제출된 큰 청크가 꼬리 지연을 만들지 않아, 여러 책을 함께 번역하면
+        전체 소요시간이 (전체 작업량 ÷ 동시성)에 가까워짐
+    - 스트림 입력(iter_chunks 제너레이터)이 있으면 청크가 만들어지는 순서대로 제출
+    - 문서별 결과는 청크 순서대로 정렬, writer/journal/용어집은 문서마다 따로
+    - 토큰 사용량·실패 목록은 전체 문서를 합산해 한 번 출력
+
+    Args:
+        documents: {문서 이름: {'chunks': 청크 리스트 또는 스트림, 'glossary': 용어집 또는 None,
+                               ('writer': OrderedOutputWriter), ('journal': TranslationJournal)}}
+        source_lang, target_lang, api_key, max_workers, estimator, retry_policy, report: translate_chunks()와 동일
+        longest_first: False면 문서 순서대로 제출
+
+    Returns:
+        dict: {문서 이름: 번역된 청크 리스트}
+    """
+    start_time = time.time()
+    hedger = get_hedger()
+    hedge_since = hedger.summary(get_model_pricing) if hedger is not None else None
+    # 공유 클라이언트의 커넥션 풀을 워커 수에 맞춤 (keep-alive 재사용, 헤지 중복 요청분 여유)
+    configure_pool(max_workers + (hedger.policy.max_concurrent if hedger is not None else 0))
+    multiple = len(documents) > 1
+    runs = {}
+    for name, doc in documents.items():
+        chunks = doc.get('chunks') or []
+        runs[name] = {
+            'chunks': chunks,
+            'glossary': doc.get('glossary'),
+            'writer': doc.get('writer'),
+            'journal': doc.get('journal'),
+            'prefix': f"{name} " if multiple else "",
+            # 스트림 입력이면 전체 청크 수를 미리 알 수 없음 (0 = 미정)
+            'total': len(chunks) if hasattr(chunks, '__len__') else 0,
+            'count': 0,
+            'restored': 0,
+            'results': {},
+        }
+    streaming = any(not hasattr(run['chunks'], '__len__') for run in runs.values())
+    total_chunks = sum(run['total'] for run in runs.values())
+
+    if not streaming:
+        source = f" from {len(runs)} documents" if multiple else ""
+        print(f"[TRANSLATING] {total_chunks} chunks{source} (with context-aware translation)...")
+    else:
+        print(f"[TRANSLATING] Streaming chunks as they are extracted (with context-aware translation)...")
+    print(f"[PARALLEL] Using {max_workers} workers for faster processing")
+    _print_prefix_cache({name: run['glossary'] for name, run in runs.items()})
+
+    # 결과는 문서별 run['results']에 청크 번호와 함께 저장
+    completed_count = 0
+    submitted_count = 0
+    # 토큰 사용량 집계: 모델별 input/output/requests
+    usage_by_model = _new_usage_table()
+
+    policy = retry_policy or DEFAULT_RETRY_POLICY
+    failures = []
+
+    def chunk_parts(chunk_data):
+        # chunk_data는 딕셔너리: {'text': '...', 'overlap': '...'}
+        chunk_text = chunk_data['text'] if isinstance(chunk_data, dict) else chunk_data
+        context = chunk_data.get('overlap') if isinstance(chunk_data, dict) else None
+        return chunk_text, context
+
+    def translate_attempt(item):
+        """각 스레드에서 실행될 번역 1회 시도 (실패 시 예외 → 재대기열)"""
+        name, i, chunk_data = item
+        chunk_text, context = chunk_parts(chunk_data)
+        return _request_translation(
+            chunk_text,
+            source_lang,
+            target_lang,
+            api_key,
+            chunk_num=i,
+            total_chunks=runs[name]['total'],
+            context=context,
+            glossary=runs[name]['glossary'],
+            missed_terms=chunk_data.get('missed_terms') if isinstance(chunk_data, dict) else None,
+            estimator=estimator
+        )
+
+    def tasks():
+        """청크 스트림 → 작업 (저널에서 복원되는 청크는 제출하지 않음)"""
+        for name, run in runs.items():
+            journal = run['journal']
+            for i, chunk_data in enumerate(run['chunks'], 1):
+                run['count'] = i
+                if journal is not None:
+                    entry = journal.lookup(i, source_hash(*chunk_parts(chunk_data)))
+                    if entry is not None:
+                        run['results'][i] = _restore_journal_entry(entry, usage_by_model)
+                        run['restored'] += 1
+                        if run['writer'] is not None:
+                            run['writer'].add(i, run['results'][i])
+                        continue
+                yield (name, i), (name, i, chunk_data)
+
+    def on_submit(key):
+        nonlocal submitted_count
+        submitted_count += 1
+
+    def on_retry(key, error, attempt, delay):
+        name, i = key
+        print(f"↻ {runs[name]['prefix']}Chunk {i:2d} 재시도 예정 ({attempt}/{policy.max_attempts - 1}, {delay:4.1f}s 후 대기열 맨 뒤로): {describe_error(error)}", flush=True)
+
+    def on_done(key, item, translated, error, attempts, elapsed):
+        """완료된 작업의 결과 기록 및 진행 상황 출력"""
+        nonlocal completed_count
+        name, i, chunk_data = item
+        run = runs[name]
+        prefix = run['prefix']
+        original_text, context = chunk_parts(chunk_data)
+        completed_count += 1
+        restored = sum(r['restored'] for r in runs.values())
+        total_label = (total_chunks - restored) if not streaming else submitted_count
+        pending_count = submitted_count - completed_count
+
+        text_out = _record_translation(translated, usage_by_model, estimator, original_text, context)
+        _journal_translation(run['journal'], i, original_text, context, translated, text_out)
+
+        if text_out:
+            run['results'][i] = text_out
+            print(f"✓ {prefix}[{completed_count:2d}/{total_label}] Chunk {i:2d} 완료 ({len(text_out):5d} chars, {elapsed:5.1f}s) | 남은작업: {pending_count:2d}", flush=True)
+        else:
+            # 원본 텍스트 사용
+            run['results'][i] = original_text
+            failures.append({
+                'chunk': i,
+                'document': name if multiple else None,
+                'attempts': attempts,
+                'error': describe_error(error) if error is not None else "빈 응답",
+                'start': chunk_data.get('start') if isinstance(chunk_data, dict) else None,
+                'end': chunk_data.get('end') if isinstance(chunk_data, dict) else None,
+            })
+            print(f"✗ {prefix}[{completed_count:2d}/{total_label}] Chunk {i:2d} SKIP (원본 사용) | 남은작업: {pending_count:2d}", flush=True)
+        if run['writer'] is not None:
+            run['writer'].add(i, run['results'][i])
+
+    # 최장 작업 우선: 청크 목록을 모두 알 때만 (스트림은 도착 순서대로)
+    task_source = tasks()
+    if longest_first and not streaming:
+        pending = list(task_source)
+        if len(pending) > 1:
+            costs = [chunk_cost(*chunk_parts(item[2]), estimator=estimator) for _, item in pending]
+            # 증분 출력 파일이 있으면 동시 제출 수(max_workers의 2배) 구간 안에서만 정렬 → 파일은 앞에서부터 자람
+            window = max_workers * 2 if any(run['writer'] is not None for run in runs.values()) else None
+            pending, schedule = order_longest_first(pending, costs, max_workers, window=window)
+            print(f"[SCHEDULE] {format_schedule(len(pending), len(runs), schedule, window)}")
+        task_source = pending
+    print(f"[STATUS] Starting translation...\n")
+
+    # 워커 풀: 청크가 들어오는 대로 제출 (동시 제출은 max_workers의 2배로 제한),
+    # 재시도 가능한 실패는 백오프 후 대기열 맨 뒤로 다시 제출
+    for run in runs.values():
+        if run['journal'] is not None and run['journal'].entries:
+            print(f"[RESUME] {run['prefix']}이전 실행 저널의 완료 청크 {len(run['journal'].entries)}개는 다시 번역하지 않습니다\n")
+
+    run_requeued(
+        task_source,
+        translate_attempt,
+        on_done,
+        max_workers=max_workers,
+        policy=policy,
+        on_retry=on_retry,
+        on_submit=on_submit
+    )
+
+    if report is not None:
+        report['failures'] = failures
+
+    # 문서별로 원래 순서대로 정렬
+    results = {name: [run['results'][i] for i in range(1, run['count'] + 1)] for name, run in runs.items()}
+    chunk_count = sum(run['count'] for run in runs.values())
+    if not chunk_count:
+        return results
+
+    elapsed = time.time() - start_time
+    journals = [run['journal'] for run in runs.values() if run['journal'] is not None]
+    resumed = {'chunks': sum(run['restored'] for run in runs.values()),
+               'elapsed': sum(journal.previous_elapsed for journal in journals)} if journals else None
+    _print_translation_summary(chunk_count, elapsed, f"{max_workers}개 워커", usage_by_model, estimator,
+                               limiter=get_limiter(api_key) if api_key else None, resumed=resumed,
+                               hedge_since=hedge_since)
+    print_failure_report(failures)
+    return results
+
+
+def enforce_glossary(
+    chunks: List[dict],
+    translated_chunks: List[str],
+    glossary: Optional[dict],
+    api_key: str,
+    max_workers: int = 20,
+    estimator=None,
+    journal=None
+) -> dict:
+    """
+    번역 후 용어집 준수 검사 + 어긋난 청크만 재번역
+
+    - 청크마다 원문에 나온 용어집 용어(Aho-Corasick)와 번역문의 지정 번역을 비교 (GlossaryChecker)
+    - 지정 번역이 빠진 청크만 누락 용어를 프롬프트에 명시해 한 번 재번역 (나머지 청크는 그대로, 로그는 원래 청크 번호)
+    - 재번역 결과의 누락이 더 적을 때만 교체 (translated_chunks를 제자리에서 갱신)
+    - 재번역 usage는 저널의 해당 청크 usage에 더해 기록하고, 합계는 반환값으로 실행 요약에 표시
+
+    Returns:
+        {'checked': int, 'flagged': int, 'fixed': int, 'remaining': {청크 번호: 누락 용어},
+         'requests': int, 'input_tokens': int, 'output_tokens': int, 'cost': float}
+    """
+    stats = {'checked': len(translated_chunks), 'flagged': 0, 'fixed': 0, 'remaining': {},
+             'requests': 0, 'input_tokens': 0, 'output_tokens': 0, 'cost': 0.0}
+    if not glossary or not glossary.get('key_terms') or not translated_chunks:
+        return stats
+
+    start_time = time.time()
+    checker = GlossaryChecker(glossary['key_terms'])
+    sources = [chunk['text'] for chunk in chunks]
+    flagged = checker.check(sources, translated_chunks)
+    stats['flagged'] = len(flagged)
+    print(f"[GLOSSARY CHECK] {len(translated_chunks)} chunks checked in {time.time() - start_time:.2f}s: "
+          f"{len(flagged)} chunks missing mandated terms ({sum(len(m) for m in flagged.values())} terms)")
+    if not flagged:
+        return stats
+    for i, missing in sorted(flagged.items()):
+        print(f"  Chunk {i:2d}: " + ", ".join(f"{eng} → {kor}" for eng, kor in missing))
+
+    order = sorted(flagged)
+    total = len(translated_chunks)
+    print(f"[GLOSSARY CHECK] Re-translating {len(order)} chunks (other chunks are kept)")
+    usage_by_model = _new_usage_table()
+
+    def retranslate_attempt(i):
+        """청크 i를 누락 용어를 명시해 재번역 (원래 청크 번호로 요청·로그)"""
+        chunk = chunks[i - 1]
+        return _request_translation(
+            chunk['text'], "English", "Korean", api_key,
+            chunk_num=i,
+            total_chunks=total,
+            context=chunk.get('overlap'),
+            glossary=glossary,
+            missed_terms=flagged[i],
+            estimator=estimator
+        )
+
+    def on_retry(i, error, attempt, delay):
+        print(f"↻ Chunk {i:2d}/{total} 재시도 예정 ({attempt}회 실패, {delay:4.1f}s 후 대기열 맨 뒤로): "
+              f"{describe_error(error)}", flush=True)
+
+    def on_done(i, _, translated, error, attempts, elapsed):
+        source = sources[i - 1]
+        context = chunks[i - 1].get('overlap')
+        missing = flagged[i]
+        text = _record_translation(translated, usage_by_model, estimator, source, context)
+        if text and text != source:
+            again = checker.missing_terms(source, text)
+            if len(again) < len(missing):
+                missing = again
+                translated_chunks[i - 1] = text
+            if journal is not None and not translated.get('cached') and translated_chunks[i - 1] != source:
+                # 재번역 비용도 재개 시 비용 요약에 들어가도록 기존 usage에 더해 기록
+                previous = journal.entries.get(i) or {}
+                journal.record(i, source_hash(source, context), translated_chunks[i - 1], translated.get('model'),
+                               _add_usage(previous.get('usage'), translated.get('usage')))
+            print(f"✓ Chunk {i:2d}/{total} 재번역 완료 ({elapsed:4.1f}s): 누락 용어 {len(flagged[i])}개 → {len(missing)}개",
+                  flush=True)
+        else:
+            reason = describe_error(error) if error is not None else "빈 응답"
+            print(f"✗ Chunk {i:2d}/{total} 재번역 실패 ({attempts}회 시도, 기존 번역 유지): {reason}", flush=True)
+        if missing:
+            stats['remaining'][i] = missing
+        else:
+            stats['fixed'] += 1
+
+    run_requeued(((i, i) for i in order), retranslate_attempt, on_done, max_workers=min(max_workers, len(order)),
+                 on_retry=on_retry)
+
+    # 재번역 usage는 별도 요약 없이 반환 → 실행 요약의 용어집 검사 줄에 합산
+    for model, agg in usage_by_model.items():
+        stats['requests'] += agg['requests']
+        stats['input_tokens'] += agg['input_tokens'] + agg['cache_write_tokens'] + agg['cache_read_tokens']
+        stats['output_tokens'] += agg['output_tokens']
+        stats['cost'] += usage_cost(model, agg['input_tokens'], agg['output_tokens'],
+                                    agg['cache_write_tokens'], agg['cache_read_tokens'])
+
+    print(f"[GLOSSARY CHECK] Fixed {stats['fixed']}/{len(order)} chunks", end="")
+    if stats['remaining']:
+        print(f" — still missing in chunks {', '.join(str(i) for i in sorted(stats['remaining']))}")
+    else:
+        print()
+    return stats
+
+
+def translate_chunks_batch(
+    chunks: Iterable[dict],
+    source_lang: str = "English",
+    target_lang: str = "Korean",
+    api_key: Optional[str] = None,
+    glossary: Optional[dict] = None,
+    estimator=None,
+    poll_interval: float = DEFAULT_POLL_INTERVAL,
+    report: Optional[dict] = None
+) -> List[str]:
+    """
+    Message Batches API로 모든 청크를 하나의 배치 작업으로 번역 (야간 작업용)
+
+    실시간 응답이 필요 없을 때 사용합니다. 배치 요청은 표준 가격의 50%이고
+    공유 레이트 리미터를 거치지 않으므로 429 경쟁이 없습니다.
+
+    - 청크는 서로 독립 (맥락은 원문 overlap)이므로 한 번에 제출
+    - 배치 ID는 .cache/batch_jobs.json에 보관 → 중단 후 같은 명령을 다시 실행하면 새로 제출하지 않고 이어서 대기
+    - 응답 캐시에 있는 청크는 제출하지 않음
+    - 결과는 청크 순서대로 재조립, 실패한 청크는 원본 사용 후 실패 보고서 출력
+
+    Args/Returns: translate_chunks()와 동일 (poll_interval: 완료 확인 간격 초)
+    """
+    start_time = time.time()
+    chunks = list(chunks)
+    total_chunks = len(chunks)
+    print(f"[TRANSLATING] {total_chunks} chunks via Message Batches API (context-aware)...")
+    _print_prefix_cache({'document': glossary})
+
+    usage_by_model = _new_usage_table()
+    cache = get_response_cache()
+    results = {}
+    requests = []
+    submitted = {}
+    batch_input = batch_output = 0
+    for i, chunk_data in enumerate(chunks, 1):
+        chunk_text = chunk_data['text'] if isinstance(chunk_data, dict) else chunk_data
+        context = chunk_data.get('overlap') if isinstance(chunk_data, dict) else None
+        system, prompt, params, memory_hit, referenced = _prepare_translation(chunk_text, context, glossary)
+        if memory_hit is not None:
+            results[i] = _memory_hit_result(memory_hit)['text']
+            continue
+        cached = cache.get(params) if cache is not None else None
+        if cached is not None:
+            _remember_translation(chunk_text, cached['text'], cached['model'], _total_input(cached),
+                                  cached['output_tokens'], referenced)
+            results[i] = cached['text']
+            continue
+        output_reserve = _output_reserve(chunk_text, estimator)
+        requests.append((i, chunk_text, context, params, referenced))
+        submitted[f"chunk-{i:05d}"] = capped_params(params, output_reserve)
+        batch_input += estimate_tokens(system) + estimate_tokens(prompt)
+        batch_output += output_reserve
+
+    if len(requests) < total_chunks:
+        print(f"[CACHE] {total_chunks - len(requests)} chunks loaded from translation memory / response cache")
+    print(f"[STATUS] Waiting for batch results (poll every {poll_interval:g}s)...\n")
+
+    try:
+        # 배치 전체를 한 번에 예약 (예산을 넘기면 제출하지 않음), 결과의 usage 합계로 정산
+        with budget_slot(TRANSLATION_MODEL, batch_input, batch_output, BATCH_PRICE_MULTIPLIER) as slot:
+            # 제출 후 중단되어도 배치는 계속 처리되므로 입력 추정치로 정산
+            slot.mark_sent()
+            outcomes = run_batch(
+                api_key,
+                list(submitted.items()),
+                label=f"translate {total_chunks} chunks",
+                poll_interval=poll_interval
+            )
+            usages = [_translation_result(outcome['message'], TRANSLATION_MODEL)['usage']
+                      for outcome in outcomes.values() if 'message' in outcome]
+            slot.record(*(sum(usage[key] for usage in usages) for key in
+                          ("input_tokens", "output_tokens", "cache_write_tokens", "cache_read_tokens")))
+    except BudgetExceeded as e:
+        outcomes = {f"chunk-{i:05d}": {'error': describe_error(e), 'attempts': 0} for i, _, _, _, _ in requests}
+
+    failures = []
+    for i, chunk_text, context, params, referenced in requests:
+        chunk_data = chunks[i - 1]
+        outcome = outcomes.get(f"chunk-{i:05d}") or {'error': "배치 결과 없음", 'attempts': 1}
+        text_out = None
+        if 'message' in outcome:
+            try:
+                check_output_reserve(outcome['message'], submitted[f"chunk-{i:05d}"])
+            except OutputReserveExceeded as e:
+                outcome = {'error': describe_error(e), 'attempts': outcome['attempts']}
+        if 'message' in outcome:
+            translated = _translation_result(outcome['message'], TRANSLATION_MODEL)
+            if cache is not None:
+                _cache_translation(cache, params, translated)
+            _remember_translation(chunk_text, translated['text'], TRANSLATION_MODEL, _total_input(translated['usage']),
+                                  translated['usage']['output_tokens'], referenced)
+            text_out = _record_translation(translated, usage_by_model, estimator, chunk_text, context)
+        if text_out:
+            results[i] = text_out
+            continue
+        results[i] = chunk_text
+        failures.append({
+            'chunk': i,
+            'attempts': outcome['attempts'],
+            'error': outcome.get('error', "빈 응답"),
+            'start': chunk_data.get('start') if isinstance(chunk_data, dict) else None,
+            'end': chunk_data.get('end') if isinstance(chunk_data, dict) else None,
+        })
+
+    if report is not None:
+        report['failures'] = failures
+
+    if total_chunks:
+        elapsed = time.time() - start_time
+        _print_translation_summary(total_chunks, elapsed, "Message Batches (배치 작업 1개)", usage_by_model, estimator,
+                                   price_multiplier=BATCH_PRICE_MULTIPLIER)
+        print_failure_report(failures)
+
+    return [results[i] for i in range(1, total_chunks + 1)]
+
+
+async def translate_with_claude_async(
+    client,
+    limiter,
+    text: str,
+    source_lang: str = "English",
+    target_lang: str = "Korean",
+    chunk_num: int = 0,
+    total_chunks: int = 0,
+    context: Optional[str] = None,
+    glossary: Optional[dict] = None,
+    retry_policy: Optional[RetryPolicy] = None,
+    semaphore=None,
+    failure: Optional[dict] = None,
+    estimator=None
+) -> Optional[dict]:
+    """
+    translate_with_claude()의 asyncio 버전
+
+    프롬프트와 반환 형식은 동일하며, 호출자가 만든 AsyncAnthropic 클라이언트와
+    공유 레이트 리미터(get_limiter)를 사용합니다.
+
+    - 재시도는 call_with_retry_async: semaphore 지정 시 각 시도만 세마포어 안에서 실행 → 백오프 대기 중에는 슬롯을 다른 청크에 양보
+    - 최종 실패 시 failure에 {'attempts': int, 'error': str}를 채우고 None 반환
+    """
+    system, prompt, params, memory_hit, referenced = _prepare_translation(text, context, glossary)
+    if memory_hit is not None:
+        return _memory_hit_result(memory_hit)
+
+    cache = get_response_cache()
+    cached = cache.get(params) if cache is not None else None
+    if cached is not None:
+        _remember_translation(text, cached['text'], cached['model'], _total_input(cached),
+                              cached['output_tokens'], referenced)
+        return _cached_translation_result(cached)
+
+    input_estimate = estimate_tokens(system) + estimate_tokens(prompt)
+    output_estimate = _output_reserve(text, estimator)
+    send_params = capped_params(params, output_estimate)
+    hedger = get_hedger()
+
+    async def send(call=None):
+        if call is not None:
+            call.check()
+        async with budget_slot(TRANSLATION_MODEL, input_estimate, output_estimate) as slot:
+            def open_stream():
+                if call is not None:
+                    call.check()
+                slot.mark_sent()
+                return client.messages.stream(**send_params)
+
+            def on_text(text):
+                if call is not None:
+                    call.on_text(text)
+                slot.on_text(text)
+
+            message = await limiter.call_stream_async(open_stream, input_estimate, output_estimate, on_text=on_text)
+            _record_budget(slot, message)
+        check_output_reserve(message, send_params)
+        return message
+
+    attempts = 0
+
+    async def attempt():
+        nonlocal attempts
+        attempts += 1
+        if hedger is None:
+            message = await send()
+        else:
+            message = await hedger.call_async(send, output_estimate, input_estimate, TRANSLATION_MODEL,
+                                              _message_usage, can_hedge=limiter.has_capacity,
+                                              label=f"Chunk {chunk_num:2d}")
+        result = _translation_result(message, TRANSLATION_MODEL)
+        if cache is not None:
+            _cache_translation(cache, params, result)
+        _remember_translation(text, result['text'], TRANSLATION_MODEL, _total_input(result['usage']),
+                              result['usage']['output_tokens'], referenced)
+        return result
+
+    try:
+        return await call_with_retry_async(attempt, retry_policy, label=f"Chunk {chunk_num:2d}", semaphore=semaphore)
+    except Exception as e:
+        print(f"[ERROR] Translation failed: {describe_error(e)}")
+        if failure is not None:
+            failure.update({'attempts': attempts, 'error': describe_error(e)})
+        return None
+
+
+def _prepare_document_async(
+    client,
+    limiter,
+    semaphore,
+    chunks: List[dict],
+    source_lang: str,
+    target_lang: str,
+    glossary: Optional[dict],
+    usage_by_model,
+    estimator=None,
+    label: str = "",
+    retry_policy: Optional[RetryPolicy] = None,
+    failures: Optional[list] = None,
+    writer=None,
+    journal=None,
+    resumed: Optional[dict] = None
+):
+    """
+    문서 하나의 번역 준비: 저널 복원 후 남은 청크와, 청크 하나를 공유 세마포어 아래에서 번역하는 코루틴 함수
+
+    writer 지정 시 완료 청크를 순서대로 파일에 추가하고, journal 지정 시 완료 청크를 기록하며
+    이전 실행에서 끝난 청크는 복원합니다 (resumed에 복원 수와 이전 소요시간 누적).
+    제출 순서는 호출 측(translate_documents_async)이 모든 문서의 청크를 모아 정합니다.
+
+    Returns:
+        (results, pending, translate_one) — results는 청크 순서 리스트 (번역이 끝나면 채워짐),
+        pending은 [(청크 번호, 청크)], translate_one(i, chunk)은 코루틴 함수
+    """
+    total_chunks = len(chunks)
+    results: List[Optional[str]] = [None] * total_chunks
+    completed_count = 0
+    prefix = f"{label} " if label else ""
+
+    pending = []
+    for i, chunk_data in enumerate(chunks, 1):
+        entry = None
+        if journal is not None:
+            chunk_text = chunk_data['text'] if isinstance(chunk_data, dict) else chunk_data
+            context = chunk_data.get('overlap') if isinstance(chunk_data, dict) else None
+            entry = journal.lookup(i, source_hash(chunk_text, context))
+        if entry is None:
+            pending.append((i, chunk_data))
+            continue
+        results[i - 1] = _restore_journal_entry(entry, usage_by_model)
+        if writer is not None:
+            writer.add(i, results[i - 1])
+    if resumed is not None and journal is not None:
+        resumed['chunks'] = resumed.get('chunks', 0) + total_chunks - len(pending)
+        resumed['elapsed'] = resumed.get('elapsed', 0.0) + journal.previous_elapsed
+    if len(pending) < total_chunks:
+        print(f"[RESUME] {prefix}이전 실행 저널에서 {total_chunks - len(pending)}개 청크 복원")
+
+    async def translate_one(i: int, chunk_data) -> None:
+        nonlocal completed_count
+        chunk_text = chunk_data['text'] if isinstance(chunk_data, dict) else chunk_data
+        context = chunk_data.get('overlap') if isinstance(chunk_data, dict) else None
+
+        chunk_start = time.time()
+        failure = {}
+        translated = await translate_with_claude_async(
+            client, limiter, chunk_text, source_lang, target_lang,
+            chunk_num=i, total_chunks=total_chunks,
+            context=context, glossary=glossary,
+            retry_policy=retry_policy, semaphore=semaphore, failure=failure, estimator=estimator
+        )
+        elapsed = time.time() - chunk_start
+
+        # 이벤트 루프는 단일 스레드이므로 집계에 락이 필요 없음
+        text_out = _record_translation(translated, usage_by_model, estimator, chunk_text, context)
+        _journal_translation(journal, i, chunk_text, context, translated, text_out)
+        completed_count += 1
+        if text_out:
+            results[i - 1] = text_out
+            print(f"✓ {prefix}[{completed_count:2d}/{len(pending)}] Chunk {i:2d} 완료 ({len(text_out):5d} chars, {elapsed:5.1f}s)", flush=True)
+        else:
+            # 원본 텍스트 사용
+            results[i - 1] = chunk_text
+            if failures is not None:
+                failures.append({
+                    'chunk': i,
+                    'document': label or None,
+                    'attempts': failure.get('attempts', 1),
+                    'error': failure.get('error', "빈 응답"),
+                    'start': chunk_data.get('start') if isinstance(chunk_data, dict) else None,
+                    'end': chunk_data.get('end') if isinstance(chunk_data, dict) else None,
+                })
+            print(f"✗ {prefix}[{completed_count:2d}/{len(pending)}] Chunk {i:2d} SKIP (원본 사용)", flush=True)
+        if writer is not None:
+            writer.add(i, results[i - 1])
+
+    return results, pending, translate_one
+
+
+async def translate_documents_async(
+    documents: dict,
+    source_lang: str = "English",
+    target_lang: str = "Korean",
+    api_key: Optional[str] = None,
+    max_concurrency: int = 64,
+    estimator=None,
+    retry_policy: Optional[RetryPolicy] = None,
+    longest_first: bool = True
+) -> dict:
+    """
+    asyncio 번역 엔진: 여러 문서의 청크를 하나의 이벤트 루프에서 동시에 번역
+
+    스레드 풀(translate_chunks)은 동시 요청 수만큼 OS 스레드가 필요하지만,
+    이 엔진은 AsyncAnthropic 클라이언트 하나와 세마포어로 동시 요청 수만 제한하므로
+    수백 개의 요청을 여러 문서에 걸쳐 한 프로세스에서 유지할 수 있습니다.
+
+    - 동시 요청 한도(max_concurrency)는 모든 문서가 공유
+    - 문서별 결과는 translate_chunks()와 같이 청크 순서대로 정렬, 실패 청크는 원본 사용
+    - 재시도 대기는 세마포어 밖에서 하므로 백오프 중인 청크가 동시 요청 자리를 차지하지 않음
+    - 토큰 사용량은 모델별로 전체 문서를 합산하여 요약 출력
+    - longest_first: 모든 문서의 청크를 예상 처리 시간이 긴 순서로 세마포어에 줄 세움 (translate_documents()와 같음,
+      writer가 있으면 문서 순서로 동시 요청 수만큼 끊은 구간 안에서만 정렬)
+
+    Args:
+        documents: {문서 이름: {'chunks': 청크 리스트, 'glossary': 용어집 또는 None,
+                               ('writer': 완료 청크를 순서대로 추가할 OrderedOutputWriter),
+                               ('journal': 완료 청크를 기록/복원할 TranslationJournal)}}
+        source_lang: 원문 언어
+        target_lang: 목표 언어
+        api_key: Anthropic API 키
+        max_concurrency: 전체 동시 요청 수 한도
+        estimator: 청크별 usage로 보정할 TokenEstimator
+        retry_policy: 재시도 정책 (기본: DEFAULT_RETRY_POLICY)
+        longest_first: False면 문서 순서대로 제출
+
+    Returns:
+        dict: {문서 이름: 번역된 청크 리스트}
+    """
+
+    start_time = time.time()
+    documents = {
+        name: {'chunks': list(doc.get('chunks') or []), 'glossary': doc.get('glossary'),
+               'writer': doc.get('writer'), 'journal': doc.get('journal')}
+        for name, doc in documents.items()
+    }
+    total = sum(len(doc['chunks']) for doc in documents.values())
+    print(f"[TRANSLATING] {total} chunks from {len(documents)} document(s) (asyncio engine, context-aware)...")
+    print(f"[ASYNC] Up to {max_concurrency} requests in flight")
+    _print_prefix_cache({name: doc['glossary'] for name, doc in documents.items()})
+    print(f"[STATUS] Starting translation...\n")
+
+    hedger = get_hedger()
+    hedge_since = hedger.summary(get_model_pricing) if hedger is not None else None
+    client = create_async_client(api_key, max_concurrency + (hedger.policy.max_concurrent if hedger is not None else 0))
+    semaphore = asyncio.Semaphore(max_concurrency)
+    limiter = get_limiter(api_key)
+    if max_concurrency > limiter.max_concurrency:
+        # 리미터 상한이 엔진의 동시 요청 수보다 낮으면 맞춰 올림 (AIMD 감소는 그대로 동작)
+        from src.llm.rate_limiter import configure_limits
+        configure_limits(max_concurrency=max_concurrency)
+    usage_by_model = _new_usage_table()
+    failures = []
+    resumed = {'chunks': 0, 'elapsed': 0.0}
+    multiple = len(documents) > 1
+    try:
+        results = {}
+        jobs = []
+        for name, doc in documents.items():
+            results[name], pending, translate_one = _prepare_document_async(
+                client, limiter, semaphore, doc['chunks'], source_lang, target_lang,
+                doc['glossary'], usage_by_model, estimator,
+                label=name if multiple else "", retry_policy=retry_policy, failures=failures,
+                writer=doc['writer'], journal=doc['journal'], resumed=resumed
+            )
+            jobs.extend((translate_one, i, chunk) for i, chunk in pending)
+        # 세마포어는 먼저 기다린 코루틴부터 깨우므로 gather 순서가 곧 제출 순서
+        if longest_first and len(jobs) > 1:
+            costs = [chunk_cost(chunk['text'] if isinstance(chunk, dict) else chunk,
+                                chunk.get('overlap') if isinstance(chunk, dict) else None,
+                                estimator=estimator)
+                     for _, _, chunk in jobs]
+            # 증분 출력 파일이 있으면 동시 요청 수 구간 안에서만 정렬 (translate_documents()와 같음)
+            window = max_concurrency if any(doc['writer'] is not None for doc in documents.values()) else None
+            jobs, schedule = order_longest_first(jobs, costs, max_concurrency, window=window)
+            print(f"[SCHEDULE] {format_schedule(len(jobs), len(documents), schedule, window)}")
+        await asyncio.gather(*(translate_one(i, chunk) for translate_one, i, chunk in jobs))
+    finally:
+        await client.close()
+
+    if total:
+        elapsed = time.time() - start_time
+        _print_translation_summary(total, elapsed, f"asyncio 동시 요청 {max_concurrency}개", usage_by_model, estimator,
+                                   limiter=limiter, resumed=resumed, hedge_since=hedge_since)
+        print_failure_report(failures)
+    return results
+
+
+def translate_chunks_async(
+    chunks: Iterable[dict],
+    source_lang: str = "English",
+    target_lang: str = "Korean",
+    api_key: Optional[str] = None,
+    max_concurrency: int = 64,
+    glossary: Optional[dict] = None,
+    estimator=None,
+    retry_policy: Optional[RetryPolicy] = None,
+    writer=None,
+    journal=None,
+    longest_first: bool = True
+) -> List[str]:
+    """
+    translate_chunks()와 같은 계약의 asyncio 엔진 진입점 (문서 1개)
+
+    스트림 입력은 먼저 리스트로 모은 뒤 번역합니다.
+    """
+    results = asyncio.run(translate_documents_async(
+        {'document': {'chunks': chunks, 'glossary': glossary, 'writer': writer, 'journal': journal}},
+        source_lang, target_lang, api_key,
+        max_concurrency=max_concurrency,
+        estimator=estimator,
+        retry_policy=retry_policy,
+        longest_first=longest_first
+    ))
+    return results['document']
+
+
+def print_glossary_summary(glossary: Optional[dict]) -> None:
+    """추출된 용어집 요약 출력"""
+    if glossary and glossary.get("key_terms"):
+        print(f"[OK] ✓ Document domain: {glossary.get('domain', 'unknown')}")
+        print(f"[OK] ✓ Extracted {len(glossary['key_terms'])} key terms")
+        sources = glossary.get('sources')
+        if sources:
+            print(f"      (document {sources['document']}, domain store +{sources['domain']}, "
+                  f"pinned {sources['pinned']})")
+        # 샘플 표시
+        sample_terms = list(glossary['key_terms'].items())[:5]
+        for eng, kor in sample_terms:
+            print(f"      • {eng} → {kor}")
+        if len(glossary['key_terms']) > 5:
+            print(f"      ... and {len(glossary['key_terms']) - 5} more")
+    else:
+        print(f"[INFO] No custom glossary - using general translation guidelines")
+
+
+def stream_translate_pdf(
+    pdf_path,
+    api_key: str,
+    workers: int = 1,
+    cache=None,
+    chunk_size: int = 5000,
+    max_workers: int = 20,
+    glossary_sample_size: int = 30000,
+    measure=None,
+    estimator=None,
+    writer=None,
+    journal=None,
+    stripper=None,
+    glossary_store=None
+):
+    """
+    스트리밍 파이프라인: 추출 → 문장 분리 → 청킹 → 번역을 하나의 흐름으로 연결
+
+    단계별 파이프라인(추출 완료 → 용어집 → 청킹 → 번역)과 달리
+    페이지가 추출되는 즉시 문장 분리기와 증분 청커로 흘려보내고,
+    완성된 청크는 바로 번역 풀에 제출합니다.
+
+    - API 호출이 PDF 파싱과 겹쳐 진행되어 전체 소요시간 단축
+    - 원문 전체 문자열을 만들지 않으므로 피크 메모리가 책 크기에 비례하지 않음
+    - 용어집은 앞부분 glossary_sample_size자만으로 추출 (전체 샘플링 불가)
+
+    Args:
+        pdf_path: PDF 파일 경로
+        api_key: Anthropic API 키
+        workers: 추출 프로세스 수 (1 = 순차, 0 = CPU 코어 수)
+        cache: PageCache 인스턴스 (None이면 캐시 미사용)
+        chunk_size: 청크 목표 크기 (문자 수, measure 지정 시 해당 단위)
+        max_workers: 번역 워커 수
+        glossary_sample_size: 용어집 추출에 사용할 선두 텍스트 크기
+        measure: 문장 크기 측정 함수 (토큰 예산 모드)
+        estimator: 청크별 usage로 보정할 TokenEstimator
+        writer: 완료된 청크를 순서대로 이어 쓸 OrderedOutputWriter
+        journal: 완료 청크를 기록하고 이전 실행 결과를 복원할 TranslationJournal
+        stripper: 머리글/꼬리말을 제거할 PageFurnitureStripper (앞쪽 몇 페이지만 미리 읽음)
+        glossary_store: 용어집 저장소 (GlossaryStore, None이면 매번 추출)
+
+    Returns:
+        tuple: (번역된_청크_목록, {'pages': int, 'characters': int}) 또는 추출 실패 시 (None, None)
+    """
+    info = {}
+    stats = {'pages': 0, 'characters': 0}
+    page_iter = (page_text for _, page_text in iter_pdf_pages(pdf_path, workers, cache, info))
+    if stripper is not None:
+        page_iter = stripper.strip(page_iter)
+
+    # 용어집 추출용 선두 샘플 확보 (이 페이지들은 이후 그대로 청커로 전달)
+    head = []
+    head_chars = 0
+    for page_text in page_iter:
+        stats['pages'] += 1
+        if page_text:
+            head.append(page_text + "\n")
+            head_chars += len(page_text) + 1
+        if head_chars >= glossary_sample_size:
+            break
+
+    if 'error' in info or not head:
+        return None, None
+
+    glossary = extract_glossary("".join(head), api_key, sample_size=glossary_sample_size,
+                                store=glossary_store, document=Path(pdf_path).stem)
+    print_glossary_summary(glossary)
+    print()
+
+    def fragments():
+        yield from head
+        stats['characters'] += head_chars
+        head.clear()
+        for page_text in page_iter:
+            stats['pages'] += 1
+            if page_text:
+                stats['characters'] += len(page_text) + 1
+                yield page_text + "\n"
+
+    chunk_stream = iter_chunks(fragments(), chunk_size=chunk_size, measure=measure)
+    translated_chunks = translate_chunks(
+        chunk_stream, "English", "Korean", api_key,
+        max_workers=max_workers,
+        glossary=glossary,
+        estimator=estimator,
+        writer=writer,
+        journal=journal
+    )
+    return translated_chunks, stats
+
+
+def markdown_header(
+    pdf_name: str,
+    pages: Optional[int] = None,
+    total_chars: Optional[int] = None,
+    chunk_count: Optional[int] = None,
+    partial: bool = False
+) -> str:
+    """번역 문서 머리말 (값을 모르는 항목은 생략, partial이면 진행 중 표시)"""
+    lines = [f"# {pdf_name} - Korean Translation", "", "**Source**: English PDF", "**Target**: Korean (한국어)"]
+    if pages is not None:
+        lines.append(f"**Pages**: {pages}")
+    if total_chars is not None:
+        lines.append(f"**Characters**: {total_chars:,}")
+    if chunk_count is not None:
+        lines.append(f"**Chunks**: {chunk_count}")
+    lines.append(f"**Timestamp**: {time.strftime('%Y-%m-%d %H:%M:%S')}")
+    if partial:
+        lines.append("**Status**: 번역 진행 중 (완료된 섹션부터 순서대로 추가됨)")
+    lines += ["", "---", "", "## Content", "", ""]
+    return "\n".join(lines)
+
+
+def markdown_footer(section_count: int) -> str:
+    """번역 문서 맺음말"""
+    return f"---\n\n**Translation completed**: All {section_count} sections translated successfully."
 
 
 def generate_markdown(
     pdf_name: str,
     translated_chunks: List[str],
     original_text: str,
-    pages: int
+    pages: int,
+    total_chars: Optional[int] = None,
+    headings: Optional[dict] = None
 ) -> str:
-    """Generate markdown from translated chunks"""
-    print(f"[MARKDOWN] Generating markdown document...", flush=True)
-    markdown = f"""# {pdf_name} - Korean Translation
-
-**Source**: English PDF
-**Target**: Korean (한국어)
-**Pages**: {pages}
-**Characters**: {len(original_text):,}
-**Chunks**: {len(translated_chunks)}
-**Timestamp**: {time.strftime('%Y-%m-%d %H:%M:%S')}
+    """Generate markdown from translated chunks
 
----
-
-## Content
-
-"""
+    스트리밍 모드에서는 원문 전체를 보관하지 않으므로 total_chars로 글자 수를 전달합니다.
+    headings(chunk_headings 결과) 지정 시 "## Section N" 대신 실제 장/절 제목을 씁니다.
+    """
+    if total_chars is None:
+        total_chars = len(original_text)
+    print(f"[MARKDOWN] Generating markdown document...", flush=True)
+    parts = [markdown_header(pdf_name, pages, total_chars, len(translated_chunks))]
 
     for i, translated in enumerate(translated_chunks, 1):
-        markdown += f"## Section {i}\n\n"
-        markdown += translated + "\n\n"
+        if headings is not None:
+            parts.append(structured_section(headings.get(i, []), translated))
+        else:
+            parts.append(default_section(i, translated))
         
         # 진행 상황 표시 (매 5섹션마다)
         if i % 5 == 0 or i == len(translated_chunks):
             progress = (i / len(translated_chunks)) * 100
             print(f"  [{i:3d}/{len(translated_chunks)}] {progress:5.1f}% complete", flush=True)
 
-    markdown += f"---\n\n"
-    markdown += f"**Translation completed**: All {len(translated_chunks)} sections translated successfully."
+    parts.append(markdown_footer(len(translated_chunks)))
 
     print(f"[OK] Markdown document generated", flush=True)
-    return markdown
+    return "".join(parts)
+
+
+def parse_args():
+    """명령행 인자 파싱"""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description='PDF → 한국어 번역 파이프라인',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+예시:
+  python translate_pdf.py                     # input/laf.pdf 번역
+  python translate_pdf.py book.pdf            # input/book.pdf 번역
+  python translate_pdf.py book.pdf --extract-workers 0
+  python translate_pdf.py book.pdf --stream
+  python translate_pdf.py book.pdf --async --concurrency 128
+  python translate_pdf.py book.pdf --estimate-only
+  python translate_pdf.py book.pdf --budget-usd 5
+        """
+    )
+
+    parser.add_argument('pdf', nargs='?', default=None,
+                       help='번역할 PDF (상대 경로는 input/ 기준, 기본: input/laf.pdf)')
+    parser.add_argument('--extract-workers', type=int, default=1,
+                       help='PDF 추출 프로세스 수 (기본: 1 = 순차, 0 = CPU 코어 수)')
+    parser.add_argument('--no-extract-cache', action='store_true',
+                       help='페이지 추출 캐시 사용 안 함 (항상 PDF에서 다시 추출)')
+    parser.add_argument('--purge-extract-cache', action='store_true',
+                       help='실행 전 페이지 추출 캐시 전체 삭제')
+    parser.add_argument('--extract-cache-mb', type=int, default=256,
+                       help='페이지 추출 캐시 최대 크기 MB (기본: 256)')
+    parser.add_argument('--no-glossary-cache', action='store_true',
+                       help='용어집 저장소 사용 안 함 (매번 용어집 추출, 분야 용어집/고정 용어 미적용)')
+    parser.add_argument('--purge-glossary-cache', action='store_true',
+                       help='실행 전 문서별 용어집 캐시 삭제 (분야 누적 용어집은 유지)')
+    parser.add_argument('--glossary-domain', default=None,
+                       help='용어집 분야 고정 (예: startup). 시리즈 전체를 같은 분야 용어집으로 통일')
+    parser.add_argument('--glossary-overrides', default='glossary_overrides.json',
+                       help='수동 고정 용어 JSON 파일 (기본: glossary_overrides.json)')
+    parser.add_argument('--no-glossary-check', action='store_true',
+                       help='번역 후 용어집 준수 검사와 어긋난 청크 재번역 사용 안 함 (단계별 모드)')
+    parser.add_argument('--keep-page-furniture', action='store_true',
+                       help='머리글/꼬리말/쪽 번호 제거 안 함 (추출 텍스트 그대로 번역)')
+    parser.add_argument('--no-layout', action='store_true',
+                       help='장/절 구조 인식 안 함 (전체 텍스트를 이어서 청킹, 출력은 "## Section N") (단계별 모드)')
+    parser.add_argument('--no-response-cache', action='store_true',
+                       help='LLM 응답 캐시 사용 안 함 (항상 API 호출)')
+    parser.add_argument('--purge-response-cache', action='store_true',
+                       help='실행 전 LLM 응답 캐시 전체 삭제')
+    parser.add_argument('--response-cache-mb', type=int, default=512,
+                       help='LLM 응답 캐시 최대 크기 MB (기본: 512)')
+    parser.add_argument('--no-translation-memory', action='store_true',
+                       help='번역 메모리 사용 안 함 (같은/비슷한 원문의 기존 번역을 재사용하지 않음)')
+    parser.add_argument('--purge-translation-memory', action='store_true',
+                       help='실행 전 번역 메모리 전체 삭제')
+    parser.add_argument('--tm-similarity', type=float, default=0.5,
+                       help='번역 메모리 유사 구간 최소 유사도 0~1 (기본: 0.5)')
+    parser.add_argument('--no-dedup', action='store_true',
+                       help='반복 문단(머리글/꼬리말 등) 한 번만 번역하기 사용 안 함 (단계별 모드)')
+    parser.add_argument('--no-resume', action='store_true',
+                       help='이전 실행 저널을 무시하고 모든 청크를 처음부터 번역')
+    parser.add_argument('--stream', action='store_true',
+                       help='스트리밍 모드: 추출과 동시에 청킹/번역 진행 (용어집은 앞부분 기준)')
+    parser.add_argument('--chunk-size', type=int, default=5000,
+                       help='청크 크기 (문자 수, 기본: 5000)')
+    parser.add_argument('--token-budget', type=int, default=None,
+                       help='토큰 예산 모드: 청크당 원문 입력 토큰 한도 (문자 수 대신 추정 토큰으로 분할)')
+    parser.add_argument('--output-budget', type=int, default=16000,
+                       help='토큰 예산 모드: 청크당 예상 출력 토큰 한도 (기본: 16000)')
+    parser.add_argument('--document-order', action='store_true',
+                       help='청크를 문서 순서대로 제출 (기본: 예상 처리 시간이 긴 청크부터 제출하되, '
+                            '부분 출력 파일이 앞에서부터 자라도록 동시 제출 수만큼의 문서 순서 구간 안에서만 정렬. '
+                            '이 옵션은 꼬리 지연 감소 대신 부분 파일이 가장 빨리 채워지는 순서를 택함)')
+    parser.add_argument('--async', dest='use_async', action='store_true',
+                       help='asyncio 번역 엔진 사용 (스레드 대신 이벤트 루프 하나로 다수 요청 동시 진행)')
+    parser.add_argument('--concurrency', type=int, default=64,
+                       help='asyncio 엔진의 동시 요청 수 한도 (기본: 64)')
+    parser.add_argument('--hedge', action='store_true',
+                       help='이번 실행의 p95 응답 시간을 넘긴 청크에 중복 요청을 보내 먼저 끝난 결과 사용 (추가 비용 발생)')
+    parser.add_argument('--hedge-budget', type=float, default=0.05,
+                       help='중복 요청 상한, 전체 요청 대비 비율 (기본: 0.05)')
+    parser.add_argument('--batch', action='store_true',
+                       help='Message Batches API로 모든 청크를 배치 작업 하나로 제출 (50%% 할인, 완료까지 수 시간 걸릴 수 있음)')
+    parser.add_argument('--batch-poll', type=float, default=30.0,
+                       help='배치 완료 확인 간격 초 (기본: 30)')
+    parser.add_argument('--budget-usd', type=float, default=None,
+                       help='비용 예산 USD: 다음 요청이 예산을 넘기면 새 요청을 중단 (완료된 청크는 저널에 남아 이어서 번역 가능)')
+    parser.add_argument('--estimate-only', action='store_true',
+                       help='청크까지 만든 뒤 예상 토큰/비용만 출력하고 종료 (API 호출 없음, 단계별 모드)')
+    parser.add_argument('--rpm-limit', type=int, default=None,
+                       help='분당 요청 수 한도 (기본: 환경변수 ANTHROPIC_RPM_LIMIT 또는 응답 헤더 기준)')
+    parser.add_argument('--itpm-limit', type=int, default=None,
+                       help='분당 입력 토큰 한도 (기본: 환경변수 ANTHROPIC_ITPM_LIMIT 또는 응답 헤더 기준)')
+    parser.add_argument('--otpm-limit', type=int, default=None,
+                       help='분당 출력 토큰 한도 (기본: 환경변수 ANTHROPIC_OTPM_LIMIT 또는 응답 헤더 기준)')
+
+    return parser.parse_args()
 
 
 def main():
+    args = parse_args()
+
     print("=" * 70)
     print("[COMPLETE PDF TRANSLATION PIPELINE]")
     print("=" * 70)
     print()
 
-    # Check API key
+    if args.budget_usd is not None and args.budget_usd <= 0:
+        print("[ERROR] --budget-usd는 0보다 커야 합니다")
+        return
+    if args.estimate_only and args.stream:
+        print("[INFO] --estimate-only는 전체 청크가 필요하므로 단계별 모드로 추정합니다.")
+        print()
+        args.stream = False
+
+    # Check API key (--estimate-only는 API를 호출하지 않음)
     api_key = get_api_key()
-    if not api_key:
+    if not api_key and not args.estimate_only:
         print("[ERROR] ANTHROPIC_API_KEY not set")
         print()
         print("Setup instructions in: CLAUDE_API_SETUP.md")
@@ -785,12 +2511,32 @@ def main():
         print("  3. Run again: python translate_full_pdf.py")
         return
 
-    print("[OK] API key configured")
-    print()
+    if api_key:
+        print("[OK] API key configured")
+        print()
+
+    # 공유 레이트 리미터 한도 (미지정 항목은 환경변수 또는 첫 응답 헤더로 결정)
+    from src.llm.rate_limiter import configure_limits
+    configure_limits(
+        requests_per_minute=args.rpm_limit,
+        input_tokens_per_minute=args.itpm_limit,
+        output_tokens_per_minute=args.otpm_limit
+    )
+    # 헤지 요청 (느린 청크에 중복 요청, 요청 수 대비 예산 안에서)
+    if args.hedge:
+        configure_hedging(HedgePolicy(budget=args.hedge_budget))
+    # 비용 예산 (요청마다 예상 비용을 예약하고 실제 usage로 정산, 넘기면 새 요청 중단)
+    if args.budget_usd is not None:
+        configure_budget(args.budget_usd)
+
+    # LLM 응답 캐시 (같은 모델/파라미터/프롬프트의 재실행은 API를 호출하지 않음)
+    response_cache = open_response_cache(
+        args.no_response_cache, args.purge_response_cache, args.response_cache_mb
+    )
 
     # Get PDF path from CLI argument or use default
-    if len(sys.argv) > 1:
-        pdf_path = Path(sys.argv[1])
+    if args.pdf:
+        pdf_path = Path(args.pdf)
         if not pdf_path.is_absolute():
             # 상대 경로면 input/ 폴더 기준으로
             pdf_path = Path("input") / pdf_path
@@ -810,54 +2556,322 @@ def main():
     print(f"[PDF] {pdf_path.name} ({pdf_path.absolute()})")
     print()
 
+    # 번역 메모리 (책/실행을 넘어 같은 원문은 재사용, 비슷한 원문은 참고 번역으로 제공)
+    translation_memory = open_translation_memory(
+        args.no_translation_memory, args.purge_translation_memory, args.tm_similarity, document=pdf_path.stem
+    )
+    if translation_memory is not None:
+        print(f"[TM] Translation memory: {len(translation_memory):,} segments")
+        print()
+
     # output 폴더 생성
     Path("output").mkdir(exist_ok=True)
+    output_path = Path('output') / f'output_{pdf_path.stem}_translated.md'
+    # 번역 중에는 완료된 섹션을 순서대로 .partial.md에 이어 씀 (완료 후 최종 파일로 교체)
+    partial_path = output_path.with_name(f'output_{pdf_path.stem}_translated.partial.md')
+    writer = None
+
+    # 실행 저널: 완료된 청크를 즉시 기록, 중단 후 다시 실행하면 남은 청크만 번역
+    # (단계별 --batch는 배치 ID로 재개하므로 사용하지 않음)
+    journal = None
+    if not (args.batch and not args.stream):
+        from src.translation.page_cache import file_sha256
+        journal = TranslationJournal(
+            Path('.cache') / 'journals' / f'translate_{pdf_path.stem}.jsonl',
+            run_info={'pdf_sha256': file_sha256(pdf_path), 'model': TRANSLATION_MODEL},
+            # 추정만 할 때는 저널을 지우지 않음
+            fresh=args.no_resume and not args.estimate_only
+        )
+        if journal.entries:
+            print(f"[RESUME] 이전 실행 저널 발견: 완료 청크 {len(journal.entries)}개 (처음부터 하려면 --no-resume)")
     print()
 
     # Extract
     print()
     print("[STEP 1/5] Extract PDF")
     print("-" * 70)
-    text, metadata, pages = extract_pdf(pdf_path)
-    if not text:
-        print("[ERROR] Failed to extract text from PDF")
-        return
+    page_cache = None
+    if args.purge_extract_cache or not args.no_extract_cache:
+        from src.translation.page_cache import PageCache
+        page_cache = PageCache(max_bytes=args.extract_cache_mb * 1024 * 1024)
+        if args.purge_extract_cache:
+            purged = page_cache.purge()
+            print(f"[CACHE] Purged {purged} cached pages")
+        if args.no_extract_cache:
+            page_cache.close()
+            page_cache = None
+
+    # 토큰 추정기 (실행마다 실제 usage로 보정되어 .cache/에 누적)
+    from src.translation.token_estimator import TokenEstimator
+    estimator = TokenEstimator(TRANSLATION_MODEL)
+    chunk_size = args.chunk_size
+    measure = None
+    if args.token_budget:
+        chunk_size = estimator.source_budget(args.token_budget, args.output_budget)
+        measure = estimator.estimate
+        cal = estimator.summary()
+        print(f"[TOKENS] Token-budget chunking: input ≤ {args.token_budget:,} tok, "
+              f"predicted output ≤ {args.output_budget:,} tok → {chunk_size:,} source tok/chunk")
+        print(f"[TOKENS] Calibration: {cal['observations']} observations, "
+              f"scale={cal['scale']}, output_ratio={cal['output_ratio']}")
+        print()
 
-    print(f"[OK] ✓ Extracted {len(text):,} characters from {len(pages)} pages")
-    print()
+    # 용어집 저장소 (같은 문서는 재추출 없음, 분야 누적 용어집 + 고정 용어 병합)
+    glossary_store = None
+    if not args.no_glossary_cache:
+        glossary_store = GlossaryStore(overrides_path=args.glossary_overrides, domain=args.glossary_domain)
+        if args.purge_glossary_cache:
+            print(f"[CACHE] Purged {glossary_store.purge()} cached document glossaries")
 
-    # Glossary extraction
-    print("[STEP 2/5] Analyze document & extract glossary")
-    print("-" * 70)
-    glossary = extract_glossary(text, api_key)
-    
-    if glossary and glossary.get("key_terms"):
-        print(f"[OK] ✓ Document domain: {glossary.get('domain', 'unknown')}")
-        print(f"[OK] ✓ Extracted {len(glossary['key_terms'])} key terms")
-        # 샘플 표시
-        sample_terms = list(glossary['key_terms'].items())[:5]
-        for eng, kor in sample_terms:
-            print(f"      • {eng} → {kor}")
-        if len(glossary['key_terms']) > 5:
-            print(f"      ... and {len(glossary['key_terms']) - 5} more")
+    # 머리글/꼬리말/쪽 번호 제거기 (제거량은 보정된 추정기로 토큰 환산)
+    stripper = None if args.keep_page_furniture else PageFurnitureStripper(measure=estimator.estimate)
+
+    if args.stream and args.use_async:
+        print("[INFO] --async는 단계별 모드 전용입니다. 스트리밍 모드는 스레드 풀로 번역합니다.")
+        print()
+    if args.stream and args.batch:
+        print("[INFO] --batch는 단계별 모드 전용입니다. 스트리밍 모드는 스레드 풀로 번역합니다.")
+        print()
+    if args.stream and not args.no_dedup:
+        print("[INFO] 반복 문단 제거는 전체 텍스트가 필요하므로 단계별 모드에서만 적용됩니다.")
+        print()
+    if args.stream and not args.no_glossary_check:
+        print("[INFO] 용어집 준수 검사는 청크 원문을 보관하는 단계별 모드에서만 적용됩니다.")
+        print()
+    if args.stream and not args.no_layout:
+        print("[INFO] 장/절 구조 인식은 문서 전체의 글꼴 크기 분포가 필요하므로 단계별 모드에서만 적용됩니다.")
+        print()
+    if args.stream and args.budget_usd is not None:
+        print("[INFO] 사전 비용 추정은 전체 청크가 필요하므로 단계별 모드에서만 출력합니다. 예산 한도는 그대로 적용됩니다.")
+        print()
+
+    dedup = None
+    glossary_check = None
+    tree = None
+    headings = None
+
+    if args.stream:
+        # 스트리밍 모드: STEP 1~4를 하나의 흐름으로 실행
+        print("[STREAM] Extract → glossary → chunk → translate (pipelined)")
+        print(f"[OUTPUT] Completed sections are appended to {partial_path}")
+        print()
+        writer = OrderedOutputWriter(partial_path, markdown_header(pdf_path.stem, partial=True))
+        translated_chunks, stream_stats = stream_translate_pdf(
+            pdf_path, api_key,
+            workers=args.extract_workers,
+            cache=page_cache,
+            chunk_size=chunk_size,
+            measure=measure,
+            estimator=estimator,
+            writer=writer,
+            journal=journal,
+            stripper=stripper,
+            glossary_store=glossary_store
+        )
+        if page_cache is not None:
+            page_cache.close()
+        if translated_chunks is None:
+            writer.close()
+            journal.close()
+            partial_path.unlink(missing_ok=True)
+            print("[ERROR] Failed to extract text from PDF")
+            return
+        text = ""
+        page_count = stream_stats['pages']
+        char_count = stream_stats['characters']
+        chunk_count = len(translated_chunks)
     else:
-        print(f"[INFO] No custom glossary - using general translation guidelines")
-    print()
+        layout = None if args.no_layout else {}
+        text, metadata, pages = extract_pdf(pdf_path, workers=args.extract_workers, cache=page_cache,
+                                            stripper=stripper, layout=layout)
+        if page_cache is not None:
+            page_cache.close()
+        if not text:
+            if journal is not None:
+                journal.close()
+            print("[ERROR] Failed to extract text from PDF")
+            return
+
+        page_count = len(pages)
+        char_count = len(text)
+        print(f"[OK] ✓ Extracted {char_count:,} characters from {page_count} pages")
+        if stripper is not None:
+            lines, chars, tokens, ratio = stripper.summary()
+            print(f"[STRIP] Removed {lines} header/footer/page-number lines: "
+                  f"{chars:,} chars (~{tokens:,.0f} tokens, {ratio:.1%} of extracted text)")
+        print()
 
-    # Chunk
-    print("[STEP 3/5] Create chunks")
-    print("-" * 70)
-    chunks = chunk_text(text, chunk_size=5000)
-    print(f"[OK] ✓ Total chunks to translate: {len(chunks)}")
-    print()
+        # Chunk (사전 비용 추정이 API 호출보다 먼저 오도록 용어집 추출 전에 청킹)
+        print("[STEP 2/5] Create chunks")
+        print("-" * 70)
+        # 장/절 구조: 본문보다 큰 글꼴의 제목 줄로 트리를 만들고 청크가 장/절 경계를 넘지 않게 함
+        if layout is not None:
+            tree = build_section_tree(pages, layout, stripper.edges if stripper is not None else None)
+            if tree.heading_count:
+                sizes = ", ".join(f"{size}pt → level {level}" for size, level in tree.levels.items())
+                print(f"[LAYOUT] {tree.count(1)} chapters, {tree.heading_count - tree.count(1)} sections "
+                      f"(body {tree.body_size}pt; headings {sizes})")
+                for line in tree.outline():
+                    print(f"  {line}")
+            else:
+                print("[LAYOUT] No headings larger than body text found, chunking the whole text")
+                tree = None
+        # 반복 문단(머리글, 꼬리말, 반복 사이드바)은 자리표시자로 바꿔 한 번만 번역
+        if not args.no_dedup:
+            dedup = deduplicate_paragraphs(text)
+            if dedup.paragraphs:
+                print(f"[DEDUP] {len(dedup.paragraphs)} repeated paragraphs ({dedup.occurrences} occurrences) → "
+                      f"{dedup.saved_chars:,} chars deduplicated ({dedup.saved_chars / char_count:.1%} of source)")
+            else:
+                print("[DEDUP] No repeated paragraphs")
+                dedup = None
+        if tree is not None:
+            section_texts = [dedup.substitute(section.text) if dedup else section.text for section in tree.sections]
+            chunks = chunk_sections(section_texts, chunk_size=chunk_size, measure=measure)
+        else:
+            chunks = chunk_text(dedup.text if dedup else text, chunk_size=chunk_size, measure=measure)
+        chunk_count = len(chunks)
+        print(f"[OK] ✓ Total chunks to translate: {chunk_count}")
+        print()
 
-    # Translate
-    print("[STEP 4/5] Translate with Claude API (병렬 처리)")
-    print("-" * 70)
-    translated_chunks = translate_chunks(
-        chunks, "English", "Korean", api_key,
-        glossary=glossary
-    )
+        # 사전 비용 추정 (보정된 토큰 추정기 기준, API 호출 없음)
+        titles = list(dict.fromkeys(title for section in tree.sections for _, title in section.headings)) \
+            if tree is not None else []
+        estimate = estimate_translation_cost(
+            chunks, estimator,
+            journal=None if args.no_resume else journal,
+            extra=(dedup.paragraphs if dedup is not None else []) + titles,
+            glossary_text=text,
+            price_multiplier=BATCH_PRICE_MULTIPLIER if args.batch else 1.0
+        )
+        print_cost_estimate(estimate, estimator)
+        print()
+        if args.estimate_only:
+            if journal is not None:
+                journal.close()
+            if response_cache is not None:
+                response_cache.close()
+            if translation_memory is not None:
+                translation_memory.close()
+            return
+
+        # Glossary extraction
+        print("[STEP 3/5] Analyze document & extract glossary")
+        print("-" * 70)
+        glossary = extract_glossary(text, api_key, store=glossary_store, document=pdf_path.stem)
+        print_glossary_summary(glossary)
+        print()
+
+        # Translate
+        print("[STEP 4/5] Translate with Claude API (병렬 처리)")
+        print("-" * 70)
+        dup_translations = []
+        if dedup is not None:
+            # 반복 문단은 몇 개 안 되는 짧은 요청이므로 --batch여도 바로 번역
+            print(f"[DEDUP] Translating {len(dedup.paragraphs)} repeated paragraphs once")
+            dup_translations = translate_chunks(
+                [{'text': paragraph, 'overlap': None} for paragraph in dedup.paragraphs],
+                "English", "Korean", api_key,
+                glossary=glossary,
+                estimator=estimator
+            )
+
+        if tree is not None:
+            # 장/절 제목도 짧은 요청으로 먼저 번역 (출력 파일의 제목으로 사용)
+            print(f"[LAYOUT] Translating {len(titles)} chapter/section headings")
+            translated_titles = dict(zip(titles, translate_chunks(
+                [{'text': title, 'overlap': None} for title in titles],
+                "English", "Korean", api_key,
+                glossary=glossary,
+                estimator=estimator
+            )))
+            headings = chunk_headings(chunks, [
+                [(level, translated_titles.get(title) or title) for level, title in section.headings]
+                for section in tree.sections
+            ])
+
+        def expand(translated: str) -> str:
+            return dedup.expand(translated, dup_translations) if dedup is not None else translated
+
+        def format_section(i: int, translated: str) -> str:
+            if headings is not None:
+                return structured_section(headings.get(i, []), expand(translated))
+            return default_section(i, expand(translated))
+
+        if args.batch:
+            translated_chunks = translate_chunks_batch(
+                chunks, "English", "Korean", api_key,
+                glossary=glossary,
+                estimator=estimator,
+                poll_interval=args.batch_poll
+            )
+        else:
+            print(f"[OUTPUT] Completed sections are appended to {partial_path}")
+            writer = OrderedOutputWriter(
+                partial_path, markdown_header(pdf_path.stem, page_count, char_count, chunk_count, partial=True),
+                format_section=format_section
+            )
+            if args.use_async:
+                translated_chunks = translate_chunks_async(
+                    chunks, "English", "Korean", api_key,
+                    max_concurrency=args.concurrency,
+                    glossary=glossary,
+                    estimator=estimator,
+                    writer=writer,
+                    journal=journal,
+                    longest_first=not args.document_order
+                )
+            else:
+                translated_chunks = translate_chunks(
+                    chunks, "English", "Korean", api_key,
+                    glossary=glossary,
+                    estimator=estimator,
+                    writer=writer,
+                    journal=journal,
+                    longest_first=not args.document_order
+                )
+
+        # 용어집 준수 검사: 지정 번역이 빠진 청크만 재번역 (예산 소진으로 중단했으면 생략)
+        budget = get_budget()
+        if not args.no_glossary_check and not (budget is not None and budget.stopped):
+            print()
+            glossary_check = enforce_glossary(
+                chunks, translated_chunks, glossary, api_key,
+                estimator=estimator,
+                journal=journal
+            )
+
+        if dedup is not None and translated_chunks:
+            lost = sum(len(missing_placeholders(chunk['text'], translated))
+                       for chunk, translated in zip(chunks, translated_chunks))
+            if lost:
+                print(f"[WARNING] 번역문에서 반복 문단 자리표시자 {lost}개가 사라져 해당 위치의 반복 문단이 빠졌습니다")
+            translated_chunks = [expand(translated) for translated in translated_chunks]
+
+    if writer is not None:
+        writer.close()
+    if journal is not None:
+        journal.close()
+
+    estimator.save()
+    if response_cache is not None:
+        response_cache.close()
+        configure_response_cache(None)
+    if translation_memory is not None:
+        translation_memory.close()
+        configure_translation_memory(None)
+
+    # 예산 소진으로 중단: 최종 파일 대신 진행 중 파일과 저널을 남겨 다음 실행에서 이어서 번역
+    budget = get_budget()
+    if budget is not None and budget.stopped:
+        print()
+        print(f"[BUDGET] 예산 소진으로 번역을 중단했습니다: {format_budget(budget.summary())}")
+        if journal is not None:
+            print("[BUDGET] 완료된 청크는 저널에 남아 있습니다. --budget-usd를 늘려 같은 명령을 다시 실행하면 "
+                  "남은 청크만 번역합니다")
+        if writer is not None:
+            print(f"[BUDGET] 지금까지의 번역 (남은 청크는 원문): {partial_path}")
+        return
 
     if not translated_chunks:
         print("[ERROR] Translation failed")
@@ -868,13 +2882,18 @@ def main():
     # Generate markdown
     print("[STEP 5/5] Generate markdown")
     print("-" * 70)
-    markdown = generate_markdown(pdf_path.stem, translated_chunks, text, len(pages))
+    markdown = generate_markdown(pdf_path.stem, translated_chunks, text, page_count, total_chars=char_count,
+                                 headings=headings)
     print()
 
-    # output/ 폴더에 저장
+    # output/ 폴더에 저장 (임시 파일에 쓴 뒤 교체, 완료되면 진행 중 파일 삭제)
     print("[SAVING] Writing output file...")
-    output_path = Path('output') / f'output_{pdf_path.stem}_translated.md'
-    output_path.write_text(markdown, encoding='utf-8')
+    tmp_path = output_path.with_name(output_path.name + '.tmp')
+    tmp_path.write_text(markdown, encoding='utf-8')
+    tmp_path.replace(output_path)
+    partial_path.unlink(missing_ok=True)
+    if journal is not None:
+        journal.discard()
     print(f"[OK] ✓ Output saved: {output_path.name}")
     print()
 
@@ -883,9 +2902,26 @@ def main():
     print("[✓ SUMMARY]")
     print("=" * 70)
     print(f"  📄 PDF File: {pdf_path.name}")
-    print(f"  📖 Pages: {len(pages)}")
-    print(f"  📝 Total Characters: {len(text):,}")
-    print(f"  📦 Chunks Created: {len(chunks)}")
+    print(f"  📖 Pages: {page_count}")
+    print(f"  📝 Total Characters: {char_count:,}")
+    print(f"  📦 Chunks Created: {chunk_count}")
+    if tree is not None:
+        print(f"  🗂️  Structure: {tree.count(1)} chapters, {tree.heading_count - tree.count(1)} sections "
+              f"(chunks never cross a section boundary)")
+    if stripper is not None:
+        lines, chars, tokens, ratio = stripper.summary()
+        print(f"  ✂️  Headers/Footers Stripped: {lines} lines, {chars:,} chars (~{tokens:,.0f} tokens saved, {ratio:.1%})")
+    if glossary_check is not None and glossary_check['checked']:
+        retranslation = ""
+        if glossary_check['requests']:
+            retranslation = (f" (re-translation {glossary_check['requests']} requests, "
+                             f"input {glossary_check['input_tokens']:,} tok / output {glossary_check['output_tokens']:,} tok, "
+                             f"≈${glossary_check['cost']:.4f})")
+        print(f"  🔎 Glossary Check: {glossary_check['flagged']} chunks flagged, {glossary_check['fixed']} fixed "
+              f"by re-translation{retranslation}")
+    if dedup is not None:
+        print(f"  🧹 Deduplicated: {dedup.saved_chars:,} chars ({len(dedup.paragraphs)} repeated paragraphs, "
+              f"{dedup.occurrences} occurrences)")
     print(f"  🌐 Chunks Translated: {len(translated_chunks)}")
     print(f"  💾 Output File: {output_path.name}")
     print(f"  📍 Location: {output_path.absolute()}")